@@ -6,6 +6,10 @@ import csv
 import os
 import re
 
+import numpy
+
+from agestrucne.pgneestimationtablefilemanager import NeEstimationTableFileManager
+
 
 def scrapePower(fileName):
     statFile  = open(fileName)
@@ -42,73 +46,174 @@ def scrapeSlopes(fileName):
     statFile.close()
     return slopeResults, resultDict
 
+#converts each unique value (level) of a table column once, and returns the list of distinct converted
+#values, in order of first appearance among the levels, and an array giving each row's index into that list.
+#levels that convert to equal values (like "1" and "1.0" as floats) share an index, as they would share a dict key.
+def _convertedLevelCodes(column, convert):
+    keyValues = []
+    indexByValue = {}
+    levelToKey = numpy.empty(len(column.levels), dtype=numpy.int64)
+    for levelIdx in range(len(column.levels)):
+        value = convert(column.levels[levelIdx])
+        if value not in indexByValue:
+            indexByValue[value] = len(keyValues)
+            keyValues.append(value)
+        levelToKey[levelIdx] = indexByValue[value]
+    return keyValues, levelToKey[column.codes]
+
+#returns a column's values, one per row, as a numpy array of the given dtype (numpy.int64 or numpy.float64)
+#uses the table's typed values when they convert exactly, otherwise casts each level with int() or float(),
+#so that values that can't be cast raise ValueError as would a per-row cast.
+def _typedColumnValues(column, dtype):
+    if dtype == numpy.int64:
+        if column.column_type == column.TYPE_INT:
+            return column.values
+        convert = int
+    else:
+        if column.column_type in (column.TYPE_INT, column.TYPE_FLOAT):
+            return column.values.astype(numpy.float64)
+        convert = float
+    levelValues = numpy.array([convert(level) for level in column.levels], dtype=dtype)
+    return levelValues[column.codes]
+
+#optional cache of loaded tables, used by long-lived processes that plot the same table more than once,
+#like the workers of the headless plot rendering service (agestrucne.pgplotrenderservice).  Off by default,
+#so that a one-shot plotting run holds no table after it's grouped.
+#keyed by absolute file path, each entry a (file size, modification time, table) tuple, so that an entry
+#is reloaded when its file changes.
+_tableCache = {}
+_cacheTables = False
+_maxCachedTables = 2
+
+#turns the table cache on or off, and empties it.
+def setTableCaching(cacheTables, maxCachedTables = 2):
+    global _cacheTables, _maxCachedTables
+    _cacheTables = cacheTables
+    _maxCachedTables = maxCachedTables
+    _tableCache.clear()
+
+def _loadTable(filename):
+    if not _cacheTables:
+        return NeEstimationTableFileManager(filename)
+    path = os.path.abspath(filename)
+    fileStat = os.stat(path)
+    signature = (fileStat.st_size, fileStat.st_mtime)
+    if path in _tableCache and _tableCache[path][0:2] == signature:
+        return _tableCache[path][2]
+    table = NeEstimationTableFileManager(filename)
+    _tableCache.pop(path, None)
+    while len(_tableCache) >= _maxCachedTables:
+        #dicts don't keep insertion order in py2, so we drop an arbitrary entry
+        _tableCache.pop(next(iter(_tableCache)))
+    _tableCache[path] = signature + (table,)
+    return table
+
+#columnar reader for the neEstimation output tables, shared by scrapeNE and SubSamplePlot.neFileRead
+#loads the table with the typed, categorically coded NeEstimationTableFileManager loader, and groups its
+#rows by sorting on the key columns' codes, rather than by a per-row pass building nested dicts.
+#filename: the neEstimation tsv file
+#keyColumns: list of (column name, conversion function) pairs giving the grouping key, each key item the
+#    converted column value.  Conversions are applied once per unique value.
+#valueColumns: list of (column name, dtype) pairs, dtype numpy.int64 or numpy.float64
+#sortColumn: optional name of one of the value columns, by which rows are ordered within each group.
+#    Rows with equal values (and all rows, when sortColumn is None) stay in file order.
+#returns 3 variables: a list of the key tuples, in order of the groups' first rows in the file,
+#an array of group offsets, so that group i's rows are at [offsets[i]:offsets[i+1]], and a dictionary
+#keyed by value column name, of arrays of all rows' values, grouped in key order.
+def readNEGroupedColumns(filename, keyColumns, valueColumns, sortColumn = None):
+    table = _loadTable(filename)
+
+    keyValueLists = []
+    rowCodes = []
+    for columnName, convert in keyColumns:
+        keyValues, codes = _convertedLevelCodes(table.getColumn(columnName), convert)
+        keyValueLists.append(keyValues)
+        rowCodes.append(codes)
+
+    values = {}
+    for columnName, dtype in valueColumns:
+        values[columnName] = _typedColumnValues(table.getColumn(columnName), dtype)
+
+    totalRows = len(rowCodes[0])
+    if totalRows == 0:
+        return [], numpy.zeros(1, dtype=numpy.int64), values
+
+    #lexsort is stable and takes its primary key last, so the first row of each sorted group is its first row in the file
+    keyOrder = numpy.lexsort(rowCodes[::-1])
+    sortedCodes = numpy.array(rowCodes)[:, keyOrder]
+    changes = numpy.any(sortedCodes[:, 1:] != sortedCodes[:, :-1], axis=0)
+    starts = numpy.concatenate(([0], numpy.nonzero(changes)[0] + 1))
+    groupSizes = numpy.diff(numpy.append(starts, totalRows))
+
+    #rank the groups by first appearance, and sort the rows by group rank (then sortColumn)
+    groupOrder = numpy.argsort(keyOrder[starts], kind="mergesort")
+    groupRanks = numpy.empty(len(starts), dtype=numpy.int64)
+    groupRanks[groupOrder] = numpy.arange(len(starts))
+    rowRanks = numpy.empty(totalRows, dtype=numpy.int64)
+    rowRanks[keyOrder] = numpy.repeat(groupRanks, groupSizes)
+    if sortColumn is None:
+        order = numpy.argsort(rowRanks, kind="mergesort")
+    else:
+        order = numpy.lexsort((values[sortColumn], rowRanks))
+
+    keys = []
+    for groupIdx in groupOrder:
+        start = starts[groupIdx]
+        keys.append(tuple([keyValueLists[keyIdx][sortedCodes[keyIdx, start]] for keyIdx in range(len(keyColumns))]))
+    offsets = numpy.concatenate(([0], numpy.cumsum(groupSizes[groupOrder])))
+
+    for columnName in values:
+        values[columnName] = values[columnName][order]
+    return keys, offsets, values
+
 def scrapeNE(filename, firstVal=0,popSub = 0, lociSub = 0,lastVal = 0):
     '''
     2017_04_27.  Note from Ted: Python3's csv reader chokes on the bytes-type
     reads returned when its file object is opened 'rb'. I've 
     changed the 'rb' flag to just 'r'.
+
+    2026_10_19.  Rows are now read and grouped by readNEGroupedColumns,
+    replacing the csv.DictReader pass and its per-row casts.  Keys,
+    their order and the returned tables are as before.
     '''
-    fileBuffer = open(filename, "r")
-    replicateData = csv.DictReader(fileBuffer, delimiter="\t", quotechar="\"")
-    dataDict = {}
-    popDict = {}
-    maxDict = {}
-    minDict ={}
-    popNum = 0
-    for item in replicateData:
-        sourceName = item['original_file']
-        #Strip extreanious Path and extension Data.
-        sourceName = os.path.basename(sourceName)
-        pop = item['pop']
-        popNum = int(pop)
-        individualCount = int(item["census"])
-        neEst = float(item['ne_est_adj'])
-        maxError = float(item['95ci_high'])
-        minError = float(item['95ci_low'])
-        subpopReplicate = return_float_or_string(item['replicate_number'])
-        lociPopReplicate = return_float_or_string(item['loci_replicate_number'])
-        subpopCount = return_float_or_string(item['sample_value'])
-        lociPopCount = return_float_or_string(item['loci_sample_value'])
-        sourceName = (sourceName,subpopCount,subpopReplicate,lociPopCount,lociPopReplicate)
-        # if neEst == "NaN":
-        #    neEst = sys.maxint
-        if not sourceName in dataDict:
-            dataDict[sourceName] = {}
-            popDict[sourceName] = {}
-            maxDict[sourceName] = {}
-            minDict[sourceName] = {}
-
-        dataDict[sourceName][popNum] = neEst
-        popDict[sourceName][popNum] = individualCount
-        maxDict[sourceName][popNum] = maxError
-        minDict[sourceName][popNum] = minError
-    replicateKeys = list(dataDict.keys())
+    #Strip extreanious Path and extension Data from the source name.
+    keyColumns = [("original_file", os.path.basename),
+                    ("sample_value", return_float_or_string),
+                    ("replicate_number", return_float_or_string),
+                    ("loci_sample_value", return_float_or_string),
+                    ("loci_replicate_number", return_float_or_string)]
+    valueColumns = [("pop", numpy.int64),
+                    ("census", numpy.int64),
+                    ("ne_est_adj", numpy.float64),
+                    ("95ci_high", numpy.float64),
+                    ("95ci_low", numpy.float64)]
+    replicateKeys, offsets, columns = readNEGroupedColumns(filename, keyColumns, valueColumns, sortColumn = "pop")
+
+    #rows are sorted by pop within each replicate. Where a pop number repeats keep its last row, as would a dict.
+    pops = columns["pop"]
+    groupIds = numpy.repeat(numpy.arange(len(replicateKeys)), numpy.diff(offsets))
+    keep = numpy.ones(len(pops), dtype=bool)
+    keep[:-1] = (pops[1:] != pops[:-1]) | (groupIds[1:] != groupIds[:-1])
+    keep &= pops >= firstVal
+    if lastVal != 0:
+        keep &= pops <= lastVal
+    keptOffsets = numpy.concatenate(([0], numpy.cumsum(numpy.bincount(groupIds[keep], minlength = len(replicateKeys)))))
+
+    popKeys = pops[keep].tolist()
+    neEsts = columns["ne_est_adj"][keep].tolist()
+    individualCounts = columns["census"][keep].tolist()
+    errors = list(zip(columns["95ci_low"][keep].tolist(), columns["95ci_high"][keep].tolist()))
+
     resultTable = {}
     individualCountTable = {}
     errorTable = {}
-    for replicate in replicateKeys:
-        replicateVctr = []
-        individualCountVctr = []
-        errorVctr = []
-        replicateDict = dataDict[replicate]
-        individualCountDict = popDict[replicate]
-        minRepDict = minDict[replicate]
-        maxRepDict = maxDict[replicate]
-
-        popKeys = list(replicateDict.keys())
-        popKeys.sort()
-
-        for popKey in popKeys:
-            if popKey >= firstVal:
-                if lastVal == 0 or popKey <= lastVal:
-                    #print(popKey)
-                    replicateVctr.append((popKey, replicateDict[popKey]))
-                    individualCountVctr.append((popKey, individualCountDict[popKey]))
-                    errorVctr.append((popKey,(minRepDict[popKey],maxRepDict[popKey])))
-        resultTable[replicate] = replicateVctr
-        individualCountTable[replicate] = individualCountVctr
-        errorTable[replicate] = errorVctr
-    fileBuffer.close()
+    for replicateIdx in range(len(replicateKeys)):
+        replicate = replicateKeys[replicateIdx]
+        start = keptOffsets[replicateIdx]
+        end = keptOffsets[replicateIdx + 1]
+        resultTable[replicate] = list(zip(popKeys[start:end], neEsts[start:end]))
+        individualCountTable[replicate] = list(zip(popKeys[start:end], individualCounts[start:end]))
+        errorTable[replicate] = list(zip(popKeys[start:end], errors[start:end]))
     return resultTable,individualCountTable, errorTable
 
 #Method to read in a graph config file and return a dictionary of
@@ -17,6 +17,7 @@ from numpy import array, math
 from scipy import stats, random
 import matplotlib.pyplot as plt
 from numpy import mean, median, isnan
+import numpy
 import csv
 import sys
 import os
@@ -307,6 +308,78 @@ def _MSE(slope, intercept, line_points):
 
 
 
+#vectorized regression stats for every line in a table at once
+#table: dictionary of lines, each a list of touples defining the x and y coordinates of a point
+#alpha: desired probability for the slope confidence intervals
+#keys: optional list of table keys giving the lines and their order, defaults to all keys in table order
+#all points are packed into flat x and y arrays with a group id per point (the line's index in keys),
+#so that per-line sums are a few bincount calls instead of per-point python loops.
+#returns a dictionary of numpy arrays indexed like keys, with entries
+#"count","slope","intercept","s_score","ci_lower","ci_upper","t_star","p_value"
+#lines with 2 or fewer points (for which slope_confidence returns an error string) get nan in all but "count",
+#lines whose x values are all equal get nan slopes, as does line_regress
+def batch_line_stats(table, alpha, keys = None):
+    if keys is None:
+        keys = list(table.keys())
+    lineCount = len(keys)
+    counts = numpy.array([len(table[key]) for key in keys], dtype = numpy.int64)
+    totalPoints = int(counts.sum())
+
+    points = numpy.empty((totalPoints, 2), dtype = numpy.float64)
+    offset = 0
+    for lineIdx in range(lineCount):
+        if counts[lineIdx] > 0:
+            points[offset:offset + counts[lineIdx]] = table[keys[lineIdx]]
+        offset += counts[lineIdx]
+    xVals = points[:, 0]
+    yVals = points[:, 1]
+    groupIds = numpy.repeat(numpy.arange(lineCount), counts)
+
+    with numpy.errstate(divide = "ignore", invalid = "ignore"):
+        xMeans = numpy.bincount(groupIds, xVals, minlength = lineCount) / counts
+        yMeans = numpy.bincount(groupIds, yVals, minlength = lineCount) / counts
+        xDiffs = xVals - xMeans[groupIds]
+        yDiffs = yVals - yMeans[groupIds]
+        sXX = numpy.bincount(groupIds, xDiffs * xDiffs, minlength = lineCount)
+        sXY = numpy.bincount(groupIds, xDiffs * yDiffs, minlength = lineCount)
+
+        slopes = numpy.where(sXX > 0, sXY / sXX, numpy.nan)
+        intercepts = yMeans - slopes * xMeans
+        residuals = yVals - (slopes[groupIds] * xVals + intercepts[groupIds])
+        errorSums = numpy.bincount(groupIds, residuals * residuals, minlength = lineCount)
+
+        dof = counts - 2
+        enoughPoints = dof > 0
+        dof = numpy.where(enoughPoints, dof, 1)
+        #get s(b1)  == sqrt((MSE)/sum(xi-mean(x))^2)
+        sScores = numpy.sqrt((errorSums / dof) / sXX)
+        tScores = stats.t.ppf(1 - old_div(alpha, 2), dof)
+        deltaConfidence = tScores * sScores
+        tStars = slopes / sScores
+        #DF = num points-2
+        pValues = stats.t.sf(tStars, dof)
+
+    result = {}
+    result["count"] = counts
+    for name, values in (("slope", slopes), ("intercept", intercepts), ("s_score", sScores),
+                            ("ci_lower", slopes - deltaConfidence), ("ci_upper", slopes + deltaConfidence),
+                            ("t_star", tStars), ("p_value", pValues)):
+        result[name] = numpy.where(enoughPoints, values, numpy.nan)
+    return result
+
+#classifies each line's slope as positive (1), neutral (0) or negative (-1) from its p value,
+#as significant when alpha exceeds 1-(abs(p-0.5)*2), the two tailed probability from the CDF
+#stats_by_line: dictionary as returned by batch_line_stats
+#returns a numpy array of the signs, with 0 for lines that have nan p values
+def batch_slope_signs(stats_by_line, alpha):
+    pValues = stats_by_line["p_value"]
+    with numpy.errstate(invalid = "ignore"):
+        alphaChecks = 1 - (abs(pValues - 0.5) * 2)
+        significant = alpha > alphaChecks
+    signs = numpy.where(stats_by_line["slope"] > 0, 1, -1)
+    return numpy.where(significant, signs, 0)
+
+
 #helper function to get line slopes, extracted in case changes or medians are wanted instead
 def _getExpectedLineSlope(vctr):
     result = mean(vctr)
@@ -495,40 +568,22 @@ def _neStatsHelper(table,neFile,confidenceAlpha, outFileName = "neStatsOut.txt",
     s_score_vctr= []
 
     Uncountable = 0
-    negativeCount=0
-    zeroCount=0
-    positiveCount=0
-    for recordKey in list(table.keys()):
+    recordKeys = list(table.keys())
+    #slopes, confidence intervals and p values for all lines at once
+    lineStats = batch_line_stats(table, confidenceAlpha, recordKeys)
+    slopeSigns = batch_slope_signs(lineStats, confidenceAlpha)
+    positiveCount = int(numpy.sum(slopeSigns > 0))
+    negativeCount = int(numpy.sum(slopeSigns < 0))
+    zeroCount = len(recordKeys) - positiveCount - negativeCount
+    s_score_vctr = lineStats["s_score"]
+
+    for lineIdx in range(len(recordKeys)):
+        recordKey = recordKeys[lineIdx]
         print(recordKey)
-        record = table[recordKey]
-        slope, intercept, confidence  = slope_confidence(confidenceAlpha, record)
-
-
-        # perform alpha test
-        alpha_result = alpha_test(confidenceAlpha, record)
-        if alpha_result == 0:
-            alpha_vctr.append(0)
-        elif slope > 0:
-            alpha_vctr.append(1)
-        else:
-            alpha_vctr.append(-1)
-
-
-        #get std dev estimate
-        s_val = calculate_s_score(record)
-        s_score_vctr.append(s_val)
-        t_star = old_div(slope,s_val)
-        #calculate p value DF = num points-2
-        p_score = stats.t.sf(t_star,len(record)-2)
-        #calculate significant from CDF(p-value)
-        alpha_check = 1-(abs(p_score-0.5)*2)
-        if confidenceAlpha > alpha_check:
-            if slope > 0:
-                positiveCount+=1
-            else:
-                negativeCount+=1
-        else:
-            zeroCount+=1
+        slope = lineStats["slope"][lineIdx]
+        intercept = lineStats["intercept"][lineIdx]
+        confidence = (float(lineStats["ci_lower"][lineIdx]), float(lineStats["ci_upper"][lineIdx]))
+        p_score = lineStats["p_value"][lineIdx]
 
         #Ted edit 2017_05_12. For python3, we have to cast the confidence tuple 
         #as a string. Looks like py3 provides no tuple handling in the format 
@@ -2,28 +2,50 @@ from __future__ import print_function
 from future import standard_library
 standard_library.install_aliases()
 import configparser
+import glob
+import multiprocessing
 import os
 import re
+import sys
+import time
 from itertools import product
-import LineRegress
-import ResultScraper
 
+from agestrucne.asnviz import FileIO
+from agestrucne.asnviz import LineRegress
 
+#the stages run for each parameter set.  A simulation is shared by all the sampling parameter sets
+#run on its output, each of which has an estimation stage, followed by a regression stage.
+SIMULATION = "simulation"
+ESTIMATION = "estimation"
+REGRESSION = "regression"
+
+#names of the files in each run folder.  Each stage writes its marker file only after its outputs
+#are complete, so that a rerun of the batch with the same output folder skips finished stages.
+simOutputBase = "sim"
+neFileName = "ne.tsv"
+neMessagesFileName = "ne.msgs"
+statsFileName = "stats.txt"
+doneMarkerFormat = ".{}.done"
+
+#seconds between checks on running stages
+pollInterval = 0.5
 
 def readconfig(filename):
 
     ## SETS DEFaULTS
     #all defaults must be in a list even if only one value
     speciesFile = ""
+    lifeTableFile = "none"
     outFolder = ""
     lineRegressConfig = ""
-    lambdas = [1.0]
-    startPopulations = []#TODO need default
-    N0s = []#TODO need default
-    microsats = []#TODO need default
-    alleleCount = []#TODO needs default
-    SNPs = []#TODO need default
-    mutationRate = [0]
+    lambdas = [None]
+    startLambdas = [None]
+    startPopulations = [None]
+    Nbs = [None]
+    microsats = [None]
+    alleleCount = [None]
+    SNPs = [None]
+    mutationRate = [None]
     lociSampling = [1.0]
     populationSampling = [1.0]
     simReps = [100]
@@ -35,6 +57,13 @@ def readconfig(filename):
     config = configparser.ConfigParser()
     config.readfp(open(filename))
 
+    def readValues(section, convert, default):
+        if config.has_section(section) and config.has_option(section, "values"):
+            paramTemp = config.get(section, "values")
+            paramList = [value.strip() for value in re.split(delimiters, paramTemp) if value.strip() != ""]
+            return [convert(value) for value in paramList]
+        return default
+
     #read in output filename
     if config.has_section("outFolder"):
         if config.has_option("outFolder", "name"):
@@ -45,95 +74,49 @@ def readconfig(filename):
         if config.has_option("species", "name"):
             speciesFile = config.get("species", "name")
 
+    ##read life table file, "none" when the species file has the life table parameters
+    if config.has_section("lifetable"):
+        if config.has_option("lifetable", "name"):
+            lifeTableFile = config.get("lifetable", "name")
+
     ##read lineRegress input file
     if config.has_section("lineRegress"):
         if config.has_option("lineRegress", "name"):
             lineRegressConfig = config.get("lineRegress", "name")
 
-    ##read Lambda
-    if config.has_section("lambda"):
-        if config.has_option("lambda", "values"):
-            paramTemp = config.get("lambda", "values")
-            paramList = re.split(delimiters.paramTemp)
-            lambdas = [float(value) for value in paramList]
-
+    lambdas = readValues("lambda", float, lambdas)
+    ##read the burn-in cycles, after which the simulation applies lambda and the Nb tolerance test
+    startLambdas = readValues("startLambdas", int, startLambdas)
     ##read starting population
-    if config.has_section("startPop"):
-        if config.has_option("startPop", "values"):
-            paramTemp = config.get("startPop", "values")
-            paramList = re.split(delimiters.paramTemp)
-            startPopulations = [int(value) for value in paramList]
-
-    ##read starting newborns (N0)
-    if config.has_section("startNewborns"):
-        if config.has_option("startNewborns", "values"):
-            paramTemp = config.get("startNewborns", "values")
-            paramList = re.split(delimiters.paramTemp)
-            N0s = [int(value) for value in paramList]
-
-    ##read starting newborns (N0)
-    if config.has_section("N0"):
-        if config.has_option("N0", "values"):
-            paramTemp = config.get("N0", "values")
-            paramList = re.split(delimiters.paramTemp)
-            N0s = [int(value) for value in paramList]
-
+    startPopulations = readValues("startPop", int, startPopulations)
+    ##read Nb.  The simulation computes N0 from Nb and the species Nb/Nc ratio, so N0 can't be set directly
+    Nbs = readValues("Nb", int, Nbs)
+    if config.has_section("N0") or config.has_section("startNewborns"):
+        raise Exception("In SimBatchRun.readconfig, N0 is computed from Nb and the Nb/Nc ratio "
+                        + "by the simulation, and can't be set.  Please give the values in an [Nb] section.")
     ##read Number of Microsats
-    if config.has_section("Microsats"):
-        if config.has_option("Microsats", "values"):
-            paramTemp = config.get("Microsats", "values")
-            paramList = re.split(delimiters.paramTemp)
-            microsats = [int(value) for value in paramList]
-
+    microsats = readValues("Microsats", int, microsats)
     ## read number of alleles per microsat
-    if config.has_section("alleleCount"):
-        if config.has_option("alleleCount", "values"):
-            paramTemp = config.get("alleleCount", "values")
-            paramList = re.split(delimiters.paramTemp)
-            alleleCount = [int(value) for value in paramList]
-
+    alleleCount = readValues("alleleCount", int, alleleCount)
     ##read in number of SNPs
-    if config.has_section("SNPs"):
-        if config.has_option("SNPs", "values"):
-            paramTemp = config.get("SNPs", "values")
-            paramList = re.split(delimiters.paramTemp)
-            SNPs = [int(value) for value in paramList]
-
+    SNPs = readValues("SNPs", int, SNPs)
     ##read in mutation Rate
-    if config.has_section("mutationRate"):
-        if config.has_option("mutationRate", "values"):
-            paramTemp = config.get("mutationRate", "values")
-            paramList = re.split(delimiters.paramTemp)
-            mutationRate = [float(value) for value in paramList]
-
-
-    if config.has_section("lociSampleRate"):
-        if config.has_option("lociSampleRate", "values"):
-            paramTemp = config.get("lociSampleRate", "values")
-            paramList = re.split(delimiters.paramTemp)
-            lociSampling = [int(value) for value in paramList]
-
-
-    if config.has_section("individualSamplRate"):
-        if config.has_option("individualSamplRate", "values"):
-            paramTemp = config.get("individualSamplRate", "values")
-            paramList = re.split(delimiters.paramTemp)
-            populationSampling = [int(value) for value in paramList]
-
-    if config.has_section("simReps"):
-        if config.has_option("simReps", "values"):
-            paramTemp = config.get("simReps", "values")
-            paramList = re.split(delimiters.paramTemp)
-            simReps = [int(value) for value in paramList]
+    mutationRate = readValues("mutationRate", float, mutationRate)
+    #sampling rates are proportions, 0 to 1
+    lociSampling = readValues("lociSampleRate", float, lociSampling)
+    populationSampling = readValues("individualSamplRate", float, populationSampling)
+    simReps = readValues("simReps", int, simReps)
 
 
     ##create parameter dictionary for return
     paramDict = {"species":speciesFile,
+                 "lifeTable":lifeTableFile,
                  "outputFolder":outFolder,
                  "regressConfig":lineRegressConfig,
                  "lambdas":lambdas,
+                 "startLambdas":startLambdas,
                  "startPops":startPopulations,
-                 "N0":N0s,
+                 "Nb":Nbs,
                  "microsats":microsats,
                  "alleleCount":alleleCount,
                  "SNPs":SNPs,
@@ -143,95 +126,223 @@ def readconfig(filename):
                  "simReps":simReps}
     return paramDict
 
-def runSimulation(species,outFolder,simReps,lambdaVal,startPop,N0,microSats,alleleCount,SNPs,mutationRate):
-    outputFiles = []
-    #create folder for simupop run
-    #run simupop
-
-    return outputFiles
-
-def runNeEst(files,runFolder,locisampling,popsampling,regressConfig):
-    statsFile = ""
-    #create output folder
-    #run neEstimator
-    neFile = ""
-    #run lineregress
-    configVals = ResultScraper.configRead(regressConfig)
-    statsFile =  LineRegress._neStatsHelper(neFile, configVals["alpha"], outFileName=statsFile,significantValue=configVals["sigSlope"],firstVal=configVals["startData"])
-    return statsFile
+#the swept simulation parameters, in the order used by runSimulation and createSimIdentifier, and the
+#sampling parameters, in the order used by runNeEst
+simParamKeys = ["simReps", "lambdas", "startLambdas", "startPops", "Nb", "microsats", "alleleCount", "SNPs", "mutationRate"]
+samplingParamKeys = ["lociSampling", "popSampling"]
+
+#returns the list of simulation parameter tuples, and the list of sampling parameter tuples,
+#whose product is the sweep's grid
+def expandGrid(configs):
+    simParamSets = list(product(*[configs[key] for key in simParamKeys]))
+    samplingParamSets = list(product(*[configs[key] for key in samplingParamKeys]))
+    return simParamSets, samplingParamSets
+
+#runs the simulation for one parameter set, writing genepop files named by outBase.
+#None values leave the species file's setting.
+def runSimulation(species, lifeTable, outBase, simReps, lambdaVal, startLambda, startPop, Nb, microSats, alleleCount, SNPs, mutationRate):
+    #imported here, since simuPOP is needed only in the simulation stage's process
+    import agestrucne.pgdrivesimulation as pgsim
+    import agestrucne.pgopsimupop as pgop
+
+    valueList = [(name, value) for name, value in [("lbd", lambdaVal), ("startAlleles", alleleCount), ("mutFreq", mutationRate)] if value is not None]
+    pgsim.drive_sims(species, lifeTable, outBase, valueList,
+                     i_replicates=simReps,
+                     i_Nb=Nb,
+                     f_Nb_tolerance=None,
+                     i_startsave=None,
+                     i_burnin=startLambda,
+                     i_processes=1,
+                     i_total_cycles=None,
+                     i_output_mode=pgop.PGOpSimuPop.OUTPUT_GENEPOP_ONLY,
+                     s_het_filter=None,
+                     i_popsize=startPop,
+                     s_cull_method=None,
+                     i_num_snps=SNPs,
+                     f_het_init_snp=None,
+                     i_num_msats=microSats,
+                     f_het_init_msat=None,
+                     i_num_chroms=None,
+                     f_recombination_intensity=None)
+    return sorted(glob.glob(outBase + "*.genepop"))
+
+#runs the Ne estimator on the genepop files matching filePattern, sampling the given proportions of
+#individuals and loci, and returns the estimates table file name
+def runNeEst(filePattern, runFolder, locisampling, popsampling):
+    import agestrucne.pgdriveneestimator as pgdne
+    import agestrucne.pgutilities as pgut
+
+    neFile = os.path.join(runFolder, neFileName)
+    tempDir = pgut.get_temporary_directory(runFolder)
+    args = [filePattern, "percent", str(popsampling * 100), "1", "99999", "1-99999", "0.05", "False", "None", "2", "1",
+            "percent", str(locisampling * 100), "1", "99999", "1-99999", "1",
+            "1", "no_debug", "0.0", "False", neFile, os.path.join(runFolder, neMessagesFileName), tempDir, "False"]
+    try:
+        pgdne.mymain(*args)
+    finally:
+        if os.path.isdir(tempDir):
+            pgut.remove_directory_and_all_contents(tempDir)
+    return neFile
+
+#runs the regression stats on the estimates table, and returns the stats file name
+def runRegression(neFile, runFolder, regressConfig):
+    statsFile = os.path.join(runFolder, statsFileName)
+    if not regressConfig:
+        table, countsTable, errorTable = FileIO.scrapeNE(neFile)
+        return LineRegress._neStatsHelper(table, neFile, 0.05, outFileName=statsFile)
+    configVals = FileIO.configRead(regressConfig)
+    table, countsTable, errorTable = FileIO.scrapeNE(neFile, configVals["startData"], lastVal=configVals["endData"])
+    if configVals["ordering"]:
+        orderingTable = FileIO.readFileOrder(configVals["ordering"])
+        table = LineRegress.orderFiles(table, orderingTable, configVals["orderingGen"])
+    return LineRegress._neStatsHelper(table, neFile, configVals["alpha"], outFileName=statsFile, significantValue=configVals["sigSlope"],
+                                      firstVal=configVals["startData"], expected=configVals["expected"])
 
 def gatherNe(fileName,firstVal):
-    results, temp = ResultScraper.scrapeNE(fileName,firstVal)
+    results, counts, errors = FileIO.scrapeNE(fileName,firstVal)
     return results
 
 def gatherPower(filename):
-    powerData = ResultScraper.scrapePower(filename)
+    powerData = FileIO.scrapePower(filename)
     return powerData
 
 def gatherSlopes(filename):
-    instanceArray, arrayDict = ResultScraper.scrapeSlopes(filename)
+    instanceArray, arrayDict = FileIO.scrapeSlopes(filename)
     return instanceArray
 
 
 
-def createIdentifier(species, outFolder, simReps, lambdaVal, startPop, N0, microSats, alleleCount, SNPs, mutationRate, locisampling, popsampling, regressConfig):
-    identifier = "l"+str(lambdaVal)
-    +"p" + str(startPop)\
-    + "N0" + str(N0) \
+def createSimIdentifier(simReps, lambdaVal, startLambda, startPop, Nb, microSats, alleleCount, SNPs, mutationRate):
+    identifier = "r" + str(simReps)\
+    + "l" + str(lambdaVal)\
+    + "b" + str(startLambda)\
+    + "p" + str(startPop)\
+    + "Nb" + str(Nb)\
     + "m" + str(microSats)\
     + "ac" + str(alleleCount)\
     + "SNPs" + str(SNPs)\
-    + "mr" + str(mutationRate)\
-    + "ls" + str(locisampling)\
-    + "ps" + str(popsampling)
+    + "mr" + str(mutationRate)
     return identifier
 
+def createSamplingIdentifier(locisampling, popsampling):
+    return "ls" + str(locisampling) + "ps" + str(popsampling)
 
-def parseIdentifier(identifier):
-    re.compile('l(?P<lambda>[\d.\.]*)p(?P<startPop>[\d*])N0(?P<N0>[\d]*)m(?P<microsats>[\d]*)ac(?P<allelecount>[\d]*)SNPs(?P<SNPs>[\d]*)mr(?P<mutations>[\d\.]*)ls(?P<locisampling>[\d\.]*)ps(?P<popsampling>[\d\.]*)')
-
-
+def createIdentifier(simParams, samplingParams):
+    return createSimIdentifier(*simParams) + createSamplingIdentifier(*samplingParams)
 
 
-
-def nameRunFolder(species,outFolder,simReps,lambdaVal,startPop,N0,microSats,alleleCount,SNPs,mutationRate,locisampling,popsampling,regressConfig):
-    runFolder = createIdentifier(species,outFolder,simReps,lambdaVal,startPop,N0,microSats,alleleCount,SNPs,mutationRate,locisampling,popsampling,regressConfig)
-    print(runFolder)
-    runFolder = os.sys.join(outFolder, runFolder)
-    if os.path.isdir(runFolder):
+#returns a dictionary of the parameter values given in an identifier, or None if it's not an identifier
+def parseIdentifier(identifier):
+    identifierRegex = re.compile(r'r(?P<simReps>[\d]*)l(?P<lambda>[\w\.]*)b(?P<startLambda>[\w]*)p(?P<startPop>[\w]*)Nb(?P<Nb>[\w]*)m(?P<microsats>[\w]*)ac(?P<allelecount>[\w]*)SNPs(?P<SNPs>[\w]*)mr(?P<mutations>[\w\.\-]*)ls(?P<locisampling>[\d\.]*)ps(?P<popsampling>[\d\.]*)$')
+    match = identifierRegex.match(identifier)
+    if match is None:
         return None
-    return runFolder
-
-def run(species,outFolder,simReps,lambdaVal,startPop,N0,microSats,alleleCount,SNPs,mutationRate,locisampling,popsampling,regressConfig):
-    runFolder = nameRunFolder(species,outFolder,simReps,lambdaVal,startPop,N0,microSats,alleleCount,SNPs,mutationRate,locisampling,popsampling,regressConfig)
-    if  not runFolder:
-        return
-    os.makedirs(runFolder)
-    simFiles = runSimulation(species,runFolder,simReps,lambdaVal,startPop,N0,microSats,alleleCount,SNPs,mutationRate)
-    neFile, statsFile = runNeEst(simFiles,runFolder,locisampling,popsampling,regressConfig)
-
-    return neFile, statsFile
-
-def runSamplingOnly(files,runFolder,locisampling,popsampling,regressConfig):
-    neFile, statsFile = runNeEst(files,runFolder,locisampling,popsampling,regressConfig)
-    return neFile,statsFile
+    return match.groupdict()
+
+
+def stageIsDone(runFolder, stage):
+    return os.path.exists(os.path.join(runFolder, doneMarkerFormat.format(stage)))
+
+def markStageDone(runFolder, stage):
+    open(os.path.join(runFolder, doneMarkerFormat.format(stage)), "w").close()
+
+#target of each stage's process.  Runs the stage, then writes its done marker
+def _runStage(stage, runFolder, args):
+    if stage == SIMULATION:
+        outBase = os.path.join(runFolder, simOutputBase)
+        #a stage that didn't finish leaves partial output, which the simulation won't overwrite
+        for partialFile in glob.glob(outBase + "*"):
+            os.remove(partialFile)
+        simFiles = runSimulation(args[0], args[1], outBase, *args[2])
+        if len(simFiles) == 0:
+            raise Exception("In SimBatchRun._runStage, the simulation in " + runFolder + " wrote no genepop files.")
+    elif stage == ESTIMATION:
+        runNeEst(*args)
+    elif stage == REGRESSION:
+        runRegression(*args)
+    else:
+        raise Exception("In SimBatchRun._runStage, unknown stage: " + str(stage) + ".")
+    markStageDone(runFolder, stage)
+
+#builds the stage tasks for the sweep.  Each task is a dictionary giving its stage, run folder, args,
+#and the index of the task it depends on (None for simulations).  Returns the list of tasks, and
+#dictionaries keyed by identifier giving the estimates table and stats file of each sampling parameter set
+def planStages(configs, outFolder):
+    simParamSets, samplingParamSets = expandGrid(configs)
+    species = os.path.abspath(configs["species"])
+    lifeTable = configs["lifeTable"] if configs["lifeTable"] == "none" else os.path.abspath(configs["lifeTable"])
+    regressConfig = os.path.abspath(configs["regressConfig"]) if configs["regressConfig"] else ""
+    tasks = []
+    neDict = {}
+    statsDict = {}
+    for simParams in simParamSets:
+        simFolder = os.path.join(outFolder, createSimIdentifier(*simParams))
+        simTask = len(tasks)
+        tasks.append({"stage":SIMULATION, "folder":simFolder, "args":(species, lifeTable, simParams), "after":None})
+        filePattern = os.path.join(simFolder, simOutputBase + "*.genepop")
+        for samplingParams in samplingParamSets:
+            runFolder = os.path.join(simFolder, createSamplingIdentifier(*samplingParams))
+            identifier = createIdentifier(simParams, samplingParams)
+            estimationTask = len(tasks)
+            tasks.append({"stage":ESTIMATION, "folder":runFolder, "args":(filePattern, runFolder) + tuple(samplingParams), "after":simTask})
+            neFile = os.path.join(runFolder, neFileName)
+            tasks.append({"stage":REGRESSION, "folder":runFolder, "args":(neFile, runFolder, regressConfig), "after":estimationTask})
+            neDict[identifier] = neFile
+            statsDict[identifier] = os.path.join(runFolder, statsFileName)
+    return tasks, neDict, statsDict
+
+#runs the tasks in up to "threads" concurrent processes, each task once the task it depends on has finished.
+#Stages whose done markers exist are skipped.  A failed task fails the tasks that depend on it, but the others run.
+#returns the list of the failed tasks' indices
+def runStages(tasks, threads = 1):
+    PENDING, RUNNING, DONE, FAILED = range(4)
+    states = [DONE if stageIsDone(task["folder"], task["stage"]) else PENDING for task in tasks]
+    running = {}
+    while True:
+        for taskIdx in list(running.keys()):
+            process = running[taskIdx]
+            if not process.is_alive():
+                process.join()
+                states[taskIdx] = DONE if process.exitcode == 0 else FAILED
+                del running[taskIdx]
+
+        #fail the pending tasks whose dependencies failed, and start the ready ones, in grid order
+        for taskIdx in range(len(tasks)):
+            if states[taskIdx] != PENDING:
+                continue
+            after = tasks[taskIdx]["after"]
+            if after is not None and states[after] == FAILED:
+                states[taskIdx] = FAILED
+            elif (after is None or states[after] == DONE) and len(running) < threads:
+                task = tasks[taskIdx]
+                if not os.path.isdir(task["folder"]):
+                    os.makedirs(task["folder"])
+                #not daemonic, since the simulation and estimation stages start processes of their own
+                process = multiprocessing.Process(target=_runStage, args=(task["stage"], task["folder"], task["args"]))
+                process.daemon = False
+                process.start()
+                running[taskIdx] = process
+                states[taskIdx] = RUNNING
+
+        if len(running) == 0:
+            break
+        time.sleep(pollInterval)
+    return [taskIdx for taskIdx in range(len(tasks)) if states[taskIdx] == FAILED]
 
 def collectStatsData(neDict, statsDict, outFolder,regressConfig):
     slopesName = "slopes.csv"
     powerName = "power.csv"
     neName = "Ne.csv"
-    statConfig = ResultScraper.configRead(regressConfig)
+    startData = FileIO.configRead(regressConfig)["startData"] if regressConfig else 0
 
     nePath = os.path.join(outFolder, neName)
     neOut = open(nePath, "w")
     neOut.write("parameters,replicate,Reproductive Cycle,Ne\n")
     for identifier in neDict:
         neFile = neDict[identifier]
-        neData = gatherNe(neFile, statConfig["startData"])
+        neData = gatherNe(neFile, startData)
         for datapoint in neData:
-            print(datapoint)
             data = neData[datapoint]
-            print(data)
             for point in data:
                 neOut.write(str(identifier) + "," + str(datapoint) + "," + str(point[0]) + "," + str(point[1]) + "\n")
     neOut.close()
@@ -250,50 +361,54 @@ def collectStatsData(neDict, statsDict, outFolder,regressConfig):
         sumPower = sum(power.values())
         powerOut.write(str(identifier)+ "," +str(power["positive"])+ "," +str(power["neutral"])+ "," +str(power["negative"])+ "," +str(sumPower)+"\n")
         for dataPoint in slopes:
-            slopeOut.write(str(identifier)+ "," +dataPoint["slope"]+ "," +dataPoint["intercept"]+ "," +dataPoint["lowerCI"]+ "," +dataPoint["upperCI"]+"\n")
+            slopeOut.write(str(identifier)+ "," +str(dataPoint["slope"])+ "," +str(dataPoint["intercept"])+ "," +str(dataPoint["lowerCI"])+ "," +str(dataPoint["upperCI"])+"\n")
     powerOut.close()
     slopeOut.close()
 
 
 
-def batch(configFile,threads = 1):
+#runs the parameter sweep given by the batch config file, with up to "threads" stages at once.
+#Rerunning with the same output folder resumes the sweep, skipping finished stages.
+#renderPlots: if True, and the config names a lineRegress config, the regression plots of each
+#    parameter set are written to image files in its run folder, using the headless plot rendering service.
+#    The stats are collected first, and plots that fail to render are reported as warnings.
+#returns the identifiers of the parameter sets that failed
+def batch(configFile,threads = 1, renderPlots = False):
     configs  = readconfig(configFile)
-    speciesFile = configs["species"]
-    outFolder = configs["outputFolder"]
-    incriment = 1
-    while os.path.isdir(outFolder):
-        outFolder = outFolder+"("+incriment+")"
-        incriment+=1
-    os.mkdirs(outFolder)
-    runParams = product(configs["species"],[outFolder],configs["simReps"],configs["lambdas"],configs["startPops"],configs["N0"],configs["microsats"],configs["alleleCount"],configs["SNPs"],configs["mutationRate"],configs["lociSampling"],configs["popSampling"],configs["regressConfig"])
-
-    if len(configs["simReps"])==1 and len(configs["startPops"])==1 and len(configs["N0"])==1 and len(configs["microsats"])==1 and len(configs["alleleCount"])==1 and len(configs["SNPs"])==1 and len(configs["mutationRate"])==1:
-        if threads == 1:
-            neFiles = []
-            simFiles = runSimulation(runParams[0],runParams[1],runParams[2],runParams[3],runParams[4],runParams[5],runParams[6],runParams[7],runParams[8],runParams[9])
-            neDict = {}
-            statsDict ={}
-            for paramset in runParams:
-                runFolder = nameRunFolder(*runParams)
-                if not runFolder:
-                    continue
-                ident = createIdentifier(*runParams)
-                neFile, statsFile = run(*runParams)
-                neDict[ident] = neFile
-                statsDict[ident] = statsFile
-    else:
-        if threads ==1:
-            neDict = {}
-            statsDict ={}
-            for paramset in runParams:
-                ident = createIdentifier(*runParams)
-                neFile, statsFile = run(*runParams)
-                neDict[ident] = neFile
-                statsDict[ident] = statsFile
-
-    collectStatsData(neDict, statsDict, outFolder, configs["regressConfig"])
+    outFolder = os.path.abspath(configs["outputFolder"])
+    if not os.path.isdir(outFolder):
+        os.makedirs(outFolder)
 
+    tasks, neDict, statsDict = planStages(configs, outFolder)
+    failedTasks = runStages(tasks, threads)
 
+    failedFolders = set([tasks[taskIdx]["folder"] for taskIdx in failedTasks])
+    failedIdentifiers = []
+    for identifier in list(statsDict.keys()):
+        runFolder = os.path.dirname(statsDict[identifier])
+        if runFolder in failedFolders or os.path.dirname(runFolder) in failedFolders:
+            failedIdentifiers.append(identifier)
+            del neDict[identifier]
+            del statsDict[identifier]
 
+    for identifier in failedIdentifiers:
+        sys.stderr.write("Warning:  In SimBatchRun.batch, the parameter set " + identifier + " failed.\n")
 
+    collectStatsData(neDict, statsDict, outFolder, configs["regressConfig"])
 
+    if renderPlots and configs["regressConfig"] and len(neDict) > 0:
+        import agestrucne.pgutilities as pgut
+        specs = [{"type":"Regression", "tsv":neDict[identifier], "config":configs["regressConfig"],
+                  "image_prefix":os.path.join(os.path.dirname(neDict[identifier]), "plot")} for identifier in neDict]
+        try:
+            pgut.render_plots_headless(specs, i_total_processes=threads)
+        except Exception as oex:
+            sys.stderr.write("Warning:  In SimBatchRun.batch, rendering the plots failed: " + str(oex) + "\n")
+
+    return failedIdentifiers
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: SimBatchRun.py <batch config file> [<total processes>]")
+        sys.exit(1)
+    batch(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1)
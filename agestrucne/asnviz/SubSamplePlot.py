@@ -3,8 +3,9 @@ import csv
 import os
 
 import matplotlib.pyplot as plt
+import numpy
 
-from agestrucne.asnviz.FileIO import configRead, makeOutlierDict, writeOutliers
+from agestrucne.asnviz.FileIO import configRead, makeOutlierDict, writeOutliers, readNEGroupedColumns
 
 
 def createBoxPlot(table,title = None, subTitle = None,  xlab = None, yLab= None, dest = "show", sortCrit = "pop",):
@@ -117,54 +118,42 @@ def neFileRead(filename, firstVal = 0):
     requres that the file buffer deliver strings, but 'rb' delivers
     bytes type objects in py3.  We open the file with 'r'
     instead of 'rb'.
+
+    2026_10_19.  Rows are now read and grouped by 
+    FileIO.readNEGroupedColumns, replacing the csv.DictReader 
+    pass, so only the (few) subsample groups are handled 
+    in python.  The per-value debugging prints were dropped.
+    '''
+
+    '''
+    Ted revised 2016_12_05, to allow
+    non-float (string) pop and loci sample values.
     '''
+    keyColumns = [("original_file", os.path.basename),
+                    ("pop", int),
+                    ("sample_value", return_float_or_string),
+                    ("loci_sample_value", return_float_or_string)]
+    valueColumns = [("ne_est_adj", numpy.float64),
+                    ("indiv_count", numpy.int64)]
+    groupKeys, offsets, columns = readNEGroupedColumns(filename, keyColumns, valueColumns)
+    neEsts = columns["ne_est_adj"].tolist()
+    individualCounts = columns["indiv_count"].tolist()
 
-    fileBuffer = open(filename, "r")
-    replicateData = csv.DictReader(fileBuffer, delimiter="\t", quotechar="\"")
     dataDict = {}
     popDict={}
-    popSample = 0
-    for item in replicateData:
-        sourceName = item['original_file']
-        sourceName = os.path.basename(sourceName)
-        cohort = int(item["pop"])
-
-
-        sourceName = (sourceName, cohort)
-        pop =  item['sample_value']
-
-        '''
-        Ted revised 2016_12_05, to allow
-        non-float (string) pop sample values.
-        '''
-        popSample = return_float_or_string(pop)
-        #popSample = float(pop)
-
-        #popSample = pop
-        loci = item['loci_sample_value']
-
-        '''
-        Ted revosed 2016_12_05, to allow
-        non-float (string) loci sample values.
-        '''
-        lociSample = return_float_or_string(loci)
-        #lociSample = float(loci)
-
-        individualCount = int(item["indiv_count"])
-        neEst = float(item['ne_est_adj'])
-        #if neEst == "NaN":
-        #    neEst = sys.maxint
+    for groupIdx in range(len(groupKeys)):
+        fileName, cohort, popSample, lociSample = groupKeys[groupIdx]
+        sourceName = (fileName, cohort)
         if  not sourceName in dataDict:
             dataDict[sourceName] = {}
             popDict[sourceName] = {}
         if not popSample in dataDict[sourceName]:
             dataDict[sourceName][popSample] = {}
             popDict[sourceName][popSample] = {}
-        if not lociSample in dataDict[sourceName][popSample]:
-            dataDict[sourceName][popSample][lociSample] = []
-            popDict[sourceName][popSample][lociSample] = []
-        dataDict[sourceName][popSample][lociSample].append(neEst)
-        popDict[sourceName][popSample][lociSample].append(individualCount)
+        start = offsets[groupIdx]
+        end = offsets[groupIdx + 1]
+        dataDict[sourceName][popSample][lociSample] = neEsts[start:end]
+        popDict[sourceName][popSample][lociSample] = individualCounts[start:end]
     replicateKeys = list(dataDict.keys())
     resultTable = {}
     individualCountTable = {}
@@ -179,14 +168,10 @@ def neFileRead(filename, firstVal = 0):
             lociKeys = list(replicateDict[popKey].keys())
             lociKeys.sort()
             for lociKey in lociKeys:
-                #print popKey
-                print(popKey)
-                print(lociKey)
                 replicateVctr.append((popKey,lociKey,replicateDict[popKey][lociKey]))
                 individualCountVctr.append((popKey,lociKey,individualCountDict[popKey][lociKey]))
         resultTable[replicate] = replicateVctr
         individualCountTable[replicate] = individualCountVctr
-        print(resultTable)
     return resultTable,individualCountTable
 
 
@@ -0,0 +1,572 @@
+'''
+Description
+2026_10_19
+
+Block-compressed genepop files, readable with random access.
+
+A block-compressed genepop file is a series of independently
+bz2-compressed blocks, and so is itself a valid (multi-stream)
+bz2 file, which bunzip2 and python's bz2 module read as usual.
+Blocks never split a line, and each "pop" line starts a new block,
+so that the blocks holding any one pop section can be decompressed
+without touching the others.  Pop sections larger than the
+block size are split over several blocks.
+
+Alongside the compressed file we write an index file, named as
+the compressed file plus BLOCK_INDEX_FILE_EXTENSION, that gives,
+for each block, its offset and length in the compressed file and
+in the uncompressed text, whether it starts with a "pop" line,
+and the lengths of its lines.  From the index a GenepopFileManager
+can compute every line's address in the uncompressed text without
+decompressing any pop section.  The index header records the size
+of the compressed file, so that an index left from another, or an 
+earlier, version of the file is not trusted (see def 
+is_block_compressed_genepop_file).
+
+The BlockCompressedGenepopWriter is used by PGOutputSimuPop to
+write simulation output.  The GenepopFileManager reads block
+compressed files through BlockCompressedGenepopReader and its
+BlockCompressedFileCursor objects, which serve the same seek,
+tell, readline and read calls it uses on uncompressed files.
+'''
+from builtins import range
+from builtins import object
+__filename__ = "genepopblockfile.py"
+__date__ = "20261019"
+__author__ = "Ted Cosart<ted.cosart@umontana.edu>"
+
+import os
+import sys
+import bz2
+import bisect
+
+BLOCK_INDEX_FILE_EXTENSION="idx"
+BLOCK_INDEX_HEADER="genepop_block_index"
+BLOCK_INDEX_VERSION="2"
+BLOCK_INDEX_DELIMITER="\t"
+BLOCK_INDEX_LIST_DELIMITER=","
+
+DEFAULT_BLOCK_SIZE=4*1024*1024
+DEFAULT_COMPRESS_LEVEL=9
+
+'''
+Total decompressed blocks a reader keeps in memory.
+'''
+BLOCK_CACHE_SIZE=4
+
+'''
+Fields in the index file's header line.
+'''
+IDX_HEADER_NAME=0
+IDX_HEADER_VERSION=1
+IDX_HEADER_ENDS_WITH_ENDLINE=2
+IDX_HEADER_COMPRESSED_SIZE=3
+
+POP_LINES=( b'pop\n', b'pop\r\n' )
+
+'''
+Leading bytes of bz2, gzip and xz files.
+'''
+COMPRESSED_FILE_MAGIC=( b'BZh', b'\x1f\x8b', b'\xfd7zXZ\x00' )
+
+SYSENCODING=sys.getdefaultencoding()
+
+def get_block_index_file_name( s_compressed_file_name ):
+	return s_compressed_file_name + "." + BLOCK_INDEX_FILE_EXTENSION
+#end get_block_index_file_name
+
+def read_block_index_header( s_index_file ):
+	'''
+	Returns the list of fields in the index file's header
+	line, or None if the file can't be read.
+	'''
+	ls_header=None
+
+	try:
+		o_index=open( s_index_file, 'r' )
+		ls_header=o_index.readline().rstrip( "\n" ).split( BLOCK_INDEX_DELIMITER )
+		o_index.close()
+	except ( IOError, OSError, UnicodeDecodeError ):
+		ls_header=None
+	#end try...except
+
+	return ls_header
+#end read_block_index_header
+
+def block_index_matches_file( ls_header, s_filename ):
+	'''
+	True if the index header fields give our index name
+	and version, and the compressed file's size.
+	'''
+	b_matches=ls_header is not None \
+				and len( ls_header ) > IDX_HEADER_COMPRESSED_SIZE \
+				and ls_header[ IDX_HEADER_NAME ] == BLOCK_INDEX_HEADER \
+				and ls_header[ IDX_HEADER_VERSION ] == BLOCK_INDEX_VERSION \
+				and ls_header[ IDX_HEADER_COMPRESSED_SIZE ] == str( os.path.getsize( s_filename ) )
+
+	return b_matches
+#end block_index_matches_file
+
+def is_block_compressed_genepop_file( s_filename ):
+	'''
+	True if the file has a block index file alongside it,
+	and the index is one of ours, of the current version,
+	written for a compressed file of this file's size.  A stale
+	or foreign index would give the wrong block offsets.
+	'''
+	s_index_file=get_block_index_file_name( s_filename )
+
+	if not ( os.path.isfile( s_filename ) and os.path.isfile( s_index_file ) ):
+		return False
+	#end if no file or no index
+
+	return block_index_matches_file( read_block_index_header( s_index_file ), s_filename )
+#end is_block_compressed_genepop_file
+
+def is_unreadable_compressed_genepop_file( s_filename ):
+	'''
+	True if the file is compressed (bz2, gzip or xz), but is not 
+	a block-compressed genepop file with a matching index, and so
+	can't be read by a GenepopFileManager without first being
+	decompressed.
+	'''
+	v_start=b''
+
+	try:
+		o_file=open( s_filename, 'rb' )
+		v_start=o_file.read( max( [ len( v_magic ) for v_magic in COMPRESSED_FILE_MAGIC ] ) )
+		o_file.close()
+	except ( IOError, OSError ):
+		return False
+	#end try...except
+
+	b_is_compressed=any( [ v_start.startswith( v_magic ) for v_magic in COMPRESSED_FILE_MAGIC ] )
+
+	return b_is_compressed and not is_block_compressed_genepop_file( s_filename )
+#end is_unreadable_compressed_genepop_file
+
+def is_pop_line( v_line ):
+	'''
+	Same test as in GenepopFileManager, def __is_pop_line,
+	applied to a bytes line that includes its endline.
+	'''
+	return v_line.lower() in POP_LINES
+#end is_pop_line
+
+class BlockCompressedGenepopWriter( object ):
+	'''
+	File-like object (write, flush, close) that writes
+	a block-compressed genepop file and its index.  Accepts
+	str or bytes.
+
+	The index is written on close(), so a file whose writer
+	was not closed has no index, and so will not be read as
+	block compressed.
+	'''
+
+	def __init__( self, s_filename,
+						i_block_size=DEFAULT_BLOCK_SIZE,
+						i_compress_level=DEFAULT_COMPRESS_LEVEL ):
+		self.__filename=s_filename
+		self.__block_size=i_block_size
+		self.__compress_level=i_compress_level
+		self.__file=open( s_filename, 'wb' )
+
+		self.__partial_line=b''
+		self.__block_lines=[]
+		self.__block_bytes=0
+
+		self.__compressed_offset=0
+		self.__uncompressed_offset=0
+
+		'''
+		Each item gives one block's compressed offset and length,
+		uncompressed offset and length, its "starts with pop" flag,
+		and the list of its line lengths.
+		'''
+		self.__index_entries=[]
+		self.__ends_with_endline=True
+		self.__closed=False
+		return
+	#end __init__
+
+	def __write_block( self ):
+		if self.__block_bytes == 0:
+			return
+		#end if empty block
+
+		v_block=b''.join( self.__block_lines )
+		v_compressed=bz2.compress( v_block, self.__compress_level )
+
+		self.__file.write( v_compressed )
+
+		self.__index_entries.append( ( self.__compressed_offset,
+										len( v_compressed ),
+										self.__uncompressed_offset,
+										len( v_block ),
+										is_pop_line( self.__block_lines[ 0 ] ),
+										[ len( v_line ) for v_line in self.__block_lines ] ) )
+
+		self.__compressed_offset+=len( v_compressed )
+		self.__uncompressed_offset+=len( v_block )
+		self.__block_lines=[]
+		self.__block_bytes=0
+		return
+	#end __write_block
+
+	def __add_line( self, v_line ):
+		'''
+		Each "pop" line starts a new block, and blocks end
+		at the first line end at or past the block size.
+		'''
+		if self.__block_bytes > 0 and is_pop_line( v_line ):
+			self.__write_block()
+		#end if pop line, start new block
+
+		self.__block_lines.append( v_line )
+		self.__block_bytes+=len( v_line )
+
+		if self.__block_bytes >= self.__block_size:
+			self.__write_block()
+		#end if block is full
+
+		return
+	#end __add_line
+
+	def write( self, v_text ):
+		if type( v_text ) != bytes:
+			v_text=v_text.encode( SYSENCODING )
+		#end if not bytes, encode
+
+		lv_lines=( self.__partial_line + v_text ).split( b'\n' )
+
+		#the last item is whatever follows the last endline:
+		self.__partial_line=lv_lines.pop()
+
+		for v_line in lv_lines:
+			self.__add_line( v_line + b'\n' )
+		#end for each complete line
+
+		return
+	#end write
+
+	def flush( self ):
+		self.__file.flush()
+		return
+	#end flush
+
+	def __write_index( self ):
+		s_index_file=get_block_index_file_name( self.__filename )
+		o_index=open( s_index_file, 'w' )
+		o_index.write( BLOCK_INDEX_DELIMITER.join( [ BLOCK_INDEX_HEADER,
+														BLOCK_INDEX_VERSION,
+														"1" if self.__ends_with_endline else "0",
+														str( self.__compressed_offset ) ] ) + "\n" )
+		for tv_entry in self.__index_entries:
+			ls_fields=[ str( v_val ) for v_val in tv_entry[ 0:4 ] ] \
+						+ [ "1" if tv_entry[ 4 ] else "0" ] \
+						+ [ BLOCK_INDEX_LIST_DELIMITER.join( \
+									[ str( i_len ) for i_len in tv_entry[ 5 ] ] ) ]
+			o_index.write( BLOCK_INDEX_DELIMITER.join( ls_fields ) + "\n" )
+		#end for each block
+
+		o_index.close()
+		return
+	#end __write_index
+
+	def close( self ):
+		if self.__closed:
+			return
+		#end if already closed
+
+		if len( self.__partial_line ) > 0:
+			#final line lacked an endline:
+			self.__add_line( self.__partial_line )
+			self.__ends_with_endline=False
+			self.__partial_line=b''
+		#end if partial line
+
+		self.__write_block()
+		self.__file.close()
+		self.__write_index()
+		self.__closed=True
+		return
+	#end close
+
+	def __enter__( self ):
+		return self
+	#end __enter__
+
+	def __exit__( self, o_type, o_value, o_traceback ):
+		self.close()
+		return False
+	#end __exit__
+
+	@property
+	def index_file_name( self ):
+		return get_block_index_file_name( self.__filename )
+	#end index_file_name
+#end class BlockCompressedGenepopWriter
+
+class BlockCompressedGenepopReader( object ):
+	'''
+	Random access to the uncompressed text of a block-compressed
+	genepop file, by uncompressed byte address.  Decompressed blocks
+	are cached, the most recently used BLOCK_CACHE_SIZE kept.
+
+	Instances can be pickled (ex: when a GenepopFileManager is
+	passed to a multiprocessing.Pool), in which case the copy
+	re-opens the compressed file on first use.
+	'''
+
+	def __init__( self, s_filename ):
+		self.__filename=s_filename
+		self.__load_index()
+		self.__file=None
+		self.__cache={}
+		self.__cache_order=[]
+		return
+	#end __init__
+
+	def __load_index( self ):
+		IDX_COMPRESSED_OFFSET=0
+		IDX_COMPRESSED_LENGTH=1
+		IDX_UNCOMPRESSED_OFFSET=2
+		IDX_UNCOMPRESSED_LENGTH=3
+		IDX_STARTS_WITH_POP=4
+		IDX_LINE_LENGTHS=5
+
+		s_index_file=get_block_index_file_name( self.__filename )
+		o_index=open( s_index_file, 'r' )
+		ls_header=o_index.readline().rstrip( "\n" ).split( BLOCK_INDEX_DELIMITER )
+
+		if not block_index_matches_file( ls_header, self.__filename ):
+			o_index.close()
+			s_msg="In BlockCompressedGenepopReader instance, " \
+						+ "def __load_index, the file, " \
+						+ s_index_file + ", is not a version " \
+						+ BLOCK_INDEX_VERSION + " block index " \
+						+ "for the file, " + self.__filename + "."
+			raise Exception( s_msg )
+		#end if not an index for this file
+
+		self.__compressed_offsets=[]
+		self.__compressed_lengths=[]
+		self.__uncompressed_offsets=[]
+		self.__uncompressed_lengths=[]
+		self.__starts_with_pop=[]
+		self.__line_lengths=[]
+
+		for s_line in o_index:
+			ls_fields=s_line.rstrip( "\n" ).split( BLOCK_INDEX_DELIMITER )
+			self.__compressed_offsets.append( int( ls_fields[ IDX_COMPRESSED_OFFSET ] ) )
+			self.__compressed_lengths.append( int( ls_fields[ IDX_COMPRESSED_LENGTH ] ) )
+			self.__uncompressed_offsets.append( int( ls_fields[ IDX_UNCOMPRESSED_OFFSET ] ) )
+			self.__uncompressed_lengths.append( int( ls_fields[ IDX_UNCOMPRESSED_LENGTH ] ) )
+			self.__starts_with_pop.append( ls_fields[ IDX_STARTS_WITH_POP ] == "1" )
+			self.__line_lengths.append( [ int( s_len ) for s_len \
+						in ls_fields[ IDX_LINE_LENGTHS ].split( BLOCK_INDEX_LIST_DELIMITER ) ] )
+		#end for each block
+
+		o_index.close()
+
+		self.__ends_with_endline=( ls_header[ IDX_HEADER_ENDS_WITH_ENDLINE ] == "1" )
+
+		if len( self.__uncompressed_offsets ) > 0:
+			self.__size=self.__uncompressed_offsets[ -1 ] + self.__uncompressed_lengths[ -1 ]
+		else:
+			self.__size=0
+		#end if any blocks, else empty
+		return
+	#end __load_index
+
+	def __getstate__( self ):
+		dv_state=self.__dict__.copy()
+		dv_state[ "_BlockCompressedGenepopReader__file" ]=None
+		dv_state[ "_BlockCompressedGenepopReader__cache" ]={}
+		dv_state[ "_BlockCompressedGenepopReader__cache_order" ]=[]
+		return dv_state
+	#end __getstate__
+
+	def __get_block( self, idx_block ):
+		if idx_block in self.__cache:
+			self.__cache_order.remove( idx_block )
+			self.__cache_order.append( idx_block )
+			return self.__cache[ idx_block ]
+		#end if cached
+
+		if self.__file is None:
+			self.__file=open( self.__filename, 'rb' )
+		#end if not yet opened
+
+		self.__file.seek( self.__compressed_offsets[ idx_block ] )
+		v_compressed=self.__file.read( self.__compressed_lengths[ idx_block ] )
+		v_block=bz2.decompress( v_compressed )
+
+		self.__cache[ idx_block ]=v_block
+		self.__cache_order.append( idx_block )
+
+		if len( self.__cache_order ) > BLOCK_CACHE_SIZE:
+			idx_oldest=self.__cache_order.pop( 0 )
+			del self.__cache[ idx_oldest ]
+		#end if cache is full
+
+		return v_block
+	#end __get_block
+
+	def __get_block_number( self, l_address ):
+		return bisect.bisect_right( self.__uncompressed_offsets, l_address ) - 1
+	#end __get_block_number
+
+	def getBytes( self, l_start, l_end ):
+		'''
+		Returns the uncompressed bytes from address l_start
+		up to (not including) l_end.
+		'''
+		l_end=min( l_end, self.__size )
+		lv_pieces=[]
+		l_address=l_start
+
+		while l_address < l_end:
+			idx_block=self.__get_block_number( l_address )
+			l_block_start=self.__uncompressed_offsets[ idx_block ]
+			v_block=self.__get_block( idx_block )
+			v_piece=v_block[ l_address - l_block_start : l_end - l_block_start ]
+			lv_pieces.append( v_piece )
+			l_address+=len( v_piece )
+		#end while bytes remain
+
+		return b''.join( lv_pieces )
+	#end getBytes
+
+	def getLineEnd( self, l_address ):
+		'''
+		Returns the address just past the endline of the
+		line that includes l_address, or the size, if the
+		line has no endline.
+		'''
+		l_line_end=self.__size
+
+		while l_address < self.__size:
+			idx_block=self.__get_block_number( l_address )
+			l_block_start=self.__uncompressed_offsets[ idx_block ]
+			v_block=self.__get_block( idx_block )
+			i_newline=v_block.find( b'\n', l_address - l_block_start )
+			if i_newline != -1:
+				l_line_end=l_block_start + i_newline + 1
+				break
+			#end if found newline
+			l_address=l_block_start + len( v_block )
+		#end while not at end
+
+		return l_line_end
+	#end getLineEnd
+
+	def getPopSectionLineStarts( self, l_first_pop_address ):
+		'''
+		Returns the list of addresses of lines starting at or
+		after l_first_pop_address, and a list of indices into that
+		list that give the lines that are "pop" lines.  Computed
+		from the index, without decompressing blocks.
+		'''
+		li_line_starts=[]
+		li_pop_line_indices=[]
+
+		for idx_block in range( len( self.__uncompressed_offsets ) ):
+			l_address=self.__uncompressed_offsets[ idx_block ]
+			if l_address + self.__uncompressed_lengths[ idx_block ] <= l_first_pop_address:
+				continue
+			#end if block precedes the pop sections
+
+			if self.__starts_with_pop[ idx_block ] and l_address >= l_first_pop_address:
+				li_pop_line_indices.append( len( li_line_starts ) )
+			#end if block starts with a pop line
+
+			for i_length in self.__line_lengths[ idx_block ]:
+				if l_address >= l_first_pop_address:
+					li_line_starts.append( l_address )
+				#end if in the pop sections
+				l_address+=i_length
+			#end for each line
+		#end for each block
+
+		return li_line_starts, li_pop_line_indices
+	#end getPopSectionLineStarts
+
+	def openCursor( self ):
+		return BlockCompressedFileCursor( self )
+	#end openCursor
+
+	def close( self ):
+		if self.__file is not None:
+			self.__file.close()
+			self.__file=None
+		#end if open
+		self.__cache={}
+		self.__cache_order=[]
+		return
+	#end close
+
+	@property
+	def size( self ):
+		return self.__size
+	#end size
+
+	@property
+	def ends_with_endline( self ):
+		return self.__ends_with_endline
+	#end ends_with_endline
+
+	@property
+	def total_blocks( self ):
+		return len( self.__uncompressed_offsets )
+	#end total_blocks
+#end class BlockCompressedGenepopReader
+
+class BlockCompressedFileCursor( object ):
+	'''
+	A minimal read-only, binary file object (seek, tell, readline,
+	read, close), over the uncompressed text of a block compressed
+	file.  It has no fileno(), since its bytes are not those of
+	the file on disk.
+	'''
+	def __init__( self, o_reader ):
+		self.__reader=o_reader
+		self.__position=0
+		return
+	#end __init__
+
+	def seek( self, l_offset, i_whence=os.SEEK_SET ):
+		if i_whence == os.SEEK_CUR:
+			l_offset+=self.__position
+		elif i_whence == os.SEEK_END:
+			l_offset+=self.__reader.size
+		#end if relative seek
+		self.__position=max( 0, l_offset )
+		return self.__position
+	#end seek
+
+	def tell( self ):
+		return self.__position
+	#end tell
+
+	def readline( self ):
+		l_start=self.__position
+		l_end=self.__reader.getLineEnd( l_start )
+		self.__position=max( l_start, l_end )
+		return self.__reader.getBytes( l_start, l_end )
+	#end readline
+
+	def read( self, i_size=-1 ):
+		l_start=self.__position
+		l_end=self.__reader.size if i_size is None or i_size < 0 \
+						else min( self.__reader.size, l_start + i_size )
+		l_end=max( l_start, l_end )
+		self.__position=l_end
+		return self.__reader.getBytes( l_start, l_end )
+	#end read
+
+	def close( self ):
+		return
+	#end close
+#end class BlockCompressedFileCursor
@@ -0,0 +1,455 @@
+'''
+Description
+Per-pop (per-cycle) summaries of a genepop file as written by
+PGOpSimuPop, whose individual IDs are the semicolon-delimited
+fields id;sex;father;mother;age.  In one pass over each pop
+section we count females and males, individuals per age,
+offspring per parent pair, and, per locus, alleles and expected
+heterozygosity.  Pop sections are read with a GenepopFileManager
+and summarized in parallel, one pop per task, and the results
+are written, in pop order, to TSV files.
+
+This module replaces, for large files, the bash scripts in
+supplementary_scripts, get_genepop_sex_ratio_per_cycle.bash,
+get_cohort_breakdown_genepop_file.bash, and
+get_parentage_quants_per_cycle.bash.
+'''
+from __future__ import division
+from __future__ import print_function
+from builtins import range
+__filename__ = "genepopcyclesummary.py"
+__date__ = "20261019"
+
+import sys
+import multiprocessing
+import numpy
+
+from agestrucne.genepopfilemanager import GenepopFileManager
+from agestrucne.genepopindividualid import GenepopIndivIdAgeStructure
+
+SYSENCODING=sys.getdefaultencoding()
+
+SEX_MALE=1
+SEX_FEMALE=2
+MISSING_ALLELE=0
+MISSING_VALUE="NA"
+
+DELIMIT_ID_AND_LOCI=","
+DELIMIT_OUTPUT="\t"
+
+SUMMARY_FILE_EXT=".pop_summary.tsv"
+AGES_FILE_EXT=".pop_ages.tsv"
+PARENTAGE_FILE_EXT=".pop_parentage.tsv"
+LOCI_FILE_EXT=".pop_loci.tsv"
+
+SUMMARY_COLUMNS=[ "pop", "individuals", "females", "males",
+					"proportion_females", "proportion_males",
+					"parent_pairs", "max_offspring_per_pair",
+					"loci_with_data", "mean_alleles_per_locus", "mean_he" ]
+AGES_COLUMNS=[ "pop", "age", "individuals" ]
+PARENTAGE_COLUMNS=[ "pop", "father", "mother", "offspring" ]
+LOCI_COLUMNS=[ "pop", "locus", "alleles", "allele_copies", "he" ]
+
+'''
+Keys into the dict returned by def summarize_pop_section.
+'''
+RESULT_POP="pop"
+RESULT_INDIVIDUALS="individuals"
+RESULT_FEMALES="females"
+RESULT_MALES="males"
+RESULT_AGE_COUNTS="age_counts"
+RESULT_PARENTAGE_COUNTS="parentage_counts"
+RESULT_ALLELES_PER_LOCUS="alleles_per_locus"
+RESULT_COPIES_PER_LOCUS="copies_per_locus"
+RESULT_HE_PER_LOCUS="he_per_locus"
+
+'''
+Set in each worker process by def initialize_summary_worker.
+'''
+WORKER_FILE_MANAGER=None
+WORKER_MIN_AGE=None
+WORKER_MAX_AGE=None
+
+def get_id_fields( s_id ):
+	'''
+	Returns the sex, father, mother and age strings from
+	an individual ID, or Nones if the ID does not have
+	the fields written by PGOpSimuPop.
+	'''
+	ls_fields=s_id.strip().split( GenepopIndivIdAgeStructure.DELIMITER_FIELDS )
+
+	if len( ls_fields ) != GenepopIndivIdAgeStructure.TOTAL_FIELDS:
+		return None, None, None, None
+	#end if not an age structure ID
+
+	return ( ls_fields[ GenepopIndivIdAgeStructure.IDX_SEX ],
+				ls_fields[ GenepopIndivIdAgeStructure.IDX_FATHER ],
+				ls_fields[ GenepopIndivIdAgeStructure.IDX_MOTHER ],
+				ls_fields[ GenepopIndivIdAgeStructure.IDX_AGE ] )
+#end get_id_fields
+
+def get_loci_stats( ls_loci_entries, i_total_loci ):
+	'''
+	From the loci text of each individual, returns three numpy
+	arrays, giving, per locus, the total distinct alleles, the
+	total allele copies counted, and the expected heterozygosity,
+	one minus the sum of squared allele frequencies.  As in
+	GenepopFileManager, def __get_allele_counts, (default), a
+	locus entry with either allele missing is not counted.
+
+	The entries are converted to integers in one call, and the
+	alleles counted for all loci with one bincount, keyed to
+	locus number and allele.
+	'''
+	i_total_indiv=len( ls_loci_entries )
+
+	if i_total_indiv == 0 or i_total_loci == 0:
+		return numpy.zeros( i_total_loci, dtype=numpy.int64 ), \
+					numpy.zeros( i_total_loci, dtype=numpy.int64 ), \
+					numpy.full( i_total_loci, numpy.nan )
+	#end if no data
+
+	ls_tokens=" ".join( ls_loci_entries ).split()
+
+	if len( ls_tokens ) != i_total_indiv * i_total_loci:
+		s_msg="In module genepopcyclesummary.py, def get_loci_stats, " \
+					+ "the pop section has " + str( len( ls_tokens ) ) \
+					+ " loci entries, but its " + str( i_total_indiv ) \
+					+ " individuals and " + str( i_total_loci ) \
+					+ " loci should give " + str( i_total_indiv * i_total_loci ) + "."
+		raise Exception( s_msg )
+	#end if wrong total entries
+
+	#Genepop gives all entries the same width,
+	#so, from one, the digits per allele:
+	i_allele_base=10 ** ( len( ls_tokens[ 0 ] ) // 2 )
+
+	a_entries=numpy.array( ls_tokens, dtype=numpy.int64 ).reshape( i_total_indiv, i_total_loci )
+
+	a_allele_1=a_entries // i_allele_base
+	a_allele_2=a_entries % i_allele_base
+
+	a_has_data=( a_allele_1 != MISSING_ALLELE ) & ( a_allele_2 != MISSING_ALLELE )
+
+	a_locus_index=numpy.broadcast_to( numpy.arange( i_total_loci, dtype=numpy.int64 ),
+														a_entries.shape )[ a_has_data ]
+
+	a_keys=numpy.concatenate( [ a_locus_index * i_allele_base + a_allele_1[ a_has_data ],
+								a_locus_index * i_allele_base + a_allele_2[ a_has_data ] ] )
+
+	a_counts=numpy.bincount( a_keys, minlength=i_total_loci * i_allele_base ) \
+											.reshape( i_total_loci, i_allele_base )
+
+	a_copies=a_counts.sum( axis=1 )
+	a_alleles=( a_counts > 0 ).sum( axis=1 )
+
+	a_he=numpy.full( i_total_loci, numpy.nan )
+	a_with_data=a_copies > 0
+	a_freqs=a_counts[ a_with_data ] / a_copies[ a_with_data, None ]
+	a_he[ a_with_data ]=1.0 - ( a_freqs * a_freqs ).sum( axis=1 )
+
+	return a_alleles, a_copies, a_he
+#end get_loci_stats
+
+def summarize_pop_section( v_bytes, i_pop_number, i_total_loci,
+								f_min_age=None, f_max_age=None ):
+	'''
+	Summarizes the individual entries of one pop section,
+	given as the raw bytes read from the genepop file.
+	When min and/or max ages are given, individuals whose
+	age is outside the range are skipped in all counts.
+	Individuals with IDs lacking the age structure fields
+	are counted only in the individual and loci totals,
+	and only when no age range is given.
+	'''
+	i_individuals=0
+	i_females=0
+	i_males=0
+	di_age_counts={}
+	dti_parentage_counts={}
+	ls_loci_entries=[]
+
+	b_filter_ages=f_min_age is not None or f_max_age is not None
+
+	s_section=v_bytes.decode( SYSENCODING ) \
+			if isinstance( v_bytes, bytes ) else str( v_bytes )
+
+	for s_line in s_section.splitlines():
+
+		if DELIMIT_ID_AND_LOCI not in s_line:
+			continue
+		#end if not an individual entry
+
+		s_id, s_loci=s_line.split( DELIMIT_ID_AND_LOCI, 1 )
+		s_sex, s_father, s_mother, s_age=get_id_fields( s_id )
+
+		if b_filter_ages:
+			if s_age is None:
+				continue
+			#end if no age
+
+			f_age=float( s_age )
+
+			if ( f_min_age is not None and f_age < f_min_age ) \
+					or ( f_max_age is not None and f_age > f_max_age ):
+				continue
+			#end if outside age range
+		#end if filtering by age
+
+		i_individuals+=1
+		ls_loci_entries.append( s_loci )
+
+		if s_sex is None:
+			continue
+		#end if no ID fields
+
+		if int( s_sex ) == SEX_FEMALE:
+			i_females+=1
+		elif int( s_sex ) == SEX_MALE:
+			i_males+=1
+		#end if female, elif male
+
+		f_age=float( s_age )
+		di_age_counts[ f_age ]=di_age_counts.get( f_age, 0 ) + 1
+
+		t_parents=( s_father, s_mother )
+		dti_parentage_counts[ t_parents ]=dti_parentage_counts.get( t_parents, 0 ) + 1
+	#end for each line
+
+	a_alleles, a_copies, a_he=get_loci_stats( ls_loci_entries, i_total_loci )
+
+	dv_result={ RESULT_POP : i_pop_number,
+				RESULT_INDIVIDUALS : i_individuals,
+				RESULT_FEMALES : i_females,
+				RESULT_MALES : i_males,
+				RESULT_AGE_COUNTS : di_age_counts,
+				RESULT_PARENTAGE_COUNTS : dti_parentage_counts,
+				RESULT_ALLELES_PER_LOCUS : a_alleles,
+				RESULT_COPIES_PER_LOCUS : a_copies,
+				RESULT_HE_PER_LOCUS : a_he }
+
+	return dv_result
+#end summarize_pop_section
+
+def initialize_summary_worker( o_genepop_file_manager, f_min_age, f_max_age ):
+	'''
+	The file manager, with its index of the pop sections,
+	is passed once to each worker, rather than with each task.
+	'''
+	global WORKER_FILE_MANAGER
+	global WORKER_MIN_AGE
+	global WORKER_MAX_AGE
+
+	WORKER_FILE_MANAGER=o_genepop_file_manager
+	WORKER_MIN_AGE=f_min_age
+	WORKER_MAX_AGE=f_max_age
+	return
+#end initialize_summary_worker
+
+def summarize_one_pop( i_pop_number ):
+	v_bytes=WORKER_FILE_MANAGER.getPopSectionBytes( i_pop_number )
+	return summarize_pop_section( v_bytes, i_pop_number,
+									WORKER_FILE_MANAGER.loci_total,
+									WORKER_MIN_AGE, WORKER_MAX_AGE )
+#end summarize_one_pop
+
+def format_value( v_value ):
+	s_value=None
+	if v_value is None:
+		s_value=MISSING_VALUE
+	elif isinstance( v_value, float ):
+		s_value=MISSING_VALUE if numpy.isnan( v_value ) else repr( v_value )
+	else:
+		s_value=str( v_value )
+	#end if None, elif float, else other
+	return s_value
+#end format_value
+
+def write_row( o_file, lv_values ):
+	o_file.write( DELIMIT_OUTPUT.join( [ format_value( v_value ) \
+								for v_value in lv_values ] ) + "\n" )
+	return
+#end write_row
+
+def get_summary_row( dv_result ):
+
+	i_individuals=dv_result[ RESULT_INDIVIDUALS ]
+	i_sexed=dv_result[ RESULT_FEMALES ] + dv_result[ RESULT_MALES ]
+
+	f_prop_females=None if i_sexed == 0 else dv_result[ RESULT_FEMALES ] / float( i_sexed )
+	f_prop_males=None if i_sexed == 0 else dv_result[ RESULT_MALES ] / float( i_sexed )
+
+	di_parentage=dv_result[ RESULT_PARENTAGE_COUNTS ]
+	i_max_offspring=max( di_parentage.values() ) if len( di_parentage ) > 0 else None
+
+	a_copies=dv_result[ RESULT_COPIES_PER_LOCUS ]
+	a_with_data=a_copies > 0
+	i_loci_with_data=int( a_with_data.sum() )
+
+	f_mean_alleles=None
+	f_mean_he=None
+
+	if i_loci_with_data > 0:
+		f_mean_alleles=float( dv_result[ RESULT_ALLELES_PER_LOCUS ][ a_with_data ].mean() )
+		f_mean_he=float( dv_result[ RESULT_HE_PER_LOCUS ][ a_with_data ].mean() )
+	#end if any loci with data
+
+	return [ dv_result[ RESULT_POP ], i_individuals,
+				dv_result[ RESULT_FEMALES ], dv_result[ RESULT_MALES ],
+				f_prop_females, f_prop_males,
+				len( di_parentage ), i_max_offspring,
+				i_loci_with_data, f_mean_alleles, f_mean_he ]
+#end get_summary_row
+
+def summarize_genepop_file( s_genepop_file,
+							s_output_prefix,
+							i_total_processes=None,
+							f_min_age=None,
+							f_max_age=None,
+							i_min_offspring_per_pair=1,
+							b_write_loci_table=False ):
+	'''
+	Writes the summary, ages, and parentage TSV files (and,
+	if the flag is set, the per-locus table), each named by
+	the output prefix plus its extension (see *_FILE_EXT).
+	Pops are summarized in parallel, and each pop's rows are
+	written as soon as it and all earlier pops are done.
+	Parent pairs with fewer than i_min_offspring_per_pair
+	offspring are omitted from the parentage table.
+
+	Returns the list of files written.
+	'''
+
+	o_genepop_file_manager=GenepopFileManager( s_genepop_file )
+
+	li_pop_numbers=o_genepop_file_manager.getListPopulationNumbers()
+
+	if i_total_processes is None:
+		i_total_processes=multiprocessing.cpu_count()
+	#end if no process total given
+
+	i_total_processes=max( 1, min( i_total_processes, len( li_pop_numbers ) ) )
+
+	ls_files=[ s_output_prefix + SUMMARY_FILE_EXT,
+				s_output_prefix + AGES_FILE_EXT,
+				s_output_prefix + PARENTAGE_FILE_EXT ]
+
+	if b_write_loci_table:
+		ls_files.append( s_output_prefix + LOCI_FILE_EXT )
+	#end if loci table
+
+	lo_files=[ open( s_file, 'w' ) for s_file in ls_files ]
+	o_summary_file, o_ages_file, o_parentage_file=lo_files[ 0:3 ]
+	o_loci_file=lo_files[ 3 ] if b_write_loci_table else None
+
+	write_row( o_summary_file, SUMMARY_COLUMNS )
+	write_row( o_ages_file, AGES_COLUMNS )
+	write_row( o_parentage_file, PARENTAGE_COLUMNS )
+
+	if o_loci_file is not None:
+		write_row( o_loci_file, LOCI_COLUMNS )
+	#end if loci table
+
+	o_pool=None
+
+	try:
+		if i_total_processes > 1 and not multiprocessing.current_process().daemon:
+			o_pool=multiprocessing.Pool( i_total_processes,
+							initializer=initialize_summary_worker,
+							initargs=( o_genepop_file_manager, f_min_age, f_max_age ) )
+			iter_results=o_pool.imap( summarize_one_pop, li_pop_numbers )
+		else:
+			initialize_summary_worker( o_genepop_file_manager, f_min_age, f_max_age )
+			iter_results=( summarize_one_pop( i_pop_number ) for i_pop_number in li_pop_numbers )
+		#end if parallel, else serial
+
+		for dv_result in iter_results:
+
+			i_pop_number=dv_result[ RESULT_POP ]
+
+			write_row( o_summary_file, get_summary_row( dv_result ) )
+
+			di_age_counts=dv_result[ RESULT_AGE_COUNTS ]
+			for f_age in sorted( di_age_counts ):
+				write_row( o_ages_file, [ i_pop_number, f_age, di_age_counts[ f_age ] ] )
+			#end for each age
+
+			dti_parentage=dv_result[ RESULT_PARENTAGE_COUNTS ]
+			for t_parents in sorted( dti_parentage, 
+							key=lambda t_ids : ( float( t_ids[ 0 ] ), float( t_ids[ 1 ] ) ) ):
+				i_offspring=dti_parentage[ t_parents ]
+				if i_offspring >= i_min_offspring_per_pair:
+					write_row( o_parentage_file, [ i_pop_number,
+										t_parents[ 0 ], t_parents[ 1 ], i_offspring ] )
+				#end if enough offspring to report
+			#end for each parent pair
+
+			if o_loci_file is not None:
+				a_alleles=dv_result[ RESULT_ALLELES_PER_LOCUS ]
+				a_copies=dv_result[ RESULT_COPIES_PER_LOCUS ]
+				a_he=dv_result[ RESULT_HE_PER_LOCUS ]
+				for idx in range( len( a_alleles ) ):
+					write_row( o_loci_file, [ i_pop_number, idx + 1, int( a_alleles[ idx ] ),
+										int( a_copies[ idx ] ), float( a_he[ idx ] ) ] )
+				#end for each locus
+			#end if loci table
+		#end for each pop's results
+	finally:
+		if o_pool is not None:
+			o_pool.close()
+			o_pool.join()
+		#end if pool
+
+		for o_file in lo_files:
+			o_file.close()
+		#end for each output file
+	#end try...finally
+
+	return ls_files
+#end summarize_genepop_file
+
+def genepop_summary_main():
+
+	import argparse as ap
+
+	o_parser=ap.ArgumentParser( description="Per-pop summaries of a " \
+					+ "genepop file written by the simulation: sex ratios, " \
+					+ "age counts, offspring per parent pair, and, per locus, " \
+					+ "allele counts and expected heterozygosity." )
+
+	o_parser.add_argument( "-g", "--genepopfile", required=True,
+				help="genepop file, with individual IDs id;sex;father;mother;age." )
+	o_parser.add_argument( "-o", "--outputprefix", required=True,
+				help="prefix for the output TSV files." )
+	o_parser.add_argument( "-p", "--processes", type=int, default=None,
+				help="total processes.  Default is one per cpu." )
+	o_parser.add_argument( "-n", "--minage", type=float, default=None,
+				help="skip individuals younger than this age." )
+	o_parser.add_argument( "-x", "--maxage", type=float, default=None,
+				help="skip individuals older than this age." )
+	o_parser.add_argument( "-m", "--minoffspring", type=int, default=1,
+				help="omit from the parentage table the parent pairs " \
+						+ "with fewer offspring than this.  Default is 1." )
+	o_parser.add_argument( "-l", "--locitable", action="store_true",
+				help="also write a table of per-locus values for each pop." )
+
+	o_args=o_parser.parse_args()
+
+	ls_files=summarize_genepop_file( o_args.genepopfile,
+										o_args.outputprefix,
+										i_total_processes=o_args.processes,
+										f_min_age=o_args.minage,
+										f_max_age=o_args.maxage,
+										i_min_offspring_per_pair=o_args.minoffspring,
+										b_write_loci_table=o_args.locitable )
+
+	for s_file in ls_files:
+		print( s_file )
+	#end for each file written
+
+	return
+#end genepop_summary_main
+
+if __name__ == "__main__":
+	genepop_summary_main()
+#end if main
@@ -12,9 +12,16 @@ __author__ = "Ted Cosart<ted.cosart@umontana.edu>"
 
 import sys
 import os
+import re
+import stat
+import mmap
+import multiprocessing
 import random	
+import numpy
 from agestrucne.genepopindividualid import GenepopIndivIdVals
 from agestrucne.genepopindividualid import GenepopIndividualId
+from agestrucne.genepopblockfile import BlockCompressedGenepopReader
+from agestrucne.genepopblockfile import is_block_compressed_genepop_file
 
 COMMA_DELIMITED_LOCI_LIST_HAS_LEADING_SPACE=True
 '''
@@ -25,6 +32,416 @@ __get_indiv_entry and getListIndividuals.
 '''
 SYSENCODING=sys.getdefaultencoding()
 
+'''
+Size of the reads used when copying raw
+byte ranges from the original file, when 
+no kernel-level copy is available.
+'''
+RAW_COPY_CHUNK_SIZE=4*1024*1024
+
+'''
+2026_10_19.  Matches, in unix-endline text, a blank line, or
+a line with leading or trailing whitespace, any of which the
+line-by-line write would strip, so that a raw copy would differ.
+'''
+UNSTRIPPED_LINE_PATTERN=re.compile( b'\n\n|\n[ \t\r\x0b\x0c]|[ \t\r\x0b\x0c]\n' )
+
+'''
+Memory-mapped access to genepop files, shared by
+all GenepopFileManager instances in a process, keyed
+to the absolute file path.  See class MappedFile.
+'''
+MAPPED_FILES={}
+
+class MappedFile( object ):
+	'''
+	Wraps a read-only mmap of a file.  Clients read through 
+	MappedFileCursor objects, each with its own position, so 
+	that one mapping serves any number of readers, and line 
+	reads are slices into the page cache rather than 
+	seek + readline system calls on separately buffered files.
+
+	Because reads never use the underlying file descriptor's 
+	offset, a mapping inherited by a forked worker process is
+	safe to keep using in the worker.
+	'''
+	def __init__( self, s_filename ):
+		self.__filename=s_filename
+		self.__file=open( s_filename, 'rb' )
+		o_stat=os.fstat( self.__file.fileno() )
+		self.__signature=( o_stat.st_size, o_stat.st_mtime )
+		self.__map=mmap.mmap( self.__file.fileno(), 0, access=mmap.ACCESS_READ )
+		return
+	#end __init__
+
+	def isCurrent( self ):
+		'''
+		False if the file has since been rewritten.
+		'''
+		b_current=False
+		try:
+			o_stat=os.stat( self.__filename )
+			b_current=( ( o_stat.st_size, o_stat.st_mtime ) == self.__signature )
+		except OSError:
+			b_current=False
+		#end try...except
+		return b_current
+	#end isCurrent
+
+	def fileno( self ):
+		return self.__file.fileno()
+	#end fileno
+
+	def close( self ):
+		self.__map.close()
+		self.__file.close()
+		return
+	#end close
+
+	@property
+	def map( self ):
+		return self.__map
+	#end map
+
+	@property
+	def size( self ):
+		return self.__signature[ 0 ]
+	#end size
+#end class MappedFile
+
+class MappedFileCursor( object ):
+	'''
+	A minimal read-only, binary file object (seek, tell, 
+	readline, read, fileno, close) over a MappedFile.
+	Closing the cursor leaves the shared mapping open.
+	'''
+	def __init__( self, o_mapped_file ):
+		self.__mapped_file=o_mapped_file
+		self.__map=o_mapped_file.map
+		self.__size=o_mapped_file.size
+		self.__position=0
+		return
+	#end __init__
+
+	def seek( self, l_offset, i_whence=os.SEEK_SET ):
+		if i_whence == os.SEEK_CUR:
+			l_offset+=self.__position
+		elif i_whence == os.SEEK_END:
+			l_offset+=self.__size
+		#end if relative seek
+		self.__position=max( 0, l_offset )
+		return self.__position
+	#end seek
+
+	def tell( self ):
+		return self.__position
+	#end tell
+
+	def readline( self ):
+		l_start=self.__position
+		l_end=self.__map.find( b'\n', l_start )
+		l_end=self.__size if l_end == -1 else l_end + 1
+		self.__position=l_end
+		return self.__map[ l_start : l_end ]
+	#end readline
+
+	def read( self, i_size=-1 ):
+		l_start=self.__position
+		l_end=self.__size if i_size is None or i_size < 0 \
+					else min( self.__size, l_start + i_size )
+		l_end=max( l_start, l_end )
+		self.__position=l_end
+		return self.__map[ l_start : l_end ]
+	#end read
+
+	def fileno( self ):
+		return self.__mapped_file.fileno()
+	#end fileno
+
+	def close( self ):
+		return
+	#end close
+#end class MappedFileCursor
+
+def get_mapped_file( s_filename ):
+	'''
+	Returns the process's MappedFile for the file, creating 
+	(or, if the file has changed, replacing) it as needed.
+	Returns None if the file can't be mapped (ex: it is empty).
+	'''
+	s_key=os.path.abspath( s_filename )
+	o_mapped_file=MAPPED_FILES.get( s_key )
+
+	if o_mapped_file is not None and not o_mapped_file.isCurrent():
+		release_mapped_file( s_filename )
+		o_mapped_file=None
+	#end if the mapped file is stale
+
+	if o_mapped_file is None:
+		try:
+			o_mapped_file=MappedFile( s_filename )
+		except ( ValueError, EnvironmentError ):
+			#mmap can't map empty or special files:
+			o_mapped_file=None
+		#end try...except
+
+		if o_mapped_file is not None:
+			MAPPED_FILES[ s_key ]=o_mapped_file
+		#end if mapped
+	#end if no current mapping
+
+	return o_mapped_file
+#end get_mapped_file
+
+def release_mapped_file( s_filename ):
+	'''
+	Closes and forgets the process's mapping of the file, if any.
+	'''
+	o_mapped_file=MAPPED_FILES.pop( os.path.abspath( s_filename ), None )
+	if o_mapped_file is not None:
+		try:
+			o_mapped_file.close()
+		except Exception:
+			#ex: caller still holds slices of the map
+			pass
+		#end try...except
+	#end if we had a mapping
+	return
+#end release_mapped_file
+
+'''
+Indexing of the pop sections (see GenepopFileManager, 
+def __read_pops_by_line_scan) searches the memory map 
+for newlines with numpy, in blocks of this many bytes.  
+Files at least PARALLEL_INDEX_MIN_BYTES in size are 
+split into byte ranges scanned by a pool of processes.
+'''
+INDEX_SCAN_BLOCK_BYTES=64*1024*1024
+PARALLEL_INDEX_MIN_BYTES=256*1024*1024
+PARALLEL_INDEX_RANGES_PER_PROCESS=4
+
+def get_line_starts_in_byte_range( t_args ):
+	'''
+	Scans bytes l_start up to l_end of the memory mapped file,
+	where l_start is the first byte of a line, and l_end is either 
+	the first byte of a line or the file size.  Returns a numpy 
+	array of the addresses of the lines starting in the range, and 
+	an array of indices into that array giving the lines that are 
+	"pop" lines (see GenepopFileManager, def __is_pop_line).
+
+	The single tuple arg allows this def to be used by
+	multiprocessing.Pool.map.
+	'''
+	( s_filename, l_start, l_end ) = t_args
+
+	NEWLINE=ord( b'\n' )
+	LENGTHS_OF_POP_LINES=( 4, 5 )
+	POP_LINES=( b'pop\n', b'pop\r\n' )
+
+	if l_end <= l_start:
+		return numpy.array( [], dtype=numpy.int64 ), numpy.array( [], dtype=numpy.int64 )
+	#end if empty range
+
+	o_mapped_file=get_mapped_file( s_filename )
+	o_map=o_mapped_file.map
+	a_bytes=numpy.frombuffer( o_map, dtype=numpy.uint8 )
+
+	'''
+	A newline at address q starts a line at q+1, and the
+	range's final byte, at l_end - 1, is either a newline
+	that starts a line in the next range, or the end of file.
+	'''
+	la_starts=[ numpy.array( [ l_start ], dtype=numpy.int64 ) ]
+	l_last_newline_searched=l_end - 1
+
+	for l_block_start in range( l_start, l_last_newline_searched, INDEX_SCAN_BLOCK_BYTES ):
+		l_block_end=min( l_block_start + INDEX_SCAN_BLOCK_BYTES, l_last_newline_searched )
+		a_newlines=numpy.flatnonzero( a_bytes[ l_block_start : l_block_end ] == NEWLINE )
+		la_starts.append( a_newlines.astype( numpy.int64 ) + ( l_block_start + 1 ) )
+	#end for each block
+
+	del a_bytes
+
+	a_starts=numpy.concatenate( la_starts )
+	a_lengths=numpy.diff( numpy.append( a_starts, l_end ) )
+
+	#"pop" lines are the only candidates of these lengths:
+	a_candidates=numpy.flatnonzero( ( a_lengths == LENGTHS_OF_POP_LINES[ 0 ] ) \
+											| ( a_lengths == LENGTHS_OF_POP_LINES[ 1 ] ) )
+	li_pop_indices=[]
+	for idx in a_candidates.tolist():
+		l_line_start=int( a_starts[ idx ] )
+		v_line=o_map[ l_line_start : l_line_start + int( a_lengths[ idx ] ) ]
+		if v_line.lower() in POP_LINES:
+			li_pop_indices.append( idx )
+		#end if pop line
+	#end for each candidate
+
+	return a_starts, numpy.array( li_pop_indices, dtype=numpy.int64 )
+#end get_line_starts_in_byte_range
+
+class RawByteRangeWriter( object ):
+	'''
+	Copies byte ranges from a file opened 'rb' into an output
+	file object.  Used by GenepopFileManager to write unaltered
+	entries without decoding and re-encoding each line.
+
+	When the output is a regular file, the input has a file
+	descriptor, and no endline conversion is needed, ranges 
+	are copied by the kernel, using os.copy_file_range,
+	or, failing that, os.sendfile (linux only).  Otherwise ranges are read 
+	in chunks and written to the output file object (or its underlying 
+	buffer, for python3 text files), converting dos endlines if 
+	the b_convert_dos_endlines flag is True.
+
+	Caller should flush the output file object before
+	creating an instance, and should not write to the output
+	file object itself until calling close().
+	'''
+
+	def __init__( self, o_infile, o_outfile, b_convert_dos_endlines=False ):
+		self.__infile=o_infile
+		self.__outfile=o_outfile
+		self.__convert_dos_endlines=b_convert_dos_endlines
+		self.__out_fd=self.__get_regular_file_descriptor( o_outfile )
+		self.__use_copy_file_range=hasattr( os, "copy_file_range" )
+		self.__use_sendfile=hasattr( os, "sendfile" ) \
+						and sys.platform.startswith( "linux" )
+		return
+	#end __init__
+
+	def __get_regular_file_descriptor( self, o_file ):
+		i_fd=None
+		try:
+			i_this_fd=o_file.fileno()
+			if stat.S_ISREG( os.fstat( i_this_fd ).st_mode ):
+				i_fd=i_this_fd
+			#end if regular file
+		except Exception:
+			i_fd=None
+		#end try...except
+		return i_fd
+	#end __get_regular_file_descriptor
+
+	def __copy_by_kernel( self, l_start, l_end ):
+		'''
+		Returns the count of bytes copied, which will be less
+		than requested only if neither kernel call is available.
+		'''
+		i_in_fd=self.__infile.fileno()
+		l_offset=l_start
+
+		while l_offset < l_end:
+			if self.__use_copy_file_range:
+				try:
+					i_copied=os.copy_file_range( i_in_fd, self.__out_fd, 
+														l_end - l_offset, l_offset )
+				except OSError:
+					#e.g. unsupported by kernel or file system, try sendfile:
+					self.__use_copy_file_range=False
+					continue
+				#end try...except
+			elif self.__use_sendfile:
+				try:
+					i_copied=os.sendfile( self.__out_fd, i_in_fd, 
+														l_offset, l_end - l_offset )
+				except OSError:
+					self.__use_sendfile=False
+					continue
+				#end try...except
+			else:
+				break
+			#end if copy_file_range, else sendfile, else neither
+
+			#zero bytes copied without an error means EOF:
+			if i_copied == 0:
+				break
+			#end if EOF
+
+			l_offset+=i_copied
+		#end while bytes remain
+
+		return l_offset - l_start
+	#end __copy_by_kernel
+
+	def writeBytes( self, v_bytes ):
+		if self.__out_fd is not None:
+			i_written=0
+			while i_written < len( v_bytes ):
+				i_written+=os.write( self.__out_fd, v_bytes[ i_written: ] )
+			#end while bytes remain
+		elif hasattr( self.__outfile, "buffer" ):
+			self.__outfile.buffer.write( v_bytes )
+		else:
+			try:
+				self.__outfile.write( v_bytes )
+			except TypeError:
+				self.__outfile.write( v_bytes.decode( SYSENCODING ) )
+			#end try...except
+		#end if descriptor, else text file buffer, else other file object
+		return
+	#end writeBytes
+
+	def copyRange( self, l_start, l_end ):
+		'''
+		Copies bytes from l_start up to (not including) l_end.
+		'''
+		if self.__out_fd is not None and not self.__convert_dos_endlines \
+								and hasattr( self.__infile, "fileno" ):
+			l_start+=self.__copy_by_kernel( l_start, l_end )
+		#end if kernel copy possible
+
+		self.__infile.seek( l_start )
+		l_remaining=l_end - l_start
+		v_carry=b''
+
+		while l_remaining > 0:
+			v_chunk=self.__infile.read( min( RAW_COPY_CHUNK_SIZE, l_remaining ) )
+			if not v_chunk:
+				break
+			#end if no more bytes
+
+			l_remaining-=len( v_chunk )
+
+			if self.__convert_dos_endlines:
+				v_chunk=v_carry + v_chunk
+				v_carry=b''
+				#don't split a \r\n pair across chunks:
+				if v_chunk.endswith( b'\r' ) and l_remaining > 0:
+					v_carry=v_chunk[ -1: ]
+					v_chunk=v_chunk[ :-1 ]
+				#end if chunk ends with a carriage return
+				v_chunk=v_chunk.replace( b'\r\n', b'\n' )
+			#end if we convert endlines
+
+			self.writeBytes( v_chunk )
+		#end while bytes remain
+
+		if v_carry:
+			self.writeBytes( v_carry )
+		#end if leftover carriage return
+
+		return
+	#end copyRange
+
+	def close( self ):
+		'''
+		Brings the output file object's position in line with 
+		the bytes written around it.  Does not close the output file.
+		'''
+		if self.__out_fd is not None:
+			try:
+				self.__outfile.seek( 0, os.SEEK_END )
+			except Exception:
+				pass
+			#end try...except
+		else:
+			self.__outfile.flush()
+		#end if descriptor, else file object
+		return
+	#end close
+#end class RawByteRangeWriter
+
 class GenepopFileManager( object ):
 
 	'''
@@ -75,9 +492,15 @@ class GenepopFileManager( object ):
 	'''
 	KEY_POP_ENTRY=0
 
-	def __init__( self, s_filename ):
+	def __init__( self, s_filename, i_index_processes=None ):
+		'''
+		param i_index_processes, if not None, gives the number
+			of processes used to index the file.  By default,
+			large files are indexed using one process per cpu.
+		'''
 		self.__filename=s_filename
 		self.__loci_count=None
+		self.__index_processes=i_index_processes
 
 		self.__setup_addresses( s_filename )
 		self.__init_subsamples()
@@ -96,13 +519,59 @@ class GenepopFileManager( object ):
 		self.__first_pop_address=None
 		self.__pop_byte_addresses={}
 		self.__header_and_loci_byte_addresses={}
+		self.__source_uses_dos_endlines=False
+		#Assigned by def __pop_section_lines_are_stripped:
+		self.__pop_section_is_stripped=None
+		self.__loci_token_width=None
+		self.__block_reader=None
+
+		if is_block_compressed_genepop_file( s_filename ):
+			self.__block_reader=BlockCompressedGenepopReader( s_filename )
+			self.__file_size=self.__block_reader.size
+			self.__source_ends_with_endline=self.__block_reader.ends_with_endline
+		else:
+			self.__file_size=os.path.getsize( s_filename )
+			self.__source_ends_with_endline=self.__file_ends_with_endline( s_filename )
+		#end if block compressed, else uncompressed
+
 		self.__read_byte_addresses()
 		return
 	#end __init_object
 
+	def __file_ends_with_endline( self, s_filename ):
+		b_ends_with_endline=True
+		if self.__file_size > 0:
+			o_file=open( s_filename, 'rb' )
+			o_file.seek( self.__file_size - 1 )
+			b_ends_with_endline=( o_file.read( 1 ) == b'\n' )
+			o_file.close()
+		#end if non-empty file
+		return b_ends_with_endline
+	#end __file_ends_with_endline
+
+	def __open_source( self ):
+		'''
+		Returns a binary, read-only file object for the original
+		file, which is, when possible, a cursor into the
+		process's shared memory map of the file, else
+		a regular file object opened 'rb'.  For block-compressed
+		files it is a cursor over the uncompressed text.
+		'''
+		if self.__block_reader is not None:
+			return self.__block_reader.openCursor()
+		#end if block compressed
+
+		o_mapped_file=get_mapped_file( self.__filename )
+		if o_mapped_file is not None:
+			return MappedFileCursor( o_mapped_file )
+		#end if mapped
+		return open( self.__filename, 'rb' )
+	#end __open_source
+
 	def __init_subsamples( self ):
 		self.__indiv_subsamples={}
 		self.__loci_subsamples={}
+		self.__loci_token_offsets={}
 		self.__pop_subsamples={}
 		return
 	#end __delete_subsamples
@@ -131,7 +600,7 @@ class GenepopFileManager( object ):
 
 		if i_loci_line_count==1:
 			IDX_LOCI_LINE=1
-			o_orig_file=open( self.__filename, "rb" )
+			o_orig_file=self.__open_source()
 			l_byte_address=\
 					self.__header_and_loci_byte_addresses[ \
 												IDX_LOCI_LINE ] 
@@ -204,10 +673,18 @@ class GenepopFileManager( object ):
 		assumes one item (loci name, or loci list) to a line, 
 		so that each item will have one line only (see class description)
 		'''
-		o_file=open( self.__filename, 'rb' )
+		o_file=self.__open_source()
 		i_item_count=0
 		s_line=o_file.readline()
 
+		'''
+		The fast, raw-copy write path (see def 
+		__write_raw_entries_to_file_object) needs to
+		know whether it must convert endlines.  We
+		assume the header line is representative.
+		'''
+		self.__source_uses_dos_endlines=s_line.endswith( b'\r\n' )
+
 		while s_line:
 			#for python3, need to convert the bytes object returnd by readline():
 			b_line=bytearray( s_line )
@@ -247,7 +724,7 @@ class GenepopFileManager( object ):
 		i_total_indiv_this_pop=0
 		i_total_lines_this_indiv=0
 
-		o_gpfile=open ( self.__filename, 'rb' )
+		o_gpfile=self.__open_source()
 		o_gpfile.seek( self.__first_pop_address )
 		s_line=o_gpfile.readline()
 		while  s_line:
@@ -277,9 +754,132 @@ class GenepopFileManager( object ):
 		#end for each line
 	#end __read_pops
 
+	def __get_total_index_processes( self ):
+		'''
+		Uses the count given by the caller, else, for large files,
+		one process per cpu.  Daemonic processes (ex: workers in a
+		multiprocessing.Pool) can't start a pool, so they use one.
+		'''
+		i_total=1
+
+		if multiprocessing.current_process().daemon:
+			i_total=1
+		elif self.__index_processes is not None:
+			i_total=max( 1, self.__index_processes )
+		elif self.__file_size >= PARALLEL_INDEX_MIN_BYTES:
+			i_total=multiprocessing.cpu_count()
+		#end if daemonic, else caller's total, else large file
+
+		return i_total
+	#end __get_total_index_processes
+
+	def __get_line_aligned_index_ranges( self, o_mapped_file, i_total_ranges ):
+		'''
+		Splits the bytes from the first "pop" line to the end of
+		the file into i_total_ranges (or fewer) ranges, each boundary 
+		moved forward to the start of the next line.
+		'''
+		l_start=self.__first_pop_address
+		l_size=self.__file_size
+		f_range_size=float( l_size - l_start ) / i_total_ranges
+
+		li_boundaries=[ l_start ]
+		for idx in range( 1, i_total_ranges ):
+			l_boundary=l_start + int( idx * f_range_size )
+			l_newline=o_mapped_file.map.find( b'\n', max( l_boundary - 1, li_boundaries[ -1 ] ) )
+			l_boundary=l_size if l_newline == -1 else l_newline + 1
+			if l_boundary > li_boundaries[ -1 ] and l_boundary < l_size:
+				li_boundaries.append( l_boundary )
+			#end if a new boundary
+		#end for each boundary
+		li_boundaries.append( l_size )
+
+		return [ ( self.__filename, li_boundaries[ idx ], li_boundaries[ idx + 1 ] ) \
+								for idx in range( len( li_boundaries ) - 1 ) ]
+	#end __get_line_aligned_index_ranges
+
+	def __read_pops_by_line_scan( self, o_mapped_file ):
+		'''
+		Gives the same byte addresses as def __read_pops, but finds 
+		the line starts with a vectorized search of the memory map,
+		and, for large files, scans byte ranges in parallel (see
+		def get_line_starts_in_byte_range), then merges the ranges' 
+		results in order.
+		'''
+		i_total_processes=self.__get_total_index_processes()
+
+		lt_ranges=self.__get_line_aligned_index_ranges( o_mapped_file,
+						i_total_processes * PARALLEL_INDEX_RANGES_PER_PROCESS \
+								if i_total_processes > 1 else 1 )
+
+		lt_results=None
+
+		if i_total_processes > 1 and len( lt_ranges ) > 1:
+			o_pool=multiprocessing.Pool( min( i_total_processes, len( lt_ranges ) ) )
+			try:
+				lt_results=o_pool.map( get_line_starts_in_byte_range, lt_ranges )
+			finally:
+				o_pool.close()
+				o_pool.join()
+			#end try...finally
+		else:
+			lt_results=[ get_line_starts_in_byte_range( t_range ) for t_range in lt_ranges ]
+		#end if parallel else serial
+
+		li_line_starts=[]
+		li_pop_line_indices=[]
+		for a_starts, a_pop_indices in lt_results:
+			li_pop_line_indices+=( a_pop_indices + len( li_line_starts ) ).tolist()
+			li_line_starts+=a_starts.tolist()
+		#end for each range's results
+
+		self.__set_pop_byte_addresses_from_line_starts( li_line_starts, li_pop_line_indices )
+
+		return
+	#end __read_pops_by_line_scan
+
+	def __set_pop_byte_addresses_from_line_starts( self, li_line_starts, li_pop_line_indices ):
+		'''
+		Given the addresses of all lines from the first "pop" line on,
+		and the indices into that list of the "pop" lines, fills the pop
+		byte address dict.  As in def __read_pops, each "pop" line is the 
+		zeroth item in its pop, and each other line is an individual's entry.
+		'''
+		li_pop_line_indices=li_pop_line_indices + [ len( li_line_starts ) ]
+		for i_pop_count in range( 1, len( li_pop_line_indices ) ):
+			idx_pop_line=li_pop_line_indices[ i_pop_count - 1 ]
+			idx_next_pop_line=li_pop_line_indices[ i_pop_count ]
+			self.__pop_byte_addresses[ i_pop_count ]= \
+					{ i_item : { 1 : li_line_starts[ idx_pop_line + i_item ] } \
+							for i_item in range( idx_next_pop_line - idx_pop_line ) }
+		#end for each pop
+
+		return
+	#end __set_pop_byte_addresses_from_line_starts
+
 	def __read_byte_addresses( self ):
 		self.__read_header_and_loci_entries()
-		self.__read_pops()
+
+		if self.__block_reader is not None:
+			'''
+			The block index gives the line addresses,
+			so no pop section is decompressed:
+			'''
+			li_line_starts, li_pop_line_indices= \
+					self.__block_reader.getPopSectionLineStarts( self.__first_pop_address )
+			self.__set_pop_byte_addresses_from_line_starts( li_line_starts, 
+																li_pop_line_indices )
+			return
+		#end if block compressed
+
+		o_mapped_file=get_mapped_file( self.__filename )
+
+		if o_mapped_file is None:
+			self.__read_pops()
+		else:
+			self.__read_pops_by_line_scan( o_mapped_file )
+		#end if no memory map, else scan the map
+
 		return
 	#end __read_byte_addresses
 
@@ -407,7 +1007,7 @@ class GenepopFileManager( object ):
 		2017_05_01.  Restoring the 'rb' flag, and adjusting code below to
 		handle bytes objects, if the interpretor is python3.
 		'''
-		o_origfile=open( self.__filename, 'rb' )
+		o_origfile=self.__open_source()
 		o_newfile=o_file_object
 
 		li_header_and_loci_lines=None
@@ -490,33 +1090,33 @@ class GenepopFileManager( object ):
 		#end if we have subsampled, single-line loci entries.
 
 		#write pops:
-		for i_pop_number in li_pop_numbers:
+		if s_loci_subsample_tag is None \
+				and self.__has_file_descriptor( o_newfile ) \
+				and self.__pop_section_lines_are_stripped():
+			'''
+			With no loci subsample, individual entries are
+			written as they appear in the original file, so we
+			copy raw byte ranges rather than reading, decoding and
+			re-encoding each line.  We do so only when the copy
+			gives the same text as the line-by-line write below,
+			that is, when no line in the pop sections is blank or
+			has whitespace to strip, and only when the output has
+			a file descriptor (not, for example, an in-memory 
+			stream or a wrapper without one).
+			'''
+			self.__write_raw_entries_to_file_object( o_origfile,
+														o_newfile,
+														li_pop_numbers,
+														s_indiv_subsample_tag,
+														i_min_pop_size )
+			o_origfile.close()
+			return
+		#end if no loci subsample, copy raw entries
 
-			li_indiv_list=None
-			i_tot_indiv=None
+		for i_pop_number in li_pop_numbers:
 
-			if s_indiv_subsample_tag is None:
-				li_indiv_list=list(self.__pop_byte_addresses[ i_pop_number ].keys())
-				i_tot_indiv=self.__get_count_indiv( li_indiv_list )
-			else:
-				ddli_subsamples=self.__indiv_subsamples
-				if s_indiv_subsample_tag not in ddli_subsamples:
-					s_msg="In GenepopFileManager instance, def __write_genepop_file_to_file_object, " \
-							"no indiv subsample with tag: " + s_indiv_subsample_tag
-					raise Exception( s_msg )
-				#end if no such tag
-
-				if i_pop_number not in ddli_subsamples[ s_indiv_subsample_tag ]:
-					s_msg="In GenepopFileManager instance, def __write_genepop_file_to_file_object, " \
-							+ "subsample with tag " + s_indiv_subsample_tag \
-							+ " has no subsample for population number " + str( i_pop_number ) + "."
-				
-					raise Exception( s_msg )
-				#end if no such pop for this subsample
-				li_indiv_list=ddli_subsamples[ s_indiv_subsample_tag ][ i_pop_number ] 
-				i_tot_indiv=self.__get_count_indiv( \
-						ddli_subsamples[ s_indiv_subsample_tag ] [ i_pop_number ] )
-			#end if no subsample, else subsample
+			li_indiv_list, i_tot_indiv=self.__get_indiv_list_for_writing( i_pop_number, 
+																		s_indiv_subsample_tag )
 
 			if i_tot_indiv >= i_min_pop_size:
 
@@ -557,7 +1157,7 @@ class GenepopFileManager( object ):
 						#end if we should insert a leading space in the loci list
 
 						o_newfile.write( s_line_to_write + UNIX_ENDLINE )
-					#end if no loci subsample, simply print orig entry, else get loci subsample
+					#end if pop entry or no loci subsample, simply print orig entry, else get loci subsample
 				#end for each individual number
 			#end if num individuals in this pop at or over min
 		#end for each pop number
@@ -566,6 +1166,206 @@ class GenepopFileManager( object ):
 		return
 	#end __write_genepop_file_to_file_object
 
+	def __has_file_descriptor( self, o_file_object ):
+		b_has_descriptor=True
+		try:
+			o_file_object.fileno()
+		except Exception:
+			b_has_descriptor=False
+		#end try...except
+		return b_has_descriptor
+	#end __has_file_descriptor
+
+	def __pop_section_lines_are_stripped( self ):
+		'''
+		True if no line from the first "pop" line to the end
+		of the file is blank or has leading or trailing whitespace 
+		(after any dos endlines are made unix endlines).  Then, copying 
+		raw byte ranges writes the same text as writing each stripped 
+		line.  The file is scanned once, on the first call.
+		'''
+		if self.__pop_section_is_stripped is not None:
+			return self.__pop_section_is_stripped
+		#end if already scanned
+
+		b_is_stripped=True
+		o_file=self.__open_source()
+		try:
+			o_file.seek( self.__first_pop_address )
+			#The pop section starts a line:
+			v_previous=b'\n'
+			v_carry=b''
+
+			while b_is_stripped:
+				v_chunk=o_file.read( RAW_COPY_CHUNK_SIZE )
+				if not v_chunk:
+					break
+				#end if no more bytes
+
+				v_chunk=v_carry + v_chunk
+				v_carry=b''
+
+				if self.__source_uses_dos_endlines:
+					#don't split a \r\n pair across chunks:
+					if v_chunk.endswith( b'\r' ):
+						v_carry=v_chunk[ -1: ]
+						v_chunk=v_chunk[ :-1 ]
+					#end if chunk ends with a carriage return
+					v_chunk=v_chunk.replace( b'\r\n', b'\n' )
+				#end if we convert endlines
+
+				v_text=v_previous + v_chunk
+
+				if UNSTRIPPED_LINE_PATTERN.search( v_text ) is not None:
+					b_is_stripped=False
+				#end if a line would be stripped
+
+				if len( v_chunk ) > 0:
+					v_previous=v_chunk[ -1: ]
+				#end if any bytes
+			#end while no line found that would be stripped
+
+			#The last line, without its endline:
+			v_last=v_previous + v_carry
+			if b_is_stripped and not v_last.endswith( b'\n' ) \
+							and v_last[ -1: ].isspace():
+				b_is_stripped=False
+			#end if the file ends with whitespace
+		finally:
+			o_file.close()
+		#end try...finally
+
+		self.__pop_section_is_stripped=b_is_stripped
+		return b_is_stripped
+	#end __pop_section_lines_are_stripped
+
+	def __get_indiv_list_for_writing( self, i_pop_number, s_indiv_subsample_tag ):
+		'''
+		Returns the list of individual numbers, including
+		the zeroth ("pop") entry, and the individual count,
+		for the given pop, either for all individuals, or
+		for the subsample given by the tag.
+		'''
+		li_indiv_list=None
+		i_tot_indiv=None
+
+		if s_indiv_subsample_tag is None:
+			li_indiv_list=list(self.__pop_byte_addresses[ i_pop_number ].keys())
+			i_tot_indiv=self.__get_count_indiv( li_indiv_list )
+		else:
+			ddli_subsamples=self.__indiv_subsamples
+			if s_indiv_subsample_tag not in ddli_subsamples:
+				s_msg="In GenepopFileManager instance, def __write_genepop_file_to_file_object, " \
+						"no indiv subsample with tag: " + s_indiv_subsample_tag
+				raise Exception( s_msg )
+			#end if no such tag
+
+			if i_pop_number not in ddli_subsamples[ s_indiv_subsample_tag ]:
+				s_msg="In GenepopFileManager instance, def __write_genepop_file_to_file_object, " \
+						+ "subsample with tag " + s_indiv_subsample_tag \
+						+ " has no subsample for population number " + str( i_pop_number ) + "."
+			
+				raise Exception( s_msg )
+			#end if no such pop for this subsample
+			li_indiv_list=ddli_subsamples[ s_indiv_subsample_tag ][ i_pop_number ] 
+			i_tot_indiv=self.__get_count_indiv( \
+					ddli_subsamples[ s_indiv_subsample_tag ] [ i_pop_number ] )
+		#end if no subsample, else subsample
+
+		return li_indiv_list, i_tot_indiv
+	#end __get_indiv_list_for_writing
+
+	def __get_end_address_of_entry( self, i_pop_number, i_indiv_number ):
+		'''
+		Returns the byte address just past the last byte
+		of an entry (a "pop" line, or an individual's line(s)).
+		Entries are contiguous in the file, so this is the
+		address of the next entry, or, for the last entry in
+		the file, the file size.
+		'''
+		l_end_address=None
+		dddl_addresses=self.__pop_byte_addresses
+
+		if i_indiv_number + 1 in dddl_addresses[ i_pop_number ]:
+			l_end_address=dddl_addresses[ i_pop_number ][ i_indiv_number + 1 ][ 1 ]
+		elif i_pop_number + 1 in dddl_addresses:
+			l_end_address=dddl_addresses[ i_pop_number + 1 ] \
+								[ GenepopFileManager.KEY_POP_ENTRY ][ 1 ]
+		else:
+			l_end_address=self.__file_size
+		#end if next indiv in this pop, else first line of next pop, else end of file
+
+		return l_end_address
+	#end __get_end_address_of_entry
+
+	def __write_raw_entries_to_file_object( self, o_origfile, 
+												o_newfile,
+												li_pop_numbers,
+												s_indiv_subsample_tag,
+												i_min_pop_size ):
+		'''
+		Writes the pop sections as raw byte ranges copied from
+		the original file.  Runs of individuals that are contiguous 
+		in the original (including across pop boundaries) are 
+		coalesced so that each run is copied with a single call.  
+		When the output is a regular file and the original uses 
+		unix endlines, the kernel does the copy (os.copy_file_range 
+		or os.sendfile), otherwise we read in chunks, converting
+		dos endlines when needed.
+		'''
+		o_newfile.flush()
+
+		o_writer=RawByteRangeWriter( o_origfile, o_newfile, 
+										b_convert_dos_endlines=self.__source_uses_dos_endlines )
+
+		l_run_start=None
+		l_run_end=None
+
+		for i_pop_number in li_pop_numbers:
+
+			li_indiv_list, i_tot_indiv=self.__get_indiv_list_for_writing( i_pop_number,
+																		s_indiv_subsample_tag )
+			if i_tot_indiv < i_min_pop_size:
+				continue
+			#end if too few individuals, skip this pop
+
+			for i_indiv_number in li_indiv_list:
+
+				l_start=self.__pop_byte_addresses[ i_pop_number ][ i_indiv_number ][ 1 ]
+				l_end=self.__get_end_address_of_entry( i_pop_number, i_indiv_number )
+
+				if l_run_end is not None and l_start == l_run_end:
+					l_run_end=l_end
+				else:
+					if l_run_start is not None:
+						o_writer.copyRange( l_run_start, l_run_end )
+					#end if we have a run, copy it
+					l_run_start=l_start
+					l_run_end=l_end
+				#end if contiguous with current run, else new run
+
+				'''
+				If the original's last line lacks an endline,
+				we need to add one, to separate this entry
+				from the next written entry:
+				'''
+				if l_end == self.__file_size and not self.__source_ends_with_endline:
+					o_writer.copyRange( l_run_start, l_run_end )
+					o_writer.writeBytes( b'\n' )
+					l_run_start=None
+					l_run_end=None
+				#end if last line in file lacks an endline
+			#end for each individual number
+		#end for each pop number
+
+		if l_run_start is not None:
+			o_writer.copyRange( l_run_start, l_run_end )
+		#end if unwritten run
+
+		o_writer.close()
+		return
+	#end __write_raw_entries_to_file_object
+
 	def __get_count_indiv( self, iter_indiv_list ):
 		'''
 		To centralize the computation of counting 
@@ -671,6 +1471,41 @@ class GenepopFileManager( object ):
 		return
 	#end printGenePopFile
 
+	def getPopSectionBytes( self, i_pop_number ):
+		'''
+		2026_10_19. Returns the raw bytes of all the individual
+		entries in the pop section, not including its "pop" line,
+		so that clients can parse a whole pop section in one 
+		read (see module genepopcyclesummary.py).
+		'''
+		dddl_addresses=self.__pop_byte_addresses
+
+		if i_pop_number not in dddl_addresses:
+			s_msg="In GenepopFileManager instance, " \
+						+ "def getPopSectionBytes, " \
+						+ "there is no pop number " \
+						+ str( i_pop_number ) + " in file, " \
+						+ self.__filename + "."
+			raise Exception( s_msg )
+		#end if no such pop
+
+		if GenepopFileManager.KEY_FIRST_INDIV_NUMBER not in dddl_addresses[ i_pop_number ]:
+			return b''
+		#end if no individuals
+
+		l_start=dddl_addresses[ i_pop_number ][ GenepopFileManager.KEY_FIRST_INDIV_NUMBER ] \
+											[ GenepopFileManager.KEY_FIRST_LINE_INDIV_ENTRY ]
+		l_end=self.__get_end_address_of_entry( i_pop_number, 
+							max( dddl_addresses[ i_pop_number ].keys() ) )
+
+		o_file=self.__open_source()
+		o_file.seek( l_start )
+		v_bytes=o_file.read( l_end - l_start )
+		o_file.close()
+
+		return v_bytes
+	#end getPopSectionBytes
+
 	def getListIndividualNumbers( self, i_pop_number=1, s_indiv_subsample_tag=None):
 		li_indiv=self.__get_list_indiv_numbers( i_pop_number, s_indiv_subsample_tag )
 		return [ i_indiv for i_indiv in li_indiv ]
@@ -765,7 +1600,8 @@ class GenepopFileManager( object ):
 	def __get_indiv_entry( self,
 							o_orig_file,
 							i_pop_number,
-							i_indiv_number ):
+							i_indiv_number,
+							b_decode=True ):
 
 		'''
 		In the open file object given by o_orig_file,
@@ -774,8 +1610,14 @@ class GenepopFileManager( object ):
 		append to string var and return the string of
 		concatenated entry lines.  Note that most often
 		there will be only one entry line (id,loci-list).
+
+		If b_decode is False, the lines are returned as
+		read, that is, as bytes when the file was opened 'rb'
+		under python3, so that callers can slice them before
+		decoding.
 		'''
 		s_entry=""
+		lv_lines=[]
 
 		i_num_lines_this_indiv_entry=len( self.__pop_byte_addresses[ i_pop_number ][ i_indiv_number ] )
 
@@ -804,6 +1646,11 @@ class GenepopFileManager( object ):
 			'''
 			v_line=o_orig_file.readline()
 
+			if not b_decode:
+				lv_lines.append( v_line )
+				continue
+			#end if caller wants undecoded lines
+
 			if type( v_line ) == bytes:
 				v_line=v_line.decode( SYSENCODING )
 			#end if we read in bytes
@@ -812,9 +1659,115 @@ class GenepopFileManager( object ):
 
 		#end for each line in entry
 
+		if not b_decode:
+			v_empty=b"" if type( lv_lines[ 0 ] ) == bytes else ""
+			return v_empty.join( lv_lines )
+		#end if undecoded
+
 		return s_entry
 	#end __get_indiv_entry
 
+	def __get_loci_token_width( self, v_loci ):
+		'''
+		Genepop files written by simulations (and most others) use 
+		the same number of digits for every allele, so that every
+		loci token has the same width.  On the first call we detect 
+		that width from the given loci text, and store it, or zero 
+		when the tokens are not of uniform width.
+		'''
+		if self.__loci_token_width is None:
+			lv_tokens=v_loci.split()
+			set_widths=set( [ len( v_token ) for v_token in lv_tokens ] )
+			if len( set_widths ) == 1 and len( lv_tokens ) == self.__loci_count:
+				self.__loci_token_width=set_widths.pop()
+			else:
+				self.__loci_token_width=0
+			#end if uniform widths, else not
+		#end if width not yet detected
+
+		return self.__loci_token_width
+	#end __get_loci_token_width
+
+	def __get_loci_token_offsets( self, s_loci_subsample_tag, li_loci_numbers, i_width ):
+		'''
+		Returns, for a fixed-width loci list, the offset of each 
+		subsampled loci token from the start of the first token.
+		Offsets are cached per tag, and recomputed when the tag 
+		has been assigned a new loci list.
+		'''
+		if s_loci_subsample_tag in self.__loci_token_offsets:
+			li_cached_numbers, li_offsets=self.__loci_token_offsets[ s_loci_subsample_tag ]
+			if li_cached_numbers is li_loci_numbers:
+				return li_offsets
+			#end if cache is for the current list
+		#end if cached
+
+		#Note that loci numbers are 1-based:
+		li_offsets=[ ( i_num - 1 ) * ( i_width + 1 ) for i_num in li_loci_numbers ]
+		self.__loci_token_offsets[ s_loci_subsample_tag ]=( li_loci_numbers, li_offsets )
+
+		return li_offsets
+	#end __get_loci_token_offsets
+
+	def __get_subsampled_loci( self, v_loci, s_loci_subsample_tag, li_loci_numbers ):
+		'''
+		Returns the loci tokens given by li_loci_numbers
+		(1-based), from the loci text of one individual entry,
+		space-delimited, and of the same type (str or bytes)
+		as v_loci.
+
+		When the tokens are of the file's uniform width and are
+		separated by single spaces, we slice each token directly
+		at its computed offset, rather than splitting the entire 
+		loci list.  Otherwise we split this line's tokens.
+		'''
+		b_is_bytes=( type( v_loci ) == bytes )
+		v_space=b' ' if b_is_bytes else ' '
+		v_tab=b'\t' if b_is_bytes else '\t'
+		v_newline=b'\n' if b_is_bytes else '\n'
+
+		v_stripped=v_loci.strip()
+		i_total_loci=self.__loci_count
+		i_width=self.__get_loci_token_width( v_stripped )
+
+		b_is_fixed_width=False
+
+		if i_width > 0 \
+				and len( v_stripped ) == ( i_total_loci * ( i_width + 1 ) ) - 1:
+			'''
+			With the expected length, the line is fixed width
+			if every separator position holds a space, and
+			there are no other blanks.
+			'''
+			i_separators=i_total_loci - 1
+			b_is_fixed_width=v_stripped[ i_width : : i_width + 1 ].count( v_space ) == i_separators \
+									and v_stripped.count( v_space ) == i_separators \
+									and v_tab not in v_stripped \
+									and v_newline not in v_stripped
+		#end if length is right for fixed width tokens
+
+		if b_is_fixed_width:
+			li_offsets=self.__get_loci_token_offsets( s_loci_subsample_tag, 
+															li_loci_numbers, 
+															i_width )
+			lv_loci=[ v_stripped[ i_offset : i_offset + i_width ] for i_offset in li_offsets ]
+		else:
+			'''
+			Seperator of loci can be either space
+			or tab, and loci may be on multiple lines.
+			Python split() with no arg splits on any
+			blank and deletes empty strings (i.e. 2 or 
+			more "blank" delimiters in a row )
+			'''
+			lv_all_loci=v_stripped.split()
+			#Note that loci numbers are 1-based, so we subtract
+			#one to find them in our loci list:
+			lv_loci=[ lv_all_loci[ i_num-1 ] for i_num in li_loci_numbers ]
+		#end if fixed width, slice, else split
+
+		return v_space.join( lv_loci )
+	#end __get_subsampled_loci
+
 	def __get_loci_for_indiv( self, 
 				o_orig_file,
 				i_pop_number, 
@@ -833,13 +1786,21 @@ class GenepopFileManager( object ):
 
 		s_loci=""
 
-		s_entry=self.__get_indiv_entry( o_orig_file, 
+		'''
+		We get the entry undecoded, so that, when subsampling,
+		we decode only the loci we keep.
+		'''
+		v_entry=self.__get_indiv_entry( o_orig_file, 
 										i_pop_number, 
-										i_indiv_number )
+										i_indiv_number,
+										b_decode=False )
 
-		ls_id_and_loci=s_entry.split( "," ) 
+		b_is_bytes=( type( v_entry ) == bytes )
 
-		if len( ls_id_and_loci ) != 2: 
+		lv_id_and_loci=v_entry.split( b"," if b_is_bytes else "," ) 
+
+		if len( lv_id_and_loci ) != 2: 
+			s_entry=v_entry.decode( SYSENCODING ) if b_is_bytes else v_entry
 			s_msg="In GenepopFileManager instance, " \
 						+ "def __get_loci_for_indiv, " \
 						+ "No single-comma delimiter found " \
@@ -848,43 +1809,32 @@ class GenepopFileManager( object ):
 			raise Exception( s_msg )
 		#end if not a 2-item list, then can't tell id from loci
 
-		s_loci_line_or_lines=ls_id_and_loci[ IDX_LOCI ]
+		v_loci_line_or_lines=lv_id_and_loci[ IDX_LOCI ]
 
 		if s_loci_subsample_tag is None:
-			s_loci=s_loci_line_or_lines
+			s_loci=v_loci_line_or_lines
 		else:
 			'''
-			We must split the loci to get 
+			We must find the loci tokens to get 
 			the subsamples.  See format 
 			spec at web address listed in
 			comments head of this file.
 			''' 		
 
-			#To combine multiple loci lines,
-			#replace newlines with spaces:
-			s_loci_line=s_loci_line_or_lines.replace( "\n", " " )
-
-			'''
-			Seperator of loci can be either space
-			or tab.  Python split() with no arg
-			splits on either and deletes empty
-			strings (i.e. 2 ormore "blank" delimiters 
-			in a row )
-			'''
-					
-			ls_loci=s_loci_line.split()
-
 			li_loci_numbers=\
 					self.__loci_subsamples[ \
 								s_loci_subsample_tag ]
 
-			#Note that loci numbers are 1-based, so we subtract
-			#one to find them in our loci list:
-			
-			s_loci=" ".join( [ ls_loci[ i_num-1 ] for i_num in li_loci_numbers ] )
+			s_loci=self.__get_subsampled_loci( v_loci_line_or_lines,
+													s_loci_subsample_tag,
+													li_loci_numbers )
 			
 		#end if loci not subsampled else subsampled
 
+		if b_is_bytes:
+			s_loci=s_loci.decode( SYSENCODING )
+		#end if bytes, decode
+
 		return s_loci
 	#end getLociForIndiv
 
@@ -1056,7 +2006,7 @@ class GenepopFileManager( object ):
 		ls_individuals=[]
 
 		li_indiv_numbers= self.__get_list_indiv_numbers( i_pop_number, s_indiv_subsample_tag )
-		o_orig_file = open( self.__filename, 'rb' )
+		o_orig_file = self.__open_source()
 
 		for i_this_indiv in li_indiv_numbers:
 
@@ -1642,7 +2592,7 @@ class GenepopFileManager( object ):
 
 		dddi_allele_counts_by_pop_by_loci={}
 
-		o_this_genepop_file=open( self.__filename, 'r' )
+		o_this_genepop_file=self.__open_source()
 
 		li_pop_nums=self.__get_pop_list( s_pop_subsample_tag )
 		li_loci_nums=self.__get_list_loci_numbers( s_loci_subsample_tag )
@@ -1758,10 +2708,14 @@ class GenepopFileManager( object ):
 		pgdriveneestimator.py, def 
 		get_nbne_ratio_from_genepop_file_header.
 		'''
-		o_origfile=open( self.__filename, 'r' )
+		o_origfile=self.__open_source()
 		o_origfile.seek( self.__header_and_loci_byte_addresses[0] )
-		s_line_stripped=( o_origfile.readline() ).strip()
-		return s_line_stripped
+		v_line_stripped=( o_origfile.readline() ).strip()
+		o_origfile.close()
+		if type( v_line_stripped ) == bytes:
+			v_line_stripped=v_line_stripped.decode( SYSENCODING )
+		#end if bytes, decode
+		return v_line_stripped
 #end class GenepopFileManager
 
 if __name__ == "__main__":
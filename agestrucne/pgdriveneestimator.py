@@ -109,6 +109,12 @@ import numpy as np
 import agestrucne.genepopfilemanager as gpf
 import agestrucne.genepopfilesampler as gps
 
+'''
+2026_10_19. Block-compressed genepop files (see
+def get_invalid_file_names).
+'''
+import agestrucne.genepopblockfile as gpb
+
 #related to calling Tiago's
 #pygenomics class that itself
 #calls NeEstimator
@@ -134,9 +140,43 @@ argument (see below, def validate_chromlocifile).
 '''
 import agestrucne.pgchromlocifilemanager as pgclf
 
+'''
+2026_10_19.  Summary (sidecar) file for the main table,
+read by the plotting interfaces when a plot needs only
+the per-group summaries.  See def drive_estimator.
+'''
+import agestrucne.pgneestimationsummaryfile as pgsum
+
+'''
+2026_10_19.  Optional SQLite database of the main table.
+See def drive_estimator.
+'''
+import agestrucne.pgneestimationdatabase as pgdb
+
 VERBOSE=False
 VERY_VERBOSE=False
 
+'''
+2026_10_19.  When the main table is written to a named
+file, we can also write its summary file, named by appending
+".summary" to the table's file name.  Because the summary's
+accumulator keeps each key's values in memory until the run
+ends, this is off by default.  The GUI's "Write summary file" 
+parameter sets this flag (see pgutilities.py, def 
+call_driveneestimator_using_subprocess).
+'''
+WRITE_SUMMARY_FILE=False
+
+'''
+2026_10_19.  When the main table is written to a named file,
+we can also write its rows to an indexed SQLite database, named 
+by appending ".sqlite" to the table's file name, which clients can 
+query for subsets of the rows.  The tsv file is always written. 
+The GUI's "Write results database" parameter sets this flag (see
+pgutilities.py, def call_driveneestimator_using_subprocess).
+'''
+WRITE_RESULTS_DATABASE=False
+
 '''
 2017_05_31. These mod-level variables
 are assigned in def set_messaging_procedures
@@ -809,10 +849,18 @@ def get_invalid_file_names( ls_file_names ):
 	Currently only check is for file name
 	length (see comments above declaration of const 
 	MAX_GENEPOP_FILE_NAME_LENGTH.
+
+	2026_10_19. We also check that a compressed file is
+	a block-compressed genepop file with a matching index, 
+	which the GenepopFileManager reads directly (see module
+	genepopblockfile.py).  Other compressed files must first
+	be decompressed.
 	'''
 	MSG_FILE_TOO_LONG="File name longer than " \
 			+ str( MAX_GENEPOP_FILE_NAME_LENGTH ) \
 			+ " characters."
+	MSG_COMPRESSED_NO_INDEX="Compressed file without a matching " \
+			+ "block index.  Decompress the file before loading it."
 
 	ls_invalid_file_names_and_messages=[]
 
@@ -823,7 +871,10 @@ def get_invalid_file_names( ls_file_names ):
 		if i_len_file_name > MAX_GENEPOP_FILE_NAME_LENGTH:
 			ls_invalid_file_names_and_messages.append( \
 					", ".join( [ s_file_name, MSG_FILE_TOO_LONG ] ) )
-		#and if file name too long
+		elif gpb.is_unreadable_compressed_genepop_file( s_file_name ):
+			ls_invalid_file_names_and_messages.append( \
+					", ".join( [ s_file_name, MSG_COMPRESSED_NO_INDEX ] ) )
+		#and if file name too long, else if compressed without index
 	#end for each file name
 
 	return ls_invalid_file_names_and_messages
@@ -1571,11 +1622,21 @@ def do_estimate(xxx_todo_changeme ):
 
 #end do_estimate
 
-def write_results( ds_results, o_main_outfile, o_secondary_outfile ):
+def write_results( ds_results, o_main_outfile, o_secondary_outfile, lo_result_stores=None ):
 	o_main_outfile.write( ds_results[ "for_stdout" ] + "\n" )
 	if ds_results[ "for_stderr" ] is not None:
 		o_secondary_outfile.write( ds_results [ "for_stderr" ] )
 	#end if we have stderr results
+
+	'''
+	2026_10_19.  Other stores of the main table's lines, 
+	the summary file accumulator and the results database.
+	'''
+	if lo_result_stores is not None:
+		for o_result_store in lo_result_stores:
+			o_result_store.addLines( ds_results[ "for_stdout" ] )
+		#end for each store
+	#end if we have other stores for the main table lines
 #end write_results
 
 def update_indiv_list( dddli_indiv_list, dv_indiv_info_for_replicate, lv_sample_vals ):
@@ -2785,7 +2846,8 @@ def get_population_number_from_loci_subsample_tag( s_loci_subsample_tag ):
 	return i_pop_number
 #end def get_population_number_from_loci_subsample_tag
 
-def write_result_sets( lds_results, lv_sample_values, o_debug_mode, o_main_outfile, o_secondary_outfile ):
+def write_result_sets( lds_results, lv_sample_values, o_debug_mode, o_main_outfile, o_secondary_outfile,
+															lo_result_stores=None ):
 
 	#Disabled call to update_indiv_list below,
 	#now makes this assignment unneeded.  May
@@ -2805,7 +2867,7 @@ def write_result_sets( lds_results, lv_sample_values, o_debug_mode, o_main_outfi
 	#end if debug mode, init indiv list
 
 	for ds_result in lds_results:
-			write_results( ds_result, o_main_outfile, o_secondary_outfile )
+			write_results( ds_result, o_main_outfile, o_secondary_outfile, lo_result_stores )
 			if o_debug_mode.isSet( DebugMode.MAKE_INDIV_TABLE ):
 				'''
 				2016_11_22, the *indiv.table file is not 
@@ -3044,9 +3106,11 @@ def get_count_estimator_fields():
 	return i_count
 #end get_count_estimator_fields
 
-def write_header_main_table( IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP, o_main_outfile ):
-
-	#write header -- field names for the main output table
+def get_main_table_column_names():
+	'''
+	2026_10_19.  Factored out of def write_header_main_table,
+	so that the summary file accumulator can locate its columns.
+	'''
 
 	ls_estimator_fields=pgout.PGOutputNeEstimator.OUTPUT_FIELDS
 
@@ -3076,7 +3140,14 @@ def write_header_main_table( IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP, o_main_outf
 	2017_06_30.  We add a het calc value to the tsv:
 	'''
 	ls_reported_fields.append( COL_NAME_HET_VALUE )
-	o_main_outfile.write( OUTPUT_DELIMITER.join( MAIN_TABLE_RUN_INFO_COLS + ls_reported_fields  ) + OUTPUT_ENDLINE )
+
+	return MAIN_TABLE_RUN_INFO_COLS + ls_reported_fields
+#end get_main_table_column_names
+
+def write_header_main_table( IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP, o_main_outfile ):
+
+	#write header -- field names for the main output table
+	o_main_outfile.write( OUTPUT_DELIMITER.join( get_main_table_column_names() ) + OUTPUT_ENDLINE )
 
 	return
 #end write_header_main_table
@@ -3326,7 +3397,8 @@ def process_current_set_of_gp_files( llv_args_each_process,
 										o_secondary_outfile,
 										o_total_calls_to_do_estimate,
 										IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP,
-										s_all_interrupt_messages ):
+										s_all_interrupt_messages,
+										lo_result_stores=None ):
 	
 
 	if o_total_calls_to_do_estimate.current_count == 0:
@@ -3406,7 +3478,8 @@ def process_current_set_of_gp_files( llv_args_each_process,
 							lv_sample_value_groupings, 
 							o_debug_mode, 
 							o_main_outfile, 
-							o_secondary_outfile )
+							o_secondary_outfile,
+							lo_result_stores )
 		o_main_outfile.flush()
 		o_secondary_outfile.flush()
 	#end for each batch given by start/end indices
@@ -3453,6 +3526,25 @@ def drive_estimator( *args ):
 	IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP = \
 			set_indices_ne_estimator_output_fields_to_skip()
 
+	o_summary_accumulator=None
+	o_results_database=None
+
+	if main_outfile_is_named_file( o_main_outfile ):
+		if WRITE_SUMMARY_FILE:
+			o_summary_accumulator=pgsum.NeEstimationSummaryAccumulator( \
+												get_main_table_column_names() )
+		#end if we're writing a summary file
+
+		if WRITE_RESULTS_DATABASE:
+			o_results_database=pgdb.NeEstimationDatabaseWriter( \
+									pgdb.get_database_file_name( o_main_outfile.name ),
+									get_main_table_column_names() )
+		#end if we're writing a database
+	#end if the main table is a named file
+
+	lo_result_stores=[ o_store for o_store in [ o_summary_accumulator, o_results_database ] \
+																	if o_store is not None ]
+
 
 	#Was used in call to make indiv table file
 	#currently disabled:
@@ -3507,26 +3599,117 @@ def drive_estimator( *args ):
 	i_bytes_available_virtual_memory=\
 			int( pgut.get_memory_virtual_available()*PERC_AVAIL_RAM_TO_ACCESS )
 	
-	for s_filename in ls_files:
+	'''
+	2026_10_19.  If the estimations raise an exception or are
+	interrupted before the database is closed, def abort closes 
+	its connection and removes the partial file, which lacks the 
+	size of the main table needed to be used in its place.
+	'''
+	try:
+		for s_filename in ls_files:
 
-		i_genepop_file_count+=1
+			i_genepop_file_count+=1
 
-		b_file_can_be_added_to_current_set=\
-				file_can_be_added_to_current_set( s_filename, 
-						o_total_bytes_currently_used_for_gp_objects, 
-						i_total_processes,
-						o_debug_mode,
-						i_bytes_available_virtual_memory )
+			b_file_can_be_added_to_current_set=\
+					file_can_be_added_to_current_set( s_filename, 
+							o_total_bytes_currently_used_for_gp_objects, 
+							i_total_processes,
+							o_debug_mode,
+							i_bytes_available_virtual_memory )
 
-		if b_file_can_be_added_to_current_set:
+			if b_file_can_be_added_to_current_set:
 
-			if VERY_VERBOSE:
-				print( "in pgdriveneestimator, def drive_estimator, processing file, " \
-									+ s_filename + "." )
-				print( "making genepop file index" )
-			#end if VERY_VERBOSE
+				if VERY_VERBOSE:
+					print( "in pgdriveneestimator, def drive_estimator, processing file, " \
+										+ s_filename + "." )
+					print( "making genepop file index" )
+				#end if VERY_VERBOSE
+
+				add_file_to_current_set( \
+								s_filename=s_filename,
+								i_min_pop_range=i_min_pop_range,
+								i_max_pop_range=i_max_pop_range,
+								i_min_pop_size=i_min_pop_size,
+								i_max_pop_size=i_max_pop_size,
+								s_sample_scheme=s_sample_scheme, 
+								lv_sample_values=lv_sample_values, 
+								i_total_replicates=i_total_replicates,
+								s_loci_sampling_scheme=s_loci_sampling_scheme,
+								v_loci_sampling_scheme_param=v_loci_sampling_scheme_param,
+								i_min_loci_position=i_min_loci_position,
+								i_max_loci_position=i_max_loci_position,
+								i_min_total_loci=i_min_total_loci,
+								i_max_total_loci=i_max_total_loci,
+								i_loci_replicates=i_loci_replicates,
+								llv_args_each_process=llv_args_each_process,
+								b_do_nb_bias_adjustment=b_do_nb_bias_adjustment,
+								f_nbne_ratio=f_nbne_ratio,
+								f_min_allele_freq=f_min_allele_freq,
+								b_monogamy=b_monogamy,
+								s_chromlocifile=s_chromlocifile,
+								i_allele_pairing_scheme=i_allele_pairing_scheme,
+								o_debug_mode=o_debug_mode,
+								IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP=IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP,
+								i_genepop_file_count=i_genepop_file_count,
+								s_temporary_directory=s_temporary_directory,
+								o_secondary_outfile=o_secondary_outfile )
+
+			elif o_total_bytes_currently_used_for_gp_objects.current_count==0 \
+									and ( not b_file_can_be_added_to_current_set ):
+				'''
+				This is the case in which there are no files loaded but the current 
+				file will generate gp objects (with n copies n=total processes under
+				multi processing) too RAM-consuming to process.  We throw an error and
+				let the user know.
+				'''
+				raise_exception_file_size_limit( s_filename, o_debug_mode, i_total_processes )
+			else:
 
-			add_file_to_current_set( \
+				if len( llv_args_each_process ) > 0:
+				
+					s_all_interrupt_messages =\
+									process_current_set_of_gp_files( \
+											llv_args_each_process=llv_args_each_process, 
+											s_filename=s_filename,
+											o_debug_mode=o_debug_mode,
+											i_total_processes=i_total_processes,
+											o_multiprocessing_event=o_multiprocessing_event,
+											s_sample_scheme=s_sample_scheme,
+											lv_sample_values=lv_sample_values,
+											o_main_outfile=o_main_outfile, 
+											o_secondary_outfile=o_secondary_outfile,
+											o_total_calls_to_do_estimate=o_total_calls_to_do_estimate,
+											IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP=IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP, 
+											s_all_interrupt_messages=s_all_interrupt_messages,
+											lo_result_stores=lo_result_stores )
+
+				#end if we have at least one set of args for estimation
+
+				'''
+				Since the current file in our list could not be added to the call set before
+				doing a round of estimates, we now reset out byte count to zero and emtpy
+				our call-set list, then add the current file as the first for the next round:
+				'''
+
+				llv_args_each_process=[]
+
+				o_total_bytes_currently_used_for_gp_objects.resetCounterToValue(0)
+
+				b_can_add_this_as_first_in_new_file_batch=\
+								file_can_be_added_to_current_set( s_filename, 
+													o_total_bytes_currently_used_for_gp_objects, 
+													i_total_processes,
+													o_debug_mode, 
+													i_bytes_available_virtual_memory )
+
+				if not b_can_add_this_as_first_in_new_file_batch:
+					'''
+					As noted above, if this file alone (since we've just processed and zeroed out
+					our total gp files loaded) is too large to process we need to raise an exception:
+					'''
+					raise_exception_file_size_limit( s_filename, o_debug_mode, i_total_processes )
+				else:
+					add_file_to_current_set(  \
 							s_filename=s_filename,
 							i_min_pop_range=i_min_pop_range,
 							i_max_pop_range=i_max_pop_range,
@@ -3554,175 +3737,121 @@ def drive_estimator( *args ):
 							i_genepop_file_count=i_genepop_file_count,
 							s_temporary_directory=s_temporary_directory,
 							o_secondary_outfile=o_secondary_outfile )
+				#end if our file on its own is still too big
 
-		elif o_total_bytes_currently_used_for_gp_objects.current_count==0 \
-								and ( not b_file_can_be_added_to_current_set ):
-			'''
-			This is the case in which there are no files loaded but the current 
-			file will generate gp objects (with n copies n=total processes under
-			multi processing) too RAM-consuming to process.  We throw an error and
-			let the user know.
-			'''
-			raise_exception_file_size_limit( s_filename, o_debug_mode, i_total_processes )
-		else:
-
-			if len( llv_args_each_process ) > 0:
-				
-				s_all_interrupt_messages =\
-								process_current_set_of_gp_files( \
-										llv_args_each_process=llv_args_each_process, 
-										s_filename=s_filename,
-										o_debug_mode=o_debug_mode,
-										i_total_processes=i_total_processes,
-										o_multiprocessing_event=o_multiprocessing_event,
-										s_sample_scheme=s_sample_scheme,
-										lv_sample_values=lv_sample_values,
-										o_main_outfile=o_main_outfile, 
-										o_secondary_outfile=o_secondary_outfile,
-										o_total_calls_to_do_estimate=o_total_calls_to_do_estimate,
-										IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP=IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP, 
-										s_all_interrupt_messages=s_all_interrupt_messages )
-
-			#end if we have at least one set of args for estimation
-
-			'''
-			Since the current file in our list could not be added to the call set before
-			doing a round of estimates, we now reset out byte count to zero and emtpy
-			our call-set list, then add the current file as the first for the next round:
-			'''
-
-			llv_args_each_process=[]
-
-			o_total_bytes_currently_used_for_gp_objects.resetCounterToValue(0)
-
-			b_can_add_this_as_first_in_new_file_batch=\
-							file_can_be_added_to_current_set( s_filename, 
-												o_total_bytes_currently_used_for_gp_objects, 
-												i_total_processes,
-												o_debug_mode, 
-												i_bytes_available_virtual_memory )
-
-			if not b_can_add_this_as_first_in_new_file_batch:
-				'''
-				As noted above, if this file alone (since we've just processed and zeroed out
-				our total gp files loaded) is too large to process we need to raise an exception:
-				'''
-				raise_exception_file_size_limit( s_filename, o_debug_mode, i_total_processes )
-			else:
-				add_file_to_current_set(  \
-						s_filename=s_filename,
-						i_min_pop_range=i_min_pop_range,
-						i_max_pop_range=i_max_pop_range,
-						i_min_pop_size=i_min_pop_size,
-						i_max_pop_size=i_max_pop_size,
-						s_sample_scheme=s_sample_scheme, 
-						lv_sample_values=lv_sample_values, 
-						i_total_replicates=i_total_replicates,
-						s_loci_sampling_scheme=s_loci_sampling_scheme,
-						v_loci_sampling_scheme_param=v_loci_sampling_scheme_param,
-						i_min_loci_position=i_min_loci_position,
-						i_max_loci_position=i_max_loci_position,
-						i_min_total_loci=i_min_total_loci,
-						i_max_total_loci=i_max_total_loci,
-						i_loci_replicates=i_loci_replicates,
-						llv_args_each_process=llv_args_each_process,
-						b_do_nb_bias_adjustment=b_do_nb_bias_adjustment,
-						f_nbne_ratio=f_nbne_ratio,
-						f_min_allele_freq=f_min_allele_freq,
-						b_monogamy=b_monogamy,
-						s_chromlocifile=s_chromlocifile,
-						i_allele_pairing_scheme=i_allele_pairing_scheme,
-						o_debug_mode=o_debug_mode,
-						IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP=IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP,
-						i_genepop_file_count=i_genepop_file_count,
-						s_temporary_directory=s_temporary_directory,
-						o_secondary_outfile=o_secondary_outfile )
-			#end if our file on its own is still too big
-
-		#end if we can add this file to our current call set else if 
-		#no other files processed but this one too big, 
-		#else we don't add the file to the current set, but we
-		#do estimates on the current set, then add the current to 
-		#the next set
+			#end if we can add this file to our current call set else if 
+			#no other files processed but this one too big, 
+			#else we don't add the file to the current set, but we
+			#do estimates on the current set, then add the current to 
+			#the next set
 							
-	#end for each genepop file, if add-able to set, add to set
-	#else if too big opn its own, throw an exception, 
-	#else do estimates on the current set, then add the current file
-	#as the first in a new setr 
+		#end for each genepop file, if add-able to set, add to set
+		#else if too big opn its own, throw an exception, 
+		#else do estimates on the current set, then add the current file
+		#as the first in a new setr 
 
-	'''
-	As expected, after a loop that processes based on batches, 
-	if we handled the last genepop file by adding it to the
-	current set of calls to do_estimate, then we still need to do 
-	estimations on this last batch of calls:
-	'''
-	if len( llv_args_each_process ) > 0:
-		s_all_interrupt_messages =\
-						process_current_set_of_gp_files( \
-										llv_args_each_process=llv_args_each_process, 
-										s_filename=s_filename,
-										o_debug_mode=o_debug_mode,
-										i_total_processes=i_total_processes,
-										o_multiprocessing_event=o_multiprocessing_event,
-										s_sample_scheme=s_sample_scheme,
-										lv_sample_values=lv_sample_values,
-										o_main_outfile=o_main_outfile, 
-										o_secondary_outfile=o_secondary_outfile,
-										o_total_calls_to_do_estimate=o_total_calls_to_do_estimate,
-										IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP=IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP, 
-										s_all_interrupt_messages=s_all_interrupt_messages )
-	#end if we have at least one call to make
+		'''
+		As expected, after a loop that processes based on batches, 
+		if we handled the last genepop file by adding it to the
+		current set of calls to do_estimate, then we still need to do 
+		estimations on this last batch of calls:
+		'''
+		if len( llv_args_each_process ) > 0:
+			s_all_interrupt_messages =\
+							process_current_set_of_gp_files( \
+											llv_args_each_process=llv_args_each_process, 
+											s_filename=s_filename,
+											o_debug_mode=o_debug_mode,
+											i_total_processes=i_total_processes,
+											o_multiprocessing_event=o_multiprocessing_event,
+											s_sample_scheme=s_sample_scheme,
+											lv_sample_values=lv_sample_values,
+											o_main_outfile=o_main_outfile, 
+											o_secondary_outfile=o_secondary_outfile,
+											o_total_calls_to_do_estimate=o_total_calls_to_do_estimate,
+											IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP=IDX_NE_ESTIMATOR_OUTPUT_FIELDS_TO_SKIP, 
+											s_all_interrupt_messages=s_all_interrupt_messages,
+											lo_result_stores=lo_result_stores )
+		#end if we have at least one call to make
 
 	
-	if o_total_calls_to_do_estimate.current_count == 0:
-		s_msg="Warning:  no calls were made to NeEstimator. " \
-					+ "Sampling parameters likely filtered out all pop sections."
+		if o_total_calls_to_do_estimate.current_count == 0:
+			s_msg="Warning:  no calls were made to NeEstimator. " \
+						+ "Sampling parameters likely filtered out all pop sections."
 		
-		o_secondary_outfile.write( s_msg + "\n" )
+			o_secondary_outfile.write( s_msg + "\n" )
 
-		s_info_msg=s_msg + "Please check the output file *.msgs for details.\n"
-		sys.stderr.write( s_info_msg  )
+			s_info_msg=s_msg + "Please check the output file *.msgs for details.\n"
+			sys.stderr.write( s_info_msg  )
 
-		if ACTIVATE_GUI_MESSAGING:
-			GUIINFO( None , s_info_msg )
-		#end if using gui messaging
-	#end if no calls were made
+			if ACTIVATE_GUI_MESSAGING:
+				GUIINFO( None , s_info_msg )
+			#end if using gui messaging
+		#end if no calls were made
 
 	
-	if s_all_interrupt_messages is not None:
+		if s_all_interrupt_messages is not None:
 
-		'''
-		When we throw error below, the calling def in pgutilities 
-		(run_driveneestimator_in_new_process) will set the multiprocessing 
-		event, which will then result in the outfiles being deleted by
-		the GUI cleanup op. Thus we save a "interrupted" version
-		of the output, not recognized by the GUI as needing to be 
-		deleted.
-		'''
-		for o_outfile in [ o_main_outfile, o_secondary_outfile ]:
-			if not o_outfile.closed:
-				o_outfile.write( s_interrupt_msg + "\n" )
-				o_outfile.close()
-			#end if not closed
-			s_name_this_file=o_outfile.name
-			pgut.do_shutil_copy( s_name_this_file, s_name_this_file + ".interrupted" )
-		#end for each outfile, copy it as interrupted version
-
-		if o_multiprocessing_event is not None:
-			o_multiprocessing_event.set()
-		#end if we have multi processing event
-
-		s_msg="In pgdriveneestimator.py, def execute_ne_for_each_sample, " \
-					+ "multiprocessing pool timed out.\nResult output files " \
-					+ "have been saved with tag, \"interrupted,\"" \
-					+ "\nand may be empty or truncated."
-		raise Exception( s_msg )
-	#end if the estimations were interrupted (see def execute_ne_for_each_sample). 
+			'''
+			When we throw error below, the calling def in pgutilities 
+			(run_driveneestimator_in_new_process) will set the multiprocessing 
+			event, which will then result in the outfiles being deleted by
+			the GUI cleanup op. Thus we save a "interrupted" version
+			of the output, not recognized by the GUI as needing to be 
+			deleted.
+			'''
+			for o_outfile in [ o_main_outfile, o_secondary_outfile ]:
+				if not o_outfile.closed:
+					o_outfile.write( s_interrupt_msg + "\n" )
+					o_outfile.close()
+				#end if not closed
+				s_name_this_file=o_outfile.name
+				pgut.do_shutil_copy( s_name_this_file, s_name_this_file + ".interrupted" )
+			#end for each outfile, copy it as interrupted version
+
+			if o_multiprocessing_event is not None:
+				o_multiprocessing_event.set()
+			#end if we have multi processing event
+
+			s_msg="In pgdriveneestimator.py, def execute_ne_for_each_sample, " \
+						+ "multiprocessing pool timed out.\nResult output files " \
+						+ "have been saved with tag, \"interrupted,\"" \
+						+ "\nand may be empty or truncated."
+			raise Exception( s_msg )
+		#end if the estimations were interrupted (see def execute_ne_for_each_sample). 
+
+		if len( lo_result_stores ) > 0:
+			o_main_outfile.flush()
+			i_main_table_bytes=os.path.getsize( o_main_outfile.name )
+		#end if we need the main table size
+
+		if o_summary_accumulator is not None:
+			o_summary_accumulator.writeFile( pgsum.get_summary_file_name( o_main_outfile.name ),
+																	i_main_table_bytes )
+		#end if we're writing a summary file
+
+		if o_results_database is not None:
+			o_results_database.close( i_main_table_bytes )
+		#end if we're writing a database
+	finally:
+		if o_results_database is not None:
+			o_results_database.abort()
+		#end if we're writing a database
+	#end try...finally
 
 	return 
 
 #end drive_estimator
 
+def main_outfile_is_named_file( o_main_outfile ):
+	'''
+	2026_10_19.  False when the main table goes to stdout 
+	or another stream without a file name.
+	'''
+	s_name=getattr( o_main_outfile, "name", None )
+	return type( s_name ) == str and os.path.isfile( s_name )
+#end main_outfile_is_named_file
+
 def set_mod_level_var_to_ldne2_executable_path():
 
 	b_found = False
@@ -279,6 +279,25 @@ def get_input_object( s_config_file,
 
 	o_input_manager.resetInputParamValues()
 
+	'''
+	2026_10_19.  Python callers (see asnviz/SimBatchRun.py) can
+	now pass a list of ( param name, value ) pairs, using the param
+	names in class SimInputParamValueHolder, to reset parameters
+	that have no argument of their own (ex: "lbd", "startAlleles").
+	The console still passes None.
+	'''
+	if lv_value_list is not None:
+		try:
+			o_list_value_holder=SimInputParamValueHolder( **dict( lv_value_list ) )
+		except TypeError as ote:
+			s_msg="In pgdrivesimulation.py, def get_input_object, " \
+						+ "the value list, " + str( lv_value_list ) \
+						+ ", has a parameter name unknown to " \
+						+ "class SimInputParamValueHolder: " + str( ote )
+			raise Exception( s_msg )
+		#end try...except
+
+		SimInputParamResetManager( o_simInput, o_list_value_holder ).resetInputParamValues()
 	#end if value list is not None
 
 	return o_simInput
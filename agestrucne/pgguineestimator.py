@@ -63,6 +63,8 @@ import agestrucne.pgguiapp as pgg
 import agestrucne.pgutilities as pgut
 import agestrucne.pgparamset as pgps
 import agestrucne.pgdriveneestimator as pgdn
+import agestrucne.pgneestimationsummaryfile as pgsum
+import agestrucne.pgneestimationdatabase as pgdb
 '''
 2017_03_27.  Used by def __create_temporary_directory_name()
 to get a uniq name for the directory.
@@ -303,7 +305,11 @@ class PGGuiNeEstimator( pgg.PGGuiApp ):
 		ls_output_file_names=[ s_output_base_with_path + "." \
 				+ pgut.NE_ESTIMATION_MAIN_TABLE_FILE_EXT, 
 				s_output_base_with_path + "." \
-				+ pgut.NE_ESTIMATION_SECONDARY_OUTPUT_FILE_EXT ]
+				+ pgut.NE_ESTIMATION_SECONDARY_OUTPUT_FILE_EXT,
+				pgsum.get_summary_file_name( s_output_base_with_path + "." \
+				+ pgut.NE_ESTIMATION_MAIN_TABLE_FILE_EXT ),
+				pgdb.get_database_file_name( s_output_base_with_path + "." \
+				+ pgut.NE_ESTIMATION_MAIN_TABLE_FILE_EXT ) ]
 
 		#If the output files exist, collect their names
 		#for return value list.
@@ -499,6 +505,8 @@ class PGGuiNeEstimator( pgg.PGGuiApp ):
 		MSG_NAME_TOO_LONG=": file name cannot exceed " \
 					+ str( MAX_GENEPOP_FILE_NAME_LENGTH ) \
 					+ " characters."
+		MSG_COMPRESSED_NO_INDEX=": compressed file without a matching " \
+					+ "block index (decompress the file before loading it)."
 		ls_bad_filenames=[]
 		s_genepopfiles=self.__genepopfiles.get()	
 		
@@ -512,6 +520,8 @@ class PGGuiNeEstimator( pgg.PGGuiApp ):
 			elif len( s_basename )\
 					> MAX_GENEPOP_FILE_NAME_LENGTH:
 				ls_bad_filenames.append( s_basename + MSG_NAME_TOO_LONG )
+			elif pgdn.gpb.is_unreadable_compressed_genepop_file( s_file ):
+				ls_bad_filenames.append( s_basename + MSG_COMPRESSED_NO_INDEX )
 			#end if bad filename
 		#end for each file
 	
@@ -834,7 +844,9 @@ class PGGuiNeEstimator( pgg.PGGuiApp ):
 							self.__output_directory.get() \
 									+ "/" \
 									+ self.output_base_name,
-							self.__temporary_directory_for_estimator ) )
+							self.__temporary_directory_for_estimator ),
+					kwargs={ "b_write_results_database":self.__writedatabase,
+								"b_write_summary_file":self.__writesummary } )
 
 		self.__op_process.start()
 		self.__set_controls_by_run_state( self.__get_run_state() )
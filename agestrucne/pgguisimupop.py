@@ -21,6 +21,15 @@ INIT_ENTRY_CONFIG_FILE=()
 
 SIM_RUNNING_MSG="Simulation in progress"
 
+'''
+2026_10_19.  While a simulation runs, we plot the pwop Nb 
+values that this replicate writes to its *_nb_values_calc_by_gen.tsv
+file each cycle (see def __add_nb_progress_plot).
+'''
+NB_PROGRESS_PLOT_REPLICATE=1
+NB_PROGRESS_PLOT_WIDTH=5.0
+NB_PROGRESS_PLOT_HEIGHT=2.4
+
 if DO_PUDB:
 	from pudb import set_trace; set_trace()
 #end if debug
@@ -46,6 +55,7 @@ from agestrucne.pgutilityclasses import ValueValidator
 
 import agestrucne.pgutilities as pgut
 import agestrucne.pgparallelopmanager as pgpar
+from agestrucne.pgplottingframe import PGPlottingFrame2DLines
 '''
 2018_07_27.  We use a static method in this class
 to check whether a user-supplied loci info file
@@ -250,6 +260,9 @@ class PGGuiSimuPop( pgg.PGGuiApp ):
 		#boxes via param name.
 		self.__param_key_value_frames=None
 
+		#Made in def __init_interface when a simulation
+		#is in progress:
+		self.__nb_progress_plot=None
 
 		self.__run_state_message=""
 		self.__init_interface()
@@ -416,6 +429,13 @@ class PGGuiSimuPop( pgg.PGGuiApp ):
 
 		self.__outbase_kv.grid( row=i_row, sticky=( NW ) )
 
+		self.__remove_nb_progress_plot()
+
+		if self.__simulation_is_in_progress:
+			i_row+=1
+			self.__add_nb_progress_plot( o_file_locations_subframe, i_row )
+		#end if sim running, show its Nb values
+
 		o_file_locations_subframe.grid( row=0, sticky=(NW) )
 		o_file_locations_subframe.grid_columnconfigure( 0, weight=1 )
 		o_file_locations_subframe.grid_rowconfigure( 0, weight=1 )
@@ -426,6 +446,53 @@ class PGGuiSimuPop( pgg.PGGuiApp ):
 		return
 	#end __init_interface
 
+	def __get_nb_progress_file_name( self ):
+		'''
+		The replicate's output file of pwop Nb values,
+		named as in pgparallelopmanager def 
+		do_pgopsimupop_replicate_from_files and
+		pgopsimupop def prepareOp.
+		'''
+		s_nb_values_ext=pgout.PGOutputSimuPop.DICT_OUTPUT_FILE_EXTENSIONS[ "sim_nb_estimates" ]
+
+		s_file_name=self.__output.basename \
+						+ pgut.SIMULATION_OUTPUT_FILE_REPLICATE_TAG \
+						+ str( NB_PROGRESS_PLOT_REPLICATE ) \
+						+ s_nb_values_ext
+		return s_file_name
+	#end __get_nb_progress_file_name
+
+	def __add_nb_progress_plot( self, o_master_frame, i_row ):
+		'''
+		The plotting frame's animation rereads the file each tick,
+		reading only the lines appended since the last tick. 
+		The file need not exist yet.  With incremental rendering
+		the line is updated and blitted rather than replotted.
+		'''
+		self.__nb_progress_plot=PGPlottingFrame2DLines( o_master_frame=o_master_frame,
+										b_do_animate=True,
+										f_figure_width=NB_PROGRESS_PLOT_WIDTH,
+										f_figure_height=NB_PROGRESS_PLOT_HEIGHT,
+										s_xlabel="cycle",
+										s_ylabel="pwop Nb, replicate " \
+												+ str( NB_PROGRESS_PLOT_REPLICATE ),
+										s_data_file=self.__get_nb_progress_file_name(),
+										i_col_num_x_values=1,
+										i_col_num_y_values=2,
+										b_incremental_rendering=True )
+
+		self.__nb_progress_plot.grid( row=i_row, sticky=( NW ) )
+		return
+	#end __add_nb_progress_plot
+
+	def __remove_nb_progress_plot( self ):
+		if self.__nb_progress_plot is not None:
+			self.__nb_progress_plot.destroy()
+			self.__nb_progress_plot=None
+		#end if we have a plot
+		return
+	#end __remove_nb_progress_plot
+
 	def __clear_grid_below_row(self, o_frame, i_row ):
 
 		for o_item in o_frame.grid_slaves():
@@ -1803,6 +1870,7 @@ class PGGuiSimuPop( pgg.PGGuiApp ):
 	def cleanup( self ):
 		self.__cancel_simulation()
 		self.__remove_temporary_config_file()
+		self.__remove_nb_progress_plot()
 	#end cleanup
 
 	def __create_validity_checker( self, v_init_value, s_validity_expression ):
@@ -84,6 +84,7 @@ from agestrucne.pgguiutilities import PGGUIMessageWaitForResultsAndActionOnCance
 from agestrucne.pgutilityclasses import ValueValidator
 
 from agestrucne.pglineregressconfigfilemaker import PGLineRegressConfigFileMaker
+from agestrucne.pgneestimationsummaryfile import NeEstimationSummaryFile
 
 class PGGuiViz( pgg.PGGuiApp ):
 	'''
@@ -1331,9 +1332,22 @@ class PGGuiViz( pgg.PGGuiApp ):
 		since, if the tsv file is large, the
 		GUI could be blocked for a comparatively
 		long time.
+
+		2026_10_19.  If the tsv file has a current summary
+		file, written by pgdriveneestimator, we get the values 
+		from it instead, without loading the tsv file.
 		'''
 
-		self.__get_subsample_values_lists_from_tsv_file_using_separate_process()
+		o_summary_file=NeEstimationSummaryFile( self.__tsv_file.get() )
+
+		if o_summary_file.is_current:
+			self.__pop_subsample_values=o_summary_file.getDistinctValues( "sample_value" )
+			self.__loci_subsample_values=o_summary_file.getDistinctValues( "loci_sample_value" )
+			self.__pop_subsample_values.sort()
+			self.__loci_subsample_values.sort()
+		else:
+			self.__get_subsample_values_lists_from_tsv_file_using_separate_process()
+		#end if we have a current summary, else use the tsv file
 
 		return
 
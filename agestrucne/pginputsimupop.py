@@ -46,6 +46,55 @@ it before use:
 VALID_TOLERANCE_TRIES=[ "100", "1000", "10000" ]
 DEFAULT_TOLERANCE_TRIES="1000"
 
+'''
+2026_10_19. The new parameter "tolerance_mode" selects how
+PGOpSimuPop gets a cycle whose PWoP Nb is inside the tolerance.
+"regenerate" (the default) redraws all of the cycle's pairs
+on each try.  "incremental" keeps the pairs and replaces
+one at a time, accepting replacements that move the Nb
+toward the target (see PGOpSimuPop, def __restrictedGenerator).
+'''
+VALID_TOLERANCE_MODES=[ "regenerate", "incremental" ]
+DEFAULT_TOLERANCE_MODE="regenerate"
+
+'''
+2026_10_19. The new parameter "burnin_snapshot_dir", if not
+"None", names a directory in which PGOpSimuPop saves the 
+population at the end of the burn-in cycles, and from which
+later runs with the same pre-burn-in parameters (ex: other
+replicates) load it instead of repeating the burn-in (see
+PGOpSimuPop, def __setBurnInSnapshotFile).
+'''
+NO_BURNIN_SNAPSHOT_DIR="None"
+
+'''
+2026_10_19. The new parameter "genepop_loci_ranges", if not
+"None", is a comma-delimited list of one-based, inclusive
+loci ranges, "m-n", for each of which PGOpSimuPop writes a
+genepop file with only those loci, (ex: the microsats only, 
+or the SNPs only), alongside the full genepop file (see def 
+makeGenepopLociRangesList).
+'''
+NO_GENEPOP_LOCI_RANGES="None"
+GENEPOP_LOCI_RANGES_DELIMITER=","
+GENEPOP_LOCI_RANGE_FIRST_LAST_DELIMITER="-"
+
+'''
+2026_10_19. The new parameters "compress_output", 
+"compression_codec", "compression_level" and 
+"compression_processes" set how PGOpSimuPop compresses
+its output files (see module pgparallelcompressor.py).
+As for "tolerance_tries", the level is stored as a string,
+for the GUI combobox, "None" giving the codec's default.
+Our client converts it with def makeCompressionLevel.
+'''
+VALID_COMPRESSION_CODECS=[ "bz2", "gzip", "lzma" ]
+DEFAULT_COMPRESSION_CODEC="bz2"
+DEFAULT_COMPRESSION_LEVEL="None"
+VALID_COMPRESSION_LEVELS=[ DEFAULT_COMPRESSION_LEVEL ] \
+							+ [ str( i_level ) for i_level in range( 1, 10 ) ]
+DEFAULT_COMPRESSION_PROCESSES=1
+
 '''
 2018_05_17. New parameter gives a value for simuPOP's
 Recombinators "intensity" parameter.  We default to
@@ -258,6 +307,79 @@ class PGInputSimuPop( object ):
 
 		return  lf_rates
 	#end makePerCycleNbAdjustmentList
+
+	def makeGenepopLociRangesList( self ):
+		'''
+		2026_10_19. Converts the genepop_loci_ranges string, ex:
+		"1-100,101-10100", into a list of ( first, last ) int tuples,
+		as expected by PGOpSimuPop's lt_genepop_loci_ranges param.
+		Returns None if the value is NO_GENEPOP_LOCI_RANGES.  Checks
+		against the total loci are left to the PGOutputSimuPop object
+		(def openGenepopTee), since with a loci file the totals are
+		not given by numMSats and numSNPs.
+		'''
+		lt_ranges=None
+
+		s_ranges=self.genepop_loci_ranges
+
+		if s_ranges is None \
+				or s_ranges.strip().lower() == NO_GENEPOP_LOCI_RANGES.lower():
+			return lt_ranges
+		#end if no ranges
+
+		lt_ranges=[]
+
+		for s_range in s_ranges.split( GENEPOP_LOCI_RANGES_DELIMITER ):
+
+			ls_first_last=s_range.strip().split( GENEPOP_LOCI_RANGE_FIRST_LAST_DELIMITER )
+
+			try:
+				if len( ls_first_last ) != 2:
+					raise ValueError( "expecting two numbers separated by \"" \
+									+ GENEPOP_LOCI_RANGE_FIRST_LAST_DELIMITER + "\"" )
+				#end if not a pair
+
+				i_first=int( ls_first_last[ 0 ] )
+				i_last=int( ls_first_last[ 1 ] )
+			except ValueError as ove:
+				s_msg="In PGInputSimuPop instance, def makeGenepopLociRangesList, " \
+							+ "the genepop_loci_ranges entry, " + s_range \
+							+ ", is not of the form m-n: " + str( ove ) + "."
+				raise Exception( s_msg )
+			#end try...except
+
+			if i_first < 1 or i_first > i_last:
+				s_msg="In PGInputSimuPop instance, def makeGenepopLociRangesList, " \
+							+ "the genepop_loci_ranges entry, " + s_range \
+							+ ", must have 1 <= m <= n."
+				raise Exception( s_msg )
+			#end if invalid range
+
+			lt_ranges.append( ( i_first, i_last ) )
+		#end for each range
+
+		return lt_ranges
+	#end makeGenepopLociRangesList
+
+	def makeCompressionLevel( self ):
+		'''
+		2026_10_19. Converts the compression_level string into
+		the int expected by PGOpSimuPop's i_compression_level
+		param, or None, for the codec's default.
+		'''
+		s_level=str( self.compression_level ).strip()
+
+		if s_level not in VALID_COMPRESSION_LEVELS:
+			s_msg="In PGInputSimuPop instance, def makeCompressionLevel, " \
+						+ "the compression_level, " + s_level \
+						+ ", is not one of " + ", ".join( VALID_COMPRESSION_LEVELS ) + "."
+			raise Exception( s_msg )
+		#end if invalid level
+
+		i_level=None if s_level == DEFAULT_COMPRESSION_LEVEL else int( s_level )
+
+		return i_level
+	#end makeCompressionLevel
 			
 	def __get_effective_size_info_if_avail( self ):
 
@@ -493,6 +615,91 @@ class PGInputSimuPop( object ):
 
 		self.__update_attribute_config_file_info( "tolerance_tries", "sim", "tolerance_tries" )
 
+		if config.has_option( "sim", "tolerance_mode" ):
+			self.tolerance_mode=config.get( "sim", "tolerance_mode" )
+
+			if self.tolerance_mode not in VALID_TOLERANCE_MODES:
+				s_msg="In PGInputSimuPop instance, def __get_config, " \
+							+ "the configuration file's value for tolerance_mode, " \
+							+ self.tolerance_mode + ", " \
+							+ "is not one of " \
+							+ ", ".join( VALID_TOLERANCE_MODES ) + "."
+				raise Exception( s_msg )
+			#end if invalid mode
+		else:
+			self.tolerance_mode=DEFAULT_TOLERANCE_MODE
+		#end if we have a value for tolerance mode
+
+		self.__update_attribute_config_file_info( "tolerance_mode", "sim", "tolerance_mode" )
+
+		if config.has_option( "sim", "burnin_snapshot_dir" ):
+			self.burnin_snapshot_dir=config.get( "sim", "burnin_snapshot_dir" )
+		else:
+			self.burnin_snapshot_dir=NO_BURNIN_SNAPSHOT_DIR
+		#end if we have a burn-in snapshot directory
+
+		self.__update_attribute_config_file_info( "burnin_snapshot_dir", "sim", "burnin_snapshot_dir" )
+
+		'''
+		2026_10_19.  When True, the genepop file is compressed as a 
+		block-compressed genepop file, with an index, which the Ne 
+		estimation can read without decompressing it (see module 
+		genepopblockfile.py).
+		'''
+		if config.has_option( "sim", "block_compress_genepop" ):
+			self.block_compress_genepop=config.getboolean( "sim", "block_compress_genepop" )
+		else:
+			self.block_compress_genepop=False
+		#end if we have a block compression flag
+
+		self.__update_attribute_config_file_info( "block_compress_genepop", "sim", "block_compress_genepop" )
+
+		if config.has_option( "sim", "genepop_loci_ranges" ):
+			self.genepop_loci_ranges=config.get( "sim", "genepop_loci_ranges" )
+		else:
+			self.genepop_loci_ranges=NO_GENEPOP_LOCI_RANGES
+		#end if we have genepop loci ranges
+
+		self.__update_attribute_config_file_info( "genepop_loci_ranges", "sim", "genepop_loci_ranges" )
+
+		'''
+		2026_10_19.  When compress_output is True, the output files
+		are compressed with the codec, level and total processes
+		(see module pgparallelcompressor.py).  Block compression
+		of the genepop file implies compress_output.
+		'''
+		if config.has_option( "sim", "compress_output" ):
+			self.compress_output=config.getboolean( "sim", "compress_output" )
+		else:
+			self.compress_output=False
+		#end if we have a compress output flag
+
+		self.__update_attribute_config_file_info( "compress_output", "sim", "compress_output" )
+
+		if config.has_option( "sim", "compression_codec" ):
+			self.compression_codec=config.get( "sim", "compression_codec" )
+		else:
+			self.compression_codec=DEFAULT_COMPRESSION_CODEC
+		#end if we have a compression codec
+
+		self.__update_attribute_config_file_info( "compression_codec", "sim", "compression_codec" )
+
+		if config.has_option( "sim", "compression_level" ):
+			self.compression_level=config.get( "sim", "compression_level" )
+		else:
+			self.compression_level=DEFAULT_COMPRESSION_LEVEL
+		#end if we have a compression level
+
+		self.__update_attribute_config_file_info( "compression_level", "sim", "compression_level" )
+
+		if config.has_option( "sim", "compression_processes" ):
+			self.compression_processes=config.getint( "sim", "compression_processes" )
+		else:
+			self.compression_processes=DEFAULT_COMPRESSION_PROCESSES
+		#end if we have a total of compression processes
+
+		self.__update_attribute_config_file_info( "compression_processes", "sim", "compression_processes" )
+
 		self.__update_attribute_config_file_info( "_PGInputSimuPop__Nb_from_pop_section", "pop", "Nb" )
 		self.__update_attribute_config_file_info( "NbVar", "pop", "NbVar" )
 
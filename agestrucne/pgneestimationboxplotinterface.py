@@ -53,6 +53,9 @@ from agestrucne.pgguiutilities import PGGUIInfoMessage
 from agestrucne.pgplottingframe import PGPlottingFrameBoxplotFromFileManager
 from agestrucne.pgframecontainerscrolled import FrameContainerScrolled
 from agestrucne.pgneestimationtablefilemanager import NeEstimationTableFileManager
+from agestrucne.pgneestimationdatabase import is_database_file
+from agestrucne.pgneestimationdatabase import NeEstimationDatabase
+from agestrucne.pgneestimationsummaryfile import NeEstimationSummaryFile
 from agestrucne.pgneestimationtableselectioncombo import PGNeEstTableColumnSelectionCombo
 from agestrucne.pgneestimationtableselectioncombo import PGNeEstTableValueSelectionCombo
 from agestrucne.pgkeyvalueframe import KeyValFrame
@@ -172,6 +175,7 @@ class PGNeEstimationBoxplotInterface( object ):
 		self.__plot_width=i_plot_width
 		self.__plot_height=i_plot_height
 		self.__tsv_file_manager=None
+		self.__summary_file=None
 		self.__plotframe=None
 
 		self.__labels=None
@@ -316,11 +320,21 @@ class PGNeEstimationBoxplotInterface( object ):
 
 		ls_column_names_to_test=o_myc.GROUP_BY_COLUMNS + o_myc.Y_AXIS_VALUE_COLUMNS
 
-		o_tsv=open( s_tsv_file_name, 'r' )
-		s_header=o_tsv.readline()
-		o_tsv.close()
+		'''
+		2026_10_19.  The table can also be given as an
+		SQLite database, as written by pgdriveneestimator.
+		'''
+		if is_database_file( s_tsv_file_name ):
+			o_database=NeEstimationDatabase( s_tsv_file_name )
+			ls_header_fields=o_database.column_names
+			o_database.close()
+		else:
+			o_tsv=open( s_tsv_file_name, 'r' )
+			s_header=o_tsv.readline()
+			o_tsv.close()
 
-		ls_header_fields = s_header.strip().split( o_tsvc.DELIM_TABLE )
+			ls_header_fields = s_header.strip().split( o_tsvc.DELIM_TABLE )
+		#end if database, else tsv file
 
 		for s_name in ls_column_names_to_test:
 
@@ -342,7 +356,13 @@ class PGNeEstimationBoxplotInterface( object ):
 		'''
 		b_return_value=False
 
-		if self.__looks_like_tsv_file( s_file_name ) == True:
+		if is_database_file( s_file_name ):
+			if self.__looks_like_tsv_file( s_file_name ) == True:
+				o_database=NeEstimationDatabase( s_file_name )
+				b_return_value=o_database.total_rows > 0
+				o_database.close()
+			#end if the database has the columns
+		elif self.__looks_like_tsv_file( s_file_name ) == True:
 			o_tsvc=NeEstimationTableFileManager
 
 			o_file=open( s_file_name, 'r' )
@@ -429,6 +449,14 @@ class PGNeEstimationBoxplotInterface( object ):
 		self.__tsv_file_manager=\
 				NeEstimationTableFileManager( self.__tsv_file_name )
 
+		'''
+		2026_10_19.  If pgdriveneestimator wrote a summary
+		file for this tsv file (and the tsv file has not since
+		changed), plots that need only its per-group stats 
+		are drawn from it (see def __get_summary_filters).
+		'''
+		self.__summary_file=NeEstimationSummaryFile( self.__tsv_file_name )
+
 		return
 	#end __make_tsv_file_manager 
 
@@ -809,6 +837,14 @@ class PGNeEstimationBoxplotInterface( object ):
 
 		df_min_max={ "min":None, "max":None }
 
+		if self.__summary_file is not None:
+			df_summary_min_max=self.__summary_file.getValueRange( \
+								self.__comboboxes[ 'select_y_variable' ].current_value )
+			if df_summary_min_max is not None:
+				return df_summary_min_max
+			#end if the summary has the range
+		#end if we have a summary file
+
 		ls_y_values=self.__tsv_file_manager.getUnfilteredTableAsList( b_skip_header=True,
 											ls_exclusive_inclusion_cols=[ \
 														self.__comboboxes[ 'select_y_variable' ].current_value ] )
@@ -910,8 +946,8 @@ class PGNeEstimationBoxplotInterface( object ):
 		filter data, in the update defs in this class, the  filters will also filter out NA's.
 		'''
 
-		self.__tsv_file_manager.setFilter( self.__comboboxes[ 'select_y_variable'].current_value,
-																lambda x : x != "NA" )
+		self.__tsv_file_manager.setNotInSetFilter( self.__comboboxes[ 'select_y_variable'].current_value,
+																[ "NA" ] )
 
 		self.__plotframe=PGPlottingFrameBoxplotFromFileManager( o_master_frame=self.__master_frame,
 																	o_tsv_file_manager=self.__tsv_file_manager,
@@ -927,7 +963,8 @@ class PGNeEstimationBoxplotInterface( object ):
 																	f_figure_height=self.__plot_height,
 																	def_to_convert_labels=self.__convert_labels,
 																	i_labelfontsize=PLOTLABELFONTSIZE,
-																	i_ticklabelsize=TICKLABELFONTSIZE )
+																	i_ticklabelsize=TICKLABELFONTSIZE,
+																	o_summary_file=self.__summary_file )
 		
 		self.__plotframe.grid( row=PGNeEstimationBoxplotInterface.ROW_NUM_PLOT, 
 												column=0, columnspan=o_myc.COLSPAN_PLOT, sticky=( N,W ) )
@@ -1007,7 +1044,7 @@ class PGNeEstimationBoxplotInterface( object ):
 		ls_non_convertable_vals=[ "NA" ]
 
 		for s_name in o_myc.Y_AXIS_VALUE_COLUMNS:
-			self.__tsv_file_manager.setFilter( s_name, lambda x : x not in ls_non_convertable_vals )
+			self.__tsv_file_manager.setNotInSetFilter( s_name, ls_non_convertable_vals )
 		#end for each y-val column variable, reset filter.
 
 		self.__update_y_scales()
@@ -1019,9 +1056,9 @@ class PGNeEstimationBoxplotInterface( object ):
 	def __on_filter_value_combo_change( self, s_column_name, s_val, o_tsv_file  ):
 
 		if s_val == "All":
-			self.__tsv_file_manager.setFilter( s_column_name, lambda x:True )
+			self.__tsv_file_manager.setFilter( s_column_name, None )
 		else:
-			self.__tsv_file_manager.setFilter( s_column_name, lambda x:x==s_val )
+			self.__tsv_file_manager.setEqualsFilter( s_column_name, s_val )
 		#end if All values accepted, else filter
 		
 		if self.__plotframe is not None:
@@ -1033,27 +1070,14 @@ class PGNeEstimationBoxplotInterface( object ):
 
 	def __on_y_scale_change(self, o_event=None ):
 		'''
-		We use the local def instead of a simple lambda
-		because we need to check for nonnumeric value
-		(NA).
+		The range filter excludes the nonnumeric
+		values (NA) as well as those outside the
+		scales' limits.
 		'''
-		def is_valid_y( s_value ):
-			b_valid=False
-			if s_value in ["NA"]:
-				b_valid=False
-			else:
-				f_value=float( s_value )
-				if f_value <= float( self.__scales[ 'y_value_upper'].scale.get() ) \
-						and f_value >= float( self.__scales[ 'y_value_lower' ].scale.get() ):
-					b_valid=True
-				#end if float in range
-			#end if
-			return b_valid
-		#end local def is_valid_y
-
-		self.__tsv_file_manager.setFilter( \
+		self.__tsv_file_manager.setRangeFilter( \
 						self.__comboboxes[ 'select_y_variable' ].current_value, 
-																	is_valid_y )
+						f_min=float( self.__scales[ 'y_value_lower' ].scale.get() ),
+						f_max=float( self.__scales[ 'y_value_upper'].scale.get() ) )
 
 		if self.__plotframe is not None:
 			self.__update_results()
@@ -1107,9 +1131,59 @@ class PGNeEstimationBoxplotInterface( object ):
 		give the user a wait message while the plot
 		updates.  It is not yet implemented.
 		'''
+		self.__plotframe.setSummaryFilters( self.__get_summary_filters() )
 		self.__update_plot()
 	#end __update_results
 
+	def __get_summary_filters( self ):
+		'''
+		2026_10_19.  Returns None if the current filters 
+		require the tsv file manager's data, else a dict,
+		column name to value, of the filter combos' equality 
+		filters, for the summary file to apply.  The summary 
+		can be used only when the y-value scales are at the 
+		data's full range, and only the summary's key columns 
+		are filtered.  (Its def getBoxplotStats checks the group-by
+		columns and y-value column).
+		'''
+		o_myc=PGNeEstimationBoxplotInterface
+
+		if self.__summary_file is None \
+				or not self.__summary_file.is_current \
+				or self.__scales is None:
+			return None
+		#end if no usable summary
+
+		df_min_max=self.__summary_file.getValueRange( \
+							self.__comboboxes[ 'select_y_variable' ].current_value )
+
+		if df_min_max is None:
+			return None
+		#end if the summary can't give the y range
+		
+		if df_min_max[ "min" ] is not None:
+			f_tolerance=float( self.__scales[ 'y_value_lower' ].scale[ 'resolution' ] )
+			f_lower=float( self.__scales[ 'y_value_lower' ].scale.get() )
+			f_upper=float( self.__scales[ 'y_value_upper' ].scale.get() )
+
+			if f_lower > df_min_max[ "min" ] + f_tolerance \
+					or f_upper < df_min_max[ "max" ] - f_tolerance:
+				return None
+			#end if the scales exclude some values
+		#end if there are values
+
+		dv_equals_filters={}
+
+		for s_column_name in o_myc.VALUE_FILTERABLE_COLUMNS:
+			s_value=self.__comboboxes[ "filterable_" + s_column_name ].current_value
+			if s_value != "All":
+				dv_equals_filters[ s_column_name ]=s_value
+			#end if filtered
+		#end for each filterable column
+
+		return dv_equals_filters
+	#end __get_summary_filters
+
 	def __destroy_widgets( self, do_dict_of_widgets ):
 		for s_widget_name in do_dict_of_widgets:
 
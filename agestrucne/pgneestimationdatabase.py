@@ -0,0 +1,446 @@
+'''
+Description
+Classes to write and query an SQLite database of the
+Ne estimation table written by pgdriveneestimator.py.
+The database holds the same rows and (string) values as
+the *tsv file, in one table, indexed on the columns that
+identify an estimate's input (original file, pop,
+sample value, replicate and loci sample value and replicate),
+so that clients can fetch filtered or grouped subsets of
+the rows without reading the whole table.
+'''
+from __future__ import print_function
+
+from builtins import range
+from builtins import object
+
+__filename__ = "pgneestimationdatabase.py"
+__date__ = "20261019"
+
+import os
+import sqlite3
+
+DATABASE_FILE_EXTENSION="sqlite"
+TABLE_NAME="ne_estimates"
+RUN_INFO_TABLE_NAME="run_info"
+RUN_INFO_SOURCE_BYTES="source_bytes"
+
+INDEXED_COLUMNS=[ "original_file", "pop", "sample_value", "replicate_number",
+								"loci_sample_value", "loci_replicate_number" ]
+
+DELIM_TABLE="\t"
+DELIM_GROUPED_FIELD_NAMES="__"
+
+'''
+The first 16 bytes of every SQLite 3 database file.
+'''
+SQLITE_FILE_HEADER=b"SQLite format 3\x00"
+
+def get_database_file_name( s_tsv_file_name ):
+	return s_tsv_file_name + "." + DATABASE_FILE_EXTENSION
+#end get_database_file_name
+
+def is_database_file( s_file_name ):
+	'''
+	True if the file exists and begins with
+	the SQLite database file header.
+	'''
+	if not os.path.isfile( s_file_name ):
+		return False
+	#end if no such file
+
+	o_file=open( s_file_name, 'rb' )
+	try:
+		v_header=o_file.read( len( SQLITE_FILE_HEADER ) )
+	finally:
+		o_file.close()
+	#end try...finally
+
+	return v_header == SQLITE_FILE_HEADER
+#end is_database_file
+
+def quote_name( s_name ):
+	'''
+	Column names like "95ci_low" are not valid
+	unquoted SQL identifiers.
+	'''
+	return '"' + s_name.replace( '"', '""' ) + '"'
+#end quote_name
+
+class NeEstimationDatabaseWriter( object ):
+	'''
+	Writes the Ne estimation table's data lines into a new
+	database.  Lines passed to def addLines are held until
+	there are ROWS_PER_TRANSACTION of them, and then inserted 
+	in a single transaction, so that the cost of a commit is 
+	paid once per batch of rows rather than once per row.  The
+	indexes are made by def close, after the rows are inserted, 
+	since building an index once is cheaper than updating it 
+	row by row.  If the run fails before def close, def abort 
+	closes the connection and removes the partial database.
+	'''
+
+	ROWS_PER_TRANSACTION=5000
+
+	def __init__( self, s_database_file_name, ls_column_names ):
+		'''
+		param s_database_file_name, name of the database file.
+			Any existing file of this name is replaced.
+		param ls_column_names, the column names, in order, of the
+			table whose lines will be passed to def addLines.
+		'''
+		self.__database_file_name=s_database_file_name
+		self.__column_names=list( ls_column_names )
+		self.__pending_rows=[]
+
+		if os.path.exists( s_database_file_name ):
+			os.remove( s_database_file_name )
+		#end if a database exists from an earlier run
+
+		self.__connection=sqlite3.connect( s_database_file_name )
+
+		self.__connection.execute( "CREATE TABLE " + TABLE_NAME + " ( " \
+					+ ", ".join( [ quote_name( s_name ) + " TEXT" \
+								for s_name in self.__column_names ] ) + " )" )
+		self.__connection.execute( "CREATE TABLE " + RUN_INFO_TABLE_NAME \
+											+ " ( name TEXT PRIMARY KEY, value TEXT )" )
+		self.__connection.commit()
+
+		self.__insert_statement="INSERT INTO " + TABLE_NAME + " VALUES ( " \
+						+ ", ".join( [ "?" ] * len( self.__column_names ) ) + " )"
+		return
+	#end __init__
+
+	def addLines( self, s_lines ):
+		'''
+		param s_lines, one or more newline-terminated or newline-delimited
+			data lines of the table.
+		'''
+		i_total_columns=len( self.__column_names )
+
+		for s_line in s_lines.split( "\n" ):
+			if s_line == "":
+				continue
+			#end if empty line
+
+			ls_fields=s_line.split( DELIM_TABLE )
+
+			if len( ls_fields ) != i_total_columns:
+				s_msg="In NeEstimationDatabaseWriter instance, " \
+							+ "def addLines, the line, " + s_line \
+							+ ", has " + str( len( ls_fields ) ) \
+							+ " fields, but the table has " \
+							+ str( i_total_columns ) + " columns."
+				raise Exception( s_msg )
+			#end if wrong number of fields
+
+			self.__pending_rows.append( ls_fields )
+		#end for each line
+
+		if len( self.__pending_rows ) >= NeEstimationDatabaseWriter.ROWS_PER_TRANSACTION:
+			self.commitBatch()
+		#end if we have a full batch
+		return
+	#end addLines
+
+	def commitBatch( self ):
+		'''
+		Inserts the lines added since the last call,
+		in one transaction.
+		'''
+		if len( self.__pending_rows ) > 0:
+			with self.__connection:
+				self.__connection.executemany( self.__insert_statement,
+													self.__pending_rows )
+			#end with transaction
+			self.__pending_rows=[]
+		#end if any rows to insert
+		return
+	#end commitBatch
+
+	def close( self, i_source_bytes=None ):
+		'''
+		Inserts any remaining lines, makes the indexes, and
+		closes the database.
+
+		param i_source_bytes, if not None, the size of the
+			*tsv file written along with the database.  Readers
+			use a database in place of the *tsv file only if the
+			latter's size still matches.
+		'''
+		self.commitBatch()
+
+		with self.__connection:
+			for s_name in INDEXED_COLUMNS:
+				if s_name in self.__column_names:
+					self.__connection.execute( "CREATE INDEX " \
+								+ quote_name( "idx_" + s_name ) \
+								+ " ON " + TABLE_NAME + " ( " + quote_name( s_name ) + " )" )
+				#end if the table has the column
+			#end for each column to index
+
+			if i_source_bytes is not None:
+				self.__connection.execute( "INSERT INTO " + RUN_INFO_TABLE_NAME \
+								+ " VALUES ( ?, ? )",
+								( RUN_INFO_SOURCE_BYTES, str( i_source_bytes ) ) )
+			#end if we have the tsv file size
+		#end with transaction
+
+		self.__connection.close()
+		self.__connection=None
+		return
+	#end close
+
+	def abort( self ):
+		'''
+		Closes the database without committing pending
+		lines, and removes its file.  Does nothing if
+		def close has already been called.
+		'''
+		if self.__connection is None:
+			return
+		#end if already closed
+
+		self.__connection.close()
+		self.__connection=None
+		self.__pending_rows=[]
+
+		if os.path.exists( self.__database_file_name ):
+			os.remove( self.__database_file_name )
+		#end if file exists
+		return
+	#end abort
+
+	@property
+	def database_file_name( self ):
+		return self.__database_file_name
+	#end property database_file_name
+#end class NeEstimationDatabaseWriter
+
+class NeEstimationDatabase( object ):
+	'''
+	Queries a database written by NeEstimationDatabaseWriter.
+	Filters are a dict of column names to the (string) value the
+	column must have, or to a list of values, one of which the 
+	column must have, and are done by the database, using its 
+	indexes.  Rows, and distinct values, are returned in the order 
+	they were written, as in the *tsv file.
+	'''
+
+	def __init__( self, s_database_file_name ):
+
+		if not is_database_file( s_database_file_name ):
+			s_msg="In NeEstimationDatabase instance, " \
+						+ "def __init__, the file, " \
+						+ s_database_file_name + ", " \
+						+ "is not an SQLite database."
+			raise Exception( s_msg )
+		#end if not a database
+
+		self.__database_file_name=s_database_file_name
+		self.__connection=sqlite3.connect( s_database_file_name )
+		self.__column_names=[ t_info[ 1 ] for t_info in \
+					self.__connection.execute( "PRAGMA table_info( " + TABLE_NAME + " )" ) ]
+
+		if len( self.__column_names ) == 0:
+			s_msg="In NeEstimationDatabase instance, " \
+						+ "def __init__, the database, " \
+						+ s_database_file_name + ", " \
+						+ "has no " + TABLE_NAME + " table."
+			raise Exception( s_msg )
+		#end if no table
+		return
+	#end __init__
+
+	def __validate_column_names( self, ls_names ):
+		for s_name in ls_names:
+			if s_name not in self.__column_names:
+				s_msg="In NeEstimationDatabase instance, " \
+							+ "def __validate_column_names, " \
+							+ "the table has no column named, " \
+							+ str( s_name ) + "."
+				raise Exception( s_msg )
+			#end if unknown column
+		#end for each name
+		return
+	#end __validate_column_names
+
+	def __get_where_clause_and_params( self, dv_equals_filters ):
+
+		if dv_equals_filters is None or len( dv_equals_filters ) == 0:
+			return "", []
+		#end if no filters
+
+		ls_names=sorted( dv_equals_filters )
+		self.__validate_column_names( ls_names )
+
+		ls_conditions=[]
+		ls_params=[]
+
+		for s_name in ls_names:
+			v_value=dv_equals_filters[ s_name ]
+			if isinstance( v_value, ( list, tuple, set, frozenset ) ):
+				ls_values=[ str( v_item ) for v_item in v_value ]
+				if len( ls_values ) == 0:
+					#No value can match an empty list:
+					ls_conditions.append( "0" )
+				else:
+					ls_conditions.append( quote_name( s_name ) + " IN ( " \
+								+ ", ".join( [ "?" ] * len( ls_values ) ) + " )" )
+					ls_params+=ls_values
+				#end if empty list, else list of values
+			else:
+				ls_conditions.append( quote_name( s_name ) + " = ?" )
+				ls_params.append( str( v_value ) )
+			#end if list of values, else single value
+		#end for each filtered column
+
+		s_clause=" WHERE " + " AND ".join( ls_conditions )
+		return s_clause, ls_params
+	#end __get_where_clause_and_params
+
+	def getRows( self, ls_column_names=None, dv_equals_filters=None ):
+		'''
+		Returns a list of tuples of strings, one per row passing
+		the filters, with the values in columns ls_column_names
+		(all columns if None).
+		'''
+		ls_column_names=self.__column_names if ls_column_names is None \
+															else ls_column_names
+		self.__validate_column_names( ls_column_names )
+
+		s_where, ls_params=self.__get_where_clause_and_params( dv_equals_filters )
+
+		s_query="SELECT " + ", ".join( [ quote_name( s_name ) for s_name in ls_column_names ] ) \
+						+ " FROM " + TABLE_NAME + s_where + " ORDER BY rowid"
+
+		return self.__connection.execute( s_query, ls_params ).fetchall()
+	#end getRows
+
+	def getDistinctValues( self, s_column_name, dv_equals_filters=None ):
+		'''
+		Returns a list of the values found in the column, in the
+		rows passing the filters, in order of their first appearance
+		in the table, as for NeEstimationTableFileManager, so that
+		clients list them in the same order for either kind of file.
+		'''
+		self.__validate_column_names( [ s_column_name ] )
+
+		s_where, ls_params=self.__get_where_clause_and_params( dv_equals_filters )
+
+		s_query="SELECT " + quote_name( s_column_name ) \
+							+ " FROM " + TABLE_NAME + s_where \
+							+ " GROUP BY " + quote_name( s_column_name ) \
+							+ " ORDER BY MIN( rowid )"
+
+		return [ t_row[ 0 ] for t_row in self.__connection.execute( s_query, ls_params ) ]
+	#end getDistinctValues
+
+	def getGroupedDataLines( self, ls_group_by_column_names,
+										ls_data_column_names,
+										dv_equals_filters=None ):
+		'''
+		As def getGroupedDataLines in NeEstimationTableFileManager,
+		returns a dict whose keys are the group-by columns' values,
+		joined in the order of the sorted column names (or "" if
+		ls_group_by_column_names is None or empty), and whose values
+		are lists of the data columns' values, joined by tabs, for
+		the rows of the group that pass the filters.
+		'''
+		ls_group_by=[] if ls_group_by_column_names is None \
+									else sorted( ls_group_by_column_names )
+		i_total_group_columns=len( ls_group_by )
+
+		dls_grouped_data_lines={}
+
+		for t_row in self.getRows( ls_group_by + list( ls_data_column_names ),
+															dv_equals_filters ):
+
+			s_group_name=DELIM_GROUPED_FIELD_NAMES.join( t_row[ : i_total_group_columns ] )
+			s_data_line=DELIM_TABLE.join( t_row[ i_total_group_columns : ] )
+
+			dls_grouped_data_lines.setdefault( s_group_name, [] ).append( s_data_line )
+		#end for each row
+
+		if i_total_group_columns == 0 and "" not in dls_grouped_data_lines:
+			dls_grouped_data_lines[ "" ]=[]
+		#end if ungrouped, the one group is listed even if empty
+
+		return dls_grouped_data_lines
+	#end getGroupedDataLines
+
+	def writeTable( self, o_open_file, dv_equals_filters=None ):
+		'''
+		Writes the header line and the rows that pass
+		the filters, as in the *tsv file.
+		'''
+		o_open_file.write( DELIM_TABLE.join( self.__column_names ) + "\n" )
+
+		for t_row in self.getRows( None, dv_equals_filters ):
+			o_open_file.write( DELIM_TABLE.join( t_row ) + "\n" )
+		#end for each row
+		return
+	#end writeTable
+
+	def isCurrentFor( self, s_tsv_file_name ):
+		'''
+		True if the database was written along with the given
+		*tsv file, and the file's size has not since changed.
+		'''
+		if not os.path.isfile( s_tsv_file_name ):
+			return False
+		#end if no tsv file
+
+		lt_rows=self.__connection.execute( "SELECT value FROM " + RUN_INFO_TABLE_NAME \
+							+ " WHERE name = ?", ( RUN_INFO_SOURCE_BYTES, ) ).fetchall()
+
+		return len( lt_rows ) == 1 \
+				and lt_rows[ 0 ][ 0 ] == str( os.path.getsize( s_tsv_file_name ) )
+	#end isCurrentFor
+
+	def close( self ):
+		self.__connection.close()
+		return
+	#end close
+
+	@property
+	def column_names( self ):
+		return list( self.__column_names )
+	#end property column_names
+
+	@property
+	def total_rows( self ):
+		return self.__connection.execute( "SELECT COUNT(*) FROM " + TABLE_NAME ).fetchone()[ 0 ]
+	#end property total_rows
+
+	@property
+	def database_file_name( self ):
+		return self.__database_file_name
+	#end property database_file_name
+#end class NeEstimationDatabase
+
+def get_current_database_for_tsv_file( s_tsv_file_name ):
+	'''
+	Returns a NeEstimationDatabase for the database written
+	along with the *tsv file, or None if there is none, or it
+	no longer matches the *tsv file.
+	'''
+	s_database_file_name=get_database_file_name( s_tsv_file_name )
+
+	if not is_database_file( s_database_file_name ):
+		return None
+	#end if no database
+
+	o_database=NeEstimationDatabase( s_database_file_name )
+
+	if not o_database.isCurrentFor( s_tsv_file_name ):
+		o_database.close()
+		return None
+	#end if database is stale
+
+	return o_database
+#end get_current_database_for_tsv_file
+
+if __name__ == "__main__":
+	pass
+#end if main
@@ -51,6 +51,8 @@ from agestrucne.pgguiutilities import PGGUIMessageWaitForResultsAndActionOnCance
 from agestrucne.pgplottingframe import PGPlottingFrameRegressionLinesFromFileManager
 from agestrucne.pgframecontainerscrolled import FrameContainerScrolled
 from agestrucne.pgneestimationtablefilemanager import NeEstimationTableFileManager
+from agestrucne.pgneestimationdatabase import is_database_file
+from agestrucne.pgneestimationdatabase import NeEstimationDatabase
 from agestrucne.pgneestimationtableselectioncombo import PGNeEstTableColumnSelectionCombo
 from agestrucne.pgneestimationtableselectioncombo import PGNeEstTableValueSelectionCombo
 from agestrucne.pgkeyvalueframe import KeyValFrame
@@ -416,11 +418,21 @@ class PGNeEstimationRegressplotInterface( object ):
 
 		ls_column_names_to_test=o_myc.GROUP_BY_COLUMNS + o_myc.Y_AXIS_VALUE_COLUMNS
 
-		o_tsv=open( s_tsv_file_name, 'r' )
-		s_header=o_tsv.readline()
-		o_tsv.close()
+		'''
+		2026_10_19.  The table can also be given as an
+		SQLite database, as written by pgdriveneestimator.
+		'''
+		if is_database_file( s_tsv_file_name ):
+			o_database=NeEstimationDatabase( s_tsv_file_name )
+			ls_header_fields=o_database.column_names
+			o_database.close()
+		else:
+			o_tsv=open( s_tsv_file_name, 'r' )
+			s_header=o_tsv.readline()
+			o_tsv.close()
 
-		ls_header_fields = s_header.strip().split( o_tsvc.DELIM_TABLE )
+			ls_header_fields = s_header.strip().split( o_tsvc.DELIM_TABLE )
+		#end if database, else tsv file
 
 		for s_name in ls_column_names_to_test:
 
@@ -442,7 +454,13 @@ class PGNeEstimationRegressplotInterface( object ):
 		'''
 		b_return_value=False
 
-		if self.__looks_like_tsv_file( s_file_name ) == True:
+		if is_database_file( s_file_name ):
+			if self.__looks_like_tsv_file( s_file_name ) == True:
+				o_database=NeEstimationDatabase( s_file_name )
+				b_return_value=o_database.total_rows > 0
+				o_database.close()
+			#end if the database has the columns
+		elif self.__looks_like_tsv_file( s_file_name ) == True:
 			o_tsvc=NeEstimationTableFileManager
 
 			o_file=open( s_file_name, 'r' )
@@ -894,9 +912,9 @@ class PGNeEstimationRegressplotInterface( object ):
 
 		if self.__min_cycle_number<=self.__max_cycle_number:
 
-			def_range=lambda x: int( x ) >= self.__min_cycle_number \
-										and int( x ) <= self.__max_cycle_number
-			self.__tsv_file_manager.setFilter( 'pop', def_range )
+			self.__tsv_file_manager.setRangeFilter( 'pop', 
+											f_min=self.__min_cycle_number,
+											f_max=self.__max_cycle_number )
 
 		else:
 			s_msg="In PGNeEstimationRegressplotInterface instance, "  \
@@ -1188,8 +1206,8 @@ class PGNeEstimationRegressplotInterface( object ):
 		'''		
 		Note that the x variable "pop" should always be an int, so we set no NA filter for x vals.
 		'''
-		self.__tsv_file_manager.setFilter( self.__comboboxes[ 'select_y_variable' ].current_value, 
-																					lambda x : x != "NA" )	
+		self.__tsv_file_manager.setNotInSetFilter( self.__comboboxes[ 'select_y_variable' ].current_value, 
+																					[ "NA" ] )	
 		self.__plotframe=\
 				PGPlottingFrameRegressionLinesFromFileManager( o_master_frame=self.__subframes[ 'plot' ],
 											o_tsv_file_manager=self.__tsv_file_manager,
@@ -1370,8 +1388,7 @@ class PGNeEstimationRegressplotInterface( object ):
 		ls_non_numeric_values=[ "NA" ]
 
 		for s_name in o_myc.Y_AXIS_VALUE_COLUMNS:
-			self.__tsv_file_manager.setFilter( s_name, 
-							lambda x : x not in ls_non_numeric_values )
+			self.__tsv_file_manager.setNotInSetFilter( s_name, ls_non_numeric_values )
 		#end for each y-val column variable, reset filter.
 
 		self.__update_y_scales()
@@ -1424,9 +1441,9 @@ class PGNeEstimationRegressplotInterface( object ):
 	def __on_filter_value_combo_change( self, s_column_name, s_val, o_tsv_file  ):
 
 		if s_val == "All":
-			self.__tsv_file_manager.setFilter( s_column_name, lambda x:True )
+			self.__tsv_file_manager.setFilter( s_column_name, None )
 		else:
-			self.__tsv_file_manager.setFilter( s_column_name, lambda x:x==s_val )
+			self.__tsv_file_manager.setEqualsFilter( s_column_name, s_val )
 		#end if All values accepted, else filter
 		
 		if self.__plotframe is not None:
@@ -0,0 +1,475 @@
+'''
+Description
+Classes to write and read a summary "sidecar" file for
+an Ne estimation table (the *tsv file) written by
+pgdriveneestimator.py.  For each combination of original
+file, pop, sample value and loci sample value, and for each
+of these columns' subsets (with the omitted columns pooled,
+and given as "*"), the summary has the count, mean, quartiles,
+whisker ends and outliers of the bias-adjusted estimate and
+its CIs.  These are the statistics matplotlib's boxplot draws,
+so that a boxplot grouped and filtered on those columns can
+be drawn from the summary without loading the table.
+'''
+from __future__ import division
+from __future__ import print_function
+
+from builtins import range
+from builtins import object
+
+__filename__ = "pgneestimationsummaryfile.py"
+__date__ = "20261019"
+
+import os
+import numpy
+
+'''
+The table columns whose values identify a summary
+group, and those whose values are summarized.
+'''
+KEY_COLUMNS=[ "original_file", "pop", "sample_value", "loci_sample_value" ]
+VALUE_COLUMNS=[ "ne_est_adj", "95ci_low_adj", "95ci_high_adj" ]
+
+SUMMARY_FILE_EXTENSION="summary"
+POOLED_VALUE="*"
+NA_VALUE="NA"
+DELIM_TABLE="\t"
+DELIM_FLIERS=","
+DELIM_GROUPED_FIELD_NAMES="__"
+SOURCE_BYTES_TAG="##source_bytes"
+
+'''
+Boxplot whiskers extend to the most extreme values
+within this many IQRs of the quartiles, matplotlib's
+default.
+'''
+WHISKER_IQR_MULTIPLE=1.5
+
+STAT_COLUMNS=[ "n", "n_nonfinite", "mean", "min", "q1", "median",
+					"q3", "max", "whislo", "whishi", "fliers" ]
+
+SUMMARY_HEADER=KEY_COLUMNS + [ "value_column" ] + STAT_COLUMNS
+
+def get_summary_file_name( s_tsv_file_name ):
+	return s_tsv_file_name + "." + SUMMARY_FILE_EXTENSION
+#end get_summary_file_name
+
+def get_stats_for_values( ar_values ):
+	'''
+	Returns a dict of the summary statistics for the
+	(finite) float values in ar_values, computed as
+	matplotlib.cbook.boxplot_stats does, for whis=1.5.
+	Returns None if ar_values is empty.
+	'''
+	if len( ar_values ) == 0:
+		return None
+	#end if no values
+
+	f_q1, f_median, f_q3=numpy.percentile( ar_values, [ 25, 50, 75 ] )
+	f_iqr=f_q3 - f_q1
+
+	f_high_limit=f_q3 + WHISKER_IQR_MULTIPLE * f_iqr
+	f_low_limit=f_q1 - WHISKER_IQR_MULTIPLE * f_iqr
+
+	ar_below_high=ar_values[ ar_values <= f_high_limit ]
+	f_whishi=f_q3 if len( ar_below_high ) == 0 \
+				or numpy.max( ar_below_high ) < f_q3 \
+				else numpy.max( ar_below_high )
+
+	ar_above_low=ar_values[ ar_values >= f_low_limit ]
+	f_whislo=f_q1 if len( ar_above_low ) == 0 \
+				or numpy.min( ar_above_low ) > f_q1 \
+				else numpy.min( ar_above_low )
+
+	ar_fliers=numpy.concatenate( [ ar_values[ ar_values < f_whislo ],
+									ar_values[ ar_values > f_whishi ] ] )
+
+	return { "n":len( ar_values ),
+				"mean":float( numpy.mean( ar_values ) ),
+				"min":float( numpy.min( ar_values ) ),
+				"q1":float( f_q1 ),
+				"median":float( f_median ),
+				"q3":float( f_q3 ),
+				"max":float( numpy.max( ar_values ) ),
+				"whislo":float( f_whislo ),
+				"whishi":float( f_whishi ),
+				"fliers":[ float( f_val ) for f_val in ar_fliers ] }
+#end get_stats_for_values
+
+class NeEstimationSummaryAccumulator( object ):
+	'''
+	Collects the values to be summarized as the Ne estimation
+	table's data lines are written, and writes the summary file.
+
+	Exact quartiles need all of a group's values, so the
+	accumulator keeps, for each combination of the key columns'
+	values, the finite floats found in each value column, and a
+	count of its non-finite values ("inf" and any other entry
+	other than "NA" that does not convert to a finite float).
+	The pooled groups are formed from these when the file is
+	written.
+	'''
+
+	def __init__( self, ls_table_column_names ):
+		'''
+		param ls_table_column_names, the column names, in order,
+			of the table whose lines will be passed to def addLines.
+		'''
+		self.__key_column_numbers=self.__get_column_numbers( ls_table_column_names,
+																		KEY_COLUMNS )
+		self.__value_column_numbers=self.__get_column_numbers( ls_table_column_names,
+																		VALUE_COLUMNS )
+		self.__values_by_key={}
+		self.__nonfinite_counts_by_key={}
+		return
+	#end __init__
+
+	def __get_column_numbers( self, ls_table_column_names, ls_names ):
+		li_column_numbers=[]
+		for s_name in ls_names:
+			if s_name not in ls_table_column_names:
+				s_msg="In NeEstimationSummaryAccumulator instance, " \
+							+ "def __get_column_numbers, " \
+							+ "the table columns do not include " \
+							+ "column, " + s_name + "."
+				raise Exception( s_msg )
+			#end if missing column
+			li_column_numbers.append( ls_table_column_names.index( s_name ) )
+		#end for each name
+		return li_column_numbers
+	#end __get_column_numbers
+
+	def addLines( self, s_lines ):
+		'''
+		param s_lines, one or more newline-terminated or newline-delimited
+			data lines of the table.
+		'''
+		for s_line in s_lines.split( "\n" ):
+			if s_line == "":
+				continue
+			#end if empty line
+
+			ls_fields=s_line.split( DELIM_TABLE )
+
+			t_key=tuple( [ ls_fields[ idx ] for idx in self.__key_column_numbers ] )
+
+			if t_key not in self.__values_by_key:
+				self.__values_by_key[ t_key ]=[ [] for s_name in VALUE_COLUMNS ]
+				self.__nonfinite_counts_by_key[ t_key ]=[ 0 for s_name in VALUE_COLUMNS ]
+			#end if new key
+
+			llf_values=self.__values_by_key[ t_key ]
+			li_nonfinite_counts=self.__nonfinite_counts_by_key[ t_key ]
+
+			for idx_value, idx_field in enumerate( self.__value_column_numbers ):
+				s_value=ls_fields[ idx_field ]
+
+				if s_value == NA_VALUE:
+					continue
+				#end if NA
+
+				try:
+					f_value=float( s_value )
+				except ValueError as ove:
+					f_value=None
+				#end try...except
+
+				if f_value is not None and numpy.isfinite( f_value ):
+					llf_values[ idx_value ].append( f_value )
+				else:
+					li_nonfinite_counts[ idx_value ]+=1
+				#end if finite, else not
+			#end for each value column
+		#end for each line
+		return
+	#end addLines
+
+	def __get_pooled_keys( self, li_key_subset ):
+		'''
+		Returns a dict, whose keys are the key tuples with the
+		key columns not indexed in li_key_subset replaced by
+		POOLED_VALUE, and whose values are the lists of the
+		accumulated keys so pooled.
+		'''
+		dlt_keys_by_pooled_key={}
+		for t_key in self.__values_by_key:
+			t_pooled=tuple( [ t_key[ idx ] if idx in li_key_subset \
+									else POOLED_VALUE for idx in range( len( t_key ) ) ] )
+			dlt_keys_by_pooled_key.setdefault( t_pooled, [] ).append( t_key )
+		#end for each key
+		return dlt_keys_by_pooled_key
+	#end __get_pooled_keys
+
+	def __get_row( self, t_pooled_key, idx_value, lt_keys ):
+
+		ar_values=numpy.array( [ f_val for t_key in lt_keys \
+								for f_val in self.__values_by_key[ t_key ][ idx_value ] ],
+								dtype=numpy.float64 )
+		i_nonfinite=sum( [ self.__nonfinite_counts_by_key[ t_key ][ idx_value ] \
+														for t_key in lt_keys ] )
+
+		dv_stats=get_stats_for_values( ar_values )
+
+		ls_row=list( t_pooled_key ) + [ VALUE_COLUMNS[ idx_value ] ]
+
+		if dv_stats is None:
+			ls_row+=[ "0", str( i_nonfinite ) ] + [ NA_VALUE ] * ( len( STAT_COLUMNS ) - 3 ) + [ "" ]
+		else:
+			ls_row+=[ str( dv_stats[ "n" ] ), str( i_nonfinite ) ]
+			ls_row+=[ repr( dv_stats[ s_stat ] ) for s_stat in STAT_COLUMNS[ 2:-1 ] ]
+			ls_row.append( DELIM_FLIERS.join( [ repr( f_val ) for f_val in dv_stats[ "fliers" ] ] ) )
+		#end if no values, else stats
+
+		return ls_row
+	#end __get_row
+
+	def writeFile( self, s_summary_file_name, i_source_bytes ):
+		'''
+		Writes the summary, first to a temporary file, which then
+		replaces any existing file of the same name.
+
+		param s_summary_file_name, name of the summary file.
+		param i_source_bytes, the size of the table file as
+			completely written.  Readers use the summary only
+			if the table's size still matches.
+		'''
+		i_total_keys=len( KEY_COLUMNS )
+		s_temp_name=s_summary_file_name + ".tmp"
+
+		o_file=open( s_temp_name, 'w' )
+		try:
+			o_file.write( SOURCE_BYTES_TAG + DELIM_TABLE + str( i_source_bytes ) + "\n" )
+			o_file.write( DELIM_TABLE.join( SUMMARY_HEADER ) + "\n" )
+
+			for i_subset in range( 2**i_total_keys ):
+				li_key_subset=[ idx for idx in range( i_total_keys ) if i_subset & ( 1 << idx ) ]
+				dlt_keys_by_pooled_key=self.__get_pooled_keys( li_key_subset )
+
+				for t_pooled_key in dlt_keys_by_pooled_key:
+					for idx_value in range( len( VALUE_COLUMNS ) ):
+						ls_row=self.__get_row( t_pooled_key, idx_value,
+												dlt_keys_by_pooled_key[ t_pooled_key ] )
+						o_file.write( DELIM_TABLE.join( ls_row ) + "\n" )
+					#end for each value column
+				#end for each pooled key
+			#end for each subset of the key columns
+		finally:
+			o_file.close()
+		#end try...finally
+
+		os.replace( s_temp_name, s_summary_file_name )
+		return
+	#end writeFile
+#end class NeEstimationSummaryAccumulator
+
+class NeEstimationSummaryFile( object ):
+	'''
+	Reads the summary file for an Ne estimation table.  If the
+	summary is missing, or was written for a table of a different
+	size than the table's current size, property is_current is False,
+	and clients should use the table itself.
+	'''
+
+	def __init__( self, s_tsv_file_name ):
+		self.__tsv_file_name=s_tsv_file_name
+		self.__summary_file_name=get_summary_file_name( s_tsv_file_name )
+		self.__is_current=False
+		self.__rows_by_pooling={}
+		self.__load_if_current()
+		return
+	#end __init__
+
+	def __load_if_current( self ):
+
+		if not ( os.path.isfile( self.__summary_file_name ) \
+					and os.path.isfile( self.__tsv_file_name ) ):
+			return
+		#end if either file is missing
+
+		o_file=open( self.__summary_file_name, 'r' )
+		try:
+			ls_size_fields=o_file.readline().rstrip( "\n" ).split( DELIM_TABLE )
+
+			if len( ls_size_fields ) != 2 or ls_size_fields[ 0 ] != SOURCE_BYTES_TAG \
+					or ls_size_fields[ 1 ] != str( os.path.getsize( self.__tsv_file_name ) ):
+				return
+			#end if not written for the table as it is now
+
+			ls_header=o_file.readline().rstrip( "\n" ).split( DELIM_TABLE )
+
+			if ls_header != SUMMARY_HEADER:
+				return
+			#end if unknown format
+
+			for s_line in o_file:
+				ls_fields=s_line.rstrip( "\n" ).split( DELIM_TABLE )
+				t_pooling=tuple( [ ls_fields[ idx ] == POOLED_VALUE \
+										for idx in range( len( KEY_COLUMNS ) ) ] )
+				self.__rows_by_pooling.setdefault( t_pooling, [] ).append( ls_fields )
+			#end for each row
+		finally:
+			o_file.close()
+		#end try...finally
+
+		self.__is_current=True
+		return
+	#end __load_if_current
+
+	def __get_rows( self, ls_grouped_columns, s_value_column ):
+		'''
+		Returns the rows for s_value_column, that pool over all the key
+		columns not in ls_grouped_columns.
+		'''
+		t_pooling=tuple( [ s_name not in ls_grouped_columns for s_name in KEY_COLUMNS ] )
+		idx_value_column=len( KEY_COLUMNS )
+
+		return [ ls_row for ls_row in self.__rows_by_pooling.get( t_pooling, [] ) \
+										if ls_row[ idx_value_column ] == s_value_column ]
+	#end __get_rows
+
+	def __get_stat( self, ls_row, s_stat ):
+		return ls_row[ len( KEY_COLUMNS ) + 1 + STAT_COLUMNS.index( s_stat ) ]
+	#end __get_stat
+
+	def canSummarize( self, s_value_column, ls_columns ):
+		'''
+		True if the summary is current, and has groups for
+		s_value_column, for any combination of the columns
+		in ls_columns (None is taken as no columns).
+		'''
+		ls_columns=[] if ls_columns is None else ls_columns
+		return self.__is_current \
+					and s_value_column in VALUE_COLUMNS \
+					and set( ls_columns ).issubset( KEY_COLUMNS )
+	#end canSummarize
+
+	def getValueRange( self, s_value_column ):
+		'''
+		Returns a dict with keys "min" and "max", giving the range of
+		the values in column s_value_column, over all rows.  Returns None
+		if the column has non-finite values, which the summary does not
+		range over.  If the column has only NA values, the min and max
+		are None.
+		'''
+		if not self.canSummarize( s_value_column, None ):
+			return None
+		#end if we can't summarize
+
+		ls_row=self.__get_rows( [], s_value_column )[ 0 ]
+
+		if int( self.__get_stat( ls_row, "n_nonfinite" ) ) > 0:
+			return None
+		#end if non-finite values
+
+		if int( self.__get_stat( ls_row, "n" ) ) == 0:
+			return { "min":None, "max":None }
+		#end if no values
+
+		return { "min":float( self.__get_stat( ls_row, "min" ) ),
+					"max":float( self.__get_stat( ls_row, "max" ) ) }
+	#end getValueRange
+
+	def getDistinctValues( self, s_key_column ):
+		'''
+		Returns a list of the (string) values found in key column
+		s_key_column, or None if the summary is not current.
+		'''
+		if not self.canSummarize( VALUE_COLUMNS[ 0 ], [ s_key_column ] ):
+			return None
+		#end if we can't summarize
+
+		idx_column=KEY_COLUMNS.index( s_key_column )
+
+		return [ ls_row[ idx_column ] for ls_row \
+					in self.__get_rows( [ s_key_column ], VALUE_COLUMNS[ 0 ] ) ]
+	#end getDistinctValues
+
+	def getBoxplotStats( self, ls_group_by_column_names, s_value_column,
+												dv_equals_filters=None ):
+		'''
+		Returns a list of dicts, as taken by matplotlib's Axes.bxp, one for
+		each group with values, with the group's label as made by
+		NeEstimationTableFileManager.getGroupedDataLines (the group's values
+		joined in the order of the sorted column names).
+
+		param ls_group_by_column_names, list of key column names, or None.
+		param s_value_column, name of a value column.
+		param dv_equals_filters, dict, key column name to the (string) value
+			that the column must equal.  Groups are formed from the rows
+			that pass all of these filters.
+
+		Returns None if the summary can't give the stats, because it is not
+		current, a column is not summarized, or one of the groups has
+		non-finite values.
+		'''
+		ls_group_by=[] if ls_group_by_column_names is None \
+									else sorted( ls_group_by_column_names )
+		dv_equals_filters={} if dv_equals_filters is None else dv_equals_filters
+
+		ls_grouped_columns=list( set( ls_group_by ).union( dv_equals_filters ) )
+
+		if not self.canSummarize( s_value_column, ls_grouped_columns ):
+			return None
+		#end if we can't summarize
+
+		li_label_column_numbers=[ KEY_COLUMNS.index( s_name ) for s_name in ls_group_by ]
+		lt_filter_column_numbers_and_values=[ ( KEY_COLUMNS.index( s_name ), str( v_value ) ) \
+										for s_name, v_value in dv_equals_filters.items() ]
+
+		ldv_stats=[]
+
+		for ls_row in self.__get_rows( ls_grouped_columns, s_value_column ):
+
+			if not all( [ ls_row[ idx ] == s_value \
+						for idx, s_value in lt_filter_column_numbers_and_values ] ):
+				continue
+			#end if filtered out
+
+			if int( self.__get_stat( ls_row, "n_nonfinite" ) ) > 0:
+				return None
+			#end if non-finite values, which the summary doesn't describe
+
+			i_n=int( self.__get_stat( ls_row, "n" ) )
+
+			if i_n == 0:
+				continue
+			#end if no values
+
+			f_median=float( self.__get_stat( ls_row, "median" ) )
+			f_q1=float( self.__get_stat( ls_row, "q1" ) )
+			f_q3=float( self.__get_stat( ls_row, "q3" ) )
+			f_notch_half_width=1.57 * ( f_q3 - f_q1 ) / numpy.sqrt( i_n )
+			s_fliers=self.__get_stat( ls_row, "fliers" )
+
+			ldv_stats.append( { "label":DELIM_GROUPED_FIELD_NAMES.join( \
+											[ ls_row[ idx ] for idx in li_label_column_numbers ] ),
+								"mean":float( self.__get_stat( ls_row, "mean" ) ),
+								"med":f_median,
+								"q1":f_q1,
+								"q3":f_q3,
+								"iqr":f_q3 - f_q1,
+								"cilo":f_median - f_notch_half_width,
+								"cihi":f_median + f_notch_half_width,
+								"whislo":float( self.__get_stat( ls_row, "whislo" ) ),
+								"whishi":float( self.__get_stat( ls_row, "whishi" ) ),
+								"fliers":numpy.array( [ float( s_val ) for s_val \
+												in s_fliers.split( DELIM_FLIERS ) if s_val != "" ] ) } )
+		#end for each row
+
+		return ldv_stats
+	#end getBoxplotStats
+
+	@property
+	def is_current( self ):
+		return self.__is_current
+	#end property is_current
+
+	@property
+	def summary_file_name( self ):
+		return self.__summary_file_name
+	#end property summary_file_name
+#end class NeEstimationSummaryFile
+
+if __name__ == "__main__":
+	pass
+#end if main
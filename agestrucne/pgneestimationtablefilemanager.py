@@ -13,6 +13,7 @@ __date__ = "20170926"
 __author__ = "Ted Cosart<ted.cosart@umontana.edu>"
 
 import sys
+import locale
 import numpy
 '''
 2017_09_28.  Possibly becasue of the __future__
@@ -23,6 +24,270 @@ found that this solves the problem:
 '''
 from functools import reduce
 
+from agestrucne.pgneestimationdatabase import is_database_file
+from agestrucne.pgneestimationdatabase import NeEstimationDatabase
+
+class NeEstimationTableColumn( object ):
+	'''
+	One column of the data lines (i.e. not the header lines) 
+	of a table loaded by NeEstimationTableFileManager.
+
+	The column's values are stored as categorical codes, an
+	integer array with one item per row, indexing into the list 
+	of unique string values (levels) found in the column.  The
+	tables repeat a few file names, sample values and replicate 
+	numbers over many rows, so the codes keep the memory footprint 
+	small and let per-value work (filters, unique values) be 
+	done once per level instead of once per row.  Because the levels 
+	are the exact strings read from the file, the rows can be 
+	reconstituted as they appear in the file.
+
+	When all of the levels convert to int, or else all convert 
+	to float, the column also has a typed array of its values, 
+	one per row.
+	'''
+
+	TYPE_INT="int"
+	TYPE_FLOAT="float"
+	TYPE_STRING="str"
+
+	def __init__( self, s_name, ls_levels, ar_codes ):
+		'''
+		param s_name, the column name as given in the file's header.
+		param ls_levels, list of the unique string values in the column.
+		param ar_codes, numpy int array, one item per row, with the
+			index into ls_levels of the row's value.
+		'''
+		self.__name=s_name
+		self.__levels=numpy.array( ls_levels, dtype=object )
+		self.__codes=ar_codes
+		self.__column_type=None
+		self.__level_values=None
+		self.__level_numbers=None
+		self.__values=None
+		self.__infer_type()
+		return
+	#end __init__
+
+	def __infer_type( self ):
+		o_myc=NeEstimationTableColumn
+
+		ls_levels=list( self.__levels )
+
+		for s_type, def_convert, o_dtype in [ ( o_myc.TYPE_INT, int, numpy.int64 ),
+											( o_myc.TYPE_FLOAT, float, numpy.float64 ) ]:
+			try:
+				self.__level_values=numpy.array( [ def_convert( s_level ) \
+										for s_level in ls_levels ], dtype=o_dtype )
+				self.__column_type=s_type
+				break
+			except ( ValueError, OverflowError ) as oex:
+				continue
+			#end try...except
+		#end for each numeric type
+
+		if self.__column_type is None:
+			self.__column_type=o_myc.TYPE_STRING
+		else:
+			self.__values=self.__level_values[ self.__codes ]
+		#end if no numeric type, else make typed values
+
+		return
+	#end __infer_type
+
+	def getStrings( self, ar_row_numbers=None ):
+		'''
+		Returns a numpy object array of the string values
+		for the rows given by ar_row_numbers, or for all rows
+		if it is None.
+		'''
+		ar_codes=self.__codes if ar_row_numbers is None \
+								else self.__codes[ ar_row_numbers ]
+		return self.__levels[ ar_codes ]
+	#end getStrings
+
+	@property
+	def name( self ):
+		return self.__name
+	#end property name
+
+	@property
+	def levels( self ):
+		return self.__levels
+	#end property levels
+
+	@property
+	def codes( self ):
+		return self.__codes
+	#end property codes
+
+	@property
+	def column_type( self ):
+		return self.__column_type
+	#end property column_type
+
+	@property
+	def values( self ):
+		'''
+		A typed numpy array of the column's values,
+		one per row, or None if the column is not numeric.
+		'''
+		return self.__values
+	#end property values
+
+	@property
+	def level_numbers( self ):
+		'''
+		A float array, one item per level, giving the level
+		as a number, or NaN for those that don't convert 
+		to float.
+		'''
+		if self.__level_numbers is None:
+			if self.__level_values is not None:
+				self.__level_numbers=self.__level_values.astype( numpy.float64 )
+			else:
+				lf_numbers=[]
+				for s_level in self.__levels:
+					try:
+						lf_numbers.append( float( s_level ) )
+					except ValueError as ove:
+						lf_numbers.append( numpy.nan )
+					#end try...except
+				#end for each level
+				self.__level_numbers=numpy.array( lf_numbers, dtype=numpy.float64 )
+			#end if numeric column, else convert what we can
+		#end if not yet computed
+
+		return self.__level_numbers
+	#end property level_numbers
+
+	@property
+	def total_rows( self ):
+		return len( self.__codes )
+	#end property total_rows
+#end class NeEstimationTableColumn
+
+class NeEstimationTableFilter( object ):
+	'''
+	A declarative filter for one column of a table loaded
+	by NeEstimationTableFileManager, passed to its setFilter
+	def in place of a def taking a string and returning a boolean
+	(NeEstimationTableFileManager's setEqualsFilter, setInSetFilter,
+	setNotInSetFilter and setRangeFilter make these for the caller).
+
+	Unlike a def, whose result the manager can only get by
+	calling it on each of the column's unique values, the filter 
+	computes its pass/fail array for the unique values with numpy.
+	Instances are also callable on a single string value, so that they 
+	can be used wherever a filter def is expected.
+	'''
+
+	EQUALS="equals"
+	IN_SET="in_set"
+	NOT_IN_SET="not_in_set"
+	RANGE="range"
+
+	def __init__( self, s_filter_type, v_value=None, f_min=None, f_max=None ):
+		'''
+		param s_filter_type, one of the class constants EQUALS, IN_SET,
+			NOT_IN_SET, RANGE.
+		param v_value, for EQUALS, the string value to be matched, and for 
+			IN_SET and NOT_IN_SET, a list of string values.
+		params f_min, f_max, for RANGE, the inclusive lower and upper limits,
+			either or both of which can be None, for no limit.  Values that
+			don't convert to float, like "NA", fail a RANGE filter.
+		'''
+		o_myc=NeEstimationTableFilter
+
+		if s_filter_type not in [ o_myc.EQUALS, o_myc.IN_SET, o_myc.NOT_IN_SET, o_myc.RANGE ]:
+			s_msg="In NeEstimationTableFilter instance, " \
+						+ "def __init__, " \
+						+ "unknown filter type: " + str( s_filter_type ) + "."
+			raise Exception( s_msg )
+		#end if unknown type
+
+		self.__filter_type=s_filter_type
+		self.__value=v_value
+		self.__min=f_min
+		self.__max=f_max
+
+		if s_filter_type in [ o_myc.IN_SET, o_myc.NOT_IN_SET ]:
+			self.__value=set( v_value )
+		#end if set type
+
+		return
+	#end __init__
+
+	def getLevelMask( self, o_column ):
+		'''
+		param o_column, an NeEstimationTableColumn.
+		Returns a boolean numpy array, one item per
+		item in the column's levels, True for those that 
+		pass the filter.
+		'''
+		o_myc=NeEstimationTableFilter
+
+		ar_levels=o_column.levels
+
+		if self.__filter_type == o_myc.EQUALS:
+			ar_mask=ar_levels == self.__value
+		elif self.__filter_type == o_myc.IN_SET:
+			ar_mask=numpy.array( [ s_level in self.__value for s_level in ar_levels ], dtype=bool )
+		elif self.__filter_type == o_myc.NOT_IN_SET:
+			ar_mask=numpy.array( [ s_level not in self.__value for s_level in ar_levels ], dtype=bool )
+		else:
+			ar_numbers=o_column.level_numbers
+			#NaN, from non-numeric values, fails all comparisons:
+			ar_mask=~numpy.isnan( ar_numbers )
+			if self.__min is not None:
+				ar_mask &= ar_numbers >= self.__min
+			#end if lower limit
+			if self.__max is not None:
+				ar_mask &= ar_numbers <= self.__max
+			#end if upper limit
+		#end if equals, else in set, else not in set, else range
+
+		return numpy.asarray( ar_mask, dtype=bool ).reshape( len( ar_levels ) )
+	#end getLevelMask
+
+	def __call__( self, s_value ):
+		o_myc=NeEstimationTableFilter
+
+		if self.__filter_type == o_myc.EQUALS:
+			b_passes=s_value == self.__value
+		elif self.__filter_type == o_myc.IN_SET:
+			b_passes=s_value in self.__value
+		elif self.__filter_type == o_myc.NOT_IN_SET:
+			b_passes=s_value not in self.__value
+		else:
+			try:
+				f_value=float( s_value )
+			except ValueError as ove:
+				return False
+			#end try...except
+			b_passes=not( numpy.isnan( f_value ) ) \
+					and ( self.__min is None or f_value >= self.__min ) \
+					and ( self.__max is None or f_value <= self.__max )
+		#end if equals, else in set, else not in set, else range
+
+		return b_passes
+	#end __call__
+
+	@property
+	def filter_type( self ):
+		return self.__filter_type
+	#end property filter_type
+
+	@property
+	def value( self ):
+		'''
+		For EQUALS, the string value, and for IN_SET and 
+		NOT_IN_SET, the set of string values.
+		'''
+		return self.__value
+	#end property value
+#end class NeEstimationTableFilter
+
 class NeEstimationTableFileManager(object):
 	'''
 	Class to read and write the table 
@@ -44,21 +309,20 @@ class NeEstimationTableFileManager(object):
 	subsample value j are fixed, so that i,j
 	is 85,85 or 85,95 or 95,85 or 95,95.
 
-	The file is loaded into a numpy array,
-	and all fields are typed as bytes.
-	(There's a type problem if we type the array 
-	"str", so that  we get different types depending 
-	on py2 vs py3:
-
-	"if you create a NumPy array containing strings, 
-	the array will use the numpy.string_ type (or 
-	the numpy.unicode_ type in Python 3)." More precisely, 
-	the array will use a sub-datatype of np.string_
-
-	This class returns its items as strings, after
-	decoding the bytes using sys.stdout.encoding.
-	I think this gives items compatible with 
-	the string methods in both py2 and py3.
+	The file's data lines are loaded column by column,
+	each column an NeEstimationTableColumn, which stores 
+	the values as integer codes into the column's unique
+	string values, and, for columns whose values are all ints 
+	or all floats, a typed numpy array of the values.  (Until 
+	now the whole file was loaded with numpy.loadtxt as one 
+	array typed as bytes, which had to be decoded item by item 
+	for every filter and grouping, and which, for large tables, 
+	took minutes and gigabytes to load.)
+
+	This class returns its items as strings, as read 
+	from the file using sys.stdout.encoding.  I think this 
+	gives items compatible with the string methods in both 
+	py2 and py3.
 
 	
 	2017_09_28
@@ -74,15 +338,21 @@ class NeEstimationTableFileManager(object):
 	DELIM_TABLE="\t"
 	DELIM_GROUPED_FIELD_NAMES="__"
 
-	COL_NAME_FILE_NAME=b'original_file'
-	COL_NAME_POP_SAMPLE_VAL=b'sample_value'
-	COL_NAME_LOCI_SAMPLE_VAL=b'loci_sample_value'
-	COL_NAME_POP_NUM=b'pop'
-	COL_NAME_POP_REPLICATE=b'replicate_number'
-	COL_NAME_LOCI_REPLICATE=b'loci_replicate_number'
+	COL_NAME_FILE_NAME='original_file'
+	COL_NAME_POP_SAMPLE_VAL='sample_value'
+	COL_NAME_LOCI_SAMPLE_VAL='loci_sample_value'
+	COL_NAME_POP_NUM='pop'
+	COL_NAME_POP_REPLICATE='replicate_number'
+	COL_NAME_LOCI_REPLICATE='loci_replicate_number'
 
 	ENCODING=sys.stdout.encoding
 
+	COMMENT_CHAR="#"
+
+	#Number of bytes of data lines read and 
+	#split per block when loading the file:
+	LOAD_CHUNK_BYTES=2**24
+
 	MAX_NUM_GROUPING_FIELDS=4
 	MAX_NUM_GROUPINGS=3000
 
@@ -177,6 +447,17 @@ class NeEstimationTableFileManager(object):
 		param s_tsv_file_delimiter gives the character that
 		delimits the columns in the tsv file. The default
 		is <tab>.
+
+		2026_10_19.  The file can also be an SQLite database 
+		of the table, as written by pgdriveneestimator.py 
+		using class NeEstimationDatabaseWriter, in which case 
+		the header and delimiter params are not used.  Only the
+		column names are read when the object is made.  While
+		the filters are all equality or in-set filters, the filtered 
+		and grouped rows, and the unique values of a column, are
+		fetched from the database, using its indexes.  The rows 
+		are loaded into memory only for the defs that need them
+		(see def __get_columns).
 		'''
 
 		self.__filename=s_file_name
@@ -185,8 +466,16 @@ class NeEstimationTableFileManager(object):
 		self.__tsv_file_delimiter=s_tsv_file_delimiter
 
 		self.__myclassname=NeEstimationTableFileManager
-		self.__table_array=None
-		self.__load_file_into_array()
+		self.__header_rows=None
+		self.__column_names=None
+		self.__columns=None
+		self.__total_data_rows=None
+
+		if is_database_file( self.__filename ):
+			self.__load_database_header()
+		else:
+			self.__load_file_into_array()
+		#end if database, else tsv file
 				
 		'''
 		Dictionary of references to functions keyed to column numbers. Valid
@@ -199,54 +488,484 @@ class NeEstimationTableFileManager(object):
 		'''
 		self.__filters={}
 
+		'''
+		Boolean row masks for the filters, one per filtered
+		column, keyed to column number, and their combination,
+		cached by def __get_filter_mask.  setFilter and 
+		unsetAllFilters invalidate them.
+		'''
+		self.__column_masks={}
+		self.__filter_mask=None
+
 		return
 	#end __init__
 
 	def __load_file_into_array( self ):
+		'''
+		Reads the tsv file, storing the header lines as 
+		lists of strings and the data lines as one 
+		NeEstimationTableColumn per column.
+
+		The data lines are read in blocks of about LOAD_CHUNK_BYTES,
+		each block split into cells and coded by column without making
+		a python object per cell (see __get_cells_by_column_from_block).
+
+		As with the numpy.loadtxt call this replaces, 
+		any text following a "#" is ignored, as are 
+		blank lines.
+		'''
+		o_myc=NeEstimationTableFileManager
+
+		self.__encoding=o_myc.ENCODING if o_myc.ENCODING is not None \
+								else locale.getpreferredencoding( False )
+		lls_header_rows=[]
+		llar_levels=None
+		llar_codes=None
+
+		o_file=open( self.__filename, 'rb' )
+
+		try:
+			while len( lls_header_rows ) < self.__header_line_tot:
+				v_line=o_file.readline()
+				if len( v_line ) == 0:
+					break
+				#end if end of file
+
+				s_line=self.__get_line_without_comment_or_endline( v_line )
+				if s_line != "":
+					lls_header_rows.append( s_line.split( self.__tsv_file_delimiter ) )
+				#end if not blank or comment
+			#end while header lines remain
 
-		self.__table_array=numpy.loadtxt( fname=self.__filename, 
-														dtype=bytes, 
-														delimiter=self.__tsv_file_delimiter )
+			if len( lls_header_rows ) < self.__line_number_col_names:
+				s_msg="In NeEstimationTableFileManager instance, " \
+							+ "def __load_file_into_array, " \
+							+ "the file, " + self.__filename \
+							+ ", has no column names on line " \
+							+ str( self.__line_number_col_names ) + "."
+				raise Exception( s_msg )
+			#end if no column names line
+
+			i_total_columns=len( lls_header_rows[ 0 ] )
+
+			llar_levels=[ [] for idx in range( i_total_columns ) ]
+			llar_codes=[ [] for idx in range( i_total_columns ) ]
+
+			while True:
+				v_block=o_file.read( o_myc.LOAD_CHUNK_BYTES )
+
+				if len( v_block ) == 0:
+					break
+				#end if no more lines
+
+				if not v_block.endswith( b'\n' ):
+					v_block+=o_file.readline()
+				#end if block ends mid-line, complete the line
+
+				lar_cells=self.__get_cells_by_column_from_block( v_block, i_total_columns )
+
+				for i_col, ar_cells in enumerate( lar_cells ):
+					'''
+					numpy.unique does the per-row work of coding this block's
+					cells.  After the last block, __get_column_levels_and_codes
+					maps the blocks' codes to the column's codes, so that no 
+					python-level work is done per cell, and only the final
+					levels are decoded.
+					'''
+					if len( ar_cells ) == 0:
+						continue
+					#end if no data lines in block
+
+					ar_block_levels, ar_block_codes=self.__get_unique_cells_and_codes( ar_cells )
+					llar_levels[ i_col ].append( ar_block_levels )
+					llar_codes[ i_col ].append( ar_block_codes )
+				#end for each column
+			#end while blocks remain
+		finally:
+			o_file.close()
+		#end try...finally
+
+		self.__header_rows=lls_header_rows
+		self.__column_names=numpy.array( \
+				lls_header_rows[ self.__line_number_col_names - 1 ], dtype=object )
+
+		self.__columns=[]
+		for i_col, s_name in enumerate( self.__column_names ):
+			ls_levels, ar_codes=self.__get_column_levels_and_codes( llar_levels[ i_col ], 
+																	llar_codes[ i_col ] )
+			self.__columns.append( NeEstimationTableColumn( s_name, ls_levels, ar_codes ) )
+		#end for each column name
+
+		self.__total_data_rows=len( self.__columns[ 0 ].codes )
 		return
 	#end __load_file_into_array
 
-	def __colname_is_in_header( self, s_colname ):
-		b_return_value=False
-		b_col_name=self.__get_bytes_from_string_value( s_colname )
-		ar_col_names=self.__table_array[ self.__line_number_col_names - 1, : ]
+	def __load_database_header( self ):
+		'''
+		2026_10_19.  For a table in an SQLite database, reads only
+		the column names and the total rows.  The rows are loaded 
+		by def __load_database_into_array, when a def needs them.
+		'''
+		o_myc=NeEstimationTableFileManager
 
-		for b_this_name in ar_col_names:
-			if b_this_name==b_col_name:
-				b_return_value=True
-				break
-			#end if match found, return is True
-		#end for each col name
-		
+		self.__encoding=o_myc.ENCODING if o_myc.ENCODING is not None \
+								else locale.getpreferredencoding( False )
+
+		o_database=NeEstimationDatabase( self.__filename )
+
+		try:
+			ls_column_names=o_database.column_names
+			i_total_rows=o_database.total_rows
+		finally:
+			o_database.close()
+		#end try...finally
+
+		self.__header_rows=[ ls_column_names ]
+		self.__column_names=numpy.array( ls_column_names, dtype=object )
+		self.__total_data_rows=i_total_rows
+		return
+	#end __load_database_header
+
+	def __load_database_into_array( self ):
+		'''
+		2026_10_19.  As def __load_file_into_array, but reads the
+		rows of a table in an SQLite database, via class NeEstimationDatabase.
+		Each column is coded by one numpy.unique call, with the 
+		levels numbered in order of first appearance, as for a
+		tsv file.
+		'''
+		ls_column_names=list( self.__column_names )
+
+		o_database=NeEstimationDatabase( self.__filename )
+
+		try:
+			lt_rows=o_database.getRows( ls_column_names )
+		finally:
+			o_database.close()
+		#end try...finally
+
+		ar_cells_by_column=numpy.array( lt_rows, dtype=object ).reshape( \
+										( len( lt_rows ), len( ls_column_names ) ) ).T
+
+		self.__columns=[]
+		for i_col, s_name in enumerate( ls_column_names ):
+			if len( lt_rows ) == 0:
+				ls_levels=[]
+				ar_codes=numpy.zeros( 0, dtype=numpy.int64 )
+			else:
+				ar_unique, ar_first_index, ar_inverse=numpy.unique( \
+										ar_cells_by_column[ i_col ].astype( str ),
+										return_index=True, return_inverse=True )
+				ar_order=numpy.argsort( ar_first_index, kind="mergesort" )
+				ar_code_for_unique=numpy.empty( len( ar_unique ), dtype=numpy.int64 )
+				ar_code_for_unique[ ar_order ]=numpy.arange( len( ar_unique ), dtype=numpy.int64 )
+				ls_levels=ar_unique[ ar_order ].tolist()
+				ar_codes=ar_code_for_unique[ ar_inverse.ravel() ]
+			#end if no rows, else code the column
+
+			self.__columns.append( NeEstimationTableColumn( s_name, ls_levels, ar_codes ) )
+		#end for each column
+
+		self.__total_data_rows=len( lt_rows )
+		return
+	#end __load_database_into_array
+
+	def __get_columns( self ):
+		'''
+		2026_10_19.  Returns the list of NeEstimationTableColumn
+		objects, first loading the rows, if the table is a database
+		whose rows have not yet been loaded.
+		'''
+		if self.__columns is None:
+			self.__load_database_into_array()
+		#end if rows not yet loaded
+
+		return self.__columns
+	#end __get_columns
+
+	def __get_database_filters( self ):
+		'''
+		2026_10_19.  If the table is a database whose rows have not
+		been loaded, and the current filters are all equality or 
+		in-set filters (NeEstimationTableFilter objects), returns them 
+		as a dict of column names to the value or list of values, as 
+		expected by NeEstimationDatabase.  Otherwise returns None, and
+		clients filter the rows in memory.
+		'''
+		o_filter_class=NeEstimationTableFilter
+
+		if self.__columns is not None:
+			return None
+		#end if the rows are loaded, or the table is a tsv file
+
+		dv_filters={}
+
+		for i_colnum in self.__filters:
+			def_filter=self.__filters[ i_colnum ]
+
+			if def_filter is None:
+				continue
+			#end if no filter on this column
+
+			if not isinstance( def_filter, o_filter_class ):
+				return None
+			#end if a def, which only the loaded rows can use
+
+			s_name=self.__column_names[ i_colnum ]
+
+			if def_filter.filter_type == o_filter_class.EQUALS:
+				dv_filters[ s_name ]=def_filter.value
+			elif def_filter.filter_type == o_filter_class.IN_SET:
+				dv_filters[ s_name ]=sorted( def_filter.value )
+			else:
+				return None
+			#end if equals, else in set, else not one the database does
+		#end for each filter
+
+		return dv_filters
+	#end __get_database_filters
+
+	def __get_database_rows_as_list_of_strings( self, ls_column_names, dv_filters ):
+		'''
+		2026_10_19.  As def __get_rows_as_list_of_strings, for the
+		rows of the database that pass the filters, in table order.
+		'''
+		o_database=NeEstimationDatabase( self.__filename )
+
+		try:
+			lt_rows=o_database.getRows( ls_column_names, dv_filters )
+		finally:
+			o_database.close()
+		#end try...finally
+
+		s_delim=self.__myclassname.DELIM_TABLE
+
+		return [ s_delim.join( t_row ) for t_row in lt_rows ]
+	#end __get_database_rows_as_list_of_strings
+
+	def __get_unique_cells_and_codes( self, ar_cells ):
+		'''
+		param ar_cells, numpy bytes ("S") array of one column's cells.
+
+		Returns a tuple, the array of unique cell values, in order of 
+		their first appearance in the block, and an int array giving, 
+		for each cell, the index of its value in the first.
+
+		Since the tables are written in runs of the same file name, sample 
+		value, replicate and so on, only the first cell of each run is
+		sorted by numpy.unique.  Cells of 8 bytes or fewer are sorted as 
+		integers, which is much faster than sorting them as strings.
+		'''
+		ar_is_run_start=numpy.ones( len( ar_cells ), dtype=bool )
+		ar_is_run_start[ 1: ]=ar_cells[ 1: ] != ar_cells[ :-1 ]
+
+		ar_run_values=ar_cells[ ar_is_run_start ]
+
+		if ar_cells.dtype.itemsize <= 8:
+			ar_unique, ar_first_runs, ar_run_codes=numpy.unique( \
+										ar_run_values.astype( "S8" ).view( numpy.uint64 ),
+										return_index=True, return_inverse=True )
+			ar_unique=ar_unique.view( "S8" )
+		else:
+			ar_unique, ar_first_runs, ar_run_codes=numpy.unique( ar_run_values, 
+																return_index=True,
+																return_inverse=True )
+		#end if narrow cells, else sort as strings
+
+		'''
+		2026_10_19.  Renumber the sorted unique values in order of
+		first appearance, so that the column's levels, and so the
+		unique values given to clients, are in table order.
+		'''
+		ar_order=numpy.argsort( ar_first_runs, kind="mergesort" )
+		ar_code_for_unique=numpy.empty( len( ar_unique ), dtype=numpy.int64 )
+		ar_code_for_unique[ ar_order ]=numpy.arange( len( ar_unique ), dtype=numpy.int64 )
+		ar_unique=ar_unique[ ar_order ]
+
+		ar_codes=ar_code_for_unique[ ar_run_codes.ravel() ][ numpy.cumsum( ar_is_run_start ) - 1 ]
+
+		return ar_unique, ar_codes
+	#end __get_unique_cells_and_codes
+
+	def __get_column_levels_and_codes( self, lar_block_levels, lar_block_codes ):
+		'''
+		param lar_block_levels, list of numpy bytes arrays, the unique cell 
+			values in each block of a column, as returned by 
+			__get_unique_cells_and_codes.
+		param lar_block_codes, list of int arrays, each block's cell codes,
+			indexing into the block's levels.
+
+		Returns a tuple, the list of the column's levels, decoded, and the int 
+		array of the column's codes, one per row.  The levels of all blocks are 
+		coded together by one numpy.unique call, rather than merged block by 
+		block, and are numbered in order of first appearance in the file (by block, 
+		and within a block as given by __get_unique_cells_and_codes).
+		'''
+		if len( lar_block_levels ) == 0:
+			return [], numpy.zeros( 0, dtype=numpy.int64 )
+		#end if no data lines
+
+		ar_block_offsets=numpy.cumsum( [ 0 ] + [ len( ar_levels ) for ar_levels in lar_block_levels ] )
+
+		ar_unique, ar_first_index, ar_inverse=numpy.unique( numpy.concatenate( lar_block_levels ),
+																return_index=True, 
+																return_inverse=True )
+		ar_order=numpy.argsort( ar_first_index, kind="mergesort" )
+		ar_code_for_unique=numpy.empty( len( ar_unique ), dtype=numpy.int64 )
+		ar_code_for_unique[ ar_order ]=numpy.arange( len( ar_unique ), dtype=numpy.int64 )
+		ar_code_for_block_level=ar_code_for_unique[ ar_inverse.ravel() ]
+
+		ar_codes=numpy.concatenate( [ ar_code_for_block_level[ ar_block_offsets[ idx ] + ar_block_codes ] \
+										for idx, ar_block_codes in enumerate( lar_block_codes ) ] )
+
+		ls_levels=[ v_level.decode( self.__encoding ) for v_level in ar_unique[ ar_order ].tolist() ]
+
+		return ls_levels, ar_codes
+	#end __get_column_levels_and_codes
+
+	def __get_line_without_comment_or_endline( self, v_line ):
+		s_line=v_line.decode( self.__encoding )
+		s_comment=NeEstimationTableFileManager.COMMENT_CHAR
+		if s_comment in s_line:
+			s_line=s_line.split( s_comment )[ 0 ]
+		#end if comment in line
+		return s_line.strip( "\r\n" )
+	#end __get_line_without_comment_or_endline
+
+	def __get_cells_by_column_from_block( self, v_block, i_total_columns ):
+		'''
+		param v_block, bytes, whole data lines from the file.
+		param i_total_columns, the number of columns each line must have.
+
+		Returns a list with one numpy bytes ("S") array per column, 
+		holding the column's cells in line order.  The delimiter and 
+		newline positions are found with numpy, and the cells for a 
+		column are gathered into a 2D array of bytes, one row per line 
+		and as wide as the column's widest cell, which is then viewed 
+		as a fixed-width bytes array.  Blocks with comment characters,
+		or delimiters that numpy can't match as a single byte, are 
+		split line by line instead.
+		'''
+		o_myc=NeEstimationTableFileManager
+
+		v_delim=self.__tsv_file_delimiter.encode( self.__encoding )
+		v_comment=o_myc.COMMENT_CHAR.encode( self.__encoding )
+
+		if len( v_delim ) != 1 or v_comment in v_block:
+			return self.__get_cells_by_column_from_block_by_line( v_block, i_total_columns )
+		#end if we can't use the vectorized split
+
+		ar_block=numpy.frombuffer( v_block, dtype=numpy.uint8 )
+
+		ar_newlines=numpy.flatnonzero( ar_block == ord( b'\n' ) )
+		if len( ar_newlines ) == 0 or ar_newlines[ -1 ] != len( ar_block ) - 1:
+			#Last line of the file with no endline:
+			ar_newlines=numpy.append( ar_newlines, len( ar_block ) )
+		#end if last line has no newline
+
+		ar_line_starts=numpy.concatenate( ( [ 0 ], ar_newlines[ :-1 ] + 1 ) )
+		ar_line_ends=ar_newlines.copy()
+
+		ar_has_cr=numpy.zeros( len( ar_line_ends ), dtype=bool )
+		ar_nonempty=ar_line_ends > ar_line_starts
+		ar_has_cr[ ar_nonempty ]=ar_block[ ar_line_ends[ ar_nonempty ] - 1 ] == ord( b'\r' )
+		ar_line_ends[ ar_has_cr ]-=1
+
+		ar_keep=ar_line_ends > ar_line_starts
+		ar_line_starts=ar_line_starts[ ar_keep ]
+		ar_line_ends=ar_line_ends[ ar_keep ]
+
+		ar_delims=numpy.flatnonzero( ar_block == ord( v_delim ) )
+
+		ar_delims_per_line=numpy.searchsorted( ar_delims, ar_line_ends ) \
+								- numpy.searchsorted( ar_delims, ar_line_starts )
+
+		if numpy.any( ar_delims_per_line != i_total_columns - 1 ):
+			#The line-by-line split reports the ragged line.
+			return self.__get_cells_by_column_from_block_by_line( v_block, i_total_columns )
+		#end if some line has the wrong number of cells
+
+		i_total_lines=len( ar_line_starts )
+
+		ar_delims=ar_delims.reshape( ( i_total_lines, i_total_columns - 1 ) )
+
+		ar_cell_starts=numpy.column_stack( ( ar_line_starts, ar_delims + 1 ) )
+		ar_cell_ends=numpy.column_stack( ( ar_delims, ar_line_ends ) )
+
+		lar_cells=[]
+		for i_col in range( i_total_columns ):
+			ar_starts=ar_cell_starts[ :, i_col ]
+			ar_lengths=ar_cell_ends[ :, i_col ] - ar_starts
+			i_width=max( 1, int( ar_lengths.max() ) if i_total_lines > 0 else 1 )
+			ar_offsets=numpy.arange( i_width )
+			ar_positions=numpy.minimum( ar_starts[ :, None ] + ar_offsets, len( ar_block ) - 1 )
+			ar_chars=ar_block[ ar_positions ]
+			ar_chars[ ar_offsets >= ar_lengths[ :, None ] ]=0
+			lar_cells.append( ar_chars.view( "S" + str( i_width ) ).ravel() )
+		#end for each column
+
+		return lar_cells
+	#end __get_cells_by_column_from_block
+
+	def __get_cells_by_column_from_block_by_line( self, v_block, i_total_columns ):
+		s_delim=self.__tsv_file_delimiter
+
+		lls_rows=[]
+		for v_line in v_block.splitlines():
+			s_line=self.__get_line_without_comment_or_endline( v_line )
+			if s_line == "":
+				continue
+			#end if blank or comment line
+
+			ls_vals=s_line.split( s_delim )
+
+			if len( ls_vals ) != i_total_columns:
+				s_msg="In NeEstimationTableFileManager instance, " \
+							+ "def __get_cells_by_column_from_block_by_line, " \
+							+ "in file, " + self.__filename \
+							+ ", the line, " + s_line + ", has " \
+							+ str( len( ls_vals ) ) + " columns, but " \
+							+ "the file's header has " + str( i_total_columns ) + "."
+				raise Exception( s_msg )
+			#end if ragged line
+
+			lls_rows.append( [ s_val.encode( self.__encoding ) for s_val in ls_vals ] )
+		#end for each line
+
+		if len( lls_rows ) == 0:
+			return [ numpy.zeros( 0, dtype="S1" ) for idx in range( i_total_columns ) ]
+		#end if no data lines
+
+		return [ numpy.array( tv_column, dtype=bytes ) for tv_column in zip( *lls_rows ) ]
+	#end __get_cells_by_column_from_block_by_line
+
+	def __colname_is_in_header( self, s_colname ):
+		b_return_value=s_colname in self.__column_names
 		return b_return_value
 	#end __colname_is_in_header
 
-	def __get_col_nums_for_col_name( self, b_col_name, b_enforce_uniq=True ):
+	def __get_col_nums_for_col_name( self, s_col_name, b_enforce_uniq=True ):
 		'''
-		param b_col_name is a bytes object, to be compared
-		to those read in to the first line of the table array.
+		param s_col_name is a string, to be compared
+		to those read in from the column names line.
 		
 		2017_02_16.  param b_enforce_uniq, when True employes an assert statment
 		that the tup[0] returned by numpy.where (i.e. the tuple with
 		indices for true values for the conditional) has exactly one
-		item, indicating a single column number that matches the b_col_name arg.
+		item, indicating a single column number that matches the s_col_name arg.
 		'''
-		ar_col_names=self.__table_array[ self.__line_number_col_names - 1, : ]
+		ar_col_names=self.__column_names
 
 		#Returns a tuple of arrays, the first array being the
 		#index or indices in the bool array wherein ar_col_names has the match.
-		tup_ar_col_nums=numpy.where( ar_col_names==b_col_name )
+		tup_ar_col_nums=numpy.where( ar_col_names==s_col_name )
 		ar_col_nums=tup_ar_col_nums[ 0 ]
 
 		if b_enforce_uniq:
 				s_msg="In NeEstimationTableFileManager instance, " \
 							+ "def __get_col_nums_for_col_name, " \
 							+ "non-unique column number for match for " \
-							+ "column name, " + str( b_col_name ) + "."
+							+ "column name, " + str( s_col_name ) + "."
 				
 				assert len( ar_col_nums ) == 1, s_msg
 		#end if we are to enforce a unique column number
@@ -254,25 +973,38 @@ class NeEstimationTableFileManager(object):
 		return ar_col_nums
 	#end __get_col_nums_for_col_name
 
-	def __get_set_values_for_column( self, i_col_number ):
+	def __get_list_values_for_column( self, i_col_number ):
 		'''
-		This def returns a list givein the set (unique)
+		This def returns the unique
 		string-typed values for the column given by i_col_number.
+
+		2026_10_19.  The values are now a list, in order of their 
+		first appearance in the table, rather than a set, so that
+		clients (ex: GUI comboboxes) list them in the same order
+		whether the table is a tsv file or a database.  For a
+		database whose rows are not loaded, the database gives them.
 		'''
-		ar_table=self.__table_array
-		i_min_row=self.__header_line_tot
+		if self.__columns is None:
+			o_database=NeEstimationDatabase( self.__filename )
+			try:
+				ls_values=o_database.getDistinctValues( self.__column_names[ i_col_number ] )
+			finally:
+				o_database.close()
+			#end try...finally
+			return ls_values
+		#end if database rows not loaded
 
-		return set( ar_table[ i_min_row : , i_col_number ] )
-	#end __get_set_values_for_column
+		return list( self.__columns[ i_col_number ].levels )
+	#end __get_list_values_for_column
 
-	def __get_set_bytes_values_for_column_name( self, b_col_name ):
+	def __get_list_values_for_column_name( self, s_col_name ):
 
-		ar_col_nums=self.__get_col_nums_for_col_name( b_col_name  )
+		ar_col_nums=self.__get_col_nums_for_col_name( s_col_name  )
 
 		if len( ar_col_nums ) != 1:
 			s_msg="In NeEstimationTableFileManager instance, " \
-							+ "def __get_set_bytes_values_for_col_name, " \
-							+ "in fetching column number for name, " + str( b_col_name ) \
+							+ "def __get_list_values_for_column_name, " \
+							+ "in fetching column number for name, " + str( s_col_name ) \
 							+ " from the file header, a non unique column " \
 							+ "number was returned, using sample value column " \
 							+ "list of column numbers found for this column name: " \
@@ -280,86 +1012,111 @@ class NeEstimationTableFileManager(object):
 			raise Exception( s_msg )
 		#end if non uniq col number
 
-		set_values=self.__get_set_values_for_column( ar_col_nums [ 0 ] )
+		ls_values=self.__get_list_values_for_column( ar_col_nums [ 0 ] )
 		
-		return list( set_values )
-
-	#end def __get_set_bytes_values_for_col_name
-
-	def __get_string_from_bytes_value( self, b_bytes ):
-		s_bytes=str( b_bytes.decode( self.__myclassname.ENCODING ) )
-		return s_bytes
-	#end __get_string_from_bytes_value
-
-	def __get_bytes_from_string_value( self, s_strval ):
-		b_strval=bytes( s_strval.encode( self.__myclassname.ENCODING ) )
-		return b_strval
-	#end __get_bytes_from_string_value
-
-	def __get_list_of_strings_from_list_of_bytes( self, lb_list ):
-		ls_as_strings=[ str(  \
-				b_val.decode( self.__myclassname.ENCODING )  )
-											for b_val in lb_list ]
-		return ls_as_strings
-	#end __get_list_of_strings_from_list_of_bytes
-
-	def __get_list_bytes_pop_sample_values( self ):
-		b_col_name=self.__myclassname.COL_NAME_POP_SAMPLE_VAL
-		set_pop_sample_values=self.__get_set_bytes_values_for_column_name( b_col_name )
-		return list( set_pop_sample_values )
-	#end __get_list_pop_sample_values
-
-	def __get_list_bytes_loci_sample_values( self ):
-		b_col_name=self.__myclassname.COL_NAME_LOCI_SAMPLE_VAL
-		set_loci_sample_values=self.__get_set_bytes_values_for_column_name( b_col_name )
-		return list( set_loci_sample_values )
-	#end __get_list_bytes_loci_sample_values
-
-	def __get_list_bytes_file_names( self ):
-		b_col_name=self.__myclassname.COL_NAME_FILE_NAME
-		set_file_names=self.__get_set_bytes_values_for_column_name( b_col_name )
-		return list( set_file_names )
-	#end __get_list_bytes_file_names
-
-	def __get_list_bytes_pop_numbers( self ):
-		b_col_name=self.__myclassname.COL_NAME_POP_NUM
-		set_pop_numbers=self.__get_set_bytes_values_for_column_name( b_col_name )
-		return list( set_pop_numbers )
-	#end __get_list_bytes_pop_numbers
-
-	def __get_list_bytes_pop_replicate_numbers( self ):
-		b_col_name=self.__myclassname.COL_NAME_POP_REPLICATE
-		set_pop_replicates=self.__get_set_bytes_values_for_column_name( b_col_name )
-		return list( set_pop_replicates )
-	#end __get_list_bytes_pop_replicate_numbers
-
-	def __get_list_bytes_loci_replicate_numbers( self ):
-		b_col_name=self.__myclassname.COL_NAME_LOCI_REPLICATE
-		set_pop_replicates=self.__get_set_bytes_values_for_column_name( b_col_name )
-		return list( set_pop_replicates )
-	#end __get_list_bytes_loci_replicate_numbers
+		return ls_values
+
+	#end def __get_list_values_for_column_name
 
 	def __get_list_of_column_numbers_for_list_of_column_names( self, ls_col_names ):
 
 		li_column_numbers=[]
 		for s_column_name in ls_col_names:
-			b_column_name=self.__get_bytes_from_string_value( s_column_name )
 			#Default 2nd arg for this call ensures we get back only one
 			#column number in the returned array:
-			ar_col_nums=self.__get_col_nums_for_col_name( b_column_name )
+			ar_col_nums=self.__get_col_nums_for_col_name( s_column_name )
 			i_col_num=ar_col_nums[ 0 ]
 			li_column_numbers.append( i_col_num )
 		#end for each column name
 		return li_column_numbers
 	#end __get_list_of_column_numbers_for_list_of_column_names
 
+	def __get_column_mask( self, i_colnum ):
+		'''
+		Returns a boolean array, one item per data row, True for
+		rows whose value in column i_colnum passes its filter.  
+		NeEstimationTableFilter objects compute their results for the 
+		column's unique values with numpy, and filter defs are called 
+		once per unique value, rather than once per row.  In either 
+		case the results are spread over the rows via the column's codes.
+		'''
+		def_filter=self.__filters[ i_colnum ]
+		o_column=self.__get_columns()[ i_colnum ]
+
+		if isinstance( def_filter, NeEstimationTableFilter ):
+			ar_level_passes=def_filter.getLevelMask( o_column )
+		else:
+			ar_level_passes=numpy.array( [ bool( def_filter( s_level ) ) \
+									for s_level in o_column.levels ], dtype=bool )
+		#end if declarative filter, else def
+
+		if len( ar_level_passes ) == 0:
+			return numpy.ones( self.__total_data_rows, dtype=bool )
+		#end if no levels
+
+		return ar_level_passes[ o_column.codes ]
+	#end __get_column_mask
+
+	def __get_filter_mask( self ):
+		'''
+		Returns a boolean array, one item per data row, True
+		for rows that pass all non-None filters.  The per-column
+		masks and their combination are cached until setFilter
+		or unsetAllFilters change the filters, so that, when one
+		filter changes, only its column's mask is recomputed.
+		'''
+		if self.__filter_mask is None:
+			ar_mask=numpy.ones( self.__total_data_rows, dtype=bool )
+
+			for i_colnum in self.__filters:
+				if self.__filters[ i_colnum ] is not None:
+					if i_colnum not in self.__column_masks:
+						self.__column_masks[ i_colnum ]=self.__get_column_mask( i_colnum )
+					#end if no cached mask for this column
+					ar_mask &= self.__column_masks[ i_colnum ]
+				#end if non-None filter
+			#end for each filter
+
+			self.__filter_mask=ar_mask
+		#end if no cached combined mask
+
+		return self.__filter_mask
+	#end __get_filter_mask
+
+	def __get_rows_as_list_of_strings( self, ar_row_numbers, li_col_nums ):
+		'''
+		param ar_row_numbers, data row indices (zero-based, not counting
+			header lines) to deliver, in order.
+		param li_col_nums, the column numbers whose values are joined
+			for each row, or None for all columns.
+		'''
+		if li_col_nums is None:
+			li_col_nums=list( range( len( self.__get_columns() ) ) )
+		#end if no exclusive columns, use all
+
+		lar_column_strings=[ self.__get_columns()[ i_col ].getStrings( ar_row_numbers ) \
+																for i_col in li_col_nums ]
+
+		s_delim=self.__myclassname.DELIM_TABLE
+
+		ls_entries=[ s_delim.join( ts_vals ) for ts_vals in zip( *lar_column_strings ) ]
+
+		return ls_entries
+	#end __get_rows_as_list_of_strings
+
+	def __get_header_as_string( self, li_col_nums ):
+		ls_header=self.__header_rows[ 0 ]
+		if li_col_nums is not None:
+			ls_header=[ ls_header[ i ] for i in li_col_nums ]
+		#end if we have exclusive col nums
+		return self.__myclassname.DELIM_TABLE.join( ls_header )
+	#end __get_header_as_string
+
 	def __get_filtered_table_as_list_of_strings( self, 
 								ls_exclusive_cols=None,
 								b_skip_header=False ):
 		ls_entries=[]
 
-		i_line_count=0
-
 		li_exclusive_col_nums=None
 
 		if ls_exclusive_cols is not None:
@@ -368,59 +1125,31 @@ class NeEstimationTableFileManager(object):
 														ls_exclusive_cols )
 		#end if we have exclusive col names
 
-		for ar_line in self.__table_array:
-			i_line_count+=1
+		if not b_skip_header:
+			ls_entries.append( self.__get_header_as_string( li_exclusive_col_nums ) )
+		#end if header should be included
 
-			#We do an "and" op to this bool
-			#with all non-None filters.
-			b_line_should_be_included=True
+		dv_database_filters=self.__get_database_filters()
 
-			if i_line_count == 1:
-				if b_skip_header == True:
-					b_line_should_be_included=False
-				else:
-					'''
-					Header line, no tests needed, and our write flag,
-					b_line_should_be_included is already set to True, 
-					so pass
-					'''
-					pass
-				#end if flag says skip header, else include
-			else:
-				for i_colnum in self.__filters:
-					if self.__filters[ i_colnum ] is not None:
-						b_table_value=ar_line[ i_colnum ]
-						s_table_value=self.__get_string_from_bytes_value( b_table_value )
-						b_line_should_be_included &= self.__filters[ i_colnum ] ( s_table_value ) 
-					#end if non-None filter
-				#end for each filter
-
-			if b_line_should_be_included:
-				ls_line_as_list_of_strings= \
-						self.__get_list_of_strings_from_list_of_bytes( ar_line )
-
-				#If we are to collect only a subset of the columns,
-				#reduce the list:
-				if li_exclusive_col_nums is not None:
-					ls_line_as_list_of_strings=[ ls_line_as_list_of_strings[ i ] \
-														for i in li_exclusive_col_nums ]
-				#end if we have exlcusive col nums
-
-				s_entry=self.__myclassname.DELIM_TABLE.join( \
-													ls_line_as_list_of_strings )
-				ls_entries.append( s_entry )
-			#end if line should be included, append to list
-		#end for each line in array
+		if dv_database_filters is not None:
+			ls_entries+=self.__get_database_rows_as_list_of_strings( ls_exclusive_cols,
+																		dv_database_filters )
+		else:
+			ar_row_numbers=numpy.flatnonzero( self.__get_filter_mask() )
+
+			ls_entries+=self.__get_rows_as_list_of_strings( ar_row_numbers, 
+																li_exclusive_col_nums )
+		#end if the database can filter, else filter in memory
 		return ls_entries
 	#end def __get_filtered_table_as_list_of_strings
 
 	def __get_unfiltered_table_as_list_of_strings( self, 
 									ls_exclusive_cols=None,
 									b_skip_header=False ):
-		ls_entries=[]
-
-		i_line_count=0
-
+		'''
+		As has always been the case for this def, the header line
+		is not included, regardless of the b_skip_header value.
+		'''
 		li_exclusive_col_nums=None
 
 		if ls_exclusive_cols is not None:
@@ -429,31 +1158,16 @@ class NeEstimationTableFileManager(object):
 														ls_exclusive_cols )
 		#end if we have exclusive col names
 
-		for ar_line in self.__table_array:
-			i_line_count += 1
-			if i_line_count == 1:
-				if b_skip_header == True:
-					continue
-				#end if we should skip the header
-			else:
+		if self.__columns is None:
+			return self.__get_database_rows_as_list_of_strings( ls_exclusive_cols, None )
+		#end if database rows not loaded
 
-				ls_line_as_list_of_strings= \
-						self.__get_list_of_strings_from_list_of_bytes( ar_line )
-
-				#If we are to collect only a subset of the columns,
-				#reduce the list:
-				if li_exclusive_col_nums is not None:
-					ls_line_as_list_of_strings=[ ls_line_as_list_of_strings[ i ] \
-														for i in li_exclusive_col_nums ]
-				#end if we have exlcusive col nums
-
-				s_entry=self.__myclassname.DELIM_TABLE.join( \
-													ls_line_as_list_of_strings )
-				ls_entries.append( s_entry )
-			#end if header, check for header incluseion, else append
-		#end for each line in array
+		ar_row_numbers=numpy.arange( self.__total_data_rows )
+
+		ls_entries=self.__get_rows_as_list_of_strings( ar_row_numbers, 
+															li_exclusive_col_nums )
 		return ls_entries
-	#end def __get_filtered_table_as_list_of_strings
+	#end def __get_unfiltered_table_as_list_of_strings
 
 	def __write_filtered_table_to_open_file_object( self, o_open_file ):
 
@@ -555,10 +1269,56 @@ class NeEstimationTableFileManager(object):
 		return li_field_numbers
 	#end __get_data_field_numbers
 
+	def __get_filtered_rows_grouped_by_columns( self, li_group_col_nums ):
+		'''
+		Groups the rows that pass the current filters on their
+		values in the columns given by li_group_col_nums, using 
+		numpy.unique on the columns' codes, rather than building
+		a string key for each row.
+
+		Returns a tuple, ( ar_row_numbers, lt_groups ), where ar_row_numbers 
+		gives the filtered rows ordered by group (and in file order within
+		a group), and lt_groups a list of tuples, ( ls_group_values, i_start, i_end ),
+		one per group, in the order in which the groups first appear in the 
+		file, such that ar_row_numbers[ i_start : i_end ] are the group's rows.
+		'''
+		ar_filtered_rows=numpy.flatnonzero( self.__get_filter_mask() )
+
+		if len( ar_filtered_rows ) == 0:
+			return ( ar_filtered_rows, [] )
+		#end if no rows pass the filters
+
+		ar_keys=numpy.column_stack( [ self.__get_columns()[ i_col ].codes[ ar_filtered_rows ] \
+														for i_col in li_group_col_nums ] )
+
+		ar_unique_keys, ar_first_rows, ar_inverse=numpy.unique( ar_keys, axis=0,
+																return_index=True,
+																return_inverse=True )
+		ar_inverse=ar_inverse.ravel()
+
+		ar_order=numpy.argsort( ar_inverse, kind="stable" )
+		ar_group_sizes=numpy.bincount( ar_inverse, minlength=len( ar_unique_keys ) )
+		ar_group_ends=numpy.cumsum( ar_group_sizes )
+		ar_group_starts=ar_group_ends - ar_group_sizes
+
+		lt_groups=[]
+		for idx_group in numpy.argsort( ar_first_rows, kind="stable" ):
+			ls_group_values=[ self.__get_columns()[ i_col ].levels[ i_code ] \
+								for i_col, i_code in zip( li_group_col_nums, 
+														ar_unique_keys[ idx_group ] ) ]
+			lt_groups.append( ( ls_group_values, int( ar_group_starts[ idx_group ] ), 
+														int( ar_group_ends[ idx_group ] ) ) )
+		#end for each group, in order of first appearance
+
+		return ( ar_filtered_rows[ ar_order ], lt_groups )
+	#end __get_filtered_rows_grouped_by_columns
+
 	def	__get_dict_data_by_group_names( self, ls_group_by_column_names, 
 												ls_data_column_names,
 												b_skip_header=True ):
 
+		o_myc=NeEstimationTableFileManager
+
 		li_grouping_field_number_by_sorted_field_names = \
 				self.__get_grouping_field_numbers_sorted_by_field_name( ls_group_by_column_names )
 
@@ -566,26 +1326,52 @@ class NeEstimationTableFileManager(object):
 
 		ls_grouping_values=self.__get_list_groupings(ls_group_by_column_names )
 
-		ls_data_lines=self.getFilteredTableAsList( b_skip_header=b_skip_header )
-
 		dls_grouped_data_lines = { s_grouping:[]  for s_grouping in  ls_grouping_values }
 
-		i_data_line_num=0
+		lt_groups_and_lines=[]
 
-		for s_line in ls_data_lines:
+		if not b_skip_header:
+			ls_header=self.__header_rows[ 0 ]
+			lt_groups_and_lines.append( \
+					( o_myc.DELIM_GROUPED_FIELD_NAMES.join( [ ls_header[ idx ] \
+								for idx in li_grouping_field_number_by_sorted_field_names ] ),
+					[ self.__get_header_as_string( li_data_field_numbers_by_field_names ) ] ) )
+		#end if we include the header
 
-			i_data_line_num+=1
-			
-			ls_vals=s_line.split( self.__myclassname.DELIM_TABLE )
-			
-			s_group_name=NeEstimationTableFileManager.DELIM_GROUPED_FIELD_NAMES.join( [ ls_vals[ idx ] \
-					for idx in li_grouping_field_number_by_sorted_field_names ] )
+		dv_database_filters=self.__get_database_filters()
+
+		if dv_database_filters is not None:
+			'''
+			2026_10_19.  The database groups the rows, joining the
+			group values in the same (sorted column name) order.
+			'''
+			o_database=NeEstimationDatabase( self.__filename )
+			try:
+				dls_database_lines=o_database.getGroupedDataLines( ls_group_by_column_names,
+																	ls_data_column_names,
+																	dv_database_filters )
+			finally:
+				o_database.close()
+			#end try...finally
+
+			lt_groups_and_lines+=list( dls_database_lines.items() )
+		else:
+			ar_row_numbers, lt_groups=self.__get_filtered_rows_grouped_by_columns( \
+												li_grouping_field_number_by_sorted_field_names )
 
-			s_data_this_line=self.__myclassname.DELIM_TABLE.join( [ ls_vals[idx] \
-									for idx in li_data_field_numbers_by_field_names ] )
+			ls_data_lines=self.__get_rows_as_list_of_strings( ar_row_numbers, 
+													li_data_field_numbers_by_field_names )
+
+			for ls_group_values, i_start, i_end in lt_groups:
+				lt_groups_and_lines.append( ( o_myc.DELIM_GROUPED_FIELD_NAMES.join( ls_group_values ), 
+														ls_data_lines[ i_start : i_end ] ) )
+			#end for each group
+		#end if the database can filter and group, else do so in memory
+
+		for s_group_name, ls_lines in lt_groups_and_lines:
 
 			try:
-				dls_grouped_data_lines[ s_group_name ].append( s_data_this_line )
+				dls_grouped_data_lines[ s_group_name ]+=ls_lines
 			except KeyError as ove:
 				s_msg="In NeEstimationTableFileManager instance, " \
 							+ "def __get_dict_data_by_group_names, " \
@@ -593,7 +1379,7 @@ class NeEstimationTableFileManager(object):
 							+ "the grouping values, " + s_group_name + "."
 				raise Exception( s_msg )
 			#end try...except...
-		#end for each data line
+		#end for each group
 		return dls_grouped_data_lines
 	#end  def  __get_dict_data_by_group_names
 
@@ -659,27 +1445,33 @@ class NeEstimationTableFileManager(object):
 				self.__get_list_of_column_numbers_for_list_of_column_names( \
 														ls_value_column_names )
 
-		ls_data_lines=self.getFilteredTableAsList( b_skip_header=b_skip_header )
-		
 		df_data_keyed_to_colnames={}
 
-		for s_line in ls_data_lines:
-			ls_vals=s_line.split( o_myc.DELIM_TABLE ) 
-			ls_key=[ ls_vals[ idx ]  for idx in li_key_column_numbers ]		
-			s_key=o_myc.DELIM_GROUPED_FIELD_NAMES.join( ls_key )
+		if not b_skip_header:
+			ls_header=self.__header_rows[ 0 ]
+			s_key=o_myc.DELIM_GROUPED_FIELD_NAMES.join( [ ls_header[ idx ] \
+												for idx in li_key_column_numbers ] )
+			df_data_keyed_to_colnames[ s_key ]=[ \
+						self.__get_header_as_string( li_value_column_numbers ) ]
+		#end if we include the header
 
-			ls_values=[ ls_vals[ idx ] for idx in li_value_column_numbers ]
-			
-			#We deliver the value field values delimited iusing
-			#the same delimiter as used by the orig table (tsv):
-			s_values=o_myc.DELIM_TABLE.join( ls_values )
+		ar_row_numbers, lt_groups=self.__get_filtered_rows_grouped_by_columns( \
+																li_key_column_numbers )
+	
+		#We deliver the value field values delimited iusing
+		#the same delimiter as used by the orig table (tsv):
+		ls_values=self.__get_rows_as_list_of_strings( ar_row_numbers, 
+														li_value_column_numbers )
+
+		for ls_key, i_start, i_end in lt_groups:
+			s_key=o_myc.DELIM_GROUPED_FIELD_NAMES.join( ls_key )
 			
 			if s_key in df_data_keyed_to_colnames:
-				df_data_keyed_to_colnames[ s_key ].append( s_values )	
+				df_data_keyed_to_colnames[ s_key ]+=ls_values[ i_start : i_end ]
 			else:
-				df_data_keyed_to_colnames[ s_key ] = [ s_values ]
+				df_data_keyed_to_colnames[ s_key ]=ls_values[ i_start : i_end ]
 			#end if key already in dict, else not
-		#end for each data line
+		#end for each group
 
 		return df_data_keyed_to_colnames
 	#end getDictDataLinesKeyedToColnames
@@ -692,26 +1484,74 @@ class NeEstimationTableFileManager(object):
 			a boolean.  The usual case, if filtering for one value, say, v1,
 			would be a def like, lambda x: x==v1. If def_filter is set to None, 
 			no filter will be applied to this column. Setting to None is the 
-			way to effectively remove a previously set filter.
+			way to effectively remove a previously set filter.  def_filter
+			can also be an NeEstimationTableFilter object, as made by the 
+			setEqualsFilter, setInSetFilter, setNotInSetFilter and 
+			setRangeFilter defs, which filter without calling python code 
+			for each of the column's values.
 		'''
-		b_column_name=self.__get_bytes_from_string_value( s_column_name )
-		ar_col_numbers=self.__get_col_nums_for_col_name( b_column_name )
+		ar_col_numbers=self.__get_col_nums_for_col_name( s_column_name )
 		if len( ar_col_numbers ) != 1:
 			s_msg="In NeEstimationTableFileManager instance, " \
 							+ "def setFilter, " \
 							+ "in fetching column number for sample value " \
 							+ "from the file header, a non unique column " \
 							+ "number was returned, using column " \
-							+ "name: " + str( b_column_name ) + ", and getting list of " \
+							+ "name: " + str( s_column_name ) + ", and getting list of " \
 							+ "column numbers: " + str( ar_col_numbers ) + "."
 			raise Exception( s_msg )
 		#end if non uniq col number
 
 		self.__filters[ ar_col_numbers[ 0 ] ] = def_filter
+		self.__column_masks.pop( ar_col_numbers[ 0 ], None )
+		self.__filter_mask=None
 	#end setFilter
 
+	def setEqualsFilter( self, s_column_name, s_value ):
+		'''
+		Filter the column to include only rows whose value is s_value.
+		'''
+		self.setFilter( s_column_name, 
+				NeEstimationTableFilter( NeEstimationTableFilter.EQUALS, v_value=s_value ) )
+		return
+	#end setEqualsFilter
+
+	def setInSetFilter( self, s_column_name, ls_values ):
+		'''
+		Filter the column to include only rows whose value is in ls_values.
+		'''
+		self.setFilter( s_column_name, 
+				NeEstimationTableFilter( NeEstimationTableFilter.IN_SET, v_value=ls_values ) )
+		return
+	#end setInSetFilter
+
+	def setNotInSetFilter( self, s_column_name, ls_values ):
+		'''
+		Filter the column to exclude rows whose value is in ls_values,
+		as, for example, the "NA" values in the estimate columns.
+		'''
+		self.setFilter( s_column_name, 
+				NeEstimationTableFilter( NeEstimationTableFilter.NOT_IN_SET, v_value=ls_values ) )
+		return
+	#end setNotInSetFilter
+
+	def setRangeFilter( self, s_column_name, f_min=None, f_max=None ):
+		'''
+		Filter the column to include only rows whose value, as a 
+		number, is within the inclusive limits f_min and f_max.  Either
+		limit can be None, for no limit.  Rows whose value is not a number 
+		are excluded.
+		'''
+		self.setFilter( s_column_name, 
+				NeEstimationTableFilter( NeEstimationTableFilter.RANGE, 
+													f_min=f_min, f_max=f_max ) )
+		return
+	#end setRangeFilter
+
 	def unsetAllFilters( self ):
 		self.__filters={}
+		self.__column_masks={}
+		self.__filter_mask=None
 		return
 	#end unsetAllFilters
 
@@ -762,8 +1602,7 @@ class NeEstimationTableFileManager(object):
 			raise Exception( s_msg )
 		#end if no such col name
 
-		b_column_name=self.__get_bytes_from_string_value( s_colname )
-		ar_col_numbers=self.__get_col_nums_for_col_name( b_column_name )
+		ar_col_numbers=self.__get_col_nums_for_col_name( s_colname )
 
 		if len( ar_col_numbers ) != 1:
 			s_msg="In NeEstimationTableFileManager instance, " \
@@ -771,24 +1610,62 @@ class NeEstimationTableFileManager(object):
 							+ "in fetching column number for sample value " \
 							+ "from the file header, a non unique column " \
 							+ "number was returned, using column " \
-							+ "name: " + str( b_column_name ) + ", and getting list of " \
+							+ "name: " + str( s_colname ) + ", and getting list of " \
 							+ "column numbers: " + str( ar_col_numbers ) + "."
 			raise Exception( s_msg )
 		#end if non uniq col number
 
-		lb_column_values=list( self.__get_set_values_for_column( ar_col_numbers[ 0 ] ) )
-		ls_column_values=self.__get_list_of_strings_from_list_of_bytes( lb_column_values )
+		ls_column_values=self.__get_list_values_for_column( ar_col_numbers[ 0 ] )
 
 		return ls_column_values
 
 	#end getUniqueStringValuesForColumn
 
 	def getColumnNumberByName( self, s_column_name ):
-		b_column_name = self.__get_bytes_from_string_value( s_column_name )
-		li_column_nums=self.__get_col_nums_for_col_name( b_column_name )
+		li_column_nums=self.__get_col_nums_for_col_name( s_column_name )
 		return li_column_nums[ 0 ]
 	#end getColumnNumberByName
 
+	def getTypedColumnValues( self, s_column_name, b_apply_filters=False ):
+		'''
+		Returns a numpy array of the column's values for the data lines,
+		typed int64 or float64 when every value in the column converts 
+		to that type, else an object array of the strings.  If 
+		b_apply_filters is True, only rows passing the current filters 
+		are included.
+		'''
+		i_col_num=self.getColumnNumberByName( s_column_name )
+		o_column=self.__get_columns()[ i_col_num ]
+
+		ar_values=o_column.values if o_column.values is not None \
+												else o_column.getStrings()
+		if b_apply_filters:
+			ar_values=ar_values[ self.__get_filter_mask() ]
+		#end if we should filter
+
+		return ar_values
+	#end getTypedColumnValues
+
+	def getColumn( self, s_column_name ):
+		'''
+		Returns the NeEstimationTableColumn for the named column,
+		giving its levels and per-row codes, for clients that
+		want to group or convert rows once per unique value.
+		Filters are not applied.
+		'''
+		i_col_num=self.getColumnNumberByName( s_column_name )
+		return self.__get_columns()[ i_col_num ]
+	#end getColumn
+
+	def getColumnType( self, s_column_name ):
+		'''
+		Returns one of the NeEstimationTableColumn TYPE_* values,
+		as inferred from the column's values when the file was loaded.
+		'''
+		i_col_num=self.getColumnNumberByName( s_column_name )
+		return self.__get_columns()[ i_col_num ].column_type
+	#end getColumnType
+
 	'''
 	These two columns' value sets are given as properties because
 	these are the motivating-user-case fields needed to select one
@@ -796,51 +1673,49 @@ class NeEstimationTableFileManager(object):
 	'''
 	@property 
 	def pop_sample_values( self ):
-		lb_pop_sample_values=self.__get_list_bytes_pop_sample_values()
-		ls_pop_sample_values=self.__get_list_of_strings_from_list_of_bytes( lb_pop_sample_values )
+		ls_pop_sample_values=self.__get_list_values_for_column_name( \
+								self.__myclassname.COL_NAME_POP_SAMPLE_VAL )
 		return ls_pop_sample_values
 	#end property pop_sample_values
 	
 	@property
 	def loci_sample_values( self ):
-		lb_loci_sample_values=self.__get_list_bytes_loci_sample_values()
-		ls_loci_sample_values=self.__get_list_of_strings_from_list_of_bytes( lb_loci_sample_values )
+		ls_loci_sample_values=self.__get_list_values_for_column_name( \
+								self.__myclassname.COL_NAME_LOCI_SAMPLE_VAL )
 		return ls_loci_sample_values
 	#end property loci_sample_values
 
 	@property
 	def header( self ):
-		ls_header_as_strings=self.__get_list_of_strings_from_list_of_bytes(  \
-															self.__table_array[ 0, : ] )
-		s_header=self.__myclassname.DELIM_TABLE.join( ls_header_as_strings )
+		s_header=self.__get_header_as_string( None )
 		return s_header
 	#end property header
 
 	@property 
 	def file_names(self ):
-		lb_file_names=self.__get_list_bytes_file_names()
-		ls_file_names=self.__get_list_of_strings_from_list_of_bytes( lb_file_names )
+		ls_file_names=self.__get_list_values_for_column_name( \
+								self.__myclassname.COL_NAME_FILE_NAME )
 		return ls_file_names
 	#end property file_names
 
 	@property
 	def pop_numbers( self ):
-		lb_pop_numbers=self.__get_list_bytes_pop_numbers()
-		ls_pop_numbers=self.__get_list_of_strings_from_list_of_bytes( lb_pop_numbers )
+		ls_pop_numbers=self.__get_list_values_for_column_name( \
+								self.__myclassname.COL_NAME_POP_NUM )
 		return ls_pop_numbers
 	#end pop_numbers
 
 	@property
 	def pop_replicate_numbers( self ):
-		lb_pop_replicates=self.__get_list_bytes_pop_replicate_numbers()
-		ls_pop_replicates=self.__get_list_of_strings_from_list_of_bytes( lb_pop_replicates )
+		ls_pop_replicates=self.__get_list_values_for_column_name( \
+								self.__myclassname.COL_NAME_POP_REPLICATE )
 		return ls_pop_replicates
 	#end pop_numbers
 
 	@property
 	def loci_replicate_numbers( self ):
-		lb_loci_replicates=self.__get_list_bytes_loci_replicate_numbers()
-		ls_loci_replicates=self.__get_list_of_strings_from_list_of_bytes( lb_loci_replicates )
+		ls_loci_replicates=self.__get_list_values_for_column_name( \
+								self.__myclassname.COL_NAME_LOCI_REPLICATE )
 		return ls_loci_replicates
 	#end pop_numbers
 
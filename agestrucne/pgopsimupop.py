@@ -38,6 +38,19 @@ LD_SAMPLE_LOCI_LINKED=True
 LD_SAMPLE_LOCI_UNLINKED=True
 LD_NUM_PAIRS=10000
 
+'''
+2026_10_19. When True, the initial genotypes
+for all loci are drawn with numpy and set by
+a single PyOperator (see def __initGenotypesInBulk),
+instead of by one sp.InitGenotype operator per
+locus, which, with large SNP panels, dominates
+startup time. The max sets how many allele values
+(individuals * ploidy * loci) are drawn per chunk
+of individuals.
+'''
+USE_BULK_GENOTYPE_INIT=True
+BULK_GENOTYPE_INIT_MAX_VALUES_PER_CHUNK=int( 1e7 )
+
 '''
 simuPOP offers these lD metrics (see
 http://simupop.sourceforge.net/manual_svn/build/
@@ -74,6 +87,8 @@ import agestrucne.pginputsimupop as pgin
 #and PWOP Nb estimnates:
 import agestrucne.pgoutputsimupop as pgout
 
+import agestrucne.pgparallelcompressor as pgcomp
+
 from simuOpt import simuOptions
 simuOptions["Quiet"] = True
 import simuPOP as sp
@@ -82,6 +97,8 @@ import random
 import numpy
 import copy
 import os
+import hashlib
+import uuid
 
 '''
 2018_07_05. We use the natsort "realsorted"
@@ -104,6 +121,19 @@ no loci file is to be used.
 import agestrucne.pgsimupoplociinfo as pgsimloci
 NO_LOCI_FILE=pgsimloci.NO_LOCI_FILE
 
+'''
+2026_10_19.  Constant-time weighted draws for the 
+age classes of parents (see def __litterSkipGenerator).
+'''
+from agestrucne.pgutilityclasses import WeightedIndexSampler
+
+'''
+2026_10_19.  Age and sex histograms, read in bulk once per
+generation, and shared by defs __calcDemo, __outputAge 
+and __harvest.
+'''
+from agestrucne.pgutilityclasses import DemographyTracker
+
 '''
 2018_06_06.  A central location to set
 the precision to apply to the inititialization
@@ -142,6 +172,25 @@ to truncnorm.
 SNP_ALLELE_FREQ_DISTRIBUTION="truncnorm"
 #SNP_ALLELE_FREQ_DISTRIBUTION="fixed_uniform"
 
+'''
+2026_10_19. Input parameters that have no effect on the
+population through the end of the burn-in cycles, and so
+are left out of the key that names a burn-in snapshot file
+(see def __setBurnInSnapshotFile).  The per-cycle Nb 
+adjustments, derived from "nbadjustment", are keyed only 
+for the burn-in cycles.
+'''
+PARAMS_NOT_AFFECTING_BURNIN=[ "config_file", "life_table_glob", "param_names", 
+								"dataDir", "reps", "startSave", "gens", 
+								"do_cycle_filter", "cycle_filter", "nbadjustment",
+								"do_het_filter", "het_filter", "tolerance_tries",
+								"tolerance_mode", "burnin_snapshot_dir",
+								"block_compress_genepop", "genepop_loci_ranges",
+								"compress_output", "compression_codec",
+								"compression_level", "compression_processes" ]
+BURNIN_SNAPSHOT_FILE_PREFIX="burnin_snapshot_"
+BURNIN_SNAPSHOT_FILE_EXT=".pop"
+
 
 '''
 2017_03_26. This mod-level def
@@ -213,6 +262,21 @@ class PGOpSimuPop( modop.APGOperation ):
 
 	POP_HET_FILTER_STRING_DELIM=","
 
+	'''
+	2026_10_19.  Values for the input's tolerance_mode, used
+	in def __restrictedGenerator.  In incremental mode, each 
+	try at the Nb tolerance can make up to this many single-pair 
+	replacements per pair, before the cycle's pairs are redrawn.
+	These are in addition to the N0 pairs drawn for each try, so
+	a cycle that fails the tolerance after the input's maximum 
+	tries draws up to ( 1 + LOCAL_MOVES_PER_PAIR ) times as many 
+	pairs as it would in regenerate mode, that is, up to 
+	11 x N0 x ( tries + 1 ).
+	'''
+	TOLERANCE_MODE_REGENERATE="regenerate"
+	TOLERANCE_MODE_INCREMENTAL="incremental"
+	LOCAL_MOVES_PER_PAIR=10
+
 
 	def __init__(self, o_input, o_output, b_compress_output=False, 
 									b_remove_db_gen_sim_files=False,
@@ -220,7 +284,12 @@ class PGOpSimuPop( modop.APGOperation ):
 									b_do_gui_messaging=False,
 									b_write_the_once_only_files=False,
 									b_is_replicate_1=False,
-									i_output_mode=OUTPUT_GENEPOP_ONLY ):  
+									i_output_mode=OUTPUT_GENEPOP_ONLY,
+									b_block_compress_genepop=False,
+									lt_genepop_loci_ranges=None,
+									s_compression_codec=pgcomp.CODEC_BZ2,
+									i_compression_level=None,
+									i_compression_processes=1 ):  
 
 		'''
 			o_input, a PGInputSimuPop object
@@ -271,6 +340,24 @@ class PGOpSimuPop( modop.APGOperation ):
 			i_output_mode.  This param was added 2017_08_04 to speed up
 				the output and skip writing the *gen *db and *sim files used
 				by Tiago in his original pipeline.  
+			b_block_compress_genepop.  When b_compress_output is True, 
+				and this flag is True, the genepop file is compressed as
+				a block-compressed genepop file with an index, which a
+				GenepopFileManager can read without first decompressing
+				(see module genepopblockfile.py).
+			lt_genepop_loci_ranges.  Added 2026_10_19.  If not None, a list
+				of ( first, last ) one-based, inclusive loci indices.  For 
+				each range, a genepop file with only those loci (ex: the 
+				microsats only, or the SNPs only) is written, as is the 
+				full genepop file, during the simulation (see class 
+				PGGenepopTeeWriter in module pgoutputsimupop.py).
+			s_compression_codec, i_compression_level, i_compression_processes.
+				Added 2026_10_19.  When b_compress_output is True, the codec 
+				(one of pgparallelcompressor.CODECS, "bz2", "gzip", "lzma"),
+				level (None gives the codec's default), and total processes 
+				used to compress the output files (see def compressAllFiles
+				in module pgoutputsimupop.py).  The defaults give the 
+				original, single-process bz2 at level 9.
 		'''
 
 		self.__guiinfo=None
@@ -296,6 +383,12 @@ class PGOpSimuPop( modop.APGOperation ):
 		self.__reportOps = [ sp.Stat(popSize=True) ]
 		self.__is_prepared=False
 		self.__compress_output=b_compress_output
+		self.__block_compress_genepop=b_block_compress_genepop
+		self.__genepop_loci_ranges=lt_genepop_loci_ranges
+		pgcomp.validate_codec( s_compression_codec )
+		self.__compression_codec=s_compression_codec
+		self.__compression_level=i_compression_level
+		self.__compression_processes=i_compression_processes
 		self.__remove_db_gen_sim_files=b_remove_db_gen_sim_files
 		self.__write_input_as_config_file=b_write_input_as_config_file
 		self.__write_once_only_files=b_write_the_once_only_files
@@ -364,6 +457,35 @@ class PGOpSimuPop( modop.APGOperation ):
 		self.__file_for_nb_records=None
 		self.__file_for_age_counts=None
 
+		'''
+		2026_10_19. Records, for each cycle given the Nb tolerance 
+		test, the pair draws and replacements it took to pass.
+		'''
+		self.__file_for_nb_tolerance_tries=None
+
+		'''
+		2026_10_19. The LD sample file (see def __write_ld_on_sample),
+		kept open, buffered, across cycles, and the loci positions and 
+		chromosome indices, which do not change during the simulation.
+		'''
+		self.__file_for_ld_sample=None
+		self.__ld_loci_layout=None
+
+		'''
+		2026_10_19. Made in def __createAge, updated once per
+		generation by def __updateDemography (see class
+		DemographyTracker in module pgutilityclasses).
+		'''
+		self.__demography_tracker=None
+
+		'''
+		2026_10_19. When USE_BULK_GENOTYPE_INIT is True, the initial
+		allele frequencies by locus, as a tuple, ( SNP loci indices,
+		SNP allele 1 frequencies, list of ( microsat locus index, allele 
+		frequencies ) ), used by def __initGenotypesInBulk.
+		'''
+		self.__bulk_genotype_init_freqs=None
+
 		'''
 		2017_08_08. This file will be created
 		when the het filter is applied,
@@ -444,6 +566,7 @@ class PGOpSimuPop( modop.APGOperation ):
 		we set this as the int-coverted value, in prepareOp:
 		'''
 		self.__max_tries_at_tolerance=None
+		self.__tolerance_mode=None
 
 		'''
 		2018_05_27. We have added a new parameter,
@@ -471,8 +594,18 @@ class PGOpSimuPop( modop.APGOperation ):
 		and __createGenomeFromLociFile
 		'''
 		self.__user_supplied_allele_frequencies=None
-		
-		
+
+		'''
+		2026_10_19.  When the input's burnin_snapshot_dir is set,
+		the file for the population as it is at the end of the
+		burn-in cycles, and the total cycles it covers (see def
+		__setBurnInSnapshotFile).  The flag is True when prepareOp
+		loaded the population from an existing snapshot file.
+		'''
+		self.__burnin_snapshot_file=None
+		self.__burnin_snapshot_cycles=0
+		self.__burnin_snapshot_loaded=False
+
 		return
 	#end __init__
 
@@ -502,7 +635,11 @@ class PGOpSimuPop( modop.APGOperation ):
 	#end if use gui messaging
 
 	def __setup_genepop_file( self ):
-		self.output.openGenepop()
+		'''
+		2026_10_19.  The genepop file, and any loci-range genepop
+		files, are now opened together, and written through the
+		output object's genepop_tee, in both output modes. 
+		'''
 		f_this_nbne=0.0
 		if hasattr( self.input, "NbNe" ):
 			f_this_nbne=self.input.NbNe
@@ -537,12 +674,10 @@ class PGOpSimuPop( modop.APGOperation ):
 		#end if genome intitialized using totals, else user
 		#supplied per-loci info.
 
-		self.output.writeGenepopFileHeaderAndLociList( \
-											self.output.genepop,
-											i_total_loci,
-											f_this_nbne,
-											b_do_compress=False,
-											o_simupop_population=o_reference_to_pop )
+		self.output.openGenepopTee( i_total_loci,
+									f_this_nbne,
+									lt_loci_ranges=self.__genepop_loci_ranges,
+									o_simupop_population=o_reference_to_pop )
 		return
 	#end __setup_genepop_file
 
@@ -602,6 +737,7 @@ class PGOpSimuPop( modop.APGOperation ):
 			to use it in def __restrictedGenerator:
 			'''
 			self.__max_tries_at_tolerance=int( self.input.tolerance_tries )
+			self.__tolerance_mode=self.input.tolerance_mode
 
 			'''
 			2017_03_08.  This call converts the list
@@ -648,7 +784,27 @@ class PGOpSimuPop( modop.APGOperation ):
 
 			self.__createSinglePop()
 
-			if self.__user_supplied_loci_info is not None:
+			'''
+			2026_10_19. If a burn-in snapshot exists for these
+			parameters we use its population, and skip the
+			(costly) fitting of the initial allele frequencies.
+			'''
+			self.__setBurnInSnapshotFile()
+
+			if self.__burnin_snapshot_file is not None \
+					and os.path.isfile( self.__burnin_snapshot_file ):
+				self.__pop=sp.loadPopulation( self.__burnin_snapshot_file )
+				self.__burnin_snapshot_loaded=True
+			#end if we have a snapshot to load
+
+			if self.__burnin_snapshot_loaded:
+				if self.__user_supplied_loci_info is not None:
+					self.__genInitOps=[]
+					self.__genPreOps=[]
+				else:
+					self.__createGenomeFromSNPAndMSatTotals( b_make_init_ops=False )
+				#end if user loci, no mutation ops, else get the mutation ops
+			elif self.__user_supplied_loci_info is not None:
 				'''
 				2018_07_27. With the addition of an option to add
 				per-loci allele frequencies to the user-supplied loci info file,
@@ -668,8 +824,12 @@ class PGOpSimuPop( modop.APGOperation ):
 			#end if we are using a loci info file,
 			#else no such file
 
-			self.__createAge()	
-			
+			self.__createAge()
+
+			if self.__burnin_snapshot_loaded:
+				self.__restoreStateFromBurnInSnapshot()
+			#end if loaded a snapshot
+
 			s_basename_without_replicate_number=self.output.basename	
 			
 			if VERY_VERBOSE==True:
@@ -699,6 +859,12 @@ class PGOpSimuPop( modop.APGOperation ):
 								in range( 1, self.__total_ages_for_age_file + 1 ) ] )
 
 				self.__file_for_age_counts.write( s_header + "\n" )
+
+				s_tolerance_tries_ext=pgout.PGOutputSimuPop.DICT_OUTPUT_FILE_EXTENSIONS[ "nb_tolerance_tries" ]
+				self.__file_for_nb_tolerance_tries=open( self.output.basename + s_tolerance_tries_ext, 'w' )
+				self.__file_for_nb_tolerance_tries.write( "\t".join( [ "generation", "mode", 
+														"pair_sets_drawn", "pair_replacements_tried",
+														"pair_replacements_kept", "nb" ] ) + "\n" )
 			#end if we are to write age counts and pwop nb values to file
 
 
@@ -706,6 +872,13 @@ class PGOpSimuPop( modop.APGOperation ):
 				self.output.openOut()
 				self.output.openErr()
 				self.output.openMegaDB()
+
+				'''
+				2026_10_19. The genepop file is now written as each
+				pop is recorded, rather than converted from the 
+				*gen file after the simulation.
+				'''
+				self.__setup_genepop_file()
 			elif self.__output_mode == PGOpSimuPop.OUTPUT_GENEPOP_ONLY:
 
 				self.__setup_genepop_file()
@@ -817,7 +990,9 @@ class PGOpSimuPop( modop.APGOperation ):
 				necessitated by python3, which otherwise produced emtpy files. Note
 				that a None value will simply return false for the hasattr test.
 				'''
-				for v_this in [ self.__file_for_nb_records, self.__file_for_age_counts, self.__file_for_het_filter ]:
+				for v_this in [ self.__file_for_nb_records, self.__file_for_age_counts, 
+									self.__file_for_het_filter, self.__file_for_nb_tolerance_tries,
+									self.__file_for_ld_sample ]:
 					if hasattr( v_this, "close" ):
 						v_this.close()
 					#end if a closable object, close it
@@ -827,16 +1002,34 @@ class PGOpSimuPop( modop.APGOperation ):
 					self.output.out.close()
 					self.output.err.close()
 					self.output.megaDB.close()
+					self.output.genepop_tee.close()
 
 					#note as of 2016_08_23, we don't compress the config file
 					if self.__compress_output:
 						s_conf_file=self.output.confname
-						s_genepop_file=self.output.genepopname
-						self.output.bz2CompressAllFiles( \
-									ls_files_to_skip=[ s_genepop_file,  s_conf_file ] )
+						ls_files_to_skip=[ s_conf_file ]
+						'''
+						2026_10_19.  Files we are about to remove
+						need not be compressed.  The genepop file, and
+						any loci-range genepop files, are now written 
+						during the simulation, rather than later by def
+						gen2Genepop, and so are compressed here, with
+						the other outputs.
+						'''
+						if self.__remove_db_gen_sim_files:
+							ls_files_to_skip+=[ self.output.simname,
+													self.output.genname,
+													self.output.dbname ]
+						#end if we will remove the sim, gen, db files
+
+						self.__compressOutputFiles( ls_files_to_skip )
 					#end if compress
 
-					self.__write_genepop_file()
+					'''
+					2026_10_19.  The genepop file was written during
+					the simulation, so we no longer call the 
+					(deprecated, now removed) def __write_genepop_file.
+					'''
 
 					if self.__remove_db_gen_sim_files:
 						#note that this call removes both compressed
@@ -849,7 +1042,7 @@ class PGOpSimuPop( modop.APGOperation ):
 
 				elif self.__output_mode == PGOpSimuPop.OUTPUT_GENEPOP_ONLY:
 
-					self.output.genepop.close()
+					self.output.genepop_tee.close()
 
 					if self.__compress_output:
 						'''
@@ -858,8 +1051,7 @@ class PGOpSimuPop( modop.APGOperation ):
 						not exist.  If called without excluding them
 						the def bz2CompressAllFiles will throw an error.
 						'''
-						self.output.bz2CompressAllFiles( \
-									ls_files_to_skip=[ self.output.genname,
+						self.__compressOutputFiles( [ self.output.genname,
 														self.output.simname,
 														self.output.dbname,
 														self.output.confname ] )
@@ -885,84 +1077,6 @@ class PGOpSimuPop( modop.APGOperation ):
 		return
 	#end doOp
 
-	def __write_genepop_file( self ):
-
-
-		'''
-		2018_07_30.
-		With the addition of an option for users to supply loci information 
-		in a file, we for now deprecate this def, which was created to leave
-		open the option to output the pops in the original format used by
-		Tiago Anteo in the AgeStructureNe code.  Because we have been, and
-		expect all future users to, use the GENEPOP output, we'll disable
-		this, instead of updating the way it fetches loci and loci totals:
-		'''
-
-		s_msg = "In PGOpSimuPop instance, def __write_genepopfile, " \
-					+ "this def has been deprecated in favor of the " \
-					+ "standard GENEPOP output format writer.  Please " \
-					+ "set the pgopsimupop.py module __output_mode member " \
-					+ "to its constant, mod-level value, \"OUTPUT_GENEPOP_ONLY\"" 
-		
-		raise Exception( s_msg )
-
-#		if self.__output_mode == PGOpSimuPop.OUTPUT_ORIG:
-#			i_num_msats=0
-#			i_num_snps=0
-#			
-#			if hasattr( self.input, PGOpSimuPop.INPUT_ATTRIBUTE_NUMBER_OF_MICROSATS ):
-#				i_num_msats=getattr( self.input, PGOpSimuPop.INPUT_ATTRIBUTE_NUMBER_OF_MICROSATS )
-#			#end if input has num msats
-#
-#			if hasattr( self.input, PGOpSimuPop.INPUT_ATTRIBUTE_NUMBER_OF_SNPS ):
-#				i_num_snps=getattr( self.input, PGOpSimuPop.INPUT_ATTRIBUTE_NUMBER_OF_SNPS )
-#			#end if input has number of snps
-#
-#			i_total_loci=None 
-#
-#			if self.__user_supplied_loci_info is None
-#
-#				i_total_loci=i_num_msats+i_num_snps
-#			else:
-#				i_total_loci=self.__user_supplied_loci_info.total_loci
-#			#####
-#
-#			if i_total_loci == 0:
-#				s_msg= "In %s instance, cannot write genepop file.  MSats and SNPs total zero."  \
-#						% type( self ).__name__ 
-#				sys.stderr.write( s_msg + "\n" )
-#			else:
-#				#writes all loci values 
-#				'''
-#				2017_05_30.  To accomodate new module pgdrivesimulation.py, which
-#				reads in a conf and does not require a life table, we default an
-#				NbNe value to zero if the conf file does not supply it.  Note that
-#				this parameter (Nb/Ne ratio) is not (currently) required for the 
-#				simulation, but is passed along in the genepop file header to allow 
-#				for an Nb bias adjustment as read-in and calculated by the 
-#				pgdriveneestimator.py module.
-#				'''
-#				f_this_nbne=0.0
-#
-#				if hasattr( self.input, "NbNe" ):
-#					f_this_nbne=self.input.NbNe
-#				#end if we have an NbNe value, use it.
-#
-#				self.output.gen2Genepop( 1, 
-#							i_total_loci, 
-#							b_pop_per_gen=True,
-#							b_do_compress=False,
-#							f_nbne_ratio=f_this_nbne )
-#			#end if no loci reported
-#		else:
-#			s_msg="In PGOpSimuPop instance, def __write_genepop_file, " \
-#						+ "this def was called but he output mode was " \
-#						+ "not for the original mode."
-#			raise Exception( s_msg )
-#		#end if output mode is orig else not
-		return
-	#end __write_genepop_file
-
 	def deliverResults( self ):
 		return
 	#end deliverResults
@@ -982,8 +1096,6 @@ class PGOpSimuPop( modop.APGOperation ):
 
 		i_num_snps=self.__user_supplied_loci_info.total_loci
 
-		i_snp_count=-1
-
 		lf_random_freqs=None
 
 		'''
@@ -1017,17 +1129,9 @@ class PGOpSimuPop( modop.APGOperation ):
 
 		#end if user has set init snp freq to zero, else use distribution
 
-		for f_random_freq in lf_random_freqs:		
-
-			i_snp_count+=1
-
-			initOps.append(
-					sp.InitGenotype(
-					#Position 0 is coded as 0, not good for genepop
-					freq=[0.0, f_random_freq, 1 - f_random_freq ],
-					loci=i_snp_count ))
-
-		#end for each snp frequency, initialize a loci
+		initOps=self.__makeGenotypeInitOps( list( range( i_num_snps ) ),
+												lf_random_freqs,
+												[] )
 
 		self.__genInitOps=initOps
 		self.__genPreOps=preOps
@@ -1059,20 +1163,9 @@ class PGOpSimuPop( modop.APGOperation ):
 
 		assert i_num_snps == len( self.__user_supplied_allele_frequencies )
 
-		i_snp_count=-1
-	
-		
-		for f_freq in self.__user_supplied_allele_frequencies:		
-
-			i_snp_count+=1
-
-			initOps.append(
-					sp.InitGenotype(
-					#Position 0 is coded as 0, not good for genepop
-					freq=[0.0, f_freq, 1 - f_freq ],
-					loci=i_snp_count ))
-
-		#end for each snp frequency, initialize a loci
+		initOps=self.__makeGenotypeInitOps( list( range( i_num_snps ) ),
+												self.__user_supplied_allele_frequencies,
+												[] )
 
 		self.__genInitOps=initOps
 		self.__genPreOps=preOps
@@ -1084,8 +1177,13 @@ class PGOpSimuPop( modop.APGOperation ):
 	'''
 	2018_07_30.  We rename this def from __createGenome to
 	__createGenomeFromSNPAndMSatTotals
+
+	2026_10_19. We add the param b_make_init_ops.  When False,
+	as when the population is loaded from a burn-in snapshot, 
+	we skip fitting the initial allele frequencies, and make
+	only the (mutation) pre-ops.
 	'''
-	def __createGenomeFromSNPAndMSatTotals( self ):
+	def __createGenomeFromSNPAndMSatTotals( self, b_make_init_ops=True ):
 
 		size = self.input.popSize
 		numMSats = self.input.numMSats
@@ -1113,7 +1211,18 @@ class PGOpSimuPop( modop.APGOperation ):
 		freqs that achieve the target het.
 		'''
 
-		for msat in range(numMSats):
+		i_msats_to_init=numMSats if b_make_init_ops else 0
+
+		'''
+		2026_10_19. We now collect the allele frequencies by 
+		locus, and make the init ops from them all at once
+		(see def __makeGenotypeInitOps).
+		'''
+		lt_msat_loci_and_freqs=[]
+		li_snp_loci=[]
+		lf_snp_freqs=[]
+
+		for msat in range(i_msats_to_init):
 			'''
 			Old call to get dirichlet on 1.0 alpha now replaced by call
 			to achieve an expected het:
@@ -1142,14 +1251,13 @@ class PGOpSimuPop( modop.APGOperation ):
 				diriList = list(diri)
 			#end if type
 
-			initOps.append(
-					sp.InitGenotype(freq=[0.0] * ((maxAlleleN + 1 - 8) // 2) +
-					diriList + [0.0] * ((maxAlleleN + 1 - 8) // 2),
-					loci=msat))
+			lt_msat_loci_and_freqs.append( ( msat, 
+					[0.0] * ((maxAlleleN + 1 - 8) // 2) +
+					diriList + [0.0] * ((maxAlleleN + 1 - 8) // 2) ) )
 		#end for msat
 
 	
-		if numSNPs > 0:
+		if numSNPs > 0 and b_make_init_ops:
 			'''
 			2018_05_24. We now generate a list of allele frequencies 
 			randomly drawn from a truncated ([0.0,1.0]) normal distribution
@@ -1158,8 +1266,6 @@ class PGOpSimuPop( modop.APGOperation ):
 			module, defs related to obtaining frequencies using the trunc 
 			normal distribution.
 			'''
-			i_snp_count=-1
-
 			lf_random_freqs=None
 
 			'''
@@ -1188,19 +1294,16 @@ class PGOpSimuPop( modop.APGOperation ):
 				#end if user wants 0.0 as init freq, else fixed uniform, else use random distribution
 				#named in SNP_ALLELE_FREQ_DISTRIBUTION
 
-			for f_random_freq in lf_random_freqs:		
-
-				i_snp_count+=1
-
-				initOps.append(
-						sp.InitGenotype(
-						#Position 0 is coded as 0, not good for genepop
-						freq=[0.0, f_random_freq, 1 - f_random_freq ],
-						loci=numMSats + i_snp_count))
-
-			#end for each snp frequency, initialize a loci
+			li_snp_loci=list( range( numMSats, numMSats + numSNPs ) )
+			lf_snp_freqs=lf_random_freqs
 		#end if we want at least one SNP
 
+		if b_make_init_ops:
+			initOps=self.__makeGenotypeInitOps( li_snp_loci,
+												lf_snp_freqs,
+												lt_msat_loci_and_freqs )
+		#end if we want init ops
+
 		preOps = []
 
 		if self.input.mutFreq > 0:
@@ -1215,6 +1318,96 @@ class PGOpSimuPop( modop.APGOperation ):
 		return
 	#end __createGenomeFromSNPAndMSatTotals
 
+	def __makeGenotypeInitOps( self, li_snp_loci, 
+										lf_snp_freqs,
+										lt_msat_loci_and_freqs ):
+		'''
+		2026_10_19. Returns the genotype init ops, given the SNP loci
+		indices, each SNP's allele 1 frequency (allele 2 has 1 - freq), 
+		and a list of ( microsat locus index, list of frequencies, indexed
+		by allele ).  When USE_BULK_GENOTYPE_INIT is False, we return the
+		original, one sp.InitGenotype per locus.  Otherwise we store the
+		frequencies and return a single PyOperator that sets the genotypes
+		of all loci (see def __initGenotypesInBulk).
+		'''
+		initOps=[]
+
+		if USE_BULK_GENOTYPE_INIT:
+			self.__bulk_genotype_init_freqs=( numpy.array( li_snp_loci, dtype=numpy.int64 ),
+												numpy.array( lf_snp_freqs, dtype=float ),
+												lt_msat_loci_and_freqs )
+
+			initOps.append( sp.PyOperator( func=self.__initGenotypesInBulk ) )
+		else:
+			for i_msat_locus, lf_msat_freqs in lt_msat_loci_and_freqs:
+				initOps.append(
+						sp.InitGenotype( freq=lf_msat_freqs, loci=i_msat_locus ) )
+			#end for each msat
+
+			for i_snp_locus, f_snp_freq in zip( li_snp_loci, lf_snp_freqs ):
+				initOps.append(
+						sp.InitGenotype(
+						#Position 0 is coded as 0, not good for genepop
+						freq=[0.0, f_snp_freq, 1 - f_snp_freq ],
+						loci=i_snp_locus ))
+			#end for each snp frequency, initialize a loci
+		#end if bulk init, else per-locus ops
+
+		return initOps
+	#end __makeGenotypeInitOps
+
+	def __initGenotypesInBulk( self, pop ):
+		'''
+		2026_10_19.  Sets the initial genotypes of all individuals at all
+		loci, drawing alleles as would the per-locus sp.InitGenotype ops
+		(each allele copy independently, by the locus' frequencies).  For
+		chunks of individuals we fill a numpy array (individual, ploidy,
+		locus), drawing all SNP alleles in one call, and each microsat's 
+		alleles in one call, then set each individual's genotype from its 
+		(ploidy-major) row.
+		'''
+		na_snp_loci, na_snp_freqs, lt_msat_loci_and_freqs=self.__bulk_genotype_init_freqs
+
+		i_num_loci=pop.totNumLoci()
+		i_ploidy=pop.ploidy()
+		i_pop_size=pop.popSize()
+
+		i_values_per_individual=max( 1, i_ploidy * i_num_loci )
+		i_individuals_per_chunk=max( 1, BULK_GENOTYPE_INIT_MAX_VALUES_PER_CHUNK \
+												// i_values_per_individual )
+
+		lt_msat_loci_and_probs=[]
+
+		for i_msat_locus, lf_msat_freqs in lt_msat_loci_and_freqs:
+			na_probs=numpy.array( lf_msat_freqs, dtype=float )
+			lt_msat_loci_and_probs.append( ( i_msat_locus, na_probs / na_probs.sum() ) )
+		#end for each msat, normalize its freqs for numpy.random.choice
+
+		for i_first in range( 0, i_pop_size, i_individuals_per_chunk ):
+
+			i_chunk_size=min( i_individuals_per_chunk, i_pop_size - i_first )
+
+			na_genotypes=numpy.zeros( ( i_chunk_size, i_ploidy, i_num_loci ), dtype=numpy.int32 )
+
+			if len( na_snp_loci ) > 0:
+				na_draws=numpy.random.random( ( i_chunk_size, i_ploidy, len( na_snp_loci ) ) )
+				na_genotypes[ :, :, na_snp_loci ]=numpy.where( na_draws < na_snp_freqs, 1, 2 )
+			#end if snps
+
+			for i_msat_locus, na_probs in lt_msat_loci_and_probs:
+				na_genotypes[ :, :, i_msat_locus ]=numpy.random.choice( len( na_probs ),
+																size=( i_chunk_size, i_ploidy ),
+																p=na_probs )
+			#end for each msat
+
+			for idx in range( i_chunk_size ):
+				pop.individual( i_first + idx ).setGenotype( na_genotypes[ idx ].ravel().tolist() )
+			#end for each individual in chunk
+		#end for each chunk of individuals
+
+		return True
+	#end __initGenotypesInBulk
+
 	def __get_dict_chromosome_number_by_loci_number_evenly_distributed ( self,
 																			i_number_of_loci, 
 																			i_number_of_chromosomes ):
@@ -1716,15 +1909,175 @@ class PGOpSimuPop( modop.APGOperation ):
 		#end if we are writing het-value-filtered pops, then we stop after the user-supplied limit
 		#is reached.
 
-		sim.evolve( initOps=genInitOps + popInitOps + ageInitOps,
+		'''
+		2026_10_19.  With a burn-in snapshot, we either start from the
+		loaded population, with no init ops, evolving only the cycles
+		after the burn-in, or, if the snapshot is not yet saved,
+		evolve the burn-in cycles, save the population, then continue.
+		simuPOP keeps the generation number in the population, so that
+		the second call to evolve picks up at the next cycle.
+		'''
+		initOps=genInitOps + popInitOps + ageInitOps
+		i_gens_to_evolve=gens
+
+		if self.__burnin_snapshot_loaded:
+			initOps=[]
+			i_gens_to_evolve=gens - self.__burnin_snapshot_cycles
+		elif self.__burnin_snapshot_file is not None:
+			sim.evolve( initOps=initOps,
+						preOps=popPreOps + genPreOps + agePreOps,
+						postOps=popPostOps + reportOps + agePostOps,
+						matingScheme=mateOp,
+						gen=self.__burnin_snapshot_cycles )
+
+			self.__saveBurnInSnapshot( sim.population( 0 ) )
+
+			initOps=[]
+			i_gens_to_evolve=gens - self.__burnin_snapshot_cycles
+		#end if we loaded a snapshot, else if we are to save one
+
+		sim.evolve( initOps=initOps,
 					preOps=popPreOps + genPreOps + agePreOps,
 					postOps=popPostOps + reportOps + agePostOps + stopOp,
 					matingScheme=mateOp,
-					gen=gens)
+					gen=i_gens_to_evolve )
 		##### end rem out and revise the evole op set by adding a stop when filtering pops by het value.
 
 	#end __evolveSim
 
+	def __setBurnInSnapshotFile( self ):
+		'''
+		2026_10_19.  If the input's burnin_snapshot_dir is set, and
+		there are burn-in cycles before the first recorded cycle,
+		sets the name of the file for the population as it is after
+		the burn-in.  The name includes a hash of the input parameters
+		that can affect the population through the burn-in, so that runs
+		that differ only in later parameters (replicates, startSave,
+		gens, Nb adjustments after the burn-in, output options) share
+		the file.
+		'''
+		s_dir=self.input.burnin_snapshot_dir \
+				if hasattr( self.input, "burnin_snapshot_dir" ) \
+				else pgin.NO_BURNIN_SNAPSHOT_DIR
+
+		if s_dir is None or s_dir == pgin.NO_BURNIN_SNAPSHOT_DIR:
+			return
+		#end if no snapshot dir
+
+		i_burnin_cycles=0 \
+				if self.input.startLambda >= PGOpSimuPop.VALUE_TO_IGNORE \
+				else self.input.startLambda
+
+		'''
+		Cycles at and after startSave are recorded, and the
+		last cycle must be evolved after the snapshot:
+		'''
+		i_snapshot_cycles=min( i_burnin_cycles,
+								self.input.startSave - 1,
+								self.input.gens - 1 )
+
+		if i_snapshot_cycles <= 0:
+			return
+		#end if no burn-in cycles to save
+
+		dv_params=self.input.getDictParamValuesByAttributeName()
+
+		ls_key_items=[ s_name + "=" + repr( dv_params[ s_name ] ) \
+							for s_name in sorted( dv_params ) \
+							if s_name not in PARAMS_NOT_AFFECTING_BURNIN ]
+
+		lf_burnin_adjustments=None \
+				if self.__nb_and_census_adjustment_by_cycle is None \
+				else list( self.__nb_and_census_adjustment_by_cycle[ : i_snapshot_cycles ] )
+
+		ls_key_items+=[ "burnin_adjustments=" + repr( lf_burnin_adjustments ),
+							"snapshot_cycles=" + str( i_snapshot_cycles ),
+							"msat_init_het_precision=" + repr( MSAT_INIT_HET_PRECISION ),
+							"snp_het_init_tolerances=" + repr( SNP_HET_INIT_TOLERANCES ),
+							"snp_allele_freq_distribution=" + SNP_ALLELE_FREQ_DISTRIBUTION ]
+
+		o_hash=hashlib.sha1( "\n".join( ls_key_items ).encode( "utf-8" ) )
+
+		#The loci file's contents, not just its name:
+		if self.__user_supplied_loci_info is not None:
+			with open( self.input.loci_file_name, 'rb' ) as o_loci_file:
+				o_hash.update( o_loci_file.read() )
+			#end with loci file
+		#end if user supplied loci
+
+		if not os.path.isdir( s_dir ):
+			try:
+				os.makedirs( s_dir )
+			except OSError:
+				#another replicate may have just made it:
+				if not os.path.isdir( s_dir ):
+					raise
+				#end if still no dir
+			#end try...except
+		#end if no dir
+
+		self.__burnin_snapshot_cycles=i_snapshot_cycles
+		self.__burnin_snapshot_file=os.path.join( s_dir,
+										BURNIN_SNAPSHOT_FILE_PREFIX \
+										+ o_hash.hexdigest() \
+										+ "_cycle_" + str( i_snapshot_cycles ) \
+										+ BURNIN_SNAPSHOT_FILE_EXT )
+		return
+	#end __setBurnInSnapshotFile
+
+	def __saveBurnInSnapshot( self, pop ):
+		'''
+		2026_10_19.  Saves the population, with the Nb target as it
+		is after any burn-in Nb adjustments (see def __harvest), to a
+		temporary name, then renames it, so that replicates running
+		in parallel never load a partly written file.
+		'''
+		pop.dvars().burnin_snapshot_target_nb=self.__targetNb
+		pop.dvars().burnin_snapshot_current_n0=self.__current_N0
+
+		s_temp_file=self.__burnin_snapshot_file + "." + str( uuid.uuid4() ) + ".tmp"
+
+		pop.save( s_temp_file )
+
+		if os.path.isfile( self.__burnin_snapshot_file ):
+			#saved meanwhile by another replicate:
+			os.remove( s_temp_file )
+		else:
+			os.rename( s_temp_file, self.__burnin_snapshot_file )
+		#end if already saved, else rename
+
+		return
+	#end __saveBurnInSnapshot
+
+	def __restoreStateFromBurnInSnapshot( self ):
+		'''
+		2026_10_19.  Called by prepareOp, after def __createAge, when
+		the population was loaded from a burn-in snapshot.  Restores
+		the Nb target, tolerance and N0 as the burn-in left them, and
+		resets simuPOP's (process-wide) individual ID counter, so that
+		new offspring do not take the IDs of the loaded individuals.
+		'''
+		dv_vars=self.__pop.vars()
+
+		if "burnin_snapshot_target_nb" in dv_vars \
+				and dv_vars[ "burnin_snapshot_target_nb" ] is not None:
+			self.__targetNb=dv_vars[ "burnin_snapshot_target_nb" ]
+			self.input.Nb=self.__targetNb
+			self.__set_nb_tolerance()
+		#end if we have a saved target Nb
+
+		if "burnin_snapshot_current_n0" in dv_vars:
+			self.__current_N0=dv_vars[ "burnin_snapshot_current_n0" ]
+		#end if we have a saved N0
+
+		i_max_id=int( max( self.__pop.indInfo( "ind_id" ) ) ) \
+						if self.__pop.popSize() > 0 else 0
+
+		sp.IdTagger().reset( i_max_id + 1 )
+
+		return
+	#end __restoreStateFromBurnInSnapshot
+
 	def __keep_collecting_filtered_pops( self, pop ):
 		'''
 		This pyOperator is used when the output mode is OUTPUT_GENEPOP_ONLY
@@ -1779,17 +2132,15 @@ class PGOpSimuPop( modop.APGOperation ):
 	def __calcDemo( self, gen, pop ):
 
 		v_return_value=None	
-		myAges = []
-		for age in range(self.input.ages - 2):
-			myAges.append(age + 1)
-		#end for age in range
 
-		curr = 0
+		'''
+		2026_10_19.  The count of individuals of ages 1 through
+		ages - 2 now comes from the demography tracker, rather than
+		from a loop over the individuals.
+		'''
+		o_demography=self.__getDemography( pop )
 
-		for i in pop.individuals():
-			if i.age in myAges:
-				curr += 1
-		#end for i in pop
+		curr = o_demography.getTotalInAgeRange( 1, self.input.ages - 2 )
 
 		#todo apply NB change here!!
 
@@ -1911,6 +2262,21 @@ class PGOpSimuPop( modop.APGOperation ):
 			#end if forceSkip . . . else
 		#end for i in range
 
+		'''
+		2026_10_19.  The age class weights are fixed for the 
+		generation, so, rather than a linear scan of the 
+		cumulative weights per parent (def __getRandomPos), 
+		we build alias tables once, and draw each parent's age 
+		class in constant time.  Likewise for litter sizes.
+		'''
+		o_female_age_sampler=WeightedIndexSampler( femaleFec )
+		o_male_age_sampler=WeightedIndexSampler( maleFec )
+		o_litter_size_sampler=None
+
+		if nLitter is None and self.input.litter:
+			o_litter_size_sampler=WeightedIndexSampler( self.input.litter )
+		#end if litter sizes are drawn
+
 		while True:
 
 			female = None
@@ -1920,10 +2286,19 @@ class PGOpSimuPop( modop.APGOperation ):
 			#end if len( next....
 
 			while not female:
-				age = self.__getRandomPos(femaleFec) + 1
-				if len(femalesAge.get(age, [])) > 0:
+				age = o_female_age_sampler.draw() + 1
+				lo_females_this_age=femalesAge.get(age, [])
+				if len(lo_females_this_age) > 0:
 
-					female = random.choice(femalesAge[age])
+					'''
+					2026_10_19. As does random.choice, but we keep the index,
+					so that we can remove a litter female from the list by 
+					moving its last item into her place, rather than by the 
+					linear list.remove.  The list's order is immaterial 
+					to the uniform draws.
+					'''
+					i_female_idx = random.randrange(len(lo_females_this_age))
+					female = lo_females_this_age[i_female_idx]
 
 					if nLitter is not None:
 						if availOfs[female] == 0:
@@ -1932,12 +2307,13 @@ class PGOpSimuPop( modop.APGOperation ):
 							availOfs[female] -= 1
 						#end if availOfs, else not
 					elif self.input.litter:
-						lSize = self.__getRandomPos(self.input.litter) + 1
+						lSize = o_litter_size_sampler.draw() + 1
 						if lSize > 1:
 							nextFemales = [female] * (lSize - 1)
 						#end if size>1
 
-						femalesAge[age].remove(female)
+						lo_females_this_age[i_female_idx] = lo_females_this_age[-1]
+						lo_females_this_age.pop()
 					#end if nLitter is not none elif litter
 				#end if len( femalsage . . . 
 			#end while not female
@@ -1951,7 +2327,7 @@ class PGOpSimuPop( modop.APGOperation ):
 			#end if isMonog
 
 			while male is None:
-				age = self.__getRandomPos(maleFec) + 1
+				age = o_male_age_sampler.draw() + 1
 				if len(malesAge.get(age, [])) > 0:
 					male = random.choice(malesAge[age])
 				#end if len malesage
@@ -1982,38 +2358,33 @@ class PGOpSimuPop( modop.APGOperation ):
 		#end while True
 	#end __litterSkipGenerator
 
-	def __calcNb( self, pop, pair ):
-		
+	def __getOffspringCounts( self, pop, pair ):
 		'''
-		2017_03_02 This float tolerance is added
-		in order to test the kbar value before using 
-		it as a divisor (below).  This to control
-		the error messaging when our new __harvest
-		def creates a population that causes a 
-		zero value for kbar.
+		2026_10_19.  Returns a dict of offspring counts, keyed
+		to ind_id, for each fecund individual in the pop, 
+		including those with no offspring in the pairs.  Replaces 
+		the per-individual scan of the pair list formerly done in 
+		def __calcNb, so that the counts take a single pass 
+		over the pop and one over the pairs.
 		'''
-		reltol=1e-90
 
 		fecms = self.input.fecundityMale
 		fecfs = self.input.fecundityFemale
-		cofs = []
+		d_counts = {}
 
 		for ind in pop.individuals():
 			if ind.sex() == 1:  # male
 				fecs = fecms
-				pos = 0
 			else:
-				pos = 1
 				fecs = fecfs
 			#end if sex==1 else not
 			
 			if fecs[int(ind.age) - 1] > 0:
-				nofs = len([x for x in pair if x[pos] == ind])
-				cofs.append(nofs)
+				d_counts[ ind.ind_id ] = 0
 			#end if fecs
 		#end for ind in pop
 
-		if len( cofs ) == 0:
+		if len( d_counts ) == 0:
 			s_msg="In PGOpSimuPop instance, " \
 					 + "def __calcNb, " \
 					 + "the program can't calculate " \
@@ -2025,10 +2396,41 @@ class PGOpSimuPop( modop.APGOperation ):
 
 			raise Exception( s_msg )
 		#end if no pairs of fecund indivs found
-							
-		kbar = 2.0 * self.__current_N0 / len(cofs)
 
-		Vk = numpy.var(cofs)
+		for male, female in pair:
+			for parent in ( male, female ):
+				if parent.ind_id in d_counts:
+					d_counts[ parent.ind_id ] += 1
+				#end if fecund parent
+			#end for each parent
+		#end for male, female
+
+		return d_counts
+	#end __getOffspringCounts
+
+	def __calcNbFromOffspringCountSums( self, i_total_fecund, i_sum_k, i_sum_k_squared ):
+		'''
+		2026_10_19.  The PWoP Nb, from the total fecund individuals 
+		and the sums of their offspring counts and squared counts.  
+		The variance numerator is computed in integers, so that
+		the result is the numpy.var of the counts used formerly,
+		but can be updated in constant time when a pair changes.
+		'''
+
+		'''
+		2017_03_02 This float tolerance is added
+		in order to test the kbar value before using 
+		it as a divisor (below).  This to control
+		the error messaging when our new __harvest
+		def creates a population that causes a 
+		zero value for kbar.
+		'''
+		reltol=1e-90
+
+		kbar = 2.0 * self.__current_N0 / i_total_fecund
+
+		Vk = ( i_total_fecund * i_sum_k_squared - i_sum_k * i_sum_k ) \
+						/ float( i_total_fecund * i_total_fecund )
 
 		if kbar <= reltol:
 			s_msg="In PGOpSimuPop instance, def __calcNb, " \
@@ -2041,12 +2443,111 @@ class PGOpSimuPop( modop.APGOperation ):
 			raise Exception( s_msg )
 		#end if kbar close to zero
 
-		nb = old_div((kbar * len(cofs) - 2), (kbar - 1 + old_div(Vk, kbar)))
-		#print len(pair), kbar, Vk, (kbar * len(cofs) - 2) / (kbar - 1 + Vk / kbar)
+		nb = old_div((kbar * i_total_fecund - 2), (kbar - 1 + old_div(Vk, kbar)))
+	
+		return nb
+	#end __calcNbFromOffspringCountSums
+
+	def __calcNb( self, pop, pair ):
+
+		d_counts=self.__getOffspringCounts( pop, pair )
+
+		i_sum_k=sum( d_counts.values() )
+		i_sum_k_squared=sum( [ k * k for k in d_counts.values() ] )
+
+		nb=self.__calcNbFromOffspringCountSums( len( d_counts ), i_sum_k, i_sum_k_squared )
 	
 		return nb
 	#end __calcNb
 
+	def __adjustPairsTowardTargetNb( self, pop, pair, o_pair_generator ):
+		'''
+		2026_10_19.  For the incremental tolerance mode.  Rather than 
+		discarding the pairs when their Nb misses the tolerance, we 
+		replace one randomly chosen pair at a time with the generator's
+		next pair, and keep the replacement only if it moves the Nb 
+		closer to the target. The offspring count sums are updated 
+		for the (at most 4) parents involved, so that each replacement 
+		costs constant time.  
+
+		The pair list is modified in place.  Returns the resulting Nb, 
+		the replacements tried and those kept.  Stops when the Nb is 
+		inside the tolerance or after LOCAL_MOVES_PER_PAIR replacements 
+		per pair.
+
+		Each call thus draws at most LOCAL_MOVES_PER_PAIR * len( pair ) 
+		pairs from the generator, on top of the len( pair ) drawn by
+		def __restrictedGenerator for the try.  As that def makes up to
+		its max tries plus one, a cycle with a tolerance that can't be met
+		draws up to ( 1 + LOCAL_MOVES_PER_PAIR ) * N0 * ( max tries + 1 ) 
+		pairs before the simulation fails, 11 times the draws made in 
+		regenerate mode.  Runs with tight tolerances should expect the
+		time to that failure to grow accordingly.
+		'''
+
+		d_counts=self.__getOffspringCounts( pop, pair )
+
+		i_total_fecund=len( d_counts )
+		i_sum_k=sum( d_counts.values() )
+		i_sum_k_squared=sum( [ k * k for k in d_counts.values() ] )
+
+		nb=self.__calcNbFromOffspringCountSums( i_total_fecund, i_sum_k, i_sum_k_squared )
+
+		f_distance=abs( nb - self.__targetNb )
+
+		i_max_moves=PGOpSimuPop.LOCAL_MOVES_PER_PAIR * len( pair )
+		i_moves=0
+		i_kept=0
+
+		while f_distance > self.__toleranceNb and i_moves < i_max_moves:
+
+			i_moves+=1
+
+			idx_pair=random.randrange( len( pair ) )
+			old_male, old_female = pair[ idx_pair ]
+			new_male, new_female = next( o_pair_generator )
+
+			d_changes={}
+
+			for parent, i_change in ( ( old_male, -1 ), ( old_female, -1 ),
+											( new_male, 1 ), ( new_female, 1 ) ):
+				if parent.ind_id in d_counts:
+					d_changes[ parent.ind_id ] = d_changes.get( parent.ind_id, 0 ) + i_change
+				#end if fecund parent
+			#end for each parent removed or added
+
+			i_new_sum_k=i_sum_k
+			i_new_sum_k_squared=i_sum_k_squared
+
+			for i_id, i_change in d_changes.items():
+				k=d_counts[ i_id ]
+				i_new_sum_k+=i_change
+				i_new_sum_k_squared+=( k + i_change ) * ( k + i_change ) - k * k
+			#end for each changed count
+
+			new_nb=self.__calcNbFromOffspringCountSums( i_total_fecund, 
+									i_new_sum_k, i_new_sum_k_squared )
+
+			f_new_distance=abs( new_nb - self.__targetNb )
+
+			if f_new_distance < f_distance:
+				pair[ idx_pair ] = ( new_male, new_female )
+
+				for i_id, i_change in d_changes.items():
+					d_counts[ i_id ]+=i_change
+				#end for each changed count
+
+				i_sum_k=i_new_sum_k
+				i_sum_k_squared=i_new_sum_k_squared
+				nb=new_nb
+				f_distance=f_new_distance
+				i_kept+=1
+			#end if the replacement moves toward the target
+		#end while outside the tolerance
+
+		return nb, i_moves, i_kept
+	#end __adjustPairsTowardTargetNb
+
 	def __restrictedGenerator( self, pop, subPop ):
 
 		if VERY_VERBOSE:
@@ -2060,6 +2561,34 @@ class PGOpSimuPop( modop.APGOperation ):
 		nbOK = False
 		nb = None
 		attempts = 0
+
+		'''
+		2026_10_19.  The incremental tolerance mode replaces single 
+		pairs (see def __adjustPairsTowardTargetNb), which would break 
+		the mate assignments made under monogamy, and would exhaust 
+		the females available under litter sizes, so these fall back
+		to redrawing all pairs. Because the generator sets the breed
+		value of each female drawn, including those in replacements 
+		not kept, we save the females' breed values to restore those
+		of females without offspring in the accepted pairs.
+		'''
+		b_incremental=self.__tolerance_mode == PGOpSimuPop.TOLERANCE_MODE_INCREMENTAL \
+								and not self.input.isMonog \
+								and not self.input.litter
+
+		s_mode=PGOpSimuPop.TOLERANCE_MODE_INCREMENTAL if b_incremental \
+								else PGOpSimuPop.TOLERANCE_MODE_REGENERATE
+		i_pair_sets_drawn = 0
+		i_replacements_tried = 0
+		i_replacements_kept = 0
+		b_tolerance_tested = False
+
+		dtup_female_breeds=None
+
+		if b_incremental:
+			dtup_female_breeds={ ind.ind_id : ( ind, ind.breed ) \
+						for ind in pop.individuals() if ind.sex() != 1 }
+		#end if incremental, save female breed values
 		
 		if VERY_VERBOSE:
 
@@ -2097,6 +2626,8 @@ class PGOpSimuPop( modop.APGOperation ):
 				pair.append( next(gen) )
 			#end for i in range
 
+			i_pair_sets_drawn += 1
+
 			'''
 			2017_03_24.  Since this def is now always used
 			to get the next gen, we change the gen 
@@ -2127,7 +2658,15 @@ class PGOpSimuPop( modop.APGOperation ):
 				break
 			#end if gen number is less than our burn-in threshold.
 
-			nb = self.__calcNb(pop, pair)
+			b_tolerance_tested = True
+
+			if b_incremental:
+				nb, i_tried, i_kept = self.__adjustPairsTowardTargetNb( pop, pair, gen )
+				i_replacements_tried += i_tried
+				i_replacements_kept += i_kept
+			else:
+				nb = self.__calcNb(pop, pair)
+			#end if incremental, else regenerate
 
 			'''
 			2017_02_06
@@ -2149,9 +2688,15 @@ class PGOpSimuPop( modop.APGOperation ):
 					print( "in restrictedGenerator, selecting pop with Nb at: " + str( nb ) )
 				#end if very verbose	
 			else:
-				for male, female in pair:
-					female.breed -= 1
-				#end for male, female
+				if b_incremental:
+					for o_female, i_breed in dtup_female_breeds.values():
+						o_female.breed = i_breed
+					#end for each female, restore breed
+				else:
+					for male, female in pair:
+						female.breed -= 1
+					#end for male, female
+				#end if incremental, else regenerate
 
 				attempts += 1
 
@@ -2199,6 +2744,16 @@ class PGOpSimuPop( modop.APGOperation ):
 
 		#end while not nbOK
 
+		if b_incremental and b_tolerance_tested:
+			set_mother_ids=set( [ female.ind_id for male, female in pair ] )
+
+			for i_id, tup_female_breed in dtup_female_breeds.items():
+				if i_id not in set_mother_ids:
+					tup_female_breed[ 0 ].breed = tup_female_breed[ 1 ]
+				#end if not a mother, restore breed
+			#end for each female
+		#end if incremental, restore breed for females with no offspring
+
 		'''
 		For comparing Nb values as calculated
 		(and accepted) on the pops as generated by simuPop, 
@@ -2248,6 +2803,20 @@ class PGOpSimuPop( modop.APGOperation ):
 				'''
 				self.__file_for_nb_records.flush()
 			#end if this gen is to be recorded, write the Nb
+
+			'''
+			2026_10_19.  We record the cost of meeting the tolerance 
+			for every cycle tested, recorded or not:
+			'''
+			if b_tolerance_tested:
+				self.__file_for_nb_tolerance_tries.write( \
+						"\t".join( [ str( i_one_indexed_gen_number ), s_mode,
+										str( i_pair_sets_drawn ),
+										str( i_replacements_tried ),
+										str( i_replacements_kept ),
+										str( nb ) ] ) + "\n" )
+				self.__file_for_nb_tolerance_tries.flush()
+			#end if this gen had the Nb tolerance test
 		#end if we are to write the nb value file
 
 		for male, female in pair:
@@ -2596,7 +3165,19 @@ class PGOpSimuPop( modop.APGOperation ):
 #		harvestRate = harvestRate/self.input.NbNc
 
 		kills = []
-		cohortDict = {}
+
+		'''
+		2026_10_19.  The cohorts, as the ind_id values of their 
+		males and females, now come from the demography tracker.
+		The population has changed (mating, culling) since its 
+		once-per-generation update, so we update it here.  The 
+		cohorts are in the order of their ages' first appearance in 
+		the population, as when this def iterated over the individuals,
+		so that for a given seed the random draws below are unchanged.
+		'''
+		self.__demography_tracker.update( pop )
+
+		cohortDict=self.__demography_tracker.getIdsByAgeAndSex()
 
 		'''
 		2017_02_27.  This counter allows
@@ -2606,17 +3187,7 @@ class PGOpSimuPop( modop.APGOperation ):
 		at next call to evolve().  See exception
 		test below.
 		'''
-		i_current_pop_size=0
-		for i in pop.individuals():
-
-			i_current_pop_size+=1
-
-			indAge = i.age
-
-			if not indAge in cohortDict:
-				cohortDict[indAge] = []
-			cohortDict[indAge].append(i)
-		#end for each individual
+		i_current_pop_size=self.__demography_tracker.pop_size
 	
 		if VERY_VERBOSE:
 			print( "    current pop size: " + str( i_current_pop_size ) )
@@ -2630,11 +3201,8 @@ class PGOpSimuPop( modop.APGOperation ):
 			cohortKills = []
 
 			# setup data and seperate males and females
-			cohort = cohortDict[cohortKey]
-			cohortTotal = len(cohort)
-			cohortMales = [x for x in cohort if x.sex() == 1]
+			cohortMales, cohortFemales = cohortDict[cohortKey]
 			maleCount = len(cohortMales)
-			cohortFemales = [x for x in cohort if x.sex() == 2]
 			femaleCount = len(cohortFemales)
 
 			'''
@@ -2680,12 +3248,8 @@ class PGOpSimuPop( modop.APGOperation ):
 			maleHarvestList = random.sample(cohortMales,maleHarvest)
 			femaleHarvestList = random.sample(cohortFemales,femaleHarvest)
 
-			for ind in maleHarvestList:
-#				print "Dead " + str(ind.ind_id)
-				kills.append(ind.ind_id)
-			for ind in femaleHarvestList:
-#				print "Dead " + str(ind.ind_id)
-				kills.append(ind.ind_id)
+			kills.extend(maleHarvestList)
+			kills.extend(femaleHarvestList)
 
 				# kills.extend(cohortKills)
 				# endif age>0 andage<.....
@@ -2771,14 +3335,18 @@ class PGOpSimuPop( modop.APGOperation ):
 
 			'''
 			Testing age counts per gen
+
+			2026_10_19. The totals now come from the
+			demography tracker, rather than from 
+			counts made in the loop over individuals.
 			'''
-			totals_by_age={}
+			totals_by_age=self.__getDemography( pop ).getTotalsByAge()
 
 			if self.__output_mode==PGOpSimuPop.OUTPUT_GENEPOP_ONLY:
 
 				if self.input.do_het_filter == False:
 
-					self.output.genepop.write( "pop\n" )
+					self.output.genepop_tee.writePopLine()
 
 				else:
 
@@ -2786,7 +3354,7 @@ class PGOpSimuPop( modop.APGOperation ):
 
 					if f_mean_het >= self.min_mean_heterozygosity \
 								and f_mean_het <= self.max_mean_heterozygosity:
-						self.output.genepop.write( "pop\n" )
+						self.output.genepop_tee.writePopLine()
 						self.total_filtered_pops_saved += 1
 						'''
 						2018_04_16.  We now increment the pop number,
@@ -2811,7 +3379,9 @@ class PGOpSimuPop( modop.APGOperation ):
 						return True
 					#end if het in range, else if pop's het less than filter's min, else return.
 				#end if not het filter in effect, else test
-			#end if output mode is genepop only, check whether het filter
+			elif self.__output_mode==PGOpSimuPop.OUTPUT_ORIG:
+				self.output.genepop_tee.writePopLine()
+			#end if output mode is genepop only, check whether het filter, else orig, one pop per recorded cycle
 
 			for i in pop.individuals():
 				'''
@@ -2866,13 +3436,19 @@ class PGOpSimuPop( modop.APGOperation ):
 
 					self.output.err.write("%s %d " % (s_id_fields, gen))
 
-					for pos in range(len(i.genotype(0))):
-						a1 = self.__zeroC(i.allele(pos, 0))
-						a2 = self.__zeroC(i.allele(pos, 1))
-						self.output.err.write(a1 + a2 + " ")
-					#end for pos in range
+					'''
+					2026_10_19. We make the loci entries once, and write
+					them to the *gen file and, through the tee writer, 
+					the genepop file(s).
+					'''
+					ls_loci_entries=[ self.__zeroC(i.allele(pos, 0)) \
+										+ self.__zeroC(i.allele(pos, 1)) \
+										for pos in range(len(i.genotype(0))) ]
+
+					self.output.err.write( " ".join( ls_loci_entries ) + " \n" \
+												if len( ls_loci_entries ) > 0 else "\n" )
 
-					self.output.err.write("\n")
+					self.output.genepop_tee.writeIndividual( s_id_fields, ls_loci_entries )
 					
 					#end if age == 1 or gen == 0
 
@@ -2885,29 +3461,14 @@ class PGOpSimuPop( modop.APGOperation ):
 								str( i.ind_id ), str( i.sex() ), str( i.father_id ),
 								str( i.mother_id ), str( i.age ) ] )
 
-					self.output.genepop.write( "%s" % (s_id_fields + ", " ) )
-
-					for pos in range(len(i.genotype(0))):
-						a1 = self.__zeroC(i.allele(pos, 0))
-						a2 = self.__zeroC(i.allele(pos, 1))
-						self.output.genepop.write(a1 + a2 + " ")
-					#end for pos in range
+					ls_loci_entries=[ self.__zeroC(i.allele(pos, 0)) \
+										+ self.__zeroC(i.allele(pos, 1)) \
+										for pos in range(len(i.genotype(0))) ]
 
-					self.output.genepop.write( "\n" )
+					self.output.genepop_tee.writeIndividual( s_id_fields, ls_loci_entries )
 
 				#end if output mode original, else genepop only 
 
-				'''
-				2017_02_07.  We are recording effects on the age 
-				structure of using the culls __equalSexCull 
-				and __harvest.
-				'''
-				if int( i.age ) in totals_by_age:
-					totals_by_age[ int(i.age) ] += 1
-				else:
-					totals_by_age[ int( i.age ) ] = 1
-				# end if age already recorded, else new age
-
 			#end for i in pop
 
 			'''
@@ -2996,6 +3557,48 @@ class PGOpSimuPop( modop.APGOperation ):
 		return True
 	#end __outputMega
 
+	def __updateDemography( self, pop ):
+		'''
+		2026_10_19.  Pre-op, run once per generation, after the
+		ages are incremented, to read the population's ages and 
+		sexes in bulk (see class DemographyTracker).
+		'''
+		self.__demography_tracker.update( pop )
+		return True
+	#end __updateDemography
+
+	def __getDemography( self, pop ):
+		'''
+		2026_10_19.  Returns the demography tracker, first 
+		updating it if its last update was not for this
+		generation and population size.
+		'''
+		if not self.__demography_tracker.isCurrent( pop ):
+			self.__demography_tracker.update( pop )
+		#end if tracker not current
+
+		return self.__demography_tracker
+	#end __getDemography
+
+	def __updateInfoFieldsBeforeMating( self, pop ):
+		'''
+		2026_10_19.  Replaces the three InfoExec pre-ops formerly 
+		used in def __createAge ( "age += 1", "mate = -1", and 
+		"force_skip = 0" ), each of which evaluated its expression 
+		for each individual.  Here we set each field for the whole 
+		population with one call to simuPOP's setIndInfo, which 
+		reuses a single value over all individuals.
+		'''
+
+		lf_ages=numpy.add( pop.indInfo( "age" ), 1 ).tolist()
+
+		pop.setIndInfo( lf_ages, "age" )
+		pop.setIndInfo( [ -1 ], "mate" )
+		pop.setIndInfo( [ 0 ], "force_skip" )
+
+		return True
+	#end __updateInfoFieldsBeforeMating
+
 	def __setAge( self, pop ):
 
 		probMale = [1.0]
@@ -3067,10 +3670,15 @@ class PGOpSimuPop( modop.APGOperation ):
 
 		
 
+		'''
+		2026_10_19.  The info fields are updated in bulk (see def 
+		__updateInfoFieldsBeforeMating).  After the ages are incremented, 
+		we update the demography tracker, whose histograms are then shared 
+		by defs __outputAge and __calcDemo (see def __updateDemography).
+		'''
 		agePreOps = [
-					sp.InfoExec("age += 1"),
-					sp.InfoExec("mate = -1"),
-					sp.InfoExec("force_skip = 0"),
+					sp.PyOperator(func=self.__updateInfoFieldsBeforeMating),
+					sp.PyOperator(func=self.__updateDemography),
 					sp.PyOperator(func=self.__outputAge),
 					]
 		
@@ -3242,8 +3850,22 @@ class PGOpSimuPop( modop.APGOperation ):
 							sp.PyOperator( func=self.__harvest ) ]
 
 
-		pop.setVirtualSplitter(sp.InfoSplitter(field='age',
-			   cutoff=list(range(1, self.input.ages))))
+		'''
+		2026_10_19.  We combine the age splitter with a sex splitter,
+		whose virtual subpopulations, males then females, follow
+		those for the ages, so that the age indices used by the 
+		CloneMating op are unchanged.  The demography tracker reads 
+		ages and ids by sex from the sex splitter's subpopulations.
+		'''
+		li_age_cutoffs=list(range(1, self.input.ages))
+		i_total_age_vsps=len( li_age_cutoffs ) + 1
+
+		pop.setVirtualSplitter( sp.CombinedSplitter( [ 
+				sp.InfoSplitter(field='age', cutoff=li_age_cutoffs),
+				sp.SexSplitter() ] ) )
+
+		self.__demography_tracker=DemographyTracker( ( 0, i_total_age_vsps ),
+														( 0, i_total_age_vsps + 1 ) )
 
 		self.__ageInitOps=ageInitOps
 		self.__agePreOps=agePreOps
@@ -3290,6 +3912,19 @@ class PGOpSimuPop( modop.APGOperation ):
 		return
 	#end __write_interruption_file
 
+	def __compressOutputFiles( self, ls_files_to_skip ):
+		'''
+		2026_10_19.  Compresses the output files, other than those
+		skipped, with this object's codec, level and total processes.
+		'''
+		self.output.compressAllFiles( ls_files_to_skip=ls_files_to_skip,
+							b_block_compress_genepop=self.__block_compress_genepop,
+							s_codec=self.__compression_codec,
+							i_level=self.__compression_level,
+							i_total_processes=self.__compression_processes )
+		return
+	#end __compressOutputFiles
+
 	def __cleanup_on_failure( self, s_reason="Nb tolerance test failure."  ):
 		'''
 		2017_06_11.  This def was added on request from 
@@ -3304,7 +3939,7 @@ class PGOpSimuPop( modop.APGOperation ):
 		self.__write_interruption_file( s_fail_notice )
 
 		if self.output:
-			for s_outfile in [ "out", "err", "megaDB", "genepop" ]:	
+			for s_outfile in [ "out", "err", "megaDB", "genepop", "genepop_tee" ]:	
 				if hasattr( self.output, s_outfile ):
 					o_file=getattr( self.output, s_outfile )
 					if hasattr( o_file, "close" ):
@@ -3320,6 +3955,10 @@ class PGOpSimuPop( modop.APGOperation ):
 					pgut.remove_files( [ s_outfile_name ] )
 				#end if file name available, close it if exists
 			#end for each of the sim output files (except conf and age/pwop records)
+
+			if hasattr( self.output, "genepop_loci_range_names" ):
+				pgut.remove_files( self.output.genepop_loci_range_names )
+			#end if loci range genepop files
 		#end if we have an output object
 			
 		if self.__file_for_nb_records is not None:
@@ -3343,14 +3982,91 @@ class PGOpSimuPop( modop.APGOperation ):
 			#end if we have a writable age counts item
 		#end if we have an age counts file
 
+		if self.__file_for_nb_tolerance_tries is not None:
+			if hasattr( self.__file_for_nb_tolerance_tries, "write" ):
+				self.__file_for_nb_tolerance_tries.write( s_fail_notice )
+				self.__file_for_nb_tolerance_tries.close()
+			#end if we have a writable tolerance tries item
+		#end if we have a tolerance tries file
+
 		return
 	#end __cleanup_on_failure
 
-	def __write_ld_on_sample( self, o_pop, 
-								i_cycle_number, 
-								i_num_loci_pairs_to_sample, 
-								s_outfile, 
-								b_sample_linked, 
+	def __getLdLociLayout( self, o_pop ):
+		'''
+		2026_10_19.  Returns a tuple of numpy arrays, indexed by locus,
+		( positions, chromosome indices, index one past the last locus
+		on the locus' chromosome ).  These are computed on the first call
+		only, as the loci do not change during the simulation.  Note that
+		simuPOP indexes loci in chromosome order.
+		'''
+		if self.__ld_loci_layout is None:
+			na_positions=numpy.array( o_pop.lociPos() )
+			na_loci_per_chrom=numpy.array( o_pop.numLoci(), dtype=numpy.int64 )
+			na_chroms=numpy.repeat( numpy.arange( len( na_loci_per_chrom ) ), na_loci_per_chrom )
+			na_chrom_ends=numpy.cumsum( na_loci_per_chrom )[ na_chroms ]
+			self.__ld_loci_layout=( na_positions, na_chroms, na_chrom_ends )
+		#end if no layout yet
+
+		return self.__ld_loci_layout
+	#end __getLdLociLayout
+
+	def __sampleLociPairs( self, na_chrom_ends,
+								i_num_loci_pairs_to_sample,
+								b_sample_linked,
+								b_sample_unlinked ):
+		'''
+		2026_10_19.  Returns a list of [ i, j ], i < j,  loci-index pairs,
+		sampled uniformly without replacement from the pairs allowed by the
+		linked (same chromosome) and unlinked flags, without listing all
+		pairs. For each first locus i we count the allowed second loci,
+		which are a contiguous run of indices, j=first_j[i], first_j[i]+1, ...
+		We then sample indices into the (virtual) list of all allowed pairs,
+		ordered by i then j, and decode each into its pair with a binary
+		search on the cumulative counts.  Memory is O( loci + pairs sampled ).
+		'''
+		i_num_loci=len( na_chrom_ends )
+		na_loci=numpy.arange( i_num_loci, dtype=numpy.int64 )
+
+		na_first_j=None
+		na_counts=None
+
+		if b_sample_linked and b_sample_unlinked:
+			na_first_j=na_loci + 1
+			na_counts=i_num_loci - na_loci - 1
+		elif b_sample_linked:
+			na_first_j=na_loci + 1
+			na_counts=na_chrom_ends - na_loci - 1
+		elif b_sample_unlinked:
+			na_first_j=na_chrom_ends
+			na_counts=i_num_loci - na_chrom_ends
+		else:
+			return []
+		#end if all pairs, else linked only, else unlinked only, else none
+
+		na_cumulative_counts=numpy.cumsum( na_counts )
+
+		i_total_pairs_available=int( na_cumulative_counts[ -1 ] ) if i_num_loci > 0 else 0
+
+		if i_total_pairs_available < i_num_loci_pairs_to_sample:
+			i_num_loci_pairs_to_sample=i_total_pairs_available
+		#end if sample size < population
+
+		na_pair_indices=numpy.array( random.sample( range( i_total_pairs_available ),
+											i_num_loci_pairs_to_sample ), dtype=numpy.int64 )
+
+		na_i=numpy.searchsorted( na_cumulative_counts, na_pair_indices, side='right' )
+		na_offsets=na_pair_indices - ( na_cumulative_counts[ na_i ] - na_counts[ na_i ] )
+		na_j=na_first_j[ na_i ] + na_offsets
+
+		return numpy.column_stack( ( na_i, na_j ) ).tolist()
+	#end __sampleLociPairs
+
+	def __write_ld_on_sample( self, o_pop,
+								i_cycle_number,
+								i_num_loci_pairs_to_sample,
+								s_outfile,
+								b_sample_linked,
 								b_sample_unlinked,
 								s_method ):
 		'''
@@ -3359,62 +4075,59 @@ class PGOpSimuPop( modop.APGOperation ):
 
 		If, after filtering linked or unlinked, loci pairs total less than
 		the value for i_num_loci_pairs_to_sample, the def samples all available.
-		'''
-		import itertools
 
-		i_num_loci=len( o_pop.lociNames() )
+		2026_10_19.  We no longer list all loci pairs to sample from (see def
+		__sampleLociPairs), which now applies the linked and unlinked flags. The
+		loci positions and chromosomes are looked up once (def __getLdLociLayout),
+		and the output file is kept open, with a large buffer, until doOp closes it.
+		'''
+		BUFFER_BYTES=1024*1024
 
-		ltup_all_pairs=None
+		na_positions, na_chroms, na_chrom_ends=self.__getLdLociLayout( o_pop )
 
-		if not( b_sample_linked and b_sample_unlinked ):
+		if not( b_sample_linked or b_sample_unlinked ):
 			print( "In pgopsimupop instance, def __write_ld_on_sample, " \
 						+ "warning, the LD report filter flags, b_sample_linked " \
-						+ "and b_sample_unlinked are not yet implemented. "\
-						+ "the sampled pairs will be selected without regard to " \
-						+ "physical linkage." )
-		#end if user has set b_sample_linked or b_sample_unlinked
-
-		ltup_all_pairs=list( itertools.combinations( range( i_num_loci ), 2 ) )
-
-		i_total_pairs_available=len( ltup_all_pairs )
-
-		if i_total_pairs_available < i_num_loci_pairs_to_sample:
-
-			i_num_loci_pairs_to_sample=i_total_pairs_available		
+						+ "and b_sample_unlinked are both False, so that no " \
+						+ "loci pairs are sampled." )
+		#end if user has excluded both linked and unlinked
 
-		#end if sample size < population
-
-		ltup_sampled_loci_pairs=random.sample( ltup_all_pairs, i_num_loci_pairs_to_sample )
+		lli_sampled_loci_pairs=self.__sampleLociPairs( na_chrom_ends,
+												i_num_loci_pairs_to_sample,
+												b_sample_linked,
+												b_sample_unlinked )
 
-		lli_sampled_loci_pairs=[ list( thistup ) for thistup in ltup_sampled_loci_pairs ]
+		if len( lli_sampled_loci_pairs ) == 0:
+			return
+		#end if no pairs
 
 		sp.stat( o_pop, LD=lli_sampled_loci_pairs, vars=[ s_method ] )
 
-		o_file=open( s_outfile, 'a' )
-	
+		if self.__file_for_ld_sample is None:
+			self.__file_for_ld_sample=open( s_outfile, 'a', BUFFER_BYTES )
+		#end if no file yet
+
 		ddd_allvars=o_pop.vars()
 
 		dd_ldvals=ddd_allvars[ s_method ]
 
+		s_cycle_number=str( i_cycle_number )
+
+		ls_lines=[]
+
 		for i_first_loci in dd_ldvals:
 
 			for i_second_loci in dd_ldvals[ i_first_loci ]:
 
 				f_ld_value=dd_ldvals[ i_first_loci ][ i_second_loci ]
 
-				i_pos_1=o_pop.locusPos( i_first_loci )
-				i_pos_2=o_pop.locusPos( i_second_loci )
-
-				i_chrom_loc_1=o_pop.chromLocusPair( i_first_loci )[0]
-				i_chrom_loc_2=o_pop.chromLocusPair( i_second_loci )[0]
-
 				f_distance="inf"
 
-				if i_chrom_loc_1==i_chrom_loc_2:
-					f_distance = abs( i_pos_2 - i_pos_1 )
+				if na_chroms[ i_first_loci ] == na_chroms[ i_second_loci ]:
+					f_distance = float( abs( na_positions[ i_second_loci ] - na_positions[ i_first_loci ] ) )
 				#end if same chrom
 
-				o_file.write( str( i_cycle_number ) \
+				ls_lines.append( s_cycle_number \
 						+ "\t" \
 						+ "l"  \
 						+ str( i_first_loci ) \
@@ -3428,10 +4141,10 @@ class PGOpSimuPop( modop.APGOperation ):
 						+ "\n" )
 
 			#end for each second loci
-		#end for each first loci	
+		#end for each first loci
+
+		self.__file_for_ld_sample.write( "".join( ls_lines ) )
 
-		o_file.close()
-		
 		return
 	#end __write_ld_on_sample
 
@@ -22,6 +22,11 @@ import shutil
 
 import tempfile
 
+from agestrucne.genepopblockfile import BlockCompressedGenepopWriter
+from agestrucne.genepopblockfile import get_block_index_file_name
+
+import agestrucne.pgparallelcompressor as pgcomp
+
 FILE_DOES_NOT_EXIST=0
 FILE_EXISTS_UNCOMPRESSED=1
 FILE_EXISTS_AS_BZ2=2
@@ -48,6 +53,71 @@ with my code reading with the space, and I need to review changes.
 '''
 IN_POP_SECTIONS_SEPARATE_FIRST_LOCI_FROM_COMMA_WITH_SPACE=True
 
+class PGGenepopTeeWriter( object ):
+	'''
+	2026_10_19.  Writes the pop sections of one or more genepop
+	files as a PGOpSimuPop object records each pop, so that no 
+	*gen file need be converted after the simulation (see
+	PGOutputSimuPop, def gen2Genepop).  Each target file gets
+	all loci, or a range of them (ex: the microsats only, or the 
+	SNPs only).  Individual entries are written in the format
+	used by the genepop-only output mode, "id, " followed by
+	each loci entry plus a space.
+	'''
+
+	def __init__( self ):
+		self.__targets=[]
+		return
+	#end __init__
+
+	def addTarget( self, o_file, idx_first_locus=None, idx_last_locus=None ):
+		'''
+		param o_file, a file object opened for writing text, 
+			whose header and loci list have been written.
+		params idx_first_locus, idx_last_locus, as for def 
+			gen2Genepop, one-based, inclusive indices of the
+			first and last loci written.  If None, all loci
+			are written.
+		'''
+		idx_start=None if idx_first_locus is None else idx_first_locus - 1
+		self.__targets.append( ( o_file, idx_start, idx_last_locus ) )
+		return
+	#end addTarget
+
+	def writePopLine( self ):
+		for o_file, idx_start, idx_stop in self.__targets:
+			o_file.write( "pop\n" )
+		#end for each target
+		return
+	#end writePopLine
+
+	def writeIndividual( self, s_id, ls_loci_entries ):
+		s_delimit_indiv_from_loci=", " \
+				if IN_POP_SECTIONS_SEPARATE_FIRST_LOCI_FROM_COMMA_WITH_SPACE \
+				else ","
+
+		for o_file, idx_start, idx_stop in self.__targets:
+			ls_entries=ls_loci_entries if idx_start is None \
+								else ls_loci_entries[ idx_start : idx_stop ]
+			o_file.write( s_id + s_delimit_indiv_from_loci \
+								+ " ".join( ls_entries ) + " \n" )
+		#end for each target
+		return
+	#end writeIndividual
+
+	def close( self ):
+		for o_file, idx_start, idx_stop in self.__targets:
+			o_file.close()
+		#end for each target
+		return
+	#end close
+
+	@property
+	def total_targets( self ):
+		return len( self.__targets )
+	#end property total_targets
+#end class PGGenepopTeeWriter
+
 class PGOutputSimuPop( object ):
 	'''
 	Object meant to fetch parameter values and prepare them for 
@@ -84,12 +154,20 @@ class PGOutputSimuPop( object ):
 									"genepop":"genepop",
 									"age_counts":"_age_counts_by_gen.tsv",
 									"sim_nb_estimates":"_nb_values_calc_by_gen.tsv",
+									"nb_tolerance_tries":"_nb_tolerance_tries_by_gen.tsv",
 									"het_filter_info":"_het_value_by_cycle_number.tsv",
 									"loci_chrom_pairs":"_loci_and_chromosome.tsv" }
 
 
 	COMPRESSION_FILE_EXTENSION="bz2"
 
+	'''
+	2026_10_19.  Extensions of all the codecs
+	usable by def compressAllFiles.
+	'''
+	COMPRESSION_FILE_EXTENSIONS=[ pgcomp.DICT_FILE_EXTENSIONS[ s_codec ] \
+											for s_codec in pgcomp.CODECS ]
+
 	def __init__( self, s_output_files_prefix ):
 
 		self.__basename=s_output_files_prefix
@@ -108,6 +186,13 @@ class PGOutputSimuPop( object ):
 		obviate any call to def gen2Genepop.
 		'''
 		self.genepop=None
+
+		'''
+		2026_10_19. Writes the genepop file, and any loci-range
+		genepop files, during the simulation (see def openGenepopTee).
+		'''
+		self.genepop_tee=None
+		self.__genepop_loci_range_names=[]
 		return
 	#end def __init__
 	
@@ -155,7 +240,13 @@ class PGOutputSimuPop( object ):
 	def __file_exists(self, s_name):
 
 		b_uncompressed_exists=os.path.isfile( s_name )
-		b_compressed_exists=os.path.isfile( s_name + ".bz2" )
+		'''
+		2026_10_19.  Files may now be compressed with gzip or lzma
+		as well as bz2 (see def compressAllFiles), so that the 
+		"BZ2" flags returned here now mean any compressed version.
+		'''
+		s_compressed_name, s_codec=pgcomp.get_existing_compressed_file( s_name )
+		b_compressed_exists=s_compressed_name is not None
 
 		if b_uncompressed_exists:
 			if b_compressed_exists:
@@ -233,6 +324,74 @@ class PGOutputSimuPop( object ):
 		return
 	#end openGenepop
 	
+	def getGenepopLociRangeFileName( self, idx_first_locus, idx_last_locus ):
+		'''
+		2026_10_19.  Name of the genepop file that gives only the
+		loci in the (one-based, inclusive) range.
+		'''
+		return self.__basename + "_loci_" + str( idx_first_locus ) \
+							+ "_" + str( idx_last_locus ) + "." \
+							+ PGOutputSimuPop.DICT_OUTPUT_FILE_EXTENSIONS[ "genepop" ]
+	#end getGenepopLociRangeFileName
+
+	def openGenepopTee( self, i_num_loci, f_nbne_ratio=None,
+								lt_loci_ranges=None,
+								o_simupop_population=None ):
+		'''
+		2026_10_19. Opens the genepop file and, for each (one-based,
+		inclusive) first and last loci index pair in lt_loci_ranges,
+		a genepop file with only those loci, writes their headers 
+		and loci lists, and sets member genepop_tee, whose writes go 
+		to all of them.
+		'''
+		self.openGenepop()
+
+		self.writeGenepopFileHeaderAndLociList( self.genepop,
+											i_num_loci,
+											f_nbne_ratio,
+											b_do_compress=False,
+											o_simupop_population=o_simupop_population )
+
+		self.genepop_tee=PGGenepopTeeWriter()
+		self.genepop_tee.addTarget( self.genepop )
+
+		self.__genepop_loci_range_names=[]
+
+		lt_ranges=[] if lt_loci_ranges is None else lt_loci_ranges
+
+		for idx_first_locus, idx_last_locus in lt_ranges:
+
+			if idx_first_locus < 1 or idx_last_locus > i_num_loci \
+								or idx_first_locus > idx_last_locus:
+				s_msg="In PGOutputSimuPop instance, def openGenepopTee, " \
+							+ "invalid loci range, " + str( idx_first_locus ) \
+							+ " to " + str( idx_last_locus ) + ", for " \
+							+ str( i_num_loci ) + " total loci."
+				raise Exception( s_msg )
+			#end if invalid range
+
+			s_range_file_name=self.getGenepopLociRangeFileName( idx_first_locus, idx_last_locus )
+
+			if self.__file_exists( s_range_file_name ):
+				self.__raise_file_exists_error( s_range_file_name )
+			#end if file exists
+
+			o_range_file=open( s_range_file_name, 'w' )
+
+			self.writeGenepopFileHeaderAndLociList( o_range_file,
+											i_num_loci,
+											f_nbne_ratio,
+											b_do_compress=False,
+											o_simupop_population=o_simupop_population,
+											t_loci_range=( idx_first_locus, idx_last_locus ) )
+
+			self.genepop_tee.addTarget( o_range_file, idx_first_locus, idx_last_locus )
+			self.__genepop_loci_range_names.append( s_range_file_name )
+		#end for each loci range
+
+		return
+	#end openGenepopTee
+
 	def copyMe( self ):
 		o_copy=PGOutputSimuPop( self.__basename )
 		return o_copy
@@ -246,41 +405,88 @@ class PGOutputSimuPop( object ):
 		#end if file exists, else open
 	#end openConf
 
-	def bz2CompressAllFiles(self, ls_files_to_skip=[] ):
+	def bz2CompressAllFiles(self, ls_files_to_skip=[], b_block_compress_genepop=False ):
 		'''
-		used code and advice in, 
+		used code and advice in,
 		http://stackoverflow.com/questions/9518705/big-file-compression-with-python
 
 		Note: checked the shutil documentation at https://docs.python.org/2/library/shutil.html
 		which warns of loss of meta file info (owner/group ACLs) when using shutil.copy() or shutil.copy2().  Unclear
 		whether this applies to the copyfileobj, though my few tests showd all of these were retained.
+
+		param b_block_compress_genepop, if True, the genepop file is written
+			as a block-compressed genepop file (see module genepopblockfile.py),
+			which is still a valid bz2 file, but comes with an index that lets
+			a GenepopFileManager read it without decompressing it to disk.
+
+		2026_10_19. The work is now done by def compressAllFiles, here
+		with its defaults, single-process bz2 at level 9.
 		'''
-		for s_myfile in [ self.__outname, self.__errname, self.__megadbname, self.__confname, self.__genepopname ]:
-			
+		self.compressAllFiles( ls_files_to_skip=ls_files_to_skip,
+									b_block_compress_genepop=b_block_compress_genepop )
+		return
+	#end bz2CompressAllFiles
+
+	def compressAllFiles( self, ls_files_to_skip=None,
+									b_block_compress_genepop=False,
+									s_codec=pgcomp.CODEC_BZ2,
+									i_level=None,
+									i_total_processes=1 ):
+		'''
+		2026_10_19.  Compresses each output file not in the skip list,
+		replacing it with a file whose name adds the codec's extension
+		(see module pgparallelcompressor.py).
+
+		param ls_files_to_skip, names of files not to compress, if None,
+			all output files are compressed.
+		param s_codec, one of pgparallelcompressor.CODECS.
+		param i_level, the codec's compression level, if None,
+			the codec's default (bz2 9, gzip 6, lzma 6).
+		param i_total_processes, if more than one, large files are
+			compressed in chunks in a pool of processes, and written
+			as multi-stream files.
+		param b_block_compress_genepop, as for def bz2CompressAllFiles.  The
+			block-compressed genepop file is always bz2.
+		'''
+		pgcomp.validate_codec( s_codec )
+
+		if ls_files_to_skip is None:
+			ls_files_to_skip=[]
+		#end if no skip list
+
+		ls_files_to_compress=[]
+
+		for s_myfile in [ self.__outname, self.__errname, self.__megadbname, self.__confname, self.__genepopname ] \
+																+ self.__genepop_loci_range_names:
 			if s_myfile in ls_files_to_skip:
 				pass
 			elif not self.__file_exists( s_myfile ):
-				self.__raise_file_not_found_error( s_myfile, "compress file with bz2"  )
+				self.__raise_file_not_found_error( s_myfile, "compress file with " + s_codec  )
 			else:
+				ls_files_to_compress.append( s_myfile )
+			#end if skip, else file absent, else exists
+		#end for each file
+
+		for s_myfile in ls_files_to_compress:
+			if b_block_compress_genepop and s_myfile == self.__genepopname:
 				with open( s_myfile, 'rb' ) as o_input:
-					with bz2.BZ2File( s_myfile + '.bz2', 'wb', compresslevel=9 ) as o_output:
-						#try/except overkill, but want logic to show
-						#we don't remove the input file
-						#if the copy op fails:
-						try: 
-							shutil.copyfileobj( o_input, o_output )
-						except Exception as  e:
-							raise e
-						#end try except
-
-						#required by windows only, else error can't remove:
-						o_input.close()
-						os.remove( s_myfile )	
-					#end with bzfile for writing
+					with BlockCompressedGenepopWriter( s_myfile + '.bz2' ) as o_output:
+						shutil.copyfileobj( o_input, o_output )
+					#end with block compressed file for writing
 				#end with current file for reading
-			#end if file absent, else exists
+				os.remove( s_myfile )
+			else:
+				#the original file is removed only
+				#after its compressed version is complete:
+				pgcomp.compress_file( s_myfile,
+										s_codec=s_codec,
+										i_level=i_level,
+										i_total_processes=i_total_processes )
+			#end if block compressed genepop, else codec
 		#end for each file
-	#end bz2CompressAllFiles
+
+		return
+	#end compressAllFiles
 
 	'''
 	2018_07_03. We add parameter o_simupop_population, so that
@@ -292,7 +498,8 @@ class PGOutputSimuPop( object ):
 								i_num_loci,
 								f_nbne_ratio = None, 
 								b_do_compress=False,
-								o_simupop_population=None ):
+								o_simupop_population=None,
+								t_loci_range=None ):
 	
 		'''
 		2017_08_04. Code to write the genpop file header
@@ -345,9 +552,16 @@ class PGOutputSimuPop( object ):
 			ls_loci_names=[ s_name + "\n"  for s_name in tup_loci_names ]
 
 		#end if no pop object, else have pop object
+
+		'''
+		2026_10_19.  For a genepop file with only a range of the loci,
+		t_loci_range gives the one-based first and last loci indices:
+		'''
+		if t_loci_range is not None:
+			ls_loci_names=ls_loci_names[ t_loci_range[ 0 ] - 1 : t_loci_range[ 1 ] ]
+		#end if loci range
 	
-		for i_locus in range( i_num_loci ):
-			s_locus_name=ls_loci_names[ i_locus ]
+		for s_locus_name in ls_loci_names:
 
 			if b_do_compress:
 				s_locus_name=s_locus_name.encode( SYSDEFAULTENCODING )
@@ -364,7 +578,10 @@ class PGOutputSimuPop( object ):
 	def gen2Genepop( self, idx_allele_start, idx_allele_stop, 
 			b_do_compress=True, 
 			b_pop_per_gen=False,
-			f_nbne_ratio=None ):
+			f_nbne_ratio=None,
+			b_block_compress=False,
+			s_codec=pgcomp.CODEC_BZ2,
+			i_level=None ):
 
 		'''
 		reads the *.gen file from the simuPop output
@@ -394,6 +611,15 @@ class PGOutputSimuPop( object ):
 		text, "nbne=str(f_nbne_ratio)". When the GUI interface for the Nb estimation reads
 		in genepop files, it will check for they key=value string and then, if present,
 		pass the value on to the calls that eventually invoke the pgdriveneestimator.
+
+		param optional b_block_compress, if true, and b_do_compress is true, the
+		bzip2 genepop file is block compressed, with an index file, so that 
+		a GenepopFileManager can read it directly (see module genepopblockfile.py).
+
+		2026_10_19. params s_codec and i_level set the compression of the genepop
+		file when b_do_compress is True (see module pgparallelcompressor.py). A
+		block-compressed genepop file is always bz2.  A compressed gen file is
+		read with whichever codec it was written.
 		'''
 
 		o_genfile=None
@@ -435,15 +661,20 @@ class PGOutputSimuPop( object ):
 			o_genfile=open( self.__genfile )
 
 		elif i_genfile_exists == FILE_EXISTS_AS_BZ2:
-			o_genfile=bz2.BZ2File( self.__genfile + ".bz2", mode='r' )
+			s_compressed_genfile, s_genfile_codec=pgcomp.get_existing_compressed_file( self.__genfile )
+			o_genfile=pgcomp.open_compressed_file( s_compressed_genfile, 'rb', s_genfile_codec )
 		else:
 			self.__raise_file_not_found_error( self.__genfile, "convert gen file to genepop" )
 		#end if uncompressed only or uncomp. and compressed, else compressed only, else no file
 
 		s_temp_file_name=self.__get_temp_file_name()
 
-		if b_do_compress == True:
-			o_genepopfile=bz2.BZ2File( s_temp_file_name + '.bz2', 'w', compresslevel=9 ) 
+		if b_do_compress == True and b_block_compress == True:
+			o_genepopfile=BlockCompressedGenepopWriter( s_temp_file_name + '.bz2' )
+		elif b_do_compress == True:
+			o_genepopfile=pgcomp.open_compressed_file(
+							pgcomp.get_compressed_file_name( s_temp_file_name, s_codec ),
+							'wb', s_codec, i_level )
 		else:
 			o_genepopfile=open( s_temp_file_name, 'w' )
 		#end if compress else don't
@@ -531,12 +762,18 @@ class PGOutputSimuPop( object ):
 		#change to shutil.move from os.rename -- threw errors (in docker install) when
 		#renaming across volumes:
 		if b_do_compress:
-			s_temp_file_name=s_temp_file_name + ".bz2"
-			s_final_name=s_final_name + ".bz2"
+			s_compressed_codec=pgcomp.CODEC_BZ2 if b_block_compress else s_codec
+			s_temp_file_name=pgcomp.get_compressed_file_name( s_temp_file_name, s_compressed_codec )
+			s_final_name=pgcomp.get_compressed_file_name( s_final_name, s_compressed_codec )
 		#end if we wrote a compressed file
 
 		shutil.move( s_temp_file_name, s_final_name )
 
+		if b_do_compress and b_block_compress:
+			shutil.move( get_block_index_file_name( s_temp_file_name ),
+							get_block_index_file_name( s_final_name ) )
+		#end if we wrote a block index
+
 		return
 	#end gen2Popgene
 
@@ -611,8 +848,21 @@ class PGOutputSimuPop( object ):
 
 		if i_exists_status_flag in [ FILE_EXISTS_AS_BZ2, 
 					FILE_EXISTS_AS_BOTH_UNCOMPRESSED_AND_BZ2 ]:
-			ls_files_to_remove.append( s_outfile_name + "." \
-					+ PGOutputSimuPop.COMPRESSION_FILE_EXTENSION )
+			#2026_10_19. Any of the codecs' versions:
+			for s_codec_extension in PGOutputSimuPop.COMPRESSION_FILE_EXTENSIONS:
+				s_compressed_name=s_outfile_name + "." + s_codec_extension
+				if os.path.isfile( s_compressed_name ):
+					ls_files_to_remove.append( s_compressed_name )
+				#end if this compressed version exists
+			#end for each codec's extension
+
+			s_compressed_name=s_outfile_name + "." \
+					+ PGOutputSimuPop.COMPRESSION_FILE_EXTENSION
+
+			#block compressed files have an index file:
+			if os.path.isfile( get_block_index_file_name( s_compressed_name ) ):
+				ls_files_to_remove.append( get_block_index_file_name( s_compressed_name ) )
+			#end if block index exists
 		#end if compressed file exists
 
 
@@ -692,5 +942,10 @@ class PGOutputSimuPop( object ):
 		return self.__genepopname
 	#end property genepopname
 
+	@property
+	def genepop_loci_range_names( self ):
+		return list( self.__genepop_loci_range_names )
+	#end property genepop_loci_range_names
+
 #end class
 
@@ -0,0 +1,251 @@
+'''
+Description
+2026_10_19
+Compression of simulation output files with a choice of codec
+(bz2, gzip, or lzma/xz) and level.  A file is read in chunks,
+each chunk compressed independently, in a pool of processes, and
+the compressed chunks are written in order, so that the output
+is a valid multi-stream (bz2, xz) or multi-member (gzip) file,
+which the usual command line tools and python modules (python 3)
+decompress as a whole.
+'''
+from __future__ import division
+from __future__ import print_function
+from builtins import range
+__filename__ = "pgparallelcompressor.py"
+__date__ = "20261019"
+
+import os
+import io
+import shutil
+import bz2
+import gzip
+import multiprocessing
+
+try:
+	import lzma
+except ImportError:
+	#python 2 has no lzma module:
+	lzma=None
+#end try...except
+
+CODEC_BZ2="bz2"
+CODEC_GZIP="gzip"
+CODEC_LZMA="lzma"
+
+CODECS=[ CODEC_BZ2, CODEC_GZIP, CODEC_LZMA ]
+
+DICT_FILE_EXTENSIONS={ CODEC_BZ2 : "bz2",
+						CODEC_GZIP : "gz",
+						CODEC_LZMA : "xz" }
+
+DICT_DEFAULT_LEVELS={ CODEC_BZ2 : 9,
+						CODEC_GZIP : 6,
+						CODEC_LZMA : 6 }
+
+DEFAULT_CHUNK_BYTES=8*1024*1024
+
+'''
+Each pass reads this many chunks per process, so that
+memory use is bounded whatever the file size.
+'''
+CHUNKS_PER_PROCESS_PER_PASS=2
+
+def validate_codec( s_codec ):
+	if s_codec not in CODECS:
+		s_msg="In module pgparallelcompressor.py, " \
+					+ "def validate_codec, unknown codec, " \
+					+ str( s_codec ) + ".  Codecs are " \
+					+ ", ".join( CODECS ) + "."
+		raise Exception( s_msg )
+	#end if unknown codec
+
+	if s_codec == CODEC_LZMA and lzma is None:
+		s_msg="In module pgparallelcompressor.py, " \
+					+ "def validate_codec, the lzma codec " \
+					+ "requires python's lzma module, which " \
+					+ "was not found."
+		raise Exception( s_msg )
+	#end if no lzma module
+	return
+#end validate_codec
+
+def get_compressed_file_name( s_file, s_codec=CODEC_BZ2 ):
+	return s_file + "." + DICT_FILE_EXTENSIONS[ s_codec ]
+#end get_compressed_file_name
+
+def get_level( s_codec, i_level=None ):
+	return DICT_DEFAULT_LEVELS[ s_codec ] if i_level is None else i_level
+#end get_level
+
+def open_compressed_file( s_file, s_mode='rb', s_codec=CODEC_BZ2, i_level=None ):
+	'''
+	Returns a file object for reading or writing (binary)
+	a single-stream file with the codec.  The level applies
+	only to writing.
+	'''
+	validate_codec( s_codec )
+
+	o_file=None
+	b_write='w' in s_mode or 'a' in s_mode
+
+	if s_codec == CODEC_BZ2:
+		if b_write:
+			o_file=bz2.BZ2File( s_file, s_mode, compresslevel=get_level( s_codec, i_level ) )
+		else:
+			o_file=bz2.BZ2File( s_file, s_mode )
+		#end if write else read
+	elif s_codec == CODEC_GZIP:
+		if b_write:
+			o_file=gzip.GzipFile( s_file, s_mode, compresslevel=get_level( s_codec, i_level ) )
+		else:
+			o_file=gzip.GzipFile( s_file, s_mode )
+		#end if write else read
+	elif s_codec == CODEC_LZMA:
+		if b_write:
+			o_file=lzma.LZMAFile( s_file, s_mode, format=lzma.FORMAT_XZ,
+											preset=get_level( s_codec, i_level ) )
+		else:
+			o_file=lzma.LZMAFile( s_file, s_mode )
+		#end if write else read
+	#end if bz2, elif gzip, elif lzma
+
+	return o_file
+#end open_compressed_file
+
+def get_existing_compressed_file( s_file ):
+	'''
+	Returns a tuple, ( compressed file name, codec ), for the
+	first compressed version of the file found, in the order of
+	CODECS, else ( None, None ).
+	'''
+	for s_codec in CODECS:
+		s_compressed_file=get_compressed_file_name( s_file, s_codec )
+		if os.path.isfile( s_compressed_file ):
+			return ( s_compressed_file, s_codec )
+		#end if compressed file exists
+	#end for each codec
+
+	return ( None, None )
+#end get_existing_compressed_file
+
+def compress_chunk( t_args ):
+	'''
+	Returns the chunk of bytes compressed as one complete
+	stream (gzip member).  The single tuple arg, ( codec,
+	level, bytes ), lets multiprocessing.Pool.map call this def.
+	'''
+	( s_codec, i_level, v_chunk )=t_args
+
+	v_compressed=None
+
+	if s_codec == CODEC_BZ2:
+		v_compressed=bz2.compress( v_chunk, i_level )
+	elif s_codec == CODEC_GZIP:
+		o_buffer=io.BytesIO()
+		o_gzip=gzip.GzipFile( fileobj=o_buffer, mode='wb', compresslevel=i_level )
+		o_gzip.write( v_chunk )
+		o_gzip.close()
+		v_compressed=o_buffer.getvalue()
+	elif s_codec == CODEC_LZMA:
+		v_compressed=lzma.compress( v_chunk, format=lzma.FORMAT_XZ, preset=i_level )
+	#end if bz2, elif gzip, elif lzma
+
+	return v_compressed
+#end compress_chunk
+
+def get_total_processes( i_total_processes=None ):
+	'''
+	Daemonic processes (ex: workers in a multiprocessing.Pool)
+	can't start a pool, so they use one process.
+	'''
+	i_total=1
+
+	if multiprocessing.current_process().daemon:
+		i_total=1
+	elif i_total_processes is None:
+		i_total=multiprocessing.cpu_count()
+	else:
+		i_total=max( 1, i_total_processes )
+	#end if daemonic, else default, else caller's total
+
+	return i_total
+#end get_total_processes
+
+def compress_file( s_file,
+					s_codec=CODEC_BZ2,
+					i_level=None,
+					i_total_processes=1,
+					i_chunk_bytes=DEFAULT_CHUNK_BYTES,
+					b_remove_original=True ):
+	'''
+	Compresses the file to its name plus the codec's extension,
+	removing the original, unless the flag is False, after the
+	compressed file is complete.  With one process the file is
+	written as a single stream, as by the codec's own module.
+	With more, chunks are compressed in a pool, and written as
+	a multi-stream file.  Returns the compressed file's name.
+	'''
+	validate_codec( s_codec )
+
+	i_level=get_level( s_codec, i_level )
+	i_total_processes=get_total_processes( i_total_processes )
+	s_compressed_file=get_compressed_file_name( s_file, s_codec )
+
+	if i_total_processes == 1 \
+			or os.path.getsize( s_file ) <= i_chunk_bytes:
+		with open( s_file, 'rb' ) as o_input:
+			with open_compressed_file( s_compressed_file, 'wb', s_codec, i_level ) as o_output:
+				shutil.copyfileobj( o_input, o_output )
+			#end with compressed file
+		#end with input file
+
+		if b_remove_original:
+			os.remove( s_file )
+		#end if remove original
+
+		return s_compressed_file
+	#end if one process or one chunk, single stream
+
+	o_pool=multiprocessing.Pool( i_total_processes )
+
+	i_chunks_per_pass=i_total_processes * CHUNKS_PER_PROCESS_PER_PASS
+
+	try:
+		with open( s_file, 'rb' ) as o_input:
+			with open( s_compressed_file, 'wb' ) as o_output:
+				b_at_end=False
+				while not b_at_end:
+					lt_args=[]
+					for idx in range( i_chunks_per_pass ):
+						v_chunk=o_input.read( i_chunk_bytes )
+						if len( v_chunk ) == 0:
+							b_at_end=True
+							break
+						#end if no more bytes
+						lt_args.append( ( s_codec, i_level, v_chunk ) )
+					#end for each chunk in this pass
+
+					if len( lt_args ) == 0:
+						break
+					#end if nothing read
+
+					lv_compressed=o_pool.map( compress_chunk, lt_args )
+
+					for v_compressed in lv_compressed:
+						o_output.write( v_compressed )
+					#end for each compressed chunk
+				#end while not at end of input
+			#end with output file
+		#end with input file
+	finally:
+		o_pool.close()
+		o_pool.join()
+	#end try...finally
+
+	if b_remove_original:
+		os.remove( s_file )
+	#end if remove original
+
+	return s_compressed_file
+#end compress_file
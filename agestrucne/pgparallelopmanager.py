@@ -224,6 +224,10 @@ def do_pgopsimupop_replicate_from_files(  s_configuration_file,
 	This limits the number of warning gui's it will produce to one,
 	about presence of lamba value in conf being unused (see __init__
 	in pgopsimupop.py).
+
+	2026_10_19. The input's block_compress_genepop flag turns on 
+	compression of the output, with the genepop file block compressed.
+	The input's genepop_loci_ranges give the loci-range genepop files.
 	'''
 
 	o_new_pgopsimupop_instance=pgsim.PGOpSimuPop( o_input,
@@ -233,7 +237,13 @@ def do_pgopsimupop_replicate_from_files(  s_configuration_file,
 			b_do_gui_messaging=b_use_gui_messaging,
 			b_write_the_once_only_files=b_write_the_once_only_files,
 			b_is_replicate_1 = ( i_replicate_number == 1 ),
-			i_output_mode=i_output_mode )
+			i_output_mode=i_output_mode,
+			b_compress_output=( o_input.compress_output or o_input.block_compress_genepop ),
+			b_block_compress_genepop=o_input.block_compress_genepop,
+			lt_genepop_loci_ranges=o_input.makeGenepopLociRangesList(),
+			s_compression_codec=o_input.compression_codec,
+			i_compression_level=o_input.makeCompressionLevel(),
+			i_compression_processes=o_input.compression_processes )
 
 	o_new_pgopsimupop_instance.prepareOp( s_tag_out  )
 
@@ -513,8 +523,15 @@ def remove_simulation_replicate_output_files( s_basename ):
 
 		ls_files_unzipped=glob.glob( s_unzipped_file_pattern )
 
-		ls_files_zipped=glob.glob( s_unzipped_file_pattern \
-				+ "." + pgout.PGOutputSimuPop.COMPRESSION_FILE_EXTENSION )
+		'''
+		2026_10_19.  Output files may be compressed
+		with any of the codecs in pgparallelcompressor.py.
+		'''
+		ls_files_zipped=[]
+		for s_compression_ext in pgout.PGOutputSimuPop.COMPRESSION_FILE_EXTENSIONS:
+			ls_files_zipped+=glob.glob( s_unzipped_file_pattern \
+					+ "." + s_compression_ext )
+		#end for each compression extension
 
 		for s_file in ls_files_unzipped + ls_files_zipped:
 			os.remove( s_file )
@@ -0,0 +1,374 @@
+'''
+Description
+A headless plot rendering service.  It renders the viz
+program's Regression and Subsample plots (see
+pgutilities.run_plotting_program) with matplotlib's Agg
+backend to image files, using a pool of worker processes
+that persist across calls, so that matplotlib, scipy and
+the viz modules are imported once per worker rather than
+once per plot.  Plot specs that use the same Ne estimation
+table are rendered in the same worker task, so that the
+table is loaded once for all of them (see
+asnviz.FileIO.setTableCaching), while specs for different
+tables render concurrently.
+'''
+from __future__ import print_function
+from future import standard_library
+standard_library.install_aliases()
+from builtins import range
+from builtins import object
+
+__filename__ = "pgplotrenderservice.py"
+__date__ = "20261019"
+
+import os
+import sys
+import configparser
+import multiprocessing
+import tempfile
+
+PLOT_TYPES=[ "Regression", "Subsample" ]
+
+'''
+The keys to a plot spec dict.  Of these, only the type,
+table and config file are required.  Subsample values
+of None mean the table is not filtered on that column.
+When the image prefix is None, it is the table file name,
+plus the lowercased plot type.
+'''
+SPEC_TYPE="type"
+SPEC_TABLE_FILE="tsv"
+SPEC_CONFIG_FILE="config"
+SPEC_POP_SUBSAMPLE_VALUE="pop_subsample_value"
+SPEC_LOCI_SUBSAMPLE_VALUE="loci_subsample_value"
+SPEC_IMAGE_PREFIX="image_prefix"
+
+DEFAULT_IMAGE_FORMAT="png"
+
+'''
+The viz config file's [destination] options, each with the
+suffix we give to the image file name it will name.  The
+stats file option is in the [confidence] section.
+'''
+DESTINATION_SECTION="destination"
+DESTINATION_OPTIONS_AND_SUFFIXES=[ ( "regressionfile", "regression" ),
+									( "boxplotfile", "boxplot" ),
+									( "scatterfile", "scatter" ),
+									( "whiskerplotfile", "whisker" ) ]
+STATS_SECTION="confidence"
+STATS_OPTION="outputFilename"
+STATS_SUFFIX="stats.txt"
+
+'''
+Items in each result returned by PGPlotRenderService.render.
+'''
+RESULT_SPEC="spec"
+RESULT_IMAGE_FILES="image_files"
+RESULT_ERROR="error"
+
+def initialize_render_worker():
+	'''
+	Initializer for the service's pool processes.  Selects the
+	Agg backend before pyplot is imported by the viz modules
+	(forcing the switch, since a forked worker inherits the
+	GUI's already-selected backend), imports the viz modules,
+	and turns on FileIO's table cache.
+	'''
+	import matplotlib
+	matplotlib.use( "Agg", force=True )
+
+	import agestrucne.asnviz.FileIO
+	import agestrucne.asnviz.LineRegress
+	import agestrucne.asnviz.SubSamplePlot
+
+	agestrucne.asnviz.FileIO.setTableCaching( True )
+	return
+#end initialize_render_worker
+
+def get_image_prefix_for_spec( ds_spec ):
+	s_prefix=ds_spec.get( SPEC_IMAGE_PREFIX )
+
+	if s_prefix is None:
+		s_prefix=ds_spec[ SPEC_TABLE_FILE ] + "." + ds_spec[ SPEC_TYPE ].lower()
+	#end if no prefix given, use the table name
+
+	return s_prefix
+#end get_image_prefix_for_spec
+
+def write_headless_config_file( s_config_file, s_image_prefix, s_image_format ):
+	'''
+	Writes a temporary copy of the viz config file, in the image
+	file's directory, with each plot destination set to an image
+	file named by the prefix, and the stats file named likewise,
+	so that no plot is "show"n, and concurrent specs never write
+	the same file.
+
+	Returns a tuple, the temp config file name and the list of the
+	image file names.
+	'''
+	o_config=configparser.RawConfigParser()
+	o_config.optionxform=str
+	o_config.read( s_config_file )
+
+	if not o_config.has_section( DESTINATION_SECTION ):
+		o_config.add_section( DESTINATION_SECTION )
+	#end if no destination section
+
+	ls_image_files=[]
+	for s_option, s_suffix in DESTINATION_OPTIONS_AND_SUFFIXES:
+		s_image_file=s_image_prefix + "." + s_suffix + "." + s_image_format
+		o_config.set( DESTINATION_SECTION, s_option, s_image_file )
+		ls_image_files.append( s_image_file )
+	#end for each destination
+
+	if not o_config.has_section( STATS_SECTION ):
+		o_config.add_section( STATS_SECTION )
+	#end if no stats section
+
+	o_config.set( STATS_SECTION, STATS_OPTION, s_image_prefix + "." + STATS_SUFFIX )
+
+	i_handle, s_temp_config_file=tempfile.mkstemp( suffix=".cfg",
+							dir=os.path.dirname( s_image_prefix ) )
+	o_file=os.fdopen( i_handle, 'w' )
+	try:
+		o_config.write( o_file )
+	finally:
+		o_file.close()
+	#end try...finally
+
+	return s_temp_config_file, ls_image_files
+#end write_headless_config_file
+
+def render_one_spec( s_type, s_table_file, s_config_file, s_image_prefix, s_image_format ):
+	'''
+	Renders one plot spec in the current (worker) process, and
+	returns the list of image files written.  The viz defs write
+	their outlier files to the current directory, so we render
+	from the image file's directory.
+	'''
+	import matplotlib.pyplot as plt
+	import agestrucne.asnviz.LineRegress
+	import agestrucne.asnviz.SubSamplePlot
+
+	s_temp_config_file, ls_image_files=write_headless_config_file( s_config_file,
+														s_image_prefix,
+														s_image_format )
+	s_original_dir=os.getcwd()
+	try:
+		os.chdir( os.path.dirname( s_image_prefix ) )
+
+		if s_type == "Regression":
+			agestrucne.asnviz.LineRegress.neRun( s_table_file, s_temp_config_file )
+		elif s_type == "Subsample":
+			agestrucne.asnviz.SubSamplePlot.subSamplePlotter( s_table_file, s_temp_config_file )
+		else:
+			s_msg="In pgplotrenderservice.py, def render_one_spec, " \
+							+ "unknown plot type: " + str( s_type ) + "."
+			raise Exception( s_msg )
+		#end if regression, else subsample, else error
+	finally:
+		os.chdir( s_original_dir )
+		os.remove( s_temp_config_file )
+		#Figures left open would accumulate in the persistent worker:
+		plt.close( "all" )
+	#end try...finally
+
+	return [ s_file for s_file in ls_image_files if os.path.exists( s_file ) ]
+#end render_one_spec
+
+def render_specs_for_one_table( t_args ):
+	'''
+	Worker def.  Renders the specs that share one table and one
+	pair of subsample values, filtering the table into a temp file
+	once for all of them when either subsample value is not None.
+
+	The single tuple arg, ( specs, image format ), allows this
+	def to be used by multiprocessing.Pool.map.  Returns a list
+	of result dicts, one per spec, in spec order.  An error rendering
+	one spec is recorded in its result, and does not stop the others.
+	'''
+	( lds_specs, s_image_format ) = t_args
+
+	import agestrucne.pgutilities as pgut
+
+	ds_first=lds_specs[ 0 ]
+	s_table_file=ds_first[ SPEC_TABLE_FILE ]
+	s_pop_value=ds_first.get( SPEC_POP_SUBSAMPLE_VALUE )
+	s_loci_value=ds_first.get( SPEC_LOCI_SUBSAMPLE_VALUE )
+	s_temp_table_file=None
+
+	ldv_results=[]
+
+	try:
+		if [ s_pop_value, s_loci_value ] != [ None, None ]:
+			s_temp_table_file=pgut.get_subsample_value_filtered_ne_estimates_table_file( s_table_file,
+																				s_pop_value,
+																				s_loci_value )
+			s_table_file=s_temp_table_file
+		#end if filtering, plot from a temp file
+
+		for ds_spec in lds_specs:
+			dv_result={ RESULT_SPEC:ds_spec, RESULT_IMAGE_FILES:[], RESULT_ERROR:None }
+			try:
+				dv_result[ RESULT_IMAGE_FILES ]=render_one_spec( ds_spec[ SPEC_TYPE ],
+													s_table_file,
+													ds_spec[ SPEC_CONFIG_FILE ],
+													get_image_prefix_for_spec( ds_spec ),
+													s_image_format )
+			except Exception as oex:
+				dv_result[ RESULT_ERROR ]=oex.__class__.__name__ + ", " + str( oex )
+			#end try...except
+			ldv_results.append( dv_result )
+		#end for each spec
+	except Exception as oex:
+		s_error=oex.__class__.__name__ + ", " + str( oex )
+		for ds_spec in lds_specs[ len( ldv_results ) : ]:
+			ldv_results.append( { RESULT_SPEC:ds_spec, RESULT_IMAGE_FILES:[], RESULT_ERROR:s_error } )
+		#end for each spec not rendered
+	finally:
+		if s_temp_table_file is not None and os.path.exists( s_temp_table_file ):
+			os.remove( s_temp_table_file )
+		#end if we made a filtered table
+	#end try...except...finally
+
+	return ldv_results
+#end render_specs_for_one_table
+
+class PGPlotRenderService( object ):
+	'''
+	Renders lists of plot specs (dicts, keyed as given by the
+	SPEC_* constants) to image files, using a pool of worker
+	processes that persists until def close is called.  Usage:
+
+		o_service=PGPlotRenderService()
+		try:
+			ldv_results=o_service.render( lds_specs )
+		finally:
+			o_service.close()
+	'''
+
+	def __init__( self, i_total_processes=None, s_image_format=DEFAULT_IMAGE_FORMAT ):
+		'''
+		param i_total_processes, the number of worker processes,
+			by default one per cpu.
+		param s_image_format, the image file extension, which
+			matplotlib uses to select the format, ex: "png", "pdf".
+		'''
+		self.__total_processes=i_total_processes \
+				if i_total_processes is not None else multiprocessing.cpu_count()
+		self.__image_format=s_image_format
+		self.__pool=None
+		return
+	#end __init__
+
+	def __get_pool( self ):
+		if self.__pool is None:
+			self.__pool=multiprocessing.Pool( self.__total_processes,
+								initializer=initialize_render_worker )
+		#end if no pool yet, start one
+		return self.__pool
+	#end __get_pool
+
+	def __get_checked_spec( self, ds_spec ):
+		'''
+		Returns a copy of the spec with absolute paths, since
+		workers render from the image files' directories.
+		'''
+		for s_key in [ SPEC_TYPE, SPEC_TABLE_FILE, SPEC_CONFIG_FILE ]:
+			if s_key not in ds_spec:
+				s_msg="In PGPlotRenderService instance, def render, " \
+							+ "a plot spec is missing its \"" + s_key + "\" item: " \
+							+ str( ds_spec ) + "."
+				raise Exception( s_msg )
+			#end if missing item
+		#end for each required item
+
+		if ds_spec[ SPEC_TYPE ] not in PLOT_TYPES:
+			s_msg="In PGPlotRenderService instance, def render, " \
+						+ "unknown plot type: " + str( ds_spec[ SPEC_TYPE ] ) \
+						+ ".  Known types: " + ", ".join( PLOT_TYPES ) + "."
+			raise Exception( s_msg )
+		#end if unknown type
+
+		ds_checked=dict( ds_spec )
+		ds_checked[ SPEC_TABLE_FILE ]=os.path.abspath( ds_spec[ SPEC_TABLE_FILE ] )
+		ds_checked[ SPEC_CONFIG_FILE ]=os.path.abspath( ds_spec[ SPEC_CONFIG_FILE ] )
+		ds_checked[ SPEC_IMAGE_PREFIX ]=os.path.abspath( get_image_prefix_for_spec( ds_checked ) )
+
+		return ds_checked
+	#end __get_checked_spec
+
+	def render( self, lds_specs ):
+		'''
+		Renders the specs, and returns a list of result dicts, in
+		spec order, each with the (checked) spec, the list of image
+		files written, and an error string, None if the spec
+		rendered without error.
+		'''
+		lds_checked=[ self.__get_checked_spec( ds_spec ) for ds_spec in lds_specs ]
+
+		#Group the specs by table and subsample values,
+		#in order of each group's first spec:
+		lt_group_keys=[]
+		dli_spec_indices_by_group={}
+		for idx in range( len( lds_checked ) ):
+			ds_spec=lds_checked[ idx ]
+			t_key=( ds_spec[ SPEC_TABLE_FILE ],
+						ds_spec.get( SPEC_POP_SUBSAMPLE_VALUE ),
+						ds_spec.get( SPEC_LOCI_SUBSAMPLE_VALUE ) )
+			if t_key not in dli_spec_indices_by_group:
+				dli_spec_indices_by_group[ t_key ]=[]
+				lt_group_keys.append( t_key )
+			#end if new group
+			dli_spec_indices_by_group[ t_key ].append( idx )
+		#end for each spec
+
+		lt_tasks=[ ( [ lds_checked[ idx ] for idx in dli_spec_indices_by_group[ t_key ] ],
+									self.__image_format ) for t_key in lt_group_keys ]
+
+		if len( lt_tasks ) == 0:
+			return []
+		#end if nothing to render
+
+		lldv_results=self.__get_pool().map( render_specs_for_one_table, lt_tasks )
+
+		ldv_results=[ None ] * len( lds_checked )
+		for i_group in range( len( lt_group_keys ) ):
+			li_indices=dli_spec_indices_by_group[ lt_group_keys[ i_group ] ]
+			for i_item in range( len( li_indices ) ):
+				ldv_results[ li_indices[ i_item ] ]=lldv_results[ i_group ][ i_item ]
+			#end for each spec in the group
+		#end for each group
+
+		return ldv_results
+	#end render
+
+	def close( self ):
+		'''
+		Lets the workers finish, and ends them.
+		'''
+		if self.__pool is not None:
+			self.__pool.close()
+			self.__pool.join()
+			self.__pool=None
+		#end if we have a pool
+		return
+	#end close
+
+	def terminate( self ):
+		'''
+		Ends the workers without waiting for them to finish,
+		as when a user cancels the plotting.
+		'''
+		if self.__pool is not None:
+			self.__pool.terminate()
+			self.__pool.join()
+			self.__pool=None
+		#end if we have a pool
+		return
+	#end terminate
+#end class PGPlotRenderService
+
+if __name__ == "__main__":
+	pass
+#end if main
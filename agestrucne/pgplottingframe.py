@@ -50,13 +50,14 @@ from matplotlib import style
 import numpy as np
 #For message to stderr in def, update_data_from_file:
 import sys
-#So that we can wait for a file to exist before 
-#trying to open it in def, update_data_from_file.
 import os
+#For the frame-time counts in def animate:
+import time
 
 from agestrucne.pgguiutilities import FredLundhsAutoScrollbar
 from agestrucne.pgneestimationtablefilemanager import NeEstimationTableFileManager
 from agestrucne.pgregresser import PGRegresser
+from agestrucne.pgtailingfilereader import PGTailingFileReader
 
 #For initializing boxplots when no data is available.
 NO_BOXPLOT_DATA={ 'labels':["no_data"], 'value_lists':[[0]] }
@@ -90,7 +91,13 @@ class PGPlottingFrame( Frame ):
 				i_animate_interval=1000,
 				s_xlabel="",
 				s_ylabel="",
-				s_zlabel=""):
+				s_zlabel="",
+				b_blit=False ):
+		'''
+		param b_blit, if True, and b_do_animate is True, the animation
+			is run with matplotlib's blitting, and so def animate must 
+			return the (animated) artists it updates.
+		'''
 
 		Frame.__init__( self, o_master_frame )
 
@@ -106,6 +113,13 @@ class PGPlottingFrame( Frame ):
 		self.zlabel=s_zlabel
 		self.__tuple_of_args_for_animation_call=tuple_args_for_animation_call
 		self.__do_animate=b_do_animate
+		self.__blit=b_blit
+		#Totals updated by def recordFrameTime:
+		self.__frame_count=0
+		self.__frame_seconds_total=0.0
+		self.__frame_seconds_max=0.0
+		#Assigned in def __add_plotting_canvas when animating:
+		self.__plot_animation=None
 		#Assigned in make_figure def below.
 		self.subplot=None
 		self.__host_canvas=None
@@ -138,7 +152,8 @@ class PGPlottingFrame( Frame ):
 				self.__plot_animation=animation.FuncAnimation( self.__figure, 
 														self.animate, 
 														fargs=self.__tuple_of_args_for_animation_call, 
-														interval=self.__animate_interval )
+														interval=self.__animate_interval,
+														blit=self.__blit )
 		#end if do animate
 
 		o_scrolling_canvas.create_window( self.__figure_width, self.__figure_height, 
@@ -174,6 +189,54 @@ class PGPlottingFrame( Frame ):
 		return
 	#end do_animate
 
+	def destroy( self ):
+		'''
+		The animation's timer would otherwise keep
+		calling def animate after the frame is gone.
+		'''
+		if self.__plot_animation is not None:
+			self.__plot_animation.event_source.stop()
+			self.__plot_animation=None
+		#end if animating
+
+		Frame.destroy( self )
+		return
+	#end destroy
+
+	def recordFrameTime( self, f_seconds ):
+		'''
+		Child classes call this with the time taken by each call
+		to their animate def, so that rendering modes can be compared
+		using def getFrameTimeStats.
+		'''
+		self.__frame_count+=1
+		self.__frame_seconds_total+=f_seconds
+		self.__frame_seconds_max=max( self.__frame_seconds_max, f_seconds )
+		return
+	#end recordFrameTime
+
+	def getFrameTimeStats( self ):
+		'''
+		Returns a dict giving the number of frames recorded by 
+		def recordFrameTime, and the total, mean and maximum
+		seconds per frame.
+		'''
+		f_mean=None if self.__frame_count == 0 \
+				else self.__frame_seconds_total / self.__frame_count
+
+		return { "frames":self.__frame_count,
+					"total_seconds":self.__frame_seconds_total,
+					"mean_seconds":f_mean,
+					"max_seconds":self.__frame_seconds_max }
+	#end getFrameTimeStats
+
+	def resetFrameTimeStats( self ):
+		self.__frame_count=0
+		self.__frame_seconds_total=0.0
+		self.__frame_seconds_max=0.0
+		return
+	#end resetFrameTimeStats
+
 	def __save_plot_to_file( self, s_filename, s_type="png" ):
 		if not( s_filename.endswith( ".png" ) or s_filename.endswith( ".pdf" ) ):
 			s_filename=s_filename + ".png"
@@ -316,6 +379,10 @@ class PGPlottingFrame2DLines( PGPlottingFrame ):
 
 	MARKER_SIZE_PAD=3
 
+	#Fraction of the axis span added when the incremental
+	#rendering rescales the axes of an animated plot:
+	ANIMATION_AXIS_HEADROOM=0.25
+
 	def __init__( self, 
 					o_master_frame=None,
 					tuple_args_for_animation_call=None,
@@ -333,7 +400,15 @@ class PGPlottingFrame2DLines( PGPlottingFrame ):
 					s_data_file=None,
 					i_col_num_x_values=1,
 					i_col_num_y_values=2,
-					s_file_col_delimiter="\t" ):
+					s_file_col_delimiter="\t",
+					b_incremental_rendering=False ):
+		'''
+		param b_incremental_rendering, if True, def animate 
+			updates line artists made on the first frame, 
+			rather than clearing and replotting the subplot, and 
+			draws the lines by blitting them over the saved 
+			static background.  See def __animate_incrementally.
+		'''
 
 		PGPlottingFrame.__init__ ( self, 
 									o_master_frame=o_master_frame,
@@ -347,22 +422,68 @@ class PGPlottingFrame2DLines( PGPlottingFrame ):
 									i_labelfontsize=i_labelfontsize,
 									i_animate_interval=i_animate_interval,
 									s_xlabel=s_xlabel,
-									s_ylabel=s_ylabel )
+									s_ylabel=s_ylabel,
+									b_blit=b_incremental_rendering )
 	
 		self.__plot_line_width=f_plot_line_width
 		self.__data_file=s_data_file
 		self.__col_num_x_vals=i_col_num_x_values
 		self.__col_num_y_vals=i_col_num_y_values
-		self.__data_file_col_delimiter="\t"
+		self.__data_file_col_delimiter=s_file_col_delimiter
+
+		self.__data_file_reader=None
+		self.__have_file_data=False
+		self.__x_values_in_file_order_are_sorted=True
+
+		self.__incremental_rendering=b_incremental_rendering
+		#Assigned in def __reset_incremental_artists:
+		self.__artists_subplot=None
+		self.__line_artists={}
+		self.__x_labels_by_line_name={}
+		self.__data_limits=None
+		self.__static_settings=None
+		self.__background=None
+		#Canvas and connection id of our draw_event handler, 
+		#so that a reset can disconnect it before connecting anew:
+		self.__draw_event_canvas=None
+		self.__draw_event_cid=None
+
+		if self.__data_file is not None:
+			self.__data_file_reader=PGTailingFileReader( self.__data_file,
+										li_col_nums=[ self.__col_num_x_vals, 
+														self.__col_num_y_vals ],
+										s_delimiter=self.__data_file_col_delimiter,
+										s_warning_source="PGPlottingFrame2DLines" )
+		#end if we have a data file to follow
 
 		return
 
 	#end __init__
 
 	def animate( self, i_interval=None ):
+		f_start_time=time.time()
+
+		if self.__incremental_rendering:
+			v_artists=self.__animate_incrementally()
+		else:
+			v_artists=self.__animate_by_replotting()
+		#end if incremental, else replot all
+
+		self.recordFrameTime( time.time() - f_start_time )
+
+		return v_artists
+	#end animate
+
+	def __animate_by_replotting( self ):
 
 		MARGIN_ADJUST=0.2
-		self.updateData()
+
+		b_data_changed=self.updateData()
+
+		if b_data_changed is False:
+			return
+		#end if no new data, nothing to redraw
+
 		self.subplot.clear()
 		self.subplot.set_xlabel(self.xlabel, fontsize=self.label_fontsize )
 		self.subplot.set_ylabel( self.ylabel, fontsize=self.label_fontsize )
@@ -394,12 +515,262 @@ class PGPlottingFrame2DLines( PGPlottingFrame ):
 				self._PGPlottingFrame__figure.canvas.draw() 
 		#end if no animation 
 		return
-	#end __animate
+	#end __animate_by_replotting
+
+	def __reset_incremental_artists( self ):
+		'''
+		Called on the first incremental frame, and when the parent 
+		class has made a new figure (as in def resetFigureWidthAndHeight).
+		'''
+		self.__artists_subplot=self.subplot
+		self.__line_artists={}
+		self.__x_labels_by_line_name={}
+		self.__data_limits=None
+		self.__static_settings=None
+		self.__background=None
+
+		if not self._PGPlottingFrame__do_animate:
+			'''
+			Without the FuncAnimation, we do our own blitting, and 
+			need to recapture the background whenever matplotlib
+			does a full draw (as on a resize).  We disconnect
+			any handler connected by an earlier reset, so that
+			the handlers don't accumulate.
+			'''
+			o_canvas=self._PGPlottingFrame__figure.canvas
+
+			if self.__draw_event_cid is not None:
+				self.__draw_event_canvas.mpl_disconnect( self.__draw_event_cid )
+			#end if we connected before
+
+			self.__draw_event_canvas=o_canvas
+			self.__draw_event_cid=o_canvas.mpl_connect( 'draw_event', 
+														self.__on_full_draw )
+		#end if not animating
+		return
+	#end __reset_incremental_artists
+
+	def __on_full_draw( self, o_event=None ):
+		if self.subplot is not self.__artists_subplot:
+			return
+		#end if the event is from a replaced figure
+
+		o_canvas=self._PGPlottingFrame__figure.canvas
+		self.__background=o_canvas.copy_from_bbox( self.subplot.bbox )
+		for o_artist in self.__line_artists.values():
+			self.subplot.draw_artist( o_artist )
+		#end for each line
+		return
+	#end __on_full_draw
+
+	def __apply_static_settings( self ):
+		'''
+		Sets the labels, tick label size and margin when they've changed
+		since the last frame.  Returns True if they changed, since then
+		the static background needs a full redraw.
+		'''
+		MARGIN_ADJUST=0.2
+
+		t_settings=( self.xlabel, self.ylabel, self.label_fontsize, 
+							self._PGPlottingFrame__ticklabelsize )
+
+		if t_settings == self.__static_settings:
+			return False
+		#end if no change
+
+		self.subplot.set_xlabel(self.xlabel, fontsize=self.label_fontsize )
+		self.subplot.set_ylabel( self.ylabel, fontsize=self.label_fontsize )
+		self.set_tic_lable_size()
+
+		if self.__static_settings is None:
+			self._PGPlottingFrame__figure.subplots_adjust(bottom=MARGIN_ADJUST)
+		#end if first frame
+
+		self.__static_settings=t_settings
+		return True
+	#end __apply_static_settings
+
+	def __update_line_artists( self ):
+		'''
+		Updates the existing line artists with set_data, creating artists
+		for new line names and removing those for names no longer in the 
+		data.  Returns True if the lines or xtick labels changed in a way
+		that needs a full redraw.
+		'''
+		b_needs_full_redraw=False
+
+		for s_line_name in self.current_data:
+			dv_line=self.current_data[ s_line_name ]
+			lv_xvals=dv_line[ "x" ] if dv_line[ "x" ] is not None else []
+			lv_yvals=dv_line[ "y" ] if dv_line[ "y" ] is not None else []
+
+			if s_line_name not in self.__line_artists:
+				o_line,=self.subplot.plot( [], [], 
+										linewidth=self.__plot_line_width,
+										markersize=self.__plot_line_width \
+												+ PGPlottingFrame2DLines.MARKER_SIZE_PAD,
+										linestyle='dashed', 
+										marker='o',
+										animated=True )
+				self.__line_artists[ s_line_name ]=o_line
+				b_needs_full_redraw=True
+			#end if new line
+
+			self.__line_artists[ s_line_name ].set_data( lv_xvals, lv_yvals )
+
+			if "x_labels" in dv_line:
+				t_labels=( tuple( dv_line[ "x_labels" ] ), tuple( lv_xvals ) )
+				if t_labels != self.__x_labels_by_line_name.get( s_line_name ):
+					self.set_x_axis_margin_and_xtick_rotation( dv_line[ "x_labels" ], 
+														lv_xtick_vals=lv_xvals )
+					self.__x_labels_by_line_name[ s_line_name ]=t_labels
+					b_needs_full_redraw=True
+				#end if labels changed
+			#end if the line has a set of xtick labels.
+		#end for each line
+
+		for s_line_name in list( self.__line_artists ):
+			if s_line_name not in self.current_data:
+				self.__line_artists.pop( s_line_name ).remove()
+				self.__x_labels_by_line_name.pop( s_line_name, None )
+				b_needs_full_redraw=True
+			#end if line no longer in data
+		#end for each artist
+
+		return b_needs_full_redraw
+	#end __update_line_artists
+
+	def __rescale_if_limits_changed( self ):
+		'''
+		Rescales the axes only when the data's limits have changed.
+		Returns True if it rescaled.
+
+		When animating, as when following a file of simulation output,
+		the data usually grows with each frame, and rescaling each 
+		time would mean a full redraw each frame.  So we rescale only 
+		when the data leaves the current view (or shrinks to less than 
+		half of it), and then leave headroom for the data to grow into.
+		'''
+		o_myc=PGPlottingFrame2DLines
+
+		lf_limits=[]
+		for o_line in self.__line_artists.values():
+			try:
+				ar_x=np.asarray( o_line.get_xdata(), dtype=float )
+				ar_y=np.asarray( o_line.get_ydata(), dtype=float )
+			except ( TypeError, ValueError ) as oex:
+				#Non-numeric values, so we can't compare limits:
+				lf_limits=None
+				break
+			#end try...except
+
+			if len( ar_x ) > 0 and len( ar_y ) > 0:
+				lf_limits.append( [ np.nanmin( ar_x ), np.nanmax( ar_x ), 
+									np.nanmin( ar_y ), np.nanmax( ar_y ) ] )
+			#end if line has data
+		#end for each line
+
+		t_limits=None
+		if lf_limits is not None and len( lf_limits ) > 0:
+			ar_limits=np.array( lf_limits )
+			t_limits=( ar_limits[ :, 0 ].min(), ar_limits[ :, 1 ].max(),
+							ar_limits[ :, 2 ].min(), ar_limits[ :, 3 ].max() )
+		#end if we have numeric data
+
+		if t_limits is not None and t_limits == self.__data_limits:
+			return False
+		#end if limits unchanged
+
+		b_animating=self._PGPlottingFrame__do_animate
+
+		if b_animating and t_limits is not None and self.__data_limits is not None:
+			f_xlow, f_xhigh=self.subplot.get_xlim()
+			f_ylow, f_yhigh=self.subplot.get_ylim()
+			b_data_in_view=t_limits[ 0 ] >= f_xlow and t_limits[ 1 ] <= f_xhigh \
+								and t_limits[ 2 ] >= f_ylow and t_limits[ 3 ] <= f_yhigh
+			b_view_much_too_big=( t_limits[ 1 ] - t_limits[ 0 ] ) < 0.5 * ( f_xhigh - f_xlow ) \
+								or ( t_limits[ 3 ] - t_limits[ 2 ] ) < 0.5 * ( f_yhigh - f_ylow )
+			if b_data_in_view and not b_view_much_too_big:
+				self.__data_limits=t_limits
+				return False
+			#end if the current view still suits the data
+		#end if animating with a view already set
+
+		self.__data_limits=t_limits
+		self.subplot.relim()
+		self.subplot.autoscale_view()
+
+		if b_animating and t_limits is not None:
+			f_xlow, f_xhigh=self.subplot.get_xlim()
+			f_ylow, f_yhigh=self.subplot.get_ylim()
+			self.subplot.set_xlim( f_xlow, f_xhigh + o_myc.ANIMATION_AXIS_HEADROOM * ( f_xhigh - f_xlow ) )
+			f_ypad=0.5 * o_myc.ANIMATION_AXIS_HEADROOM * ( f_yhigh - f_ylow )
+			self.subplot.set_ylim( f_ylow - f_ypad, f_yhigh + f_ypad )
+		#end if animating, add headroom
+
+		return True
+	#end __rescale_if_limits_changed
+
+	def __animate_incrementally( self ):
+		'''
+		Instead of clearing the subplot and replotting all lines
+		on each frame, we create the line artists once, and update 
+		them with set_data.  The labels and axes limits, drawn with 
+		the static background, are reset only when they change, when 
+		we do a full redraw. Otherwise, only the (animated) lines are 
+		drawn over the saved background, and blitted to the canvas.
+		'''
+		o_canvas=self._PGPlottingFrame__figure.canvas
+
+		if self.subplot is not self.__artists_subplot:
+			self.__reset_incremental_artists()
+		#end if first frame or new figure
+
+		b_data_changed=self.updateData()
+
+		b_needs_full_redraw=self.__apply_static_settings()
+
+		if b_data_changed is not False or b_needs_full_redraw:
+			b_needs_full_redraw=self.__update_line_artists() or b_needs_full_redraw
+			b_needs_full_redraw=self.__rescale_if_limits_changed() or b_needs_full_redraw
+		#end if data may have changed
+
+		lo_artists=list( self.__line_artists.values() )
+
+		if self._PGPlottingFrame__do_animate:
+			'''
+			The FuncAnimation, made with blit=True, draws and blits 
+			the returned artists.
+			'''
+			if b_needs_full_redraw:
+				o_canvas.draw()
+			#end if static parts changed
+		else:
+			if b_needs_full_redraw or self.__background is None:
+				#Our draw_event handler saves the background and draws the lines.
+				o_canvas.draw()
+			else:
+				o_canvas.restore_region( self.__background )
+				for o_artist in lo_artists:
+					self.subplot.draw_artist( o_artist )
+				#end for each line
+				o_canvas.blit( self.subplot.bbox )
+			#end if full redraw, else blit
+		#end if animating, else draw or blit ourselves
+
+		return lo_artists
+	#end __animate_incrementally
 
 	def updateData( self ):
+		'''
+		Returns False when the data file had no new data since the 
+		last update, so that def animate can skip redrawing, else True.
+		'''
+		b_data_changed=True
 		if self.__data_file is not None:
-			self.__update_data_from_file()
-		return
+			b_data_changed=self.__update_data_from_file()
+		#end if we have a data file
+		return b_data_changed
 	#end updateData
 
 	def clearPlot( self ):
@@ -411,65 +782,61 @@ class PGPlottingFrame2DLines( PGPlottingFrame ):
 	#end clearPlot
 
 	def __update_data_from_file( self ):
-
-		self.clearPlot()
-
-		o_file=None	
-
-		NO_DATA={ "line1": { "x":[], "y":[] } }
-		
-		self.current_data=NO_DATA
-
 		'''
+		Until now this def reopened and reparsed the whole data
+		file on each animation tick.  The PGTailingFileReader instead
+		parses only the lines appended since the last tick, and we 
+		return False when there were none, so that the plot is not redrawn.
+
 		We want this object to be able to wait
-		for a file of data to be created and written to.
+		for a file of data to be created and written to,
+		which the reader does, returning no new rows until
+		the file exists.
 		'''
-		if os.path.exists( self.__data_file ):
-			o_file=open( self.__data_file )
-			i_line_count=0
-
-			for s_line in o_file:
-				i_line_count+=1
-
-				ls_values=s_line.strip().split( self.__data_file_col_delimiter )
-
-				try:
-					f_x = float( ls_values[ self.__col_num_x_vals - 1 ] ) 
-					f_y = float( ls_values[ self.__col_num_y_vals - 1 ] )  
-
-					self.current_data[ "line1" ][ "x" ].append( f_x )
-					self.current_data[ "line1" ][ "y" ].append( f_y )
-				except ValueError as ve:
-					s_msg="In PGPlottingFrame2DLines instance, " \
-							+ "def update_data_from_file, " \
-							+ "reading file line: \"" \
-							+ s_line.strip() + "\", columns " + str(self.__col_num_x_vals ) \
-							+ " and " + str( self.__col_num_y_vals ) + ", " \
-							+ "the program could not cast the values as numbers."
+		i_new_rows=self.__data_file_reader.update()
 
-					sys.stderr.write( "Warning:  " + s_msg  + "\n" )
-				#end if can't cast send message, try next
-			#end for each line
+		b_first_update=not self.__have_file_data
+		self.__have_file_data=True
 
-			o_file.close()
+		if i_new_rows == 0 \
+				and not self.__data_file_reader.was_reset \
+				and not b_first_update:
+			return False
+		#end if no new data
 
-		#end if the file exists, open it
+		ar_x=self.__data_file_reader.getColumnValues( 0 )
+		ar_y=self.__data_file_reader.getColumnValues( 1 )
 
 		'''
 		We need strictly increasing xvalues or the 
 		plotted line can zigzag and cross itself.
+		Lines are usually appended in x order, so we
+		only check the new values to see if the file's
+		order still holds, and sort only when it does not.
 		'''
+		if self.__data_file_reader.was_reset or b_first_update:
+			self.__x_values_in_file_order_are_sorted=True
+			i_first_new=0
+		else:
+			i_first_new=len( ar_x ) - i_new_rows
+		#end if we read the file from its start, check all, else only new values
 
-		l_idx_sorted_on_xval=list( np.argsort( self.current_data[ "x" ] ) )
-
-		lf_sorted_x=[ self.current_data["x"][idx] for idx in l_idx_sorted_on_xval ]
-		lf_sorted_y=[ self.current_data["y"][idx] for idx in l_idx_sorted_on_xval ]
+		if self.__x_values_in_file_order_are_sorted:
+			ar_check=ar_x[ max( 0, i_first_new - 1 ) : ]
+			self.__x_values_in_file_order_are_sorted=bool( np.all( ar_check[ 1: ] >= ar_check[ :-1 ] ) )
+		#end if the file's x values have been in order so far
 
-		dlv_sorted_data_in_file={ "x":lf_sorted_x , "y":lf_sorted_y } 
+		if self.__x_values_in_file_order_are_sorted:
+			dlv_sorted_data_in_file={ "x":ar_x, "y":ar_y }
+		else:
+			ar_idx_sorted_on_xval=np.argsort( ar_x, kind="stable" )
+			dlv_sorted_data_in_file={ "x":ar_x[ ar_idx_sorted_on_xval ], 
+											"y":ar_y[ ar_idx_sorted_on_xval ] }
+		#end if x values already sorted, else sort
 
-		self.current_data=dlv_sorted_data_in_file
+		self.current_data={ "line1":dlv_sorted_data_in_file }
 
-		return	
+		return True	
 
 	#end update_data_from_file
 #end class PGPlottingFrame2DLines
@@ -509,7 +876,8 @@ class PGPlottingFrame2DLinesFromFileManager( PGPlottingFrame2DLines ):
 					s_data_file=None,
 					i_col_num_x_values=1,
 					i_col_num_y_values=2,
-					s_file_col_delimiter="\t" ):
+					s_file_col_delimiter="\t",
+					b_incremental_rendering=False ):
 
 		'''
 		Note that we don't use the s_data_file string,
@@ -533,7 +901,8 @@ class PGPlottingFrame2DLinesFromFileManager( PGPlottingFrame2DLines ):
 									s_data_file=None,
 									i_col_num_x_values=i_col_num_x_values,
 									i_col_num_y_values=i_col_num_y_values,
-									s_file_col_delimiter=s_file_col_delimiter )
+									s_file_col_delimiter=s_file_col_delimiter,
+									b_incremental_rendering=b_incremental_rendering )
 
 		self.__tsv_file_manager=o_tsv_file_manager	
 		self.__x_val_column_name=s_x_value_colname
@@ -702,7 +1071,8 @@ class PGPlottingFrameRegressionLinesFromFileManager( PGPlottingFrame2DLinesFromF
 					i_col_num_x_values=1,
 					i_col_num_y_values=2,
 					s_file_col_delimiter="\t",
-					s_expected_slope = "auto" ):
+					s_expected_slope = "auto",
+					b_incremental_rendering=False ):
 
 		'''
 		Note that we don't use the s_data_file string,
@@ -733,7 +1103,8 @@ class PGPlottingFrameRegressionLinesFromFileManager( PGPlottingFrame2DLinesFromF
 									s_data_file=None,
 									i_col_num_x_values=i_col_num_x_values,
 									i_col_num_y_values=i_col_num_y_values,
-									s_file_col_delimiter=s_file_col_delimiter )
+									s_file_col_delimiter=s_file_col_delimiter,
+									b_incremental_rendering=b_incremental_rendering )
 
 		self.__mangledname="_PGPlottingFrame2DLinesFromFileManager__"
 		self.__expected_slope=s_expected_slope
@@ -1073,12 +1444,19 @@ class PGPlottingFrameBoxplotFromFileManager( PGPlottingFrame ):
 					s_data_file=None,
 					i_col_num_x_values=1,
 					i_col_num_y_values=2,
-					s_file_col_delimiter="\t"):
+					s_file_col_delimiter="\t",
+					o_summary_file=None ):
 		'''
 		Arg def_to_convert_labels expects a ref to a def
 		that takes as the first arg the self.current_data[ 'labels' ]
 		list, and as the second arg the sorted version of the sting list 
 		given by self.__group_by_column_names.
+
+		2026_10_19.  Arg o_summary_file, if not None, is a 
+		NeEstimationSummaryFile object for the tsv file.  When the 
+		client calls setSummaryFilters with a dict of filters, the 
+		boxes are drawn from the summary's stats, if it has them, 
+		rather than from the tsv file manager's data.
 		'''
 
 		PGPlottingFrame.__init__ ( self, 
@@ -1106,6 +1484,10 @@ class PGPlottingFrameBoxplotFromFileManager( PGPlottingFrame ):
 		self.__y_value_column_name=s_y_value_colname
 		self.__def_to_convert_labels=def_to_convert_labels
 
+		self.__summary_file=o_summary_file
+		self.__summary_filters=None
+		self.__current_stats=None
+
 	#end __init__
 
 	def animate( self, i_interval=None ):
@@ -1118,8 +1500,12 @@ class PGPlottingFrameBoxplotFromFileManager( PGPlottingFrame ):
 			self.set_x_axis_margin_and_xtick_rotation( self.current_data[ 'labels' ] )
 			self.subplot.set_xlabel(self.xlabel, fontsize=self.label_fontsize )
 			self.subplot.set_ylabel( self.ylabel, fontsize=self.label_fontsize )
-			self.subplot.boxplot( x=self.current_data[ 'value_lists' ],
+			if self.__current_stats is not None:
+				self.subplot.bxp( self.__current_stats )
+			else:
+				self.subplot.boxplot( x=self.current_data[ 'value_lists' ],
 										labels=self.current_data[ 'labels' ] )
+			#end if drawing from summary stats, else from values
 			if self._PGPlottingFrame__do_animate==False:
 				#self.subplot.draw( renderer=self._PGPlottingFrame__figure.canvas.draw() )
 				self._PGPlottingFrame__figure.canvas.draw() 
@@ -1193,6 +1579,36 @@ class PGPlottingFrameBoxplotFromFileManager( PGPlottingFrame ):
 		return
 	#end __update_data_from_file_manager
 
+	def __update_data_from_summary_stats( self, ldv_stats ):
+		'''
+		2026_10_19.  As for __update_data_from_file_manager,
+		but with labels and boxes from the summary file's 
+		stats.  The value lists are left empty.
+		'''
+		ls_labels=[ dv_stats[ 'label' ] for dv_stats in ldv_stats ]
+		ls_natsorted_labels=realsorted( ls_labels )
+		ldv_sorted_stats=[ ldv_stats[ ls_labels.index( s_label ) ] \
+											for s_label in ls_natsorted_labels ]
+
+		self.current_data[ 'labels' ]=list( ls_natsorted_labels )
+		self.current_data[ 'value_lists' ]=[ [] for s_label in ls_natsorted_labels ]
+
+		ls_sorted_groupby_column_names=None if self.__group_by_column_names is None \
+							else sorted( self.__group_by_column_names ) 
+
+		if self.__def_to_convert_labels is not None:
+			self.__def_to_convert_labels( self.current_data[ 'labels' ], 
+										ls_sorted_groupby_column_names )
+		#end if client wants some label processing
+
+		for dv_stats, s_label in zip( ldv_sorted_stats, self.current_data[ 'labels' ] ):
+			dv_stats[ 'label' ]=s_label
+		#end for each box, use the converted label
+
+		self.__current_stats=ldv_sorted_stats
+		return
+	#end __update_data_from_summary_stats
+
 	def __remove_empty_data_lists( self ):
 
 		ls_labels_with_data=[]
@@ -1244,6 +1660,19 @@ class PGPlottingFrameBoxplotFromFileManager( PGPlottingFrame ):
 
 	def updateData( self, v_data=None ):
 
+		self.__current_stats=None
+
+		if self.__summary_file is not None \
+					and self.__summary_filters is not None:
+			ldv_stats=self.__summary_file.getBoxplotStats( self.__group_by_column_names,
+															self.__y_value_column_name,
+															self.__summary_filters )
+			if ldv_stats is not None:
+				self.__update_data_from_summary_stats( ldv_stats )
+				return
+			#end if the summary has the stats
+		#end if the client allows use of the summary
+
 		if self.__tsv_file_manager is not None:
 			self.__update_data_from_file_manager()
 		else:
@@ -1252,6 +1681,19 @@ class PGPlottingFrameBoxplotFromFileManager( PGPlottingFrame ):
 		return
 	#end updateData
 
+	def setSummaryFilters( self, dv_equals_filters ):
+		'''
+		2026_10_19.  Param dv_equals_filters is None if
+		the data must come from the tsv file manager 
+		(its filters are not all equality filters on 
+		the summary's key columns), else a dict of key column 
+		names to values the column must equal (an empty dict 
+		if no filters), to apply to the summary's groups.
+		'''
+		self.__summary_filters=dv_equals_filters
+		return
+	#end setSummaryFilters
+
 	def setGroupByColumnNames( self, ls_group_by_column_names ):
 		self.__group_by_column_names=ls_group_by_column_names 
 		return
@@ -23,8 +23,8 @@ __author__ = "Ted Cosart<ted.cosart@umontana.edu>"
 
 import os
 
+import numpy
 from numpy import mean, median, isnan
-from scipy import stats
 
 '''
 Now using revised versions of the viz files
@@ -32,7 +32,12 @@ from Brian T, so that slopeConfidence
 is now slope_confidence:
 '''
 #from agestrucne.asnviz.LineRegress import slopeConfidence
-from agestrucne.asnviz.LineRegress import slope_confidence, alpha_test, calculate_s_score
+#from agestrucne.asnviz.LineRegress import slope_confidence, alpha_test, calculate_s_score
+'''
+2026_10_19. The per-line stats now come from the batch
+defs, computed for all lines at once.
+'''
+from agestrucne.asnviz.LineRegress import batch_line_stats, batch_slope_signs
 
 from agestrucne.pgneestimationtablefilemanager import NeEstimationTableFileManager
 
@@ -134,8 +139,6 @@ class PGRegressionStats( object ):
 													"\n" ] )
 			slopeVctr = []
 			confidenceVctr = []
-			alpha_vctr=[]
-			s_score_vctr=[]
 
 			Uncountable = 0
 			'''
@@ -151,9 +154,31 @@ class PGRegressionStats( object ):
 
 			ls_keys_sorted=sorted( list(table.keys()) )
 
-			for recordKey in ls_keys_sorted:
+			'''
+			2026_10_19.  Rather than calling slope_confidence, alpha_test,
+			calculate_s_score and stats.t.sf per line, we get the slopes, 
+			intercepts, confidence intervals and p-values for all lines 
+			in one batch.  The alpha_test results (alpha_vctr) were never 
+			used in the output, so we no longer compute them.
+			'''
+			d_line_stats=batch_line_stats( table, self.__confidence_alpha, ls_keys_sorted )
+			ar_slope_signs=batch_slope_signs( d_line_stats, self.__confidence_alpha )
+
+			'''
+			As with slope_confidence, lines with 2 or fewer points 
+			get NA values and are not counted:
+			'''
+			ar_has_stats=d_line_stats[ "count" ] > 2
 
-				record = table[recordKey]
+			positiveCount=int( numpy.sum( ar_has_stats & ( ar_slope_signs > 0 ) ) )
+			negativeCount=int( numpy.sum( ar_has_stats & ( ar_slope_signs < 0 ) ) )
+			zeroCount=int( numpy.sum( ar_has_stats ) ) - positiveCount - negativeCount
+
+			s_score_vctr=d_line_stats[ "s_score" ][ ar_has_stats ]
+
+			for idx in range( len( ls_keys_sorted ) ):
+
+				recordKey=ls_keys_sorted[ idx ]
 
 				s_file_name=recordKey
 				
@@ -161,55 +186,14 @@ class PGRegressionStats( object ):
 					s_file_name=self.__get_source_file_name_from_file_manager_key( recordKey )
 				#end if not b_use_all_key_fields
 				
-				v_return_slope_conf=slope_confidence( self.__confidence_alpha,record)
-
-				
-
-				slope=None; intercept=None; confidence=None
 				ls_vals_for_table=None
 
-				if type( v_return_slope_conf ) == tuple:
-					#We assume we got numbers if a tuple was returned.
-					slope, intercept, confidence  = v_return_slope_conf 
-					'''
-
-					2018_03_17.  New code from Brian T's 
-					latest _neStatsHelper
-					'''
-					# perform alpha test
-					alpha_result = alpha_test(self.__significant_value, record)
-					if alpha_result == 0:
-						alpha_vctr.append(0)
-					elif slope > 0:
-						alpha_vctr.append(1)
-					else:
-						alpha_vctr.append(-1)
-
-					#get std dev estimate
-					s_val = calculate_s_score(record)
-					s_score_vctr.append(s_val)
-					t_star = old_div(slope,s_val)
-					#calculate p value DF = num points-2
-					p_score = stats.t.sf(t_star,len(record)-2)
-
-					'''
-					2018_04_11.  From Brian T's revisions as
-					posted to master repository today or yesterday.
-					'''
-					#calculate significant from CDF(p-value)
-					alpha_check = 1-(abs(p_score-0.5)*2)
-					if self.__confidence_alpha > alpha_check:
-						if slope > 0:
-							positiveCount+=1
-						else:
-							negativeCount+=1
-					else:
-						zeroCount+=1
-
-					#end if confidence alpha > alpha check
-					'''
-					End revisions 2018_04_11.
-					'''
+				if ar_has_stats[ idx ]:
+					slope=d_line_stats[ "slope" ][ idx ]
+					intercept=d_line_stats[ "intercept" ][ idx ]
+					confidence=( d_line_stats[ "ci_lower" ][ idx ], 
+										d_line_stats[ "ci_upper" ][ idx ] )
+					p_score=d_line_stats[ "p_value" ][ idx ]
 					 
 					'''
 					Note that the "float" cast was need (at least in py3 ), 
@@ -238,7 +222,7 @@ class PGRegressionStats( object ):
 
 					ls_vals_for_table=[ s_file_name, "NA", "NA", "NA", "NA","\n" ]
 
-				#end if slopeConf returned a tuple or couldn't compute
+				#end if line had enough points to compute, else not
 				
 				tableString+=STATS_TABLE_DELIM.join( ls_vals_for_table )
 				
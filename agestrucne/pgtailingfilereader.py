@@ -0,0 +1,218 @@
+'''
+Description
+A class that follows a delimited data file as another
+process appends lines to it, as do the simulation's
+output files while a simulation runs.  Each call to
+def update reads only the bytes appended since the
+last call, and parses the new lines into growable
+numpy arrays, one per requested column, so that a
+live plot's per-tick cost is proportional to the
+new data rather than to the whole file.
+'''
+from __future__ import print_function
+from builtins import range
+from builtins import object
+
+__filename__ = "pgtailingfilereader.py"
+__date__ = "20261019"
+
+import os
+import sys
+import numpy
+
+class PGTailingFileReader( object ):
+	'''
+	Reads the numeric values in the given columns of a
+	delimited file, remembering the byte offset just past
+	the last complete line read, so that each call to update
+	parses only lines appended since.  A final line without
+	a newline is held back until its newline arrives, since
+	the writer may not have finished it.
+
+	If the file shrinks or is replaced (as when a new run
+	writes a new file of the same name), the reader starts
+	over from the beginning of the file, and property
+	was_reset is True after that update.
+	'''
+
+	INITIAL_CAPACITY=1024
+
+	def __init__( self, s_file_name,
+						li_col_nums=[ 1, 2 ],
+						s_delimiter="\t",
+						s_warning_source="PGTailingFileReader" ):
+		'''
+		param s_file_name, the file to follow.  It need not
+			yet exist.
+		param li_col_nums, the (1-based) numbers of the columns
+			whose values are to be read, as floats.
+		param s_delimiter, the column delimiter.
+		param s_warning_source, name used to begin the warnings
+			written to stderr for lines whose values can't be
+			cast as numbers (these lines are skipped).
+		'''
+		self.__file_name=s_file_name
+		self.__col_nums=list( li_col_nums )
+		self.__delimiter=s_delimiter
+		self.__warning_source=s_warning_source
+		self.__was_reset=False
+		self.__reset()
+		return
+	#end __init__
+
+	def __reset( self ):
+		self.__offset=0
+		self.__file_id=None
+		self.__total_rows=0
+		self.__columns=[ numpy.zeros( PGTailingFileReader.INITIAL_CAPACITY,
+									dtype=numpy.float64 ) for i_col in self.__col_nums ]
+		return
+	#end __reset
+
+	def __get_file_id( self, o_stat ):
+		return ( o_stat.st_dev, o_stat.st_ino )
+	#end __get_file_id
+
+	def __append_rows( self, llf_rows ):
+		i_new_total=self.__total_rows + len( llf_rows )
+
+		if i_new_total > len( self.__columns[ 0 ] ):
+			i_capacity=len( self.__columns[ 0 ] )
+			while i_capacity < i_new_total:
+				i_capacity*=2
+			#end while capacity too small
+
+			lar_grown=[]
+			for ar_column in self.__columns:
+				ar_new=numpy.zeros( i_capacity, dtype=numpy.float64 )
+				ar_new[ : self.__total_rows ]=ar_column[ : self.__total_rows ]
+				lar_grown.append( ar_new )
+			#end for each column
+
+			self.__columns=lar_grown
+		#end if we need more room
+
+		ar_rows=numpy.array( llf_rows, dtype=numpy.float64 ).reshape( \
+										( len( llf_rows ), len( self.__col_nums ) ) )
+
+		for idx in range( len( self.__col_nums ) ):
+			self.__columns[ idx ][ self.__total_rows : i_new_total ]=ar_rows[ :, idx ]
+		#end for each column
+
+		self.__total_rows=i_new_total
+		return
+	#end __append_rows
+
+	def __parse_lines( self, s_text ):
+		llf_rows=[]
+		for s_line in s_text.splitlines():
+			s_line=s_line.strip()
+			if s_line == "":
+				continue
+			#end if blank line
+
+			ls_values=s_line.split( self.__delimiter )
+
+			try:
+				llf_rows.append( [ float( ls_values[ i_col - 1 ] ) \
+											for i_col in self.__col_nums ] )
+			except ( ValueError, IndexError ) as oex:
+				s_msg="In " + self.__warning_source + " instance, " \
+						+ "def update, " \
+						+ "reading file line: \"" \
+						+ s_line + "\", columns " \
+						+ ", ".join( [ str( i_col ) for i_col in self.__col_nums ] ) + ", " \
+						+ "the program could not cast the values as numbers."
+				sys.stderr.write( "Warning:  " + s_msg  + "\n" )
+			#end try...except
+		#end for each line
+
+		return llf_rows
+	#end __parse_lines
+
+	def update( self ):
+		'''
+		Reads any complete lines appended to the file since the last
+		call.  Returns the number of new rows of values, zero when the
+		file doesn't exist or nothing new was appended.
+		'''
+		self.__was_reset=False
+
+		try:
+			o_stat=os.stat( self.__file_name )
+		except OSError as ose:
+			return 0
+		#end try...except
+
+		t_file_id=self.__get_file_id( o_stat )
+
+		if self.__file_id is not None \
+				and ( t_file_id != self.__file_id or o_stat.st_size < self.__offset ):
+			self.__reset()
+			self.__was_reset=True
+		#end if file replaced or truncated, start over
+
+		self.__file_id=t_file_id
+
+		if o_stat.st_size == self.__offset:
+			return 0
+		#end if nothing new
+
+		o_file=open( self.__file_name, 'rb' )
+		try:
+			o_file.seek( self.__offset )
+			v_new=o_file.read( o_stat.st_size - self.__offset )
+		finally:
+			o_file.close()
+		#end try...finally
+
+		i_last_newline=v_new.rfind( b'\n' )
+
+		if i_last_newline < 0:
+			return 0
+		#end if no complete line yet
+
+		self.__offset+=i_last_newline + 1
+
+		i_rows_before=self.__total_rows
+		llf_rows=self.__parse_lines( v_new[ : i_last_newline + 1 ].decode( "utf-8", "replace" ) )
+
+		if len( llf_rows ) > 0:
+			self.__append_rows( llf_rows )
+		#end if any parsable lines
+
+		return self.__total_rows - i_rows_before
+	#end update
+
+	def getColumnValues( self, i_index ):
+		'''
+		Returns a numpy array of the values read so far, in file order,
+		for the column given by li_col_nums[ i_index ], as passed to
+		__init__.  The array is a view, valid until the next update.
+		'''
+		return self.__columns[ i_index ][ : self.__total_rows ]
+	#end getColumnValues
+
+	@property
+	def was_reset( self ):
+		'''
+		True if the last update found the file replaced
+		or truncated, and so read it from the beginning.
+		'''
+		return self.__was_reset
+	#end property was_reset
+
+	@property
+	def total_rows( self ):
+		return self.__total_rows
+	#end property total_rows
+
+	@property
+	def file_name( self ):
+		return self.__file_name
+	#end property file_name
+#end class PGTailingFileReader
+
+if __name__ == "__main__":
+	pass
+#end if main
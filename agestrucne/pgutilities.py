@@ -55,6 +55,7 @@ import traceback
 
 from agestrucne.pgutilityclasses import IndependantSubprocessGroup 
 from agestrucne.pgneestimationtablefilemanager import NeEstimationTableFileManager 
+from agestrucne.pgneestimationdatabase import get_current_database_for_tsv_file
 
 #for getting roots of quadratic, for
 #calls from pgopsimupop, to get initial
@@ -75,6 +76,9 @@ distribution
 '''
 import scipy.stats as scistats
 from numpy import searchsorted
+from numpy import array as nparray
+from numpy import nonzero as npnonzero
+from numpy.random import uniform as npuniform
 
 '''
 2018_07_09.  For sampling from a random 
@@ -795,7 +799,9 @@ def run_driveneestimator_in_new_process( o_multiprocessing_event,
 										s_do_nb_bias_adjustment,
 										s_outfile_basename,
 										s_temporary_directory_for_estimator,
-										s_file_delimiter="," ):
+										s_file_delimiter=",",
+										b_write_results_database=False,
+										b_write_summary_file=False ):
 	'''
 	Similar to def above, "do_simulation_reps_in_subprocesses," this def is called from a
 	PGGuiNeEstimator instance, in def runEstimator(), which first spawns
@@ -816,6 +822,10 @@ def run_driveneestimator_in_new_process( o_multiprocessing_event,
 	(optionally, when the param != "None") a chromosome/loci table, and the int arg i_allele_pairing_scheme,
 	which tells LDNe2 how to use chrom info to pair (or avoid pairing) alleles.
 
+	2026_10_19.  If b_write_results_database is True, pgdriveneestimator.py
+	also writes the table of estimates to an indexed SQLite database (see 
+	its flag WRITE_RESULTS_DATABASE).  Likewise, if b_write_summary_file
+	is True, it writes the table's summary file (flag WRITE_SUMMARY_FILE).
 	'''
 
 	try:
@@ -930,7 +940,9 @@ def run_driveneestimator_in_new_process( o_multiprocessing_event,
 																				s_main_output_filename )
 
 		o_subprocess=call_driveneestimator_using_subprocess( seq_final_arg_set, 
-											s_main_def_to_call=s_pgdriveneestimator_main_def_to_call )
+											s_main_def_to_call=s_pgdriveneestimator_main_def_to_call,
+											b_write_results_database=b_write_results_database,
+											b_write_summary_file=b_write_summary_file )
 
 		'''
 		This def loops while calling poll() and tests timeout value, currently
@@ -1118,7 +1130,9 @@ def get_add_path_statment_for_popen():
 	return s_path_append_statement
 #end get_add_path_statment_for_popen
 
-def call_driveneestimator_using_subprocess( seq_arg_set, s_main_def_to_call="mymain" ):
+def call_driveneestimator_using_subprocess( seq_arg_set, s_main_def_to_call="mymain",
+												b_write_results_database=False,
+												b_write_summary_file=False ):
 
 	'''
 	2017_02_20.  We add param s_main_def_to_call to resolve
@@ -1127,6 +1141,11 @@ def call_driveneestimator_using_subprocess( seq_arg_set, s_main_def_to_call="mym
 	we write the file list to a temp file, and call mymainlongfilelist instead
 	of mymain.  We retain the former in case a more graceful handling of
 	the long command string becomes possible.
+
+	2026_10_19.  We add param b_write_results_database, which, when True, 
+	sets pgdriveneestimator.py's WRITE_RESULTS_DATABASE flag in the new 
+	process, before the call.  Param b_write_summary_file does the same
+	for its WRITE_SUMMARY_FILE flag.
 	'''
 
 	QUOTE="\""
@@ -1134,6 +1153,14 @@ def call_driveneestimator_using_subprocess( seq_arg_set, s_main_def_to_call="mym
 
 	s_import_statement="import agestrucne.pgdriveneestimator as pgd;"
 
+	if b_write_results_database:
+		s_import_statement+="pgd.WRITE_RESULTS_DATABASE=True;"
+	#end if we are to write the results database
+
+	if b_write_summary_file:
+		s_import_statement+="pgd.WRITE_SUMMARY_FILE=True;"
+	#end if we are to write the summary file
+
 	s_arg_list=( QUOTE +"," + QUOTE ).join( seq_arg_set )
 	s_arg_list=QUOTE + s_arg_list + QUOTE
 
@@ -1252,15 +1279,20 @@ def get_subsample_value_filtered_ne_estimates_table_file( s_estimates_table_file
 	Assumtions: Either s_pop_subsample_value or s_loci_subsample_value are non None,
 				otherwise, this def simply rewrites the original table file to the new
 				file name
+
+	2026_10_19.  If pgdriveneestimator wrote a database of the
+	table (see class NeEstimationDatabaseWriter), and the table has 
+	not since changed, we fetch the filtered rows from the database, 
+	using its indexes, rather than loading the whole table.
 	'''
-	o_ne_estimates_file_manager=NeEstimationTableFileManager( s_estimates_table_file )
+	dv_equals_filters={}
 
 	if s_pop_subsample_value is not None:
-		o_ne_estimates_file_manager.setFilter( 'sample_value', lambda x : x == s_pop_subsample_value ) 
+		dv_equals_filters[ 'sample_value' ]=s_pop_subsample_value
 	#end if there is a pop subsample value
 
 	if s_loci_subsample_value is not None:
-		o_ne_estimates_file_manager.setFilter( 'loci_sample_value' , lambda x : x == s_loci_subsample_value )
+		dv_equals_filters[ 'loci_sample_value' ]=s_loci_subsample_value
 	#end if we have a loci subsample value
 
 	s_current_dir=os.path.abspath( os.curdir )
@@ -1270,9 +1302,23 @@ def get_subsample_value_filtered_ne_estimates_table_file( s_estimates_table_file
 
 	s_temp_file_name=tup_tempfile[ 1 ]
 
+	o_database=get_current_database_for_tsv_file( s_estimates_table_file )
+
 	o_tempfile=open( s_temp_file_name, 'w' )
 
-	o_ne_estimates_file_manager.writeFilteredTable( o_tempfile )
+	if o_database is not None:
+		o_database.writeTable( o_tempfile, dv_equals_filters )
+		o_database.close()
+	else:
+		o_ne_estimates_file_manager=NeEstimationTableFileManager( s_estimates_table_file )
+
+		for s_column_name in dv_equals_filters:
+			o_ne_estimates_file_manager.setEqualsFilter( s_column_name, 
+										dv_equals_filters[ s_column_name ] ) 
+		#end for each filter
+
+		o_ne_estimates_file_manager.writeFilteredTable( o_tempfile )
+	#end if we have a database, else use the table file
 
 	o_tempfile.close()
 
@@ -1478,6 +1524,41 @@ def run_plotting_program( s_type, s_estimates_table_file, s_plotting_config_file
 	return
 #end run_plotting_program
 
+def render_plots_headless( lds_plot_specs, i_total_processes=None, s_image_format="png" ):
+	'''
+	2026_10_19.  For batch jobs that need image files of many plots,
+	rather than plots shown one subprocess at a time (see def
+	call_plotting_program_in_new_subprocess).  Each spec is a dict
+	with the "type" ("Regression" or "Subsample"), "tsv" and "config"
+	args to def run_plotting_program, and optionally the "pop_subsample_value"
+	and "loci_subsample_value" filter args, and an "image_prefix" for the
+	files written.  Returns a list of result dicts, one per spec (see
+	class PGPlotRenderService in pgplotrenderservice.py), and raises an
+	Exception if any spec failed to render.
+	'''
+	from agestrucne.pgplotrenderservice import PGPlotRenderService, RESULT_ERROR, RESULT_SPEC
+
+	o_service=PGPlotRenderService( i_total_processes=i_total_processes,
+										s_image_format=s_image_format )
+	try:
+		ldv_results=o_service.render( lds_plot_specs )
+	finally:
+		o_service.close()
+	#end try...finally
+
+	ls_errors=[ str( dv_result[ RESULT_SPEC ] ) + ": " + dv_result[ RESULT_ERROR ] \
+							for dv_result in ldv_results if dv_result[ RESULT_ERROR ] is not None ]
+
+	if len( ls_errors ) > 0:
+		s_msg="In pgutilities.py, def render_plots_headless, " \
+					+ str( len( ls_errors ) ) + " of " + str( len( ldv_results ) ) \
+					+ " plot specs failed to render: " + "; ".join( ls_errors )
+		raise Exception( s_msg )
+	#end if errors
+
+	return ldv_results
+#end render_plots_headless
+
 def show_error_in_messagebox_in_new_process( o_exception, s_msg_prefix=None ):
 	
 	s_errortype= o_exception.__class__.__name__
@@ -1611,10 +1692,23 @@ def get_subsample_values_lists_from_tsv_file( s_tsv_file ):
 	'''
 	ls_pop_subsample_values=None
 	ls_loci_subsample_values=None
-	o_ne_file=NeEstimationTableFileManager( s_tsv_file )
 
-	ls_pop_subsample_values=o_ne_file.pop_sample_values
-	ls_loci_subsample_values=o_ne_file.loci_sample_values
+	'''
+	2026_10_19.  A current database of the table gives 
+	the values from its indexes.
+	'''
+	o_database=get_current_database_for_tsv_file( s_tsv_file )
+
+	if o_database is not None:
+		ls_pop_subsample_values=o_database.getDistinctValues( 'sample_value' )
+		ls_loci_subsample_values=o_database.getDistinctValues( 'loci_sample_value' )
+		o_database.close()
+	else:
+		o_ne_file=NeEstimationTableFileManager( s_tsv_file )
+
+		ls_pop_subsample_values=o_ne_file.pop_sample_values
+		ls_loci_subsample_values=o_ne_file.loci_sample_values
+	#end if we have a database, else use the table file
 
 	return { "pop":ls_pop_subsample_values,
 				"loci":ls_loci_subsample_values }
@@ -1950,23 +2044,26 @@ def get_sample_trunc_normal_allele_frequencies( f_mean_allele_freq,
 		#move low to high:
 		lf_tolerances.sort()	
 
+		'''
+		2026_10_19.  Tries are now drawn as rows of a 2D array,
+		scored all at once (see def get_first_draw_within_tolerance).
+		'''
+		def draw_tries( i_tries ):
+			return o_generator.rvs( size=( i_tries, i_num_freqs ) )
+		#end draw_tries
+
 		for f_tolerance in lf_tolerances:
 
 			if lf_random_freqs is not None:
 				break
 			#end if we've found a set of freqs, break
 
-			for idx in range( NUM_TRIES ):
-
-				lf_these_freqs=o_generator.rvs( i_num_freqs ) 
-
-				f_mean_expected_het=get_mean_expected_het_for_set_of_biallelic_freqs( lf_these_freqs )
-						
-				if abs( f_mean_expected_het - f_target_het_value ) <= f_tolerance:
-					lf_random_freqs=lf_these_freqs
-					break
-				#end if within tolerance
-			#end for each try
+			lf_random_freqs=get_first_draw_within_tolerance( draw_tries,
+										get_mean_expected_het_by_row_of_biallelic_freqs,
+										f_target_het_value,
+										f_tolerance,
+										NUM_TRIES,
+										i_num_freqs )
 		#end for each tolerance value
 
 		if lf_random_freqs is None:
@@ -2009,21 +2106,88 @@ def get_sample_trunc_normal_distribution_generator( f_mean,
 #end get_sample_trunc_normal_distribution_generator
 
 def get_mean_expected_het_for_set_of_biallelic_freqs( lf_biallelic_freqs ):
-	lf_expected_het_values=[]
+	'''
+	2026_10_19. Now computed with numpy arrays (see def
+	get_mean_expected_het_by_row_of_biallelic_freqs).
+	'''
+	na_freqs=nparray( lf_biallelic_freqs, dtype=float ).reshape( 1, -1 )
 
-	for f_freq in lf_biallelic_freqs:
+	f_mean_expected_het=get_mean_expected_het_by_row_of_biallelic_freqs( na_freqs )[ 0 ]
 
-		f_this_expected_het=1 - sum( [ f_afreq * f_afreq  \
-								for f_afreq in [ f_freq, 1 - f_freq ] ] )
+	return f_mean_expected_het
+#end get_mean_expected_het_for_set_of_biallelic_freqs
 
-		lf_expected_het_values.append( f_this_expected_het )
+def get_mean_expected_het_by_row_of_biallelic_freqs( na_biallelic_freqs ):
+	'''
+	2026_10_19. For a 2D numpy array, each row a set of SNP
+	allele frequencies f (with partner allele 1-f), returns
+	the mean expected heterozygosity, 1 - ( f^2 + ( 1-f )^2 ),
+	of each row.
+	'''
+	na_other_freqs=1 - na_biallelic_freqs
 
-	#end for each frequency
+	na_expected_hets=1 - ( na_biallelic_freqs * na_biallelic_freqs \
+									+ na_other_freqs * na_other_freqs )
 
-	f_mean_expected_het=npmean( lf_expected_het_values )
+	return na_expected_hets.mean( axis=1 )
+#end get_mean_expected_het_by_row_of_biallelic_freqs
 
-	return f_mean_expected_het
-#end get_mean_expected_het_for_set_of_biallelic_freqs
+def get_expected_het_by_row_of_allele_freqs( na_allele_freqs ):
+	'''
+	2026_10_19. For a 2D numpy array, each row the frequencies
+	of all alleles at a locus, returns each row's expected
+	heterozygosity, 1 - sum( f^2 ).
+	'''
+	return 1 - ( na_allele_freqs * na_allele_freqs ).sum( axis=1 )
+#end get_expected_het_by_row_of_allele_freqs
+
+def get_first_draw_within_tolerance( def_draw_tries,
+										def_score_tries,
+										f_target_value,
+										f_tolerance,
+										i_max_tries,
+										i_values_per_try,
+										i_max_values_per_batch=int( 1e6 ) ):
+	'''
+	2026_10_19.  Replaces the one-try-at-a-time loops of the defs that
+	draw random allele frequencies until a score (an expected het) is
+	within tolerance of its target.  Each batch of tries is drawn as the
+	rows of a 2D array, by def_draw_tries( i_tries ), and scored by
+	def_score_tries( 2D array ), which returns one value per row.  Batches
+	start at one try, since with many loci the first usually succeeds,
+	and then double, up to i_max_values_per_batch values.  Returns the
+	first row within tolerance, else None after i_max_tries tries.
+
+	Because whole batches are drawn, the rows after the first one
+	within tolerance are drawn too.  So a caller's generator is
+	advanced further than by the old loops, and later draws from it
+	differ from the old ones, even for the same seed.
+	'''
+	i_max_tries_per_batch=max( 1, i_max_values_per_batch // max( 1, i_values_per_try ) )
+
+	i_tries_per_batch=1
+	i_tries_done=0
+
+	while i_tries_done < i_max_tries:
+
+		i_tries_this_batch=min( i_tries_per_batch, i_max_tries - i_tries_done )
+
+		na_tries=def_draw_tries( i_tries_this_batch )
+
+		na_scores=def_score_tries( na_tries )
+
+		na_idx_within=npnonzero( abs( na_scores - f_target_value ) <= f_tolerance )[ 0 ]
+
+		if len( na_idx_within ) > 0:
+			return na_tries[ na_idx_within[ 0 ] ]
+		#end if a try is within tolerance
+
+		i_tries_done+=i_tries_this_batch
+		i_tries_per_batch=min( 2 * i_tries_per_batch, i_max_tries_per_batch )
+	#end while tries remain
+
+	return None
+#end get_first_draw_within_tolerance
 
 def get_roots_quadratic( f_a, f_b, f_c ):
 
@@ -2064,7 +2228,20 @@ def get_sample_uniform_random_allele_frequencies( f_mean_allele_freq,
 
 		lf_random_freqs=None
 
-		i_count_tries=0
+		'''
+		2026_10_19.  Tries are now drawn with numpy as rows
+		of a 2D array, and scored all at once (see def
+		get_first_draw_within_tolerance).  Note that the draws 
+		now come from numpy's global generator rather than from 
+		python's random module.  This is the generator used by 
+		the truncated normal and dirichlet frequency draws, and 
+		reseeded by PGOpSimuPop's __init__, so seeding python's 
+		random no longer reproduces these frequencies.  Seed 
+		numpy.random instead.
+		'''
+		def draw_tries( i_tries ):
+			return npuniform( MIN_RANGE, MAX_RANGE, size=( i_tries, i_num_freqs ) )
+		#end draw_tries
 
 		for f_tolerance in lf_tolerances:
 
@@ -2072,19 +2249,16 @@ def get_sample_uniform_random_allele_frequencies( f_mean_allele_freq,
 				break
 			#end if we have found a set of freqs, break
 
-			for idx in range( NUM_TRIES ):
-
-				i_count_tries+=1
+			na_freqs=get_first_draw_within_tolerance( draw_tries,
+										get_mean_expected_het_by_row_of_biallelic_freqs,
+										f_target_het_value,
+										f_tolerance,
+										NUM_TRIES,
+										i_num_freqs )
 
-				lf_these_freqs=[ random.uniform( MIN_RANGE, MAX_RANGE ) for idx in range( i_num_freqs ) ] 
-
-				f_mean_expected_het=get_mean_expected_het_for_set_of_biallelic_freqs( lf_these_freqs )
-
-				if abs( f_mean_expected_het - f_target_het_value ) <= f_tolerance:
-					lf_random_freqs=lf_these_freqs
-					break
-				#end if within tolerance
-			#end for each try
+			if na_freqs is not None:
+				lf_random_freqs=list( na_freqs )
+			#end if found
 		#end for each tolerance value
 
 		if lf_random_freqs is None:
@@ -2148,26 +2322,23 @@ def get_dirichlet_allele_dist_for_expected_het( f_expected_het,
 		f_myalpha=0.5
 	#end if expected het 0, else over max else...
 
-	b_achieved_het=False
-	for i_trial_number in range( MAX_TRIALS ):
-
-		if b_achieved_het:
-			break
-		#end if done, break
-
-		for i_trial in range( TRIALS ):
-			lf_these_freqs=dirichlet( [ f_myalpha ] * i_num_alleles )
-			f_het=1-( sum ( [ f_freq * f_freq for f_freq in lf_these_freqs ] ) )
-
-			if abs( f_expected_het - f_het ) <= f_tolerance: 
-				lf_freqs=lf_these_freqs
-				b_achieved_het=True
-				break
-			#end if
-		#end for each trial
-	#end for each trial number
-
-	return lf_freqs 
+	'''
+	2026_10_19.  The MAX_TRIALS * TRIALS tries are now drawn
+	as rows of a 2D array, and scored all at once (see def
+	get_first_draw_within_tolerance).
+	'''
+	def draw_tries( i_tries ):
+		return dirichlet( [ f_myalpha ] * i_num_alleles, size=i_tries )
+	#end draw_tries
+
+	lf_freqs=get_first_draw_within_tolerance( draw_tries,
+								get_expected_het_by_row_of_allele_freqs,
+								f_expected_het,
+								f_tolerance,
+								MAX_TRIALS * TRIALS,
+								i_num_alleles )
+
+	return lf_freqs
 #end get_dirichlet_allele_dist_for_expected_het
 
 if __name__ == "__main__":
@@ -17,8 +17,11 @@ __author__ = "Ted Cosart<ted.cosart@umontana.edu>"
 import sys
 import numpy
 import re
+import random
+import bz2
 
 from agestrucne.pgvalidationdefs import *
+from agestrucne.genepopblockfile import is_block_compressed_genepop_file
 
 class IndependantProcessGroup( object ):
 	'''
@@ -1401,7 +1404,15 @@ class NbNeReader( object ):
 			s_header_text=v_genepop_file.header
 		else:
 			try:
-				o_file=open( v_genepop_file, 'r' )
+				'''
+				2026_10_19. Block-compressed genepop files 
+				are also valid bz2 files.
+				'''
+				if is_block_compressed_genepop_file( v_genepop_file ):
+					o_file=bz2.open( v_genepop_file, 'rt' )
+				else:
+					o_file=open( v_genepop_file, 'r' )
+				#end if block compressed, else uncompressed
 			except IOError as ioe:
 				s_msg="In NbNeReader, def __read_nbne_ratio, " \
 							+ "there was an error opening the file, " \
@@ -1632,6 +1643,203 @@ class GenepopPopWriter( object ):
 
 #end class GenepopPopWriter
 
+class WeightedIndexSampler( object ):
+	'''
+	2026_10_19.  Draws an index i, 0 <= i < len( weights ),
+	with probability weights[ i ] / sum( weights ), in
+	constant time per draw, using Walker's alias method.
+	Building the tables is linear in the number of weights,
+	so clients that draw many times from fixed weights (ex:
+	PGOpSimuPop's per-generation age class draws for parents)
+	build one sampler and reuse it.
+
+	As with a linear scan over the cumulative weights, weights
+	that sum to zero always give index zero.
+	'''
+
+	def __init__( self, lf_weights, o_random=random ):
+		'''
+		param lf_weights, a sequence of non-negative numbers.
+		param o_random, the source of uniform floats in [0,1), 
+			by default python's random module.
+		'''
+		self.__random=o_random
+		self.__total_weights=len( lf_weights )
+
+		if self.__total_weights == 0:
+			s_msg="In WeightedIndexSampler instance, def __init__, " \
+						+ "the list of weights is empty."
+			raise Exception( s_msg )
+		#end if no weights
+
+		f_sum=float( sum( lf_weights ) )
+
+		self.__is_all_zero=( f_sum <= 0.0 )
+
+		self.__probabilities=[ 1.0 ] * self.__total_weights
+		self.__aliases=list( range( self.__total_weights ) )
+
+		if not self.__is_all_zero:
+			lf_scaled=[ float( f_weight ) * self.__total_weights / f_sum \
+											for f_weight in lf_weights ]
+			li_small=[ idx for idx in range( self.__total_weights ) if lf_scaled[ idx ] < 1.0 ]
+			li_large=[ idx for idx in range( self.__total_weights ) if lf_scaled[ idx ] >= 1.0 ]
+
+			while len( li_small ) > 0 and len( li_large ) > 0:
+				i_small=li_small.pop()
+				i_large=li_large[ -1 ]
+				self.__probabilities[ i_small ]=lf_scaled[ i_small ]
+				self.__aliases[ i_small ]=i_large
+				lf_scaled[ i_large ]=( lf_scaled[ i_large ] + lf_scaled[ i_small ] ) - 1.0
+				if lf_scaled[ i_large ] < 1.0:
+					li_small.append( li_large.pop() )
+				#end if large column now under-full
+			#end while columns to pair
+
+			#Columns left in either list are (up to float error) full,
+			#so they keep probability 1.0 and never use their alias.
+		#end if any weight
+		return
+	#end __init__
+
+	def draw( self ):
+		if self.__is_all_zero:
+			return 0
+		#end if no weight, use the first index
+
+		#One uniform draw gives both the column and the coin:
+		f_value=self.__random.random() * self.__total_weights
+		i_column=int( f_value )
+
+		if i_column >= self.__total_weights:
+			i_column=self.__total_weights - 1
+		#end if float rounding put us past the last column
+
+		if ( f_value - i_column ) < self.__probabilities[ i_column ]:
+			return i_column
+		#end if the column's own index
+
+		return self.__aliases[ i_column ]
+	#end draw
+#end class WeightedIndexSampler
+
+class DemographyTracker( object ):
+	'''
+	2026_10_19.  Holds, for one state of a simuPOP population, the
+	ages and ind_id values of its males and females, as numpy arrays,
+	read in bulk with the population's indInfo, which, given a virtual
+	subpopulation made by a sex splitter, returns the field's values 
+	for one sex only.  Clients (ex: PGOpSimuPop's defs __calcDemo,
+	__outputAge and __harvest) call def update once per change to the
+	population, and share the age and sex histograms, rather than each
+	iterating over the individuals.
+	'''
+
+	def __init__( self, t_male_subpop, t_female_subpop ):
+		'''
+		param t_male_subpop, a ( subpopulation, virtual subpopulation )
+			tuple giving the males.
+		param t_female_subpop, the ( subpopulation, virtual subpopulation )
+			tuple giving the females.
+		'''
+		self.__male_subpop=t_male_subpop
+		self.__female_subpop=t_female_subpop
+
+		self.__generation=None
+		self.__pop_size=None
+
+		self.__male_ages=None
+		self.__female_ages=None
+		self.__male_ids=None
+		self.__female_ids=None
+		#Assigned in def update, see def getIdsByAgeAndSex:
+		self.__ages_in_order_of_appearance=None
+		return
+	#end __init__
+
+	def update( self, o_pop ):
+		self.__generation=o_pop.dvars().gen
+		self.__pop_size=o_pop.popSize()
+
+		self.__male_ages=numpy.array( o_pop.indInfo( "age", subPop=self.__male_subpop ), dtype=numpy.int64 )
+		self.__female_ages=numpy.array( o_pop.indInfo( "age", subPop=self.__female_subpop ), dtype=numpy.int64 )
+		self.__male_ids=numpy.array( o_pop.indInfo( "ind_id", subPop=self.__male_subpop ) )
+		self.__female_ids=numpy.array( o_pop.indInfo( "ind_id", subPop=self.__female_subpop ) )
+
+		na_ages, na_first_index=numpy.unique( numpy.array( o_pop.indInfo( "age" ), dtype=numpy.int64 ),
+													return_index=True )
+		self.__ages_in_order_of_appearance=na_ages[ numpy.argsort( na_first_index ) ].tolist()
+		return
+	#end update
+
+	def isCurrent( self, o_pop ):
+		'''
+		True when the last update was for the population's
+		current generation and size.  Clients that change the 
+		population without changing its size (ex: mating, with 
+		constant N) should call def update instead.
+		'''
+		return self.__generation is not None \
+					and self.__generation == o_pop.dvars().gen \
+					and self.__pop_size == o_pop.popSize()
+	#end isCurrent
+
+	def getTotalsByAge( self ):
+		'''
+		Returns a dict, keyed by (int) age, of
+		the total individuals of that age.
+		'''
+		na_ages, na_counts=numpy.unique( numpy.concatenate( ( self.__male_ages, 
+																self.__female_ages ) ),
+												return_counts=True )
+
+		return dict( zip( na_ages.tolist(), na_counts.tolist() ) )
+	#end getTotalsByAge
+
+	def getTotalInAgeRange( self, i_min_age, i_max_age ):
+		'''
+		Returns the total individuals with 
+		i_min_age <= age <= i_max_age.
+		'''
+		i_total=0
+
+		for na_ages in [ self.__male_ages, self.__female_ages ]:
+			i_total+=int( numpy.count_nonzero( ( na_ages >= i_min_age ) \
+															& ( na_ages <= i_max_age ) ) )
+		#end for each sex
+
+		return i_total
+	#end getTotalInAgeRange
+
+	def getIdsByAgeAndSex( self ):
+		'''
+		Returns a dict, keyed by (int) age, of tuples, 
+		( list of male ind_id values, list of female 
+		ind_id values ), each list in population order.
+
+		The ages are inserted in the order of their first
+		appearance in the population, the order in which
+		PGOpSimuPop's def __harvest visited the cohorts when it 
+		built its dict by iterating over the individuals. Since
+		it draws random values for each cohort in turn, this 
+		keeps the harvest's draws the same for a given seed.
+		'''
+		dtl_ids_by_age={}
+
+		for i_age in self.__ages_in_order_of_appearance:
+			dtl_ids_by_age[ i_age ]=( self.__male_ids[ self.__male_ages == i_age ].tolist(),
+										self.__female_ids[ self.__female_ages == i_age ].tolist() )
+		#end for each age
+
+		return dtl_ids_by_age
+	#end getIdsByAgeAndSex
+
+	@property
+	def pop_size( self ):
+		return self.__pop_size
+	#end property pop_size
+#end class DemographyTracker
+
 if __name__ == "__main__":
 #	
 #	p1=1
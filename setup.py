@@ -59,7 +59,8 @@ setup(
 						'pyttk;python_version=="2.7"',
 						'simupop;python_version>="3.0"' ],
 	python_requires='>=2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*,<=4',
-	entry_points={ 'console_scripts': [ 'agestrucnb=agestrucne.negui:negui_main' ] },
+	entry_points={ 'console_scripts': [ 'agestrucnb=agestrucne.negui:negui_main',
+		'agestrucnb_genepop_summary=agestrucne.genepopcyclesummary:genepop_summary_main' ] },
 	scripts=[ 'agestrucne/pgdriveneestimator.py', 'agestrucne/pgdrivesimulation.py' ]
 )
 
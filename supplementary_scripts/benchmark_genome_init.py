@@ -0,0 +1,114 @@
+'''
+Description
+Compares the startup time of the genotype initialization
+made by PGOpSimuPop's def __createGenomeFromSNPAndMSatTotals,
+in its original form, one simuPOP InitGenotype operator per
+locus, to that of the bulk initialization now used (module
+flag USE_BULK_GENOTYPE_INIT, private defs __makeGenotypeInitOps
+and __initGenotypesInBulk).
+
+For each total of SNPs, the SNP allele frequencies are drawn
+for the given expected heterozygosity (pgutilities def
+get_snp_allele_freqs_from_het_value_using_random_dist), then,
+for each method, the init operators are made and applied to a
+population of the given size.  The seconds taken by each step,
+and the mean expected heterozygosity of the initialized SNPs,
+are printed as a table.
+
+Requires simuPOP.
+
+Example:
+	python benchmark_genome_init.py -n 1000 -s "1000,10000,50000" -e 0.3
+'''
+from __future__ import print_function
+from __future__ import division
+from builtins import range
+
+__filename__ = "benchmark_genome_init.py"
+__date__ = "20261019"
+
+import argparse as ap
+import time
+
+import numpy
+import simuPOP as sp
+
+import agestrucne.pgopsimupop as pgop
+import agestrucne.pgutilities as pgut
+
+METHODS=[ "per_locus", "bulk" ]
+
+def time_freq_draws( i_num_snps, f_het ):
+
+	f_start=time.time()
+	lf_freqs=pgut.get_snp_allele_freqs_from_het_value_using_random_dist( \
+												f_this_het_value=f_het,
+												i_num_freqs=i_num_snps,
+												lf_tolerances=pgop.SNP_HET_INIT_TOLERANCES,
+												s_distribution=pgop.SNP_ALLELE_FREQ_DISTRIBUTION )
+	f_elapsed=time.time() - f_start
+
+	return f_elapsed, lf_freqs
+#end time_freq_draws
+
+def time_genotype_init( s_method, i_size, lf_freqs ):
+
+	i_num_snps=len( lf_freqs )
+
+	o_pop=sp.Population( i_size, ploidy=2, loci=[ 1 ] * i_num_snps )
+
+	pgop.USE_BULK_GENOTYPE_INIT=( s_method == "bulk" )
+
+	o_op=pgop.PGOpSimuPop.__new__( pgop.PGOpSimuPop )
+
+	f_start=time.time()
+
+	lo_init_ops=o_op._PGOpSimuPop__makeGenotypeInitOps( list( range( i_num_snps ) ),
+															lf_freqs,
+															[] )
+	o_pop.evolve( initOps=lo_init_ops, gen=0 )
+
+	f_elapsed=time.time() - f_start
+
+	#As a check that the methods agree, the mean
+	#expected het of the initialized loci:
+	sp.stat( o_pop, alleleFreq=sp.ALL_AVAIL )
+
+	lf_allele_1_freqs=[ o_pop.dvars().alleleFreq[ i_locus ][ 1 ] \
+									for i_locus in range( i_num_snps ) ]
+
+	f_het=pgut.get_mean_expected_het_for_set_of_biallelic_freqs( lf_allele_1_freqs )
+
+	return f_elapsed, f_het
+#end time_genotype_init
+
+if __name__ == "__main__":
+
+	o_parser=ap.ArgumentParser()
+	o_parser.add_argument( "-n", "--popsize", type=int, default=1000,
+				help="total individuals in the population." )
+	o_parser.add_argument( "-s", "--snps", default="1000,10000,50000",
+				help="comma-delimited totals of SNPs." )
+	o_parser.add_argument( "-e", "--het", type=float, default=0.3,
+				help="expected heterozygosity used to draw the SNP allele frequencies." )
+
+	o_args=o_parser.parse_args()
+
+	li_snp_totals=[ int( s_val ) for s_val in o_args.snps.split( "," ) ]
+
+	print( "\t".join( [ "snps", "method", "freq_seconds", "init_seconds", "het" ] ) )
+
+	for i_num_snps in li_snp_totals:
+
+		f_freq_seconds, lf_freqs=time_freq_draws( i_num_snps, o_args.het )
+
+		for s_method in METHODS:
+			f_init_seconds, f_het=time_genotype_init( s_method, o_args.popsize, lf_freqs )
+			print( "\t".join( [ str( i_num_snps ),
+								s_method,
+								"%0.2f" % f_freq_seconds,
+								"%0.2f" % f_init_seconds,
+								"%0.4f" % f_het ] ) )
+		#end for each method
+	#end for each snp total
+#end if main
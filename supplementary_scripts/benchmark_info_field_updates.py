@@ -0,0 +1,107 @@
+'''
+Description
+Compares the run time of the pre-mating info field updates
+used by PGOpSimuPop's def __createAge, in their original
+form, three simuPOP InfoExec operators ("age += 1",
+"mate = -1", "force_skip = 0"), to that of the bulk update
+now used (the private def __updateInfoFieldsBeforeMating).
+
+Each method evolves a population of the given size for the
+given number of generations, using clone mating, so that the
+population size is constant and the mating cost is small.
+The time for a run with no pre-ops is also given as a baseline.
+
+Requires simuPOP.
+
+Example:
+	python benchmark_info_field_updates.py -n 100000 -g 200
+'''
+from __future__ import print_function
+from builtins import range
+
+__filename__ = "benchmark_info_field_updates.py"
+__date__ = "20261019"
+
+import argparse as ap
+import time
+
+import simuPOP as sp
+
+import agestrucne.pgopsimupop as pgop
+
+INFO_FIELDS=[ "ind_id", "father_id", "mother_id",
+				"age", "breed", "rep_succ",
+				"mate", "force_skip" ]
+
+def get_pre_ops( s_method ):
+
+	lo_pre_ops=None
+
+	if s_method == "none":
+		lo_pre_ops=[]
+	elif s_method == "infoexec":
+		lo_pre_ops=[ sp.InfoExec( "age += 1" ),
+						sp.InfoExec( "mate = -1" ),
+						sp.InfoExec( "force_skip = 0" ) ]
+	elif s_method == "bulk":
+		o_op=pgop.PGOpSimuPop.__new__( pgop.PGOpSimuPop )
+		lo_pre_ops=[ sp.PyOperator(
+				func=o_op._PGOpSimuPop__updateInfoFieldsBeforeMating ) ]
+	else:
+		raise Exception( "In benchmark_info_field_updates.py, " \
+							+ "def get_pre_ops, unknown method: " \
+							+ s_method + "." )
+	#end if none, elif infoexec, elif bulk, else error
+
+	return lo_pre_ops
+#end get_pre_ops
+
+def time_evolve( s_method, i_size, i_generations ):
+
+	o_pop=sp.Population( i_size, ploidy=2, loci=[ 1 ], infoFields=INFO_FIELDS )
+
+	o_pop.evolve( initOps=[ sp.InitSex(), sp.IdTagger() ],
+					preOps=[],
+					matingScheme=sp.CloneMating(),
+					gen=0 )
+
+	lo_pre_ops=get_pre_ops( s_method )
+
+	f_start=time.time()
+	o_pop.evolve( preOps=lo_pre_ops,
+					matingScheme=sp.CloneMating(),
+					gen=i_generations )
+	f_elapsed=time.time() - f_start
+
+	#As a check that the methods agree, the
+	#(cloned) age after the last generation:
+	f_age=o_pop.indInfo( "age" )[ 0 ]
+
+	return f_elapsed, f_age
+#end time_evolve
+
+if __name__ == "__main__":
+
+	o_parser=ap.ArgumentParser()
+	o_parser.add_argument( "-n", "--popsize", type=int, default=100000,
+				help="individuals in the population." )
+	o_parser.add_argument( "-g", "--generations", type=int, default=200,
+				help="generations to evolve." )
+	o_parser.add_argument( "-s", "--seed", type=int, default=1 )
+
+	o_args=o_parser.parse_args()
+
+	print( "\t".join( [ "method", "popsize", "generations", "seconds", "final_age" ] ) )
+
+	for s_method in [ "none", "infoexec", "bulk" ]:
+		sp.setRNG( seed=o_args.seed )
+
+		f_elapsed, f_age=time_evolve( s_method, o_args.popsize, o_args.generations )
+
+		print( "\t".join( [ s_method,
+							str( o_args.popsize ),
+							str( o_args.generations ),
+							"%0.2f" % f_elapsed,
+							str( f_age ) ] ) )
+	#end for each method
+#end if main
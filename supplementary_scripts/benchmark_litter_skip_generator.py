@@ -0,0 +1,189 @@
+'''
+Description
+Measures the throughput, in parent pairs per second, of
+PGOpSimuPop's default mating generator (the private def
+__litterSkipGenerator), for the life tables in the
+agestrucne/resources directory.
+
+For each life table, the script builds a simuPOP population
+of the given size, whose ages follow the life table's survival
+rates, then times the draw of the given number of pairs from one
+call to the generator.  A litter size distribution can be given to
+exercise the litter-female removal path.
+
+Requires simuPOP.
+
+Example:
+	python benchmark_litter_skip_generator.py -n 5000 -p 200000 -l "0.5,0.3,0.2"
+'''
+from __future__ import print_function
+from builtins import range
+from builtins import object
+
+__filename__ = "benchmark_litter_skip_generator.py"
+__date__ = "20261019"
+
+import argparse as ap
+import configparser
+import ast
+import glob
+import os
+import random
+import time
+
+import simuPOP as sp
+
+import agestrucne.pgopsimupop as pgop
+
+class BenchmarkInput( object ):
+	'''
+	Holds the few PGInputSimuPop attributes
+	read by def __litterSkipGenerator.
+	'''
+	def __init__( self, lf_fec_male, lf_fec_female, lf_litter ):
+		self.fecundityMale=lf_fec_male
+		self.fecundityFemale=lf_fec_female
+		self.litter=lf_litter
+		self.skip=None
+		self.forceSkip=0.0
+		self.isMonog=False
+		return
+	#end __init__
+#end class BenchmarkInput
+
+def get_life_table_values( s_life_table_file ):
+	o_config=configparser.ConfigParser()
+	o_config.read( s_life_table_file )
+
+	if not o_config.has_section( "resources" ) \
+			or not o_config.has_option( "resources", "fecMale" ):
+		return None
+	#end if not a life table with fecundities
+
+	dv_values={}
+	for s_option in [ "ages", "survivalMale", "survivalFemale", "fecMale", "fecFemale" ]:
+		dv_values[ s_option ]=ast.literal_eval( o_config.get( "resources", s_option ) )
+	#end for each option
+
+	return dv_values
+#end get_life_table_values
+
+def get_stationary_age_weights( i_ages, lf_survival ):
+	'''
+	Relative abundance of ages 1 through i_ages - 1,
+	the product of the survival rates to each age.
+	'''
+	lf_weights=[]
+	f_surviving=1.0
+	for idx in range( i_ages - 1 ):
+		lf_weights.append( f_surviving )
+		if idx < len( lf_survival ):
+			f_surviving*=lf_survival[ idx ]
+		#end if we have a rate for this age
+	#end for each age
+
+	return lf_weights
+#end get_stationary_age_weights
+
+def make_population( dv_life_table, i_size ):
+	o_pop=sp.Population( i_size, ploidy=2, loci=[ 1 ],
+							infoFields=[ "ind_id", "father_id", "mother_id",
+											"age", "breed", "rep_succ",
+											"mate", "force_skip" ] )
+
+	lf_male_weights=get_stationary_age_weights( dv_life_table[ "ages" ],
+											dv_life_table[ "survivalMale" ] )
+	lf_female_weights=get_stationary_age_weights( dv_life_table[ "ages" ],
+											dv_life_table[ "survivalFemale" ] )
+	li_ages=list( range( 1, dv_life_table[ "ages" ] ) )
+
+	i_id=1
+	for o_ind in o_pop.individuals():
+		b_male=random.random() < 0.5
+		o_ind.setSex( sp.MALE if b_male else sp.FEMALE )
+		lf_weights=lf_male_weights if b_male else lf_female_weights
+		o_ind.age=random.choices( li_ages, weights=lf_weights )[ 0 ]
+		o_ind.ind_id=i_id
+		o_ind.breed=-1000
+		o_ind.mate=-1
+		i_id+=1
+	#end for each individual
+
+	o_pop.dvars().gen=1
+	return o_pop
+#end make_population
+
+def time_generator( dv_life_table, i_size, i_pairs, lf_litter ):
+	o_op=pgop.PGOpSimuPop.__new__( pgop.PGOpSimuPop )
+	o_op.input=BenchmarkInput( dv_life_table[ "fecMale" ],
+								dv_life_table[ "fecFemale" ],
+								lf_litter )
+
+	o_pop=make_population( dv_life_table, i_size )
+
+	if lf_litter is not None:
+		'''
+		Each litter female is removed once chosen, so the
+		fecund females bound the total pairs the generator
+		can give before it would search indefinitely.
+		'''
+		i_fecund_females=len( [ o_ind for o_ind in o_pop.individuals() \
+						if o_ind.sex() == sp.FEMALE \
+						and dv_life_table[ "fecFemale" ][ int( o_ind.age ) - 1 ] > 0 ] )
+		i_pairs=min( i_pairs, i_fecund_females )
+	#end if litter sizes, limit the pairs
+
+	f_start=time.time()
+	o_generator=o_op._PGOpSimuPop__litterSkipGenerator( o_pop, 0 )
+	for idx in range( i_pairs ):
+		next( o_generator )
+	#end for each pair
+	f_elapsed=time.time() - f_start
+
+	f_rate=i_pairs / f_elapsed if f_elapsed > 0 else float( "inf" )
+
+	return i_pairs, f_rate
+#end time_generator
+
+if __name__ == "__main__":
+
+	s_default_dir=os.path.join( os.path.dirname( os.path.abspath( pgop.__file__ ) ), "resources" )
+
+	o_parser=ap.ArgumentParser()
+	o_parser.add_argument( "-g", "--glob",
+				default=os.path.join( s_default_dir, "*.life.table.info" ),
+				help="glob pattern for the life table files, by default all in agestrucne/resources." )
+	o_parser.add_argument( "-n", "--popsize", type=int, default=5000,
+				help="individuals in each benchmark population." )
+	o_parser.add_argument( "-p", "--pairs", type=int, default=100000,
+				help="total pairs to draw from the generator." )
+	o_parser.add_argument( "-l", "--litter", default=None,
+				help="comma-delimited litter size probabilities (sizes 1, 2, ...). " \
+						+ "Default is no litter sizes." )
+	o_parser.add_argument( "-s", "--seed", type=int, default=1 )
+
+	o_args=o_parser.parse_args()
+
+	lf_litter=None if o_args.litter is None \
+			else [ float( s_val ) for s_val in o_args.litter.split( "," ) ]
+
+	print( "\t".join( [ "life_table", "ages", "popsize", "pairs", "pairs_per_second" ] ) )
+
+	for s_life_table_file in sorted( glob.glob( o_args.glob ) ):
+		dv_life_table=get_life_table_values( s_life_table_file )
+		if dv_life_table is None:
+			continue
+		#end if not a usable life table
+
+		random.seed( o_args.seed )
+		sp.setRNG( seed=o_args.seed )
+
+		i_pairs, f_rate=time_generator( dv_life_table, o_args.popsize, o_args.pairs, lf_litter )
+
+		print( "\t".join( [ os.path.basename( s_life_table_file ),
+							str( dv_life_table[ "ages" ] ),
+							str( o_args.popsize ),
+							str( i_pairs ),
+							"%0.1f" % f_rate ] ) )
+	#end for each life table
+#end if main
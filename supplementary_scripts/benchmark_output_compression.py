@@ -0,0 +1,88 @@
+'''
+Description
+Compares codecs, levels and total processes for compressing
+simulation output files (see module agestrucne/pgparallelcompressor.py,
+used by PGOutputSimuPop's def compressAllFiles).
+
+For each combination, a copy of the given file (ex: a genepop
+or *gen file from a simulation) is compressed, and the seconds
+taken, and the ratio of the compressed to the original size, are
+printed as a table.  The original file is not changed.
+
+Example:
+	python benchmark_output_compression.py -f mysim.genepop -c "bz2,gzip,lzma" -l "1,6,9" -p "1,4"
+'''
+from __future__ import print_function
+from __future__ import division
+
+__filename__ = "benchmark_output_compression.py"
+__date__ = "20261019"
+
+import argparse as ap
+import os
+import shutil
+import tempfile
+import time
+
+import agestrucne.pgparallelcompressor as pgcomp
+
+def time_compression( s_file, s_codec, i_level, i_total_processes, i_chunk_bytes ):
+
+	s_temp_dir=tempfile.mkdtemp()
+
+	try:
+		s_copy=os.path.join( s_temp_dir, os.path.basename( s_file ) )
+		shutil.copy( s_file, s_copy )
+
+		f_start=time.time()
+		s_compressed=pgcomp.compress_file( s_copy,
+											s_codec=s_codec,
+											i_level=i_level,
+											i_total_processes=i_total_processes,
+											i_chunk_bytes=i_chunk_bytes )
+		f_elapsed=time.time() - f_start
+
+		f_ratio=os.path.getsize( s_compressed ) / os.path.getsize( s_file )
+	finally:
+		shutil.rmtree( s_temp_dir )
+	#end try...finally
+
+	return f_elapsed, f_ratio
+#end time_compression
+
+if __name__ == "__main__":
+
+	o_parser=ap.ArgumentParser()
+	o_parser.add_argument( "-f", "--file", required=True,
+				help="file to compress (a copy is used)." )
+	o_parser.add_argument( "-c", "--codecs", default=",".join( pgcomp.CODECS ),
+				help="comma-delimited codecs, from " + ", ".join( pgcomp.CODECS ) + "." )
+	o_parser.add_argument( "-l", "--levels", default="1,6,9",
+				help="comma-delimited compression levels." )
+	o_parser.add_argument( "-p", "--processes", default="1,4",
+				help="comma-delimited total processes." )
+	o_parser.add_argument( "-b", "--chunkbytes", type=int, default=pgcomp.DEFAULT_CHUNK_BYTES,
+				help="bytes per chunk when compressing with more than one process." )
+
+	o_args=o_parser.parse_args()
+
+	ls_codecs=o_args.codecs.split( "," )
+	li_levels=[ int( s_val ) for s_val in o_args.levels.split( "," ) ]
+	li_processes=[ int( s_val ) for s_val in o_args.processes.split( "," ) ]
+
+	print( "\t".join( [ "codec", "level", "processes", "seconds", "ratio" ] ) )
+
+	for s_codec in ls_codecs:
+		for i_level in li_levels:
+			for i_processes in li_processes:
+				f_elapsed, f_ratio=time_compression( o_args.file, s_codec, i_level,
+															i_processes, o_args.chunkbytes )
+				print( "\t".join( [ s_codec,
+									str( i_level ),
+									str( i_processes ),
+									"%0.2f" % f_elapsed,
+									"%0.4f" % f_ratio ] ) )
+			#end for each total processes
+		#end for each level
+	#end for each codec
+#end if main